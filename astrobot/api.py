@@ -0,0 +1,459 @@
+"""
+This module contains the HTTP JSON API of AstroBot.
+
+The API serves the same daily reports and plots as the bot, for the website and other tools. It
+goes through the same pipeline (single-flight layer, work queue, compute pool or compute service)
+so it shares the caches of the bot. Every answer has an ETag derived from the normalized request,
+so that a client sending it back in If-None-Match gets a 304 without any computation.
+
+Endpoints:
+    GET /status: The status of the ephemeris kernel.
+    GET /report: The daily report of a body for one location and date.
+    GET /plot: The polar sky map or the xy path of a body, as PNG.
+    POST /batch: The daily reports of many locations and dates ({"requests": [{...}, ...]}).
+    GET /range: The daily reports of a range of dates, streamed as JSON lines.
+
+The request parameters are body, latitude, longitude, altitude (default 0), timezone (default
+the timezone of the location), date (YYYY-MM-DD, default today) and time (HH:MM, default now for
+today and midnight otherwise). The report endpoint also takes plot (true to add the data only drawn
+by the plots: the solstice paths of the sun, empty otherwise), the plot endpoint type (polar or
+cartesian), and the range endpoint start and end instead of date.
+
+Attributes:
+    MAX_BATCH (int): The maximum number of requests of a batch.
+    MAX_RANGE (int): The maximum number of days of a range.
+    CACHE_MAX_AGE (int): The max-age of the answers, in seconds.
+
+Methods:
+    report_to_dict: Convert a daily report to JSON-compatible values.
+    create_app: Create the application of the API.
+    serve: Serve the API until cancelled.
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+from datetime import date as Date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+from aiohttp import web
+
+from constants import BODIES, COMPUTE_WORKERS, EPHEMERIS_KERNEL, MAX_YEAR, MIN_YEAR, PLOT_DATA, PLOT_TYPES
+from results import DailyPath, Events
+from workqueue import QueueFullError
+import pipeline
+import timezones
+
+MAX_BATCH = 100
+MAX_RANGE = 366
+CACHE_MAX_AGE = 60
+
+def _jsonable(
+    value
+):
+    """
+    Convert a value of a daily report to JSON-compatible values.
+
+    Args:
+        value: The value to convert.
+
+    Returns:
+        The converted value.
+    """
+    if isinstance(value, (DailyPath, Events)):
+        return _jsonable(tuple(value))
+    if isinstance(value, dict):
+        return {str(_jsonable(key)): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, (Date, time)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def report_to_dict(
+    report
+) -> dict:
+    """
+    Convert a daily report to JSON-compatible values.
+
+    Args:
+        report (DailyReport): The daily report.
+
+    Returns:
+        dict: The fields of the report, with the dates and times in ISO 8601, and the daily path as
+        its altitudes, azimuths and peak_hours_altaz.
+    """
+    values = {}
+    for field in dataclasses.fields(report):
+        value = getattr(report, field.name)
+        if isinstance(value, DailyPath):
+            values['altitudes'], values['azimuths'], values['peak_hours_altaz'] = value
+        else:
+            values[field.name] = value
+    return _jsonable(values)
+
+def _parse_request(
+    params
+) -> tuple:
+    """
+    Parse and validate the parameters of a request.
+
+    Args:
+        params (Mapping): The query parameters or the JSON object of the request.
+
+    Returns:
+        tuple: The body, latitude, longitude, altitude, timezone, date and current time.
+
+    Raises:
+        ValueError: If a parameter is missing or invalid.
+    """
+    body = params.get('body')
+    if body not in BODIES:
+        raise ValueError(f'body must be one of {", ".join(BODIES)}')
+    try:
+        latitude = float(params['latitude'])
+        longitude = float(params['longitude'])
+        altitude = float(params.get('altitude', 0))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('latitude and longitude are required numbers, altitude is an optional number')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('latitude must be within [-90, 90] and longitude within [-180, 180]')
+
+    timezone = params.get('timezone') or timezones.get_timezone(latitude, longitude)
+    try:
+        today = datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f'unknown timezone {timezone}')
+
+    date = _check_date(Date.fromisoformat(params['date'])) if 'date' in params else today.date()
+    if 'time' in params:
+        now = datetime.combine(date, time.fromisoformat(params['time']))
+    elif date == today.date():
+        now = today
+    else:
+        now = datetime.combine(date, time())
+
+    return body, latitude, longitude, altitude, timezone, datetime.combine(date, time()), now
+
+def _check_date(
+    date: Date
+) -> Date:
+    """
+    Check that a date is within the range of the ephemeris.
+
+    Args:
+        date (datetime.date): The date.
+
+    Returns:
+        datetime.date: The date.
+
+    Raises:
+        ValueError: If the date is out of the range of the ephemeris.
+    """
+    if not MIN_YEAR <= date.year <= MAX_YEAR:
+        raise ValueError(f'the year must be within [{MIN_YEAR}, {MAX_YEAR}]')
+    return date
+
+def _get_etag(
+    *parts
+) -> str:
+    """
+    Get the ETag of an answer from the normalized request.
+
+    Args:
+        *parts: The normalized request.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    return '"' + hashlib.sha1(repr(parts).encode()).hexdigest() + '"'
+
+def _not_modified(
+    request: web.Request,
+    etag: str
+) -> web.Response | None:
+    """
+    Get the 304 answer if the client already has the answer with the given ETag.
+
+    Args:
+        request (web.Request): The request.
+        etag (str): The ETag of the answer.
+
+    Returns:
+        web.Response: The 304 answer, or None if the answer has to be computed.
+    """
+    if etag in request.headers.get('If-None-Match', ''):
+        return web.Response(status=304, headers=_cache_headers(etag))
+    return None
+
+def _cache_headers(
+    etag: str
+) -> dict:
+    """
+    Get the caching headers of an answer.
+
+    Args:
+        etag (str): The ETag of the answer.
+
+    Returns:
+        dict: The ETag and Cache-Control headers.
+    """
+    return {'ETag': etag, 'Cache-Control': f'public, max-age={CACHE_MAX_AGE}'}
+
+def _error(
+    status: int,
+    message: str,
+    **headers
+) -> web.Response:
+    """
+    Get an error answer.
+
+    Args:
+        status (int): The HTTP status.
+        message (str): The error message.
+        **headers: The additional headers.
+
+    Returns:
+        web.Response: The JSON error answer.
+    """
+    return web.json_response({'error': message}, status=status, headers=headers)
+
+@web.middleware
+async def _errors(
+    request: web.Request,
+    handler
+) -> web.StreamResponse:
+    """
+    Turn the validation errors, the full work queue and the missing kernel into error answers.
+
+    Args:
+        request (web.Request): The request.
+        handler (callable): The handler of the endpoint.
+
+    Returns:
+        web.StreamResponse: The answer of the handler, or the error answer.
+    """
+    if request.path != '/status':
+        status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        if status['state'] != 'ready':
+            return _error(503, f'ephemeris kernel {status["state"]} ({status["progress"]:.0%})', **{'Retry-After': '10'})
+    try:
+        return await handler(request)
+    except ValueError as error:
+        return _error(400, str(error))
+    except QueueFullError as error:
+        return _error(503, f'busy ({error.waiting} waiting requests)', **{'Retry-After': '1'})
+
+async def _compute(
+    body: str,
+    plot_type: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    now: datetime
+) -> tuple:
+    """
+    Compute a request with the pipeline, with the ETag of its answer.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        plot_type (str): The type of plot, as in constants.PLOT_TYPES values, PLOT_DATA for the data of the plots without an image, or None for text only.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the report.
+        now (datetime): The time of the current position.
+
+    Returns:
+        tuple: The daily report, the PNG image (None for text only) and the ETag.
+    """
+    etag = _get_etag(pipeline.get_request_key(body, plot_type, latitude, longitude, altitude, timezone, date, now))
+    report, image = await pipeline.compute(body, plot_type, latitude, longitude, altitude, timezone, date, now)
+    return report, image, etag
+
+async def get_status(
+    request: web.Request
+) -> web.Response:
+    """
+    Get the status of the ephemeris kernel.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The status, as returned by KernelManager.status.
+    """
+    return web.json_response(await pipeline.kernel_status(EPHEMERIS_KERNEL))
+
+async def get_report(
+    request: web.Request
+) -> web.Response:
+    """
+    Get the daily report of a body for one location and date.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The report as JSON.
+    """
+    body, latitude, longitude, altitude, timezone, date, now = _parse_request(request.query)
+    plot = request.query.get('plot', 'false').lower()
+    if plot not in ('true', 'false'):
+        raise ValueError('plot must be true or false')
+    # The solstice paths are only computed for the data of the plots
+    plot_type = PLOT_DATA if plot == 'true' else None
+    etag = _get_etag(pipeline.get_request_key(body, plot_type, latitude, longitude, altitude, timezone, date, now))
+    if (response := _not_modified(request, etag)) is not None:
+        return response
+
+    report, _, etag = await _compute(body, plot_type, latitude, longitude, altitude, timezone, date, now)
+    return web.json_response(report_to_dict(report), headers=_cache_headers(etag))
+
+async def get_plot(
+    request: web.Request
+) -> web.Response:
+    """
+    Get the polar sky map or the xy path of a body, as PNG.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The PNG image.
+    """
+    body, latitude, longitude, altitude, timezone, date, now = _parse_request(request.query)
+    plot_type = request.query.get('type', 'polar')
+    if plot_type not in PLOT_TYPES.values():
+        raise ValueError(f'type must be one of {", ".join(PLOT_TYPES.values())}')
+    etag = _get_etag(pipeline.get_request_key(body, plot_type, latitude, longitude, altitude, timezone, date, now))
+    if (response := _not_modified(request, etag)) is not None:
+        return response
+
+    _, image, etag = await _compute(body, plot_type, latitude, longitude, altitude, timezone, date, now)
+    return web.Response(body=image, content_type='image/png', headers=_cache_headers(etag))
+
+async def post_batch(
+    request: web.Request
+) -> web.Response:
+    """
+    Get the daily reports of many locations and dates.
+
+    Each item of the answer is either a report, or an object with the error of its request.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.Response: The reports as JSON, in the order of the requests.
+    """
+    try:
+        requests = (await request.json())['requests']
+    except (json.JSONDecodeError, KeyError, TypeError):
+        raise ValueError('the body must be a JSON object with a "requests" list')
+    if not isinstance(requests, list) or len(requests) > MAX_BATCH:
+        raise ValueError(f'requests must be a list of at most {MAX_BATCH} objects')
+
+    # Run as many requests at once as the compute pool, so a full batch never fills the work queue
+    slots = asyncio.Semaphore(COMPUTE_WORKERS)
+
+    async def run(params):
+        try:
+            body, latitude, longitude, altitude, timezone, date, now = _parse_request(params)
+            async with slots:
+                report, _, _ = await _compute(body, None, latitude, longitude, altitude, timezone, date, now)
+            return report_to_dict(report)
+        except (ValueError, AttributeError) as error:
+            return {'error': str(error)}
+        except QueueFullError as error:
+            return {'error': f'busy ({error.waiting} waiting requests)'}
+
+    return web.json_response({'results': await asyncio.gather(*[run(params) for params in requests])})
+
+async def get_range(
+    request: web.Request
+) -> web.StreamResponse:
+    """
+    Get the daily reports of a range of dates, streamed as JSON lines as soon as they are computed.
+
+    Args:
+        request (web.Request): The request.
+
+    Returns:
+        web.StreamResponse: One report per line, in the order of the dates.
+    """
+    params = dict(request.query)
+    start = _check_date(Date.fromisoformat(params.pop('start', '')))
+    end = _check_date(Date.fromisoformat(params.pop('end', '')))
+    days = (end - start).days + 1
+    if not 0 < days <= MAX_RANGE:
+        raise ValueError(f'the range must hold between 1 and {MAX_RANGE} days')
+    body, latitude, longitude, altitude, timezone, _, _ = _parse_request({**params, 'date': start.isoformat()})
+    etag = _get_etag(body, latitude, longitude, altitude, timezone, start, end)
+    if (response := _not_modified(request, etag)) is not None:
+        return response
+
+    response = web.StreamResponse(headers={**_cache_headers(etag), 'Content-Type': 'application/x-ndjson'})
+    await response.prepare(request)
+
+    # Compute the days by windows of the size of the compute pool, and stream them in order
+    dates = [datetime.combine(start + timedelta(days=day), time()) for day in range(days)]
+    try:
+        for index in range(0, days, COMPUTE_WORKERS):
+            reports = await asyncio.gather(*[
+                _compute(body, None, latitude, longitude, altitude, timezone, date, date)
+                for date in dates[index:index + COMPUTE_WORKERS]
+            ])
+            await response.write(b''.join(json.dumps(report_to_dict(report)).encode() + b'\n' for report, _, _ in reports))
+    except QueueFullError as error:
+        # The headers are already sent, end the stream with the error
+        await response.write(json.dumps({'error': f'busy ({error.waiting} waiting requests)'}).encode() + b'\n')
+
+    await response.write_eof()
+    return response
+
+def create_app(
+) -> web.Application:
+    """
+    Create the application of the API.
+
+    Returns:
+        web.Application: The application.
+    """
+    app = web.Application(middlewares=[_errors])
+    app.add_routes([
+        web.get('/status', get_status),
+        web.get('/report', get_report),
+        web.get('/plot', get_plot),
+        web.post('/batch', post_batch),
+        web.get('/range', get_range),
+    ])
+    return app
+
+async def serve(
+    host: str,
+    port: int
+) -> None:
+    """
+    Serve the API until cancelled.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+    """
+    runner = web.AppRunner(create_app())
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+
+    print(f'AstroBot - HTTP API listening on http://{host}:{port}')
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,366 @@
+"""
+This module contains the batch almanac tool of AstroBot.
+
+It computes the sunrise, sunset, moonrise, moonset and twilight times of many sites over date
+ranges, for example a whole year of tables for every club site. The sites are read from a CSV file
+with the columns name, latitude, longitude, and optionally altitude, timezone (default: the
+timezone of the site), start and end (YYYY-MM-DD). The work is split in chunks of days over a
+process pool whose workers load the ephemeris kernel once, and the rows are written as soon as their chunk is done, to CSV, JSON lines
+or Parquet (with pyarrow, imported only for a Parquet output, in row groups of ROW_GROUP_ROWS rows). An interrupted CSV or JSON lines run can be resumed: the rows already
+written are skipped.
+
+The twilight columns describe the night starting on the date: the dusks of its evening and the
+dawns of the next morning.
+
+Usage:
+    python batch.py sites.csv almanac.csv --start 2025-01-01 --end 2025-12-31 --workers 8
+    python batch.py sites.csv almanac.jsonl --resume
+
+Attributes:
+    COLUMNS (list): The columns of the output rows.
+    CHUNK_DAYS (int): The number of days computed by a worker at once.
+    ROW_GROUP_ROWS (int): The number of rows of each row group of a Parquet output.
+    DAWNS (dict): The twilight column of each twilight level reached while the sun rises.
+    DUSKS (dict): The twilight column of each twilight level reached while the sun sets.
+
+Methods:
+    read_sites: Read the sites of a CSV file.
+    compute_chunk: Compute the rows of a site over some days.
+    run: Compute the rows of every site and date, and write them to the output file.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date as Date, datetime, timedelta
+
+from skyfield import almanac
+
+from constants import EPHEMERIS_KERNEL
+from ephemeris import Ephemeris, ts
+import kernels
+import timezones
+
+COLUMNS = [
+    'name', 'date',
+    'sunrise', 'sunset', 'moonrise', 'moonset',
+    'civil_dusk', 'nautical_dusk', 'astronomical_dusk',
+    'astronomical_dawn', 'nautical_dawn', 'civil_dawn',
+]
+CHUNK_DAYS = 16
+ROW_GROUP_ROWS = 65536
+
+DAWNS = {1: 'astronomical_dawn', 2: 'nautical_dawn', 3: 'civil_dawn'}
+DUSKS = {2: 'civil_dusk', 1: 'nautical_dusk', 0: 'astronomical_dusk'}
+
+def read_sites(
+    path: str,
+    start: Date,
+    end: Date
+) -> list[dict]:
+    """
+    Read the sites of a CSV file.
+
+    Args:
+        path (str): The path of the CSV file.
+        start (datetime.date): The first date of the sites without a start column.
+        end (datetime.date): The last date of the sites without an end column.
+
+    Returns:
+        list: The sites, with their name, latitude, longitude, altitude, timezone, start and end.
+
+    Raises:
+        ValueError: If a row is invalid.
+    """
+    sites = []
+    with open(path, newline='', encoding='utf-8') as file:
+        for line, row in enumerate(csv.DictReader(file), start=2):
+            try:
+                latitude, longitude = float(row['latitude']), float(row['longitude'])
+                sites.append({
+                    'name': row['name'],
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'altitude': float(row.get('altitude') or 0),
+                    'timezone': row.get('timezone') or timezones.get_timezone(latitude, longitude),
+                    'start': Date.fromisoformat(row['start']) if row.get('start') else start,
+                    'end': Date.fromisoformat(row['end']) if row.get('end') else end,
+                })
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f'{path}:{line}: invalid site ({error})')
+    return sites
+
+def _format_time(
+    value
+) -> str:
+    """
+    Format a time of the output rows.
+
+    Args:
+        value (datetime.time): The time, or None.
+
+    Returns:
+        str: The time as HH:MM:SS, or an empty string.
+    """
+    return value.strftime('%H:%M:%S') if value is not None else ''
+
+def _init_worker(
+    data_dir: str
+) -> None:
+    """
+    Load the ephemeris kernel once in a worker process.
+
+    Args:
+        data_dir (str): The directory of the kernels.
+    """
+    kernels.manager = kernels.KernelManager(data_dir)
+    kernels.manager.load(EPHEMERIS_KERNEL)
+
+def compute_chunk(
+    site: dict,
+    dates: list[Date]
+) -> list[dict]:
+    """
+    Compute the rows of a site over some days.
+
+    Args:
+        site (dict): The site, as returned by read_sites.
+        dates (list): The dates to compute.
+
+    Returns:
+        list: One row per date, with the columns of COLUMNS.
+    """
+    eph = Ephemeris.for_location(site['latitude'], site['longitude'], site['altitude'], site['timezone'])
+    twilight_level = almanac.dark_twilight_day(kernels.manager.load(EPHEMERIS_KERNEL), eph.observer)
+
+    rows = []
+    for date in dates:
+        date = datetime(date.year, date.month, date.day)
+        row = dict.fromkeys(COLUMNS, '')
+        row['name'] = site['name']
+        row['date'] = date.date().isoformat()
+
+        for body, rise_column, set_column in (('sun', 'sunrise', 'sunset'), ('moon', 'moonrise', 'moonset')):
+            rise_time, set_time = eph.get_rise_set_times(date, body)
+            row[rise_column], row[set_column] = _format_time(rise_time), _format_time(set_time)
+
+        # Name the twilight transitions from the level they leave, starting from the level at noon
+        twilight = eph.get_twilight_times_events(date)
+        if twilight is not None:
+            level = int(twilight_level(ts.from_datetime(date.replace(hour=12, tzinfo=eph.timezone))))
+            for event_time, event in zip(*twilight):
+                column = DAWNS.get(event) if event > level else DUSKS.get(event)
+                if column is not None:
+                    row[column] = _format_time(event_time)
+                level = event
+
+        rows.append(row)
+    return rows
+
+class _Writer:
+    """
+    A class to write the output rows incrementally, in the format given by the file extension.
+
+    Attributes:
+        path (str): The path of the output file.
+        format (str): The format of the output file ('csv', 'jsonl' or 'parquet').
+
+    Methods:
+        done(): Get the (name, date) of the rows already written.
+        write(rows): Write rows to the output file.
+        close(): Close the output file.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        resume: bool
+    ) -> None:
+        """
+        Initialize the _Writer object, and open the output file.
+
+        Args:
+            path (str): The path of the output file.
+            resume (bool): Whether to append to an interrupted run instead of overwriting it.
+
+        Raises:
+            ValueError: If the format is not supported, or cannot be resumed.
+        """
+        self.path = path
+        self.format = os.path.splitext(path)[1].lstrip('.').lower()
+        if self.format == 'json':
+            self.format = 'jsonl'
+        if self.format not in ('csv', 'jsonl', 'parquet'):
+            raise ValueError('The output file must be a .csv, .jsonl or .parquet file')
+        resume = resume and os.path.exists(path)
+
+        if self.format == 'parquet':
+            try:
+                import pyarrow
+                import pyarrow.parquet
+            except ImportError:
+                raise ValueError('The Parquet output needs pyarrow (pip install pyarrow)')
+            if resume:
+                raise ValueError('Only the CSV and JSON lines outputs can be resumed')
+            self._pyarrow = pyarrow
+            self._schema = pyarrow.schema([(column, pyarrow.string()) for column in COLUMNS])
+            self._file = pyarrow.parquet.ParquetWriter(path, self._schema)
+            self._rows = []
+            self._done = set()
+            return
+
+        self._done = self._read_done() if resume else set()
+        self._file = open(path, 'a' if resume else 'w', newline='', encoding='utf-8')
+        if self.format == 'csv':
+            self._csv = csv.DictWriter(self._file, COLUMNS)
+            if not resume:
+                self._csv.writeheader()
+
+    def _read_done(
+        self
+    ) -> set:
+        """
+        Read the rows of an interrupted run, and drop its last row if it was cut.
+
+        Returns:
+            set: The (name, date) of the complete rows.
+        """
+        with open(self.path, 'rb+') as file:
+            content = file.read()
+            file.truncate(content.rfind(b'\n') + 1)
+        lines = content[:content.rfind(b'\n') + 1].decode('utf-8').splitlines()
+
+        if self.format == 'csv':
+            rows = csv.DictReader(lines)
+        else:
+            rows = (json.loads(line) for line in lines)
+        return {(row['name'], row['date']) for row in rows}
+
+    def done(
+        self
+    ) -> set:
+        """
+        Get the (name, date) of the rows already written.
+
+        Returns:
+            set: The (name, date) of the rows already written.
+        """
+        return self._done
+
+    def write(
+        self,
+        rows: list[dict]
+    ) -> None:
+        """
+        Write rows to the output file.
+
+        Args:
+            rows (list): The rows to write.
+        """
+        if self.format == 'parquet':
+            # Buffer the rows, a row group per chunk of days would be tiny
+            self._rows.extend(rows)
+            if len(self._rows) >= ROW_GROUP_ROWS:
+                self._write_row_group()
+            return
+        if self.format == 'csv':
+            self._csv.writerows(rows)
+        else:
+            self._file.writelines(json.dumps(row) + '\n' for row in rows)
+        self._file.flush()
+
+    def _write_row_group(
+        self
+    ) -> None:
+        """
+        Write the buffered rows of a Parquet output as one row group.
+        """
+        if self._rows:
+            self._file.write_table(self._pyarrow.Table.from_pylist(self._rows, schema=self._schema), row_group_size=ROW_GROUP_ROWS)
+            self._rows = []
+
+    def close(
+        self
+    ) -> None:
+        """
+        Write the buffered rows, and close the output file.
+        """
+        if self.format == 'parquet':
+            self._write_row_group()
+        self._file.close()
+
+def run(
+    sites: list[dict],
+    output: str,
+    workers: int = None,
+    resume: bool = False,
+    progress=sys.stderr
+) -> int:
+    """
+    Compute the rows of every site and date, and write them to the output file.
+
+    Args:
+        sites (list): The sites, as returned by read_sites.
+        output (str): The path of the output file (.csv, .jsonl or .parquet).
+        workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+        resume (bool, optional): Whether to skip the rows of an interrupted run. Defaults to False.
+        progress (file, optional): Where to report the progress, or None. Defaults to stderr.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = _Writer(output, resume)
+    done = writer.done()
+
+    # Split the missing rows of each site in chunks of days
+    chunks = []
+    for site in sites:
+        dates = [
+            site['start'] + timedelta(days=day)
+            for day in range((site['end'] - site['start']).days + 1)
+            if (site['name'], (site['start'] + timedelta(days=day)).isoformat()) not in done
+        ]
+        chunks.extend((site, dates[index:index + CHUNK_DAYS]) for index in range(0, len(dates), CHUNK_DAYS))
+
+    total = sum(len(dates) for _, dates in chunks)
+    written = 0
+    start = time.monotonic()
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(kernels.manager.data_dir,)) as executor:
+            pending = {executor.submit(compute_chunk, site, dates) for site, dates in chunks}
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    rows = future.result()
+                    writer.write(rows)
+                    written += len(rows)
+
+                if progress is not None:
+                    elapsed = time.monotonic() - start
+                    print(f'\r{written}/{total} rows - {written / elapsed:.1f} rows/s', end='', file=progress, flush=True)
+    finally:
+        writer.close()
+
+    if progress is not None:
+        elapsed = time.monotonic() - start
+        print(f'\r{written} rows in {elapsed:.1f} s - {written / max(elapsed, 1e-9):.1f} rows/s', file=progress)
+    return written
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compute sunrise, sunset, moonrise, moonset and twilight tables.')
+    parser.add_argument('sites', help='CSV file with the columns name, latitude, longitude[, altitude, timezone, start, end]')
+    parser.add_argument('output', help='Output file (.csv, .jsonl or .parquet)')
+    parser.add_argument('--start', type=Date.fromisoformat, default=Date.today(), help='First date of the sites without a start column')
+    parser.add_argument('--end', type=Date.fromisoformat, default=None, help='Last date of the sites without an end column (default: start + 1 year)')
+    parser.add_argument('--workers', type=int, default=None, help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('--resume', action='store_true', help='Skip the rows already written by an interrupted run')
+
+    args = parser.parse_args()
+    end = args.end or args.start.replace(year=args.start.year + 1) - timedelta(days=1)
+    kernels.manager.download(EPHEMERIS_KERNEL)
+    run(read_sites(args.sites, args.start, end), args.output, args.workers, args.resume)
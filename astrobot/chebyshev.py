@@ -0,0 +1,283 @@
+"""
+This module contains the Chebyshev fast position engine for AstroBot.
+
+The plots only need positions to about 0.01°, so instead of running the full apparent-position
+pipeline for each sample, the engine fits Chebyshev polynomials to the geocentric apparent position
+of each body (and to the Greenwich apparent sidereal time) over daily spans. The fits do not depend
+on the observer, so they are cached and shared by every location: evaluating a position for an
+observer is then a polynomial evaluation and a cheap rotation.
+
+Attributes:
+    FIT_DEGREE (int): The degree of the Chebyshev polynomials.
+    FIT_NODES (int): The number of reference positions computed to fit a span.
+    engine (ChebyshevEngine): The engine shared by the application.
+
+Methods:
+    validate(eph, date, sky_object, delta): Compare the fast daily path against the reference path.
+"""
+
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+import numpy as np
+from numpy.polynomial import chebyshev
+from skyfield.api import load, wgs84
+from skyfield.framelib import true_equator_and_equinox_of_date
+
+import kernels
+from constants import EPHEMERIS_KERNEL
+
+FIT_DEGREE = 12
+FIT_NODES = 25
+
+ts = load.timescale()
+
+class ChebyshevEngine:
+    """
+    A class to compute approximate positions from cached Chebyshev fits.
+
+    Attributes:
+        filename (str): The name of the ephemeris kernel used for the fits.
+        degree (int): The degree of the Chebyshev polynomials.
+        cache_size (int): The maximum number of fitted spans kept in memory.
+
+    Methods:
+        fit(sky_object, day): Get the fit of the given object over the given TT day.
+        geocentric(sky_object, tt): Get the geocentric apparent position and sidereal time at the given times.
+        altaz(sky_object, tt, latitude, longitude, elevation_m): Get the altitude and azimuth at the given times.
+        altaz_many(sky_objects, tt, latitude, longitude, elevation_m): Get the altitudes and azimuths of several objects.
+        altaz_observers(sky_objects, tt, latitudes, longitudes, elevations_m): Get them for several observers at once.
+    """
+
+    def __init__(
+        self,
+        filename: str = EPHEMERIS_KERNEL,
+        degree: int = FIT_DEGREE,
+        cache_size: int = 512
+    ) -> None:
+        """
+        Initialize the ChebyshevEngine object.
+
+        Args:
+            filename (str, optional): The name of the ephemeris kernel. Defaults to EPHEMERIS_KERNEL.
+            degree (int, optional): The degree of the Chebyshev polynomials. Defaults to FIT_DEGREE.
+            cache_size (int, optional): The maximum number of fitted spans kept. Defaults to 512.
+        """
+        self.filename = filename
+        self.degree = degree
+        self.cache_size = cache_size
+
+        self._lock = threading.Lock()
+        self._fits = OrderedDict()
+
+    def fit(
+        self,
+        sky_object: str,
+        day: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the fit of the given object over the given TT day, computing it if needed.
+
+        Args:
+            sky_object (str): The name of the object (e.g. 'moon' or 'mars barycenter').
+            day (int): The TT Julian day number at the start of the span.
+
+        Returns:
+            tuple: The coefficients of the x, y, z position (AU, true equator and equinox of date)
+            and of the unwrapped Greenwich apparent sidereal time (radians).
+        """
+        key = (sky_object, day)
+        with self._lock:
+            fit = self._fits.get(key)
+            if fit is not None:
+                self._fits.move_to_end(key)
+                return fit
+
+        # Compute the reference positions at the Chebyshev nodes of the span
+        nodes = np.cos(np.pi * (np.arange(FIT_NODES) + 0.5) / FIT_NODES)
+        t = ts.tt_jd(day + (nodes + 1) / 2)
+        eph = kernels.manager.load(self.filename, ['earth', sky_object], day, day + 1)
+        apparent = eph['earth'].at(t).observe(eph[sky_object]).apparent()
+        xyz = apparent.frame_xyz(true_equator_and_equinox_of_date).au
+        gast = np.unwrap(t.gast / 12 * np.pi)
+
+        fit = (
+            chebyshev.chebfit(nodes, xyz.T, self.degree).T,
+            chebyshev.chebfit(nodes, gast, self.degree)
+        )
+
+        with self._lock:
+            self._fits[key] = fit
+            while len(self._fits) > self.cache_size:
+                self._fits.popitem(last=False)
+
+        return fit
+
+    def geocentric(
+        self,
+        sky_object: str,
+        tt: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the geocentric apparent position and the sidereal time at the given times.
+
+        Args:
+            sky_object (str): The name of the object.
+            tt (np.ndarray): The TT Julian dates.
+
+        Returns:
+            tuple: The x, y, z positions with shape (3, n) in AU, and the sidereal times in radians.
+        """
+        tt = np.atleast_1d(np.asarray(tt, dtype=float))
+        days = np.floor(tt)
+        xyz = np.empty((3, tt.size))
+        gast = np.empty(tt.size)
+
+        # Evaluate each daily span on the samples it contains
+        for day in np.unique(days):
+            mask = days == day
+            xyz_coefficients, gast_coefficients = self.fit(sky_object, int(day))
+            x = 2 * (tt[mask] - day) - 1
+            xyz[:, mask] = [chebyshev.chebval(x, c) for c in xyz_coefficients]
+            gast[mask] = chebyshev.chebval(x, gast_coefficients)
+
+        return xyz, gast
+
+    def altaz(
+        self,
+        sky_object: str,
+        tt: np.ndarray,
+        latitude: float,
+        longitude: float,
+        elevation_m: float = 0.0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the topocentric altitude and azimuth of the given object at the given times.
+
+        Args:
+            sky_object (str): The name of the object.
+            tt (np.ndarray): The TT Julian dates.
+            latitude (float): The latitude of the observer, in degrees.
+            longitude (float): The longitude of the observer, in degrees.
+            elevation_m (float, optional): The elevation of the observer in meters. Defaults to 0.
+
+        Returns:
+            tuple: The altitudes and azimuths in degrees.
+        """
+        altitudes, azimuths = self.altaz_many([sky_object], tt, latitude, longitude, elevation_m)
+        return altitudes[0], azimuths[0]
+
+    def altaz_many(
+        self,
+        sky_objects: list[str],
+        tt: np.ndarray,
+        latitude: float,
+        longitude: float,
+        elevation_m: float = 0.0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the topocentric altitudes and azimuths of several objects on a shared time grid.
+
+        Args:
+            sky_objects (list): The names of the objects.
+            tt (np.ndarray): The TT Julian dates.
+            latitude (float): The latitude of the observer, in degrees.
+            longitude (float): The longitude of the observer, in degrees.
+            elevation_m (float, optional): The elevation of the observer in meters. Defaults to 0.
+
+        Returns:
+            tuple: The altitudes and azimuths in degrees, with shape (objects, times).
+        """
+        altitudes, azimuths = self.altaz_observers(sky_objects, np.atleast_1d(tt)[None], [latitude], [longitude], [elevation_m])
+        return altitudes[:, 0], azimuths[:, 0]
+
+    def altaz_observers(
+        self,
+        sky_objects: list[str],
+        tt: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        elevations_m: np.ndarray = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the topocentric altitudes and azimuths of several objects for several observers at once.
+
+        Each observer has its own row of times (for example its own local day). The geocentric
+        positions of every time are evaluated in one pass, and the observers only differ by the
+        final rotation, so the cost grows with the number of samples, not of calls.
+
+        Args:
+            sky_objects (list): The names of the objects.
+            tt (np.ndarray): The TT Julian dates, with shape (observers, times).
+            latitudes (np.ndarray): The latitudes of the observers, in degrees.
+            longitudes (np.ndarray): The longitudes of the observers, in degrees.
+            elevations_m (np.ndarray, optional): The elevations of the observers in meters. Defaults to 0.
+
+        Returns:
+            tuple: The altitudes and azimuths in degrees, with shape (objects, observers, times).
+        """
+        tt = np.asarray(tt, dtype=float)
+        latitudes = np.asarray(latitudes, dtype=float)
+        longitudes = np.asarray(longitudes, dtype=float)
+        elevations_m = np.zeros_like(latitudes) if elevations_m is None else np.asarray(elevations_m, dtype=float)
+
+        positions = [self.geocentric(sky_object, tt.ravel()) for sky_object in sky_objects]
+        xyz = np.stack([position[0] for position in positions]).reshape(len(sky_objects), 3, *tt.shape)
+        gast = positions[0][1].reshape(tt.shape)
+
+        # Rotate the observers from the terrestrial frame to the true equator of date (no polar motion)
+        x, y, z = (coordinate[:, None] for coordinate in wgs84.latlon(latitudes, longitudes, elevations_m).itrs_xyz.au)
+        cos_gast, sin_gast = np.cos(gast), np.sin(gast)
+        xyz = xyz - np.array([x * cos_gast - y * sin_gast, x * sin_gast + y * cos_gast, np.broadcast_to(z, gast.shape)])
+
+        # Convert the topocentric positions to hour angle and declination, then to altitude and azimuth
+        dec = np.arctan2(xyz[:, 2], np.hypot(xyz[:, 0], xyz[:, 1]))
+        ha = gast + np.radians(longitudes)[:, None] - np.arctan2(xyz[:, 1], xyz[:, 0])
+        lat = np.radians(latitudes)[:, None]
+
+        alt = np.arcsin(np.sin(lat) * np.sin(dec) + np.cos(lat) * np.cos(dec) * np.cos(ha))
+        az = np.arctan2(-np.cos(dec) * np.sin(ha), np.sin(dec) * np.cos(lat) - np.cos(dec) * np.sin(lat) * np.cos(ha))
+
+        return np.degrees(alt), np.degrees(az) % 360
+
+def validate(
+    eph,
+    date,
+    sky_object: str,
+    delta: timedelta = timedelta(minutes=20)
+) -> float:
+    """
+    Compare the fast daily path of the given object against the reference apparent positions.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object of the observer.
+        date (datetime.datetime): The date of the path.
+        sky_object (str): The name of the object.
+        delta (timedelta, optional): The time interval between each position. Defaults to 20 minutes.
+
+    Returns:
+        float: The largest angular separation between both paths, in degrees.
+    """
+    date = date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=eph.timezone)
+    t = ts.from_datetime(date)
+    tt = t.tt + np.arange(24 * 3 + 1) * (delta / timedelta(days=1))
+    t = ts.tt_jd(tt)
+
+    # Compute the reference path with the full apparent-position pipeline
+    kernel = kernels.manager.load(engine.filename, ['earth', sky_object], tt[0], tt[-1])
+    observer, target = eph._get_bodies(kernel, sky_object)
+    reference_alt, reference_az, _ = observer.at(t).observe(target).apparent().altaz()
+    reference_alt, reference_az = reference_alt.radians, reference_az.radians
+
+    fast_alt, fast_az = np.radians(engine.altaz(sky_object, tt, eph.latitude, eph.longitude, eph.altitude))
+
+    # Compare the separation on the sphere, to be independent of the azimuth near the zenith
+    cos_separation = (
+        np.sin(reference_alt) * np.sin(fast_alt)
+        + np.cos(reference_alt) * np.cos(fast_alt) * np.cos(reference_az - fast_az)
+    )
+
+    return float(np.degrees(np.arccos(np.clip(cos_separation, -1, 1))).max())
+
+engine = ChebyshevEngine()
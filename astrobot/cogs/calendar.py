@@ -0,0 +1,138 @@
+"""
+This module contains the Calendar cog for AstroBot.
+
+The Calendar cog provides a command to get the rise and set times of a body for every day of a month.
+
+Attributes:
+    bot (commands.Bot): The bot instance.
+
+Methods:
+    calendar: Get the monthly calendar of a body for a given location.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+import discord
+from discord import Embed, File, Option
+from discord.ext import commands
+
+from constants import BODY_NAMES, EPHEMERIS_KERNEL, MAX_YEAR, MIN_YEAR, MONTHS
+import pipeline
+from service import ServiceError
+import timezones
+import utils
+from workqueue import QueueFullError
+
+class Calendar(commands.Cog):
+    """
+    Calendar cog for AstroBot.
+
+    This cog provides a command to get the rise and set times, the time above the horizon and the
+    moon phase of a body for every day of a month.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        calendar: Get the monthly calendar of a body for a given location.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+    @discord.slash_command(description='Get the rise and set times of a body for every day of a month')
+    async def calendar(
+        self,
+        ctx,
+        body: Option(str, choices=BODY_NAMES.keys(), description='Body'),
+        latitude: Option(float, description='Latitude of the location'),
+        longitude: Option(float, description='Longitude of the location'),
+        altitude: Option(int, default=0, description='Altitude of the location'),
+        month: Option(int, default=0, min_value=1, max_value=12, description='Month of the year (default: this month)'),
+        year: Option(int, default=0, min_value=MIN_YEAR, max_value=MAX_YEAR, description='Year (default: this year)')
+    ):
+        """
+        Get the monthly calendar of a body for a given location.
+
+        Args:
+            body (str): The French name of the body.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            altitude (int): The altitude of the location.
+            month (int): The month of the year (default: this month).
+            year (int): The year (default: this year).
+
+        Usage:
+            /calendar body latitude longitude altitude month year
+
+        Example:
+            /calendar Lune 48.8566 2.3522 0 3 2024
+
+        Returns:
+            None
+        """
+        await ctx.defer() # Defer the response to avoid the "This interaction failed" error
+
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
+
+        # Get the current month if no month is provided
+        # Use the local time of the timezone of the location
+        timezone = timezones.get_timezone(latitude, longitude)
+        current_datetime = datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
+        month = current_datetime.month if month == 0 else month
+        year = current_datetime.year if year == 0 else year
+
+        # Compute the whole month in one pass and render it off the event loop
+        try:
+            month_calendar, image = await pipeline.compute_calendar(BODY_NAMES[body], latitude, longitude, altitude, timezone, year, month, ctx.author.id, ctx.guild_id)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+
+        file = File(BytesIO(image), filename='calendar.png')
+
+        google_maps_url = utils.get_google_maps_url(latitude, longitude)
+        bing_maps_url = utils.get_bing_maps_url(latitude, longitude)
+
+        embed = Embed(
+            title=f'Calendrier {body} - {MONTHS[month - 1]} {year}',
+            description=f'À {latitude}° de latitude et {longitude}° de longitude (↑ lever, ↓ coucher, durée au-dessus de l\'horizon).',
+            color=discord.Color.og_blurple()
+        )
+        embed.set_image(url=f'attachment://{file.filename}')
+        embed.add_field(name='Cartes du lieu d\'observation', value=f'[Google Maps]({google_maps_url}) - [Bing Maps]({bing_maps_url})', inline=False)
+
+        await ctx.respond(embed=embed, file=file)
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(Calendar(bot))
@@ -0,0 +1,374 @@
+"""
+This module contains the Digest cog for AstroBot.
+
+The Digest cog lets users and channels subscribe a location to a morning digest: the sunrise and
+sunset of the day, the dusks of the evening, the moon phase and the planets visible during the
+night, posted at a chosen local time. The digests are computed ahead of their posting time, in
+batches of deduplicated sites run in the worker threads, and kept until they are posted. When
+several bot processes run on the host, only the one holding the scheduler lock posts them.
+
+Attributes:
+    bot (commands.Bot): The bot instance.
+
+Methods:
+    digest: Subscribe a location to the daily digest, in the channel or in private messages.
+    digest_stop: Stop the daily digest of the channel or of the private messages.
+    post_digests: Compute the upcoming daily digests and post the due ones.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as Timezone
+
+import discord
+from discord import Embed, Option
+from discord.ext import commands, tasks
+
+from constants import BODY_NAMES, DIGEST_CHUNK, DIGEST_LEAD, DIGEST_SEND_INTERVAL, DIRECTIONS, EPHEMERIS_KERNEL
+import digest
+from digest import Digest
+import pipeline
+from service import ServiceError
+import timezones
+import utils
+from workqueue import QueueFullError
+
+# English name of a body: French name, for the fields of the embed
+FRENCH_NAMES = {body: name for name, body in BODY_NAMES.items()}
+
+class DailyDigest(commands.Cog):
+    """
+    Daily digest cog for AstroBot.
+
+    This cog provides the commands to subscribe to the daily digest, and a task computing the
+    digests of the subscriptions due within DIGEST_LEAD minutes, then posting them at their time.
+    The subscriptions sharing a quantized location share one digest.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        digest: Subscribe a location to the daily digest, in the channel or in private messages.
+        digest_stop: Stop the daily digest of the channel or of the private messages.
+        post_digests: Compute the upcoming daily digests and post the due ones.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+        # The digests computed, by site and date, and the ones being computed
+        self._digests = {}
+        self._computing = set()
+        self._tasks = set()
+
+        self.post_digests.start()
+
+    def cog_unload(
+        self
+    ):
+        """
+        Stop the task and the computations when the cog is unloaded.
+        """
+        self.post_digests.cancel()
+        for task in self._tasks:
+            task.cancel()
+        digest.scheduler.release()
+
+    @discord.slash_command(description='Subscribe a location to a daily digest of the sky, in this channel or in private messages')
+    async def digest(
+        self,
+        ctx,
+        latitude: Option(float, description='Latitude of the location'),
+        longitude: Option(float, description='Longitude of the location'),
+        altitude: Option(int, default=0, description='Altitude of the location'),
+        hour: Option(int, default=8, min_value=0, max_value=23, description='Local hour of the digest (default: 8)'),
+        minute: Option(int, default=0, min_value=0, max_value=59, description='Local minute of the digest (default: 0)'),
+        private: Option(bool, default=False, description='Receive the digest in private messages rather than in this channel')
+    ):
+        """
+        Subscribe a location to the daily digest, replacing the previous subscription of the channel or of the user.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            altitude (int): The altitude of the location.
+            hour (int): The local hour of the digest.
+            minute (int): The local minute of the digest.
+            private (bool): Whether to receive the digest in private messages.
+
+        Usage:
+            /digest latitude longitude altitude hour minute private
+
+        Example:
+            /digest 48.8566 2.3522 0 8 0 False
+
+        Returns:
+            None
+        """
+        # The digests of a channel are set by its moderators, outside of a server they go to the user
+        private = private or ctx.guild_id is None
+        if not private and not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond('Il faut la permission de gérer le serveur pour abonner ce salon. Utilisez l\'option private pour le recevoir en message privé.', ephemeral=True)
+            return
+
+        subscription = {
+            'target': 'user' if private else 'channel',
+            'target_id': ctx.author.id if private else ctx.channel_id,
+            'latitude': latitude,
+            'longitude': longitude,
+            'altitude': altitude,
+            'timezone': timezones.get_timezone(latitude, longitude),
+            'time': f'{hour:02d}:{minute:02d}',
+            'user_id': ctx.author.id,
+            'last_posted': None,
+        }
+
+        # Start tomorrow if the time of today is already passed
+        now = datetime.now(Timezone.utc)
+        post = digest.get_next_post(subscription, now)
+        if post <= now:
+            subscription['last_posted'] = post.date().isoformat()
+        digest.subscriptions.add(subscription)
+
+        where = 'en message privé' if private else 'dans ce salon'
+        await ctx.respond(f'Le résumé du ciel sera envoyé {where} chaque jour à {subscription["time"]} (heure locale).', ephemeral=True)
+
+    @discord.slash_command(description='Stop the daily digest of this channel or of your private messages')
+    async def digest_stop(
+        self,
+        ctx,
+        private: Option(bool, default=False, description='Stop the digest of your private messages rather than the one of this channel')
+    ):
+        """
+        Stop the daily digest of the channel or of the private messages of the user.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+            private (bool): Whether to stop the digest of the private messages.
+
+        Usage:
+            /digest_stop private
+
+        Returns:
+            None
+        """
+        private = private or ctx.guild_id is None
+        if not private and not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond('Il faut la permission de gérer le serveur pour désabonner ce salon.', ephemeral=True)
+            return
+
+        if digest.subscriptions.remove('user' if private else 'channel', ctx.author.id if private else ctx.channel_id):
+            await ctx.respond('Le résumé du ciel ne sera plus envoyé.', ephemeral=True)
+        else:
+            await ctx.respond('Aucun résumé du ciel n\'est envoyé ici.', ephemeral=True)
+
+    @tasks.loop(minutes=1)
+    async def post_digests(
+        self
+    ):
+        """
+        Compute the upcoming daily digests and post the due ones.
+
+        The digests due within DIGEST_LEAD minutes are computed in the background, in batches of
+        DIGEST_CHUNK sites, so that they are ready at their posting time. The due digests are then
+        posted, spaced by DIGEST_SEND_INTERVAL to stay below the rate limits of Discord. Only the
+        bot process holding the scheduler lock computes and posts them.
+
+        Usage:
+            Automatically triggered every minute.
+
+        Returns:
+            None
+        """
+        # Another bot process of the host posts the digests, try again at the next tick in case it stopped
+        if not digest.scheduler.acquire():
+            return
+
+        subscriptions = digest.subscriptions.all()
+        if not subscriptions:
+            return
+
+        # Wait for the next tick if the ephemeris kernel is still being downloaded, or the compute service is unavailable
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            return
+        if status['state'] != 'ready':
+            return
+
+        now = datetime.now(Timezone.utc)
+        due, missing = [], defaultdict(set)
+        for subscription in subscriptions:
+            post = digest.get_next_post(subscription, now)
+            if post - now > timedelta(minutes=DIGEST_LEAD):
+                continue
+            key = (digest.get_site(subscription), post.date())
+            if key in self._digests:
+                if post <= now:
+                    due.append((subscription, self._digests[key]))
+            elif key not in self._computing:
+                missing[post.date()].add(key[0])
+
+        # Compute the missing digests in the background, the due ones are posted at the next tick
+        for date, sites in missing.items():
+            sites = sorted(sites)
+            for start in range(0, len(sites), DIGEST_CHUNK):
+                chunk = sites[start:start + DIGEST_CHUNK]
+                self._computing.update((site, date) for site in chunk)
+                task = asyncio.create_task(self._compute(chunk, date))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        posted = defaultdict(list)
+        for subscription, result in due:
+            if await self._post(subscription, result):
+                posted[result.date].append(subscription)
+            await asyncio.sleep(DIGEST_SEND_INTERVAL)
+        for date, subscriptions in posted.items():
+            digest.subscriptions.mark_posted(subscriptions, date)
+
+        # Forget the digests of the past days
+        yesterday = (now - timedelta(days=1)).date()
+        for key in [key for key in self._digests if key[1] < yesterday]:
+            del self._digests[key]
+
+    async def _compute(
+        self,
+        sites: list[tuple],
+        date
+    ) -> None:
+        """
+        Compute the digests of a batch of sites, and keep them until they are posted.
+
+        Args:
+            sites (list): The sites of the batch.
+            date (datetime.date): The local date of the digests.
+        """
+        try:
+            for site, result in zip(sites, await pipeline.compute_digests(sites, date)):
+                self._digests[(site, date)] = result
+        except QueueFullError:
+            # The commands of the users come first, the batch is computed again at the next tick
+            return
+        except Exception as error:
+            print(f'AstroBot - Daily digests of {len(sites)} sites not computed: {error}')
+        finally:
+            self._computing.difference_update((site, date) for site in sites)
+
+    async def _post(
+        self,
+        subscription: dict,
+        result: Digest
+    ) -> bool:
+        """
+        Post a digest to the channel or the user of a subscription, and forget the subscription if it can no longer be posted.
+
+        Args:
+            subscription (dict): The subscription.
+            result (Digest): The digest of the site of the subscription.
+
+        Returns:
+            bool: Whether the digest was posted.
+        """
+        try:
+            if subscription['target'] == 'channel':
+                # The channel may belong to a guild of another bot process
+                target = self.bot.get_channel(subscription['target_id']) or await self.bot.fetch_channel(subscription['target_id'])
+            else:
+                target = await self.bot.get_or_fetch_user(subscription['target_id'])
+            await target.send(embed=self._get_embed(subscription, result))
+            return True
+        except (discord.NotFound, discord.Forbidden):
+            # The channel was deleted or the user does not accept private messages
+            digest.subscriptions.remove(subscription['target'], subscription['target_id'])
+        except discord.HTTPException as error:
+            print(f'AstroBot - Daily digest of {subscription["target"]} {subscription["target_id"]} not posted: {error}')
+        return False
+
+    def _get_embed(
+        self,
+        subscription: dict,
+        result: Digest
+    ) -> Embed:
+        """
+        Get the embed of a digest.
+
+        Args:
+            subscription (dict): The subscription.
+            result (Digest): The digest of the site of the subscription.
+
+        Returns:
+            Embed: The embed of the digest.
+        """
+        def format_time(time):
+            return time.strftime('%H:%M') if time is not None else '—'
+
+        latitude, longitude = subscription['latitude'], subscription['longitude']
+        embed = Embed(
+            title=f'Le ciel du {result.date.strftime("%d/%m/%Y")}',
+            description=f'À {latitude}° de latitude et {longitude}° de longitude.',
+            color=discord.Color.dark_blue()
+        )
+        embed.add_field(name='Lever du soleil', value=format_time(result.sunrise), inline=True)
+        embed.add_field(name='Coucher du soleil', value=format_time(result.sunset), inline=True)
+        embed.add_field(
+            name='Crépuscules',
+            value='\n'.join(f'{name} : {format_time(time)}' for name, time in result.dusks.items()),
+            inline=False
+        )
+        trend = 'croissante' if result.moon_phase < 180 else 'décroissante'
+        embed.add_field(name='Lune', value=f'Éclairée à {result.moon_illumination:.0%}, {trend}', inline=False)
+
+        if not result.planets:
+            embed.add_field(name='Planètes', value='Aucune planète observable cette nuit.', inline=False)
+        for window in result.planets:
+            direction = DIRECTIONS[round(window.peak_azimuth / 45) % 8]
+            embed.add_field(
+                name=FRENCH_NAMES[window.body],
+                value=(
+                    f'{window.start.strftime("%H:%M")} → {window.end.strftime("%H:%M")}, '
+                    f'au plus haut à {window.peak_time.strftime("%H:%M")} ({window.peak_altitude:.1f}° {direction})'
+                ),
+                inline=False
+            )
+        embed.add_field(
+            name='Cartes du lieu d\'observation',
+            value=f'[Google Maps]({utils.get_google_maps_url(latitude, longitude)}) - [Bing Maps]({utils.get_bing_maps_url(latitude, longitude)})',
+            inline=False
+        )
+        embed.set_footer(text='Heures locales. /digest_stop pour se désabonner.')
+
+        return embed
+
+    @post_digests.before_loop
+    async def before_post_digests(
+        self
+    ):
+        """
+        Wait for the bot to be ready before starting the task.
+
+        Returns:
+            None
+        """
+        await self.bot.wait_until_ready()
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(DailyDigest(bot))
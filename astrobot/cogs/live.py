@@ -0,0 +1,308 @@
+"""
+This module contains the Live cog for AstroBot.
+
+The Live cog provides a command to post a sky map of the sun and the moon in a channel, and keeps
+it up to date: the message is edited every few minutes with the current positions. The daily
+paths and the background of the map are drawn once per location and day, only the markers of the
+current positions are drawn again at each update.
+
+Attributes:
+    bot (commands.Bot): The bot instance.
+
+Methods:
+    live: Post a live sky map of the sun and the moon in the channel.
+    live_stop: Stop updating the live sky map of the server.
+    update_live_messages: Update the live messages of every server.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import asyncio
+import time
+from datetime import datetime
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+import discord
+from discord import Embed, File, Option
+from discord.ext import commands, tasks
+
+from constants import BODY_NAMES, DIRECTIONS, EPHEMERIS_KERNEL, LIVE_EDIT_INTERVAL, LIVE_UPDATE_BUDGET, LIVE_UPDATE_MINUTES
+import guilds
+import pipeline
+from service import ServiceError
+import timezones
+import utils
+from workqueue import QueueFullError
+
+# English name of a body: French name, for the fields of the embed
+FRENCH_NAMES = {body: name for name, body in BODY_NAMES.items()}
+
+class Live(commands.Cog):
+    """
+    Live cog for AstroBot.
+
+    This cog provides a command to post a sky map of the sun and the moon, and a task updating
+    the live message of every server within an update budget. Each server has at most one live
+    message, stored in its settings so that the updates go on after a restart.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        live: Post a live sky map of the sun and the moon in the channel.
+        live_stop: Stop updating the live sky map of the server.
+        update_live_messages: Update the live messages of every server.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+        # The messages already fetched, by guild, and the position of the next update in the round
+        self._messages = {}
+        self._next = 0
+
+        self.update_live_messages.start()
+
+    def cog_unload(
+        self
+    ):
+        """
+        Stop the updates when the cog is unloaded.
+        """
+        self.update_live_messages.cancel()
+
+    async def _render(
+        self,
+        guild_id: int,
+        live: dict
+    ) -> tuple[Embed, File]:
+        """
+        Render the live sky map of a server at the current local time.
+
+        Args:
+            guild_id (int): The id of the guild.
+            live (dict): The live message settings of the guild.
+
+        Returns:
+            tuple: The embed and the image of the message.
+
+        Raises:
+            QueueFullError: If the work queue is full.
+            ServiceError: If the compute service failed to compute the request.
+        """
+        latitude, longitude = live['latitude'], live['longitude']
+        now = datetime.now(ZoneInfo(live['timezone'])).replace(tzinfo=None)
+        positions, image = await pipeline.compute_live(latitude, longitude, live['altitude'], live['timezone'], now, live['user_id'], guild_id)
+
+        file = File(BytesIO(image), filename='live_sky.png')
+
+        embed = Embed(
+            title='Le soleil et la lune en direct',
+            description=f'À {latitude}° de latitude et {longitude}° de longitude, mis à jour toutes les {LIVE_UPDATE_MINUTES} minutes.',
+            color=discord.Color.dark_blue()
+        )
+        embed.set_image(url=f'attachment://{file.filename}')
+        for body, altitudes, azimuths in zip(positions.bodies, positions.altitudes, positions.azimuths):
+            body_altitude, body_azimuth = float(altitudes[-1]), float(azimuths[-1])
+            if body_altitude >= 0:
+                value = f'{body_altitude:.1f}° {DIRECTIONS[round(body_azimuth / 45) % 8]}'
+            else:
+                value = f'Sous l\'horizon ({body_altitude:.1f}°)'
+            embed.add_field(name=FRENCH_NAMES[body], value=value, inline=True)
+        embed.set_footer(text=f'Dernière mise à jour : {positions.now.strftime("%d/%m/%Y à %H:%M")} (heure locale)')
+
+        return embed, file
+
+    @discord.slash_command(description='Post a sky map of the sun and the moon in this channel, updated every few minutes')
+    @discord.guild_only()
+    @discord.default_permissions(manage_guild=True)
+    async def live(
+        self,
+        ctx,
+        latitude: Option(float, description='Latitude of the location'),
+        longitude: Option(float, description='Longitude of the location'),
+        altitude: Option(int, default=0, description='Altitude of the location')
+    ):
+        """
+        Post a live sky map of the sun and the moon in the channel, replacing the live message of the server.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            altitude (int): The altitude of the location.
+
+        Usage:
+            /live latitude longitude altitude
+
+        Example:
+            /live 48.8566 2.3522 0
+
+        Returns:
+            None
+        """
+        await ctx.defer(ephemeral=True) # Defer the response to avoid the "This interaction failed" error
+
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
+
+        live = {
+            'channel_id': ctx.channel_id,
+            'latitude': latitude,
+            'longitude': longitude,
+            'altitude': altitude,
+            'timezone': timezones.get_timezone(latitude, longitude),
+            'user_id': ctx.author.id,
+        }
+        try:
+            embed, file = await self._render(ctx.guild_id, live)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+
+        # Post a plain message rather than an answer, since the answers can only be edited for 15 minutes
+        message = await ctx.channel.send(embed=embed, file=file)
+        live['message_id'] = message.id
+        guilds.settings.set(ctx.guild_id, 'live', live)
+        self._messages[ctx.guild_id] = message
+
+        await ctx.respond(f'Le message en direct sera mis à jour toutes les {LIVE_UPDATE_MINUTES} minutes.')
+
+    @discord.slash_command(description='Stop updating the live sky map of this server')
+    @discord.guild_only()
+    @discord.default_permissions(manage_guild=True)
+    async def live_stop(
+        self,
+        ctx
+    ):
+        """
+        Stop updating the live sky map of the server. The message itself is kept.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+
+        Usage:
+            /live_stop
+
+        Returns:
+            None
+        """
+        guilds.settings.set(ctx.guild_id, 'live', None)
+        self._messages.pop(ctx.guild_id, None)
+
+        await ctx.respond('Le message en direct ne sera plus mis à jour.', ephemeral=True)
+
+    @tasks.loop(minutes=LIVE_UPDATE_MINUTES)
+    async def update_live_messages(
+        self
+    ):
+        """
+        Update the live messages of every server.
+
+        The edits are spaced by LIVE_EDIT_INTERVAL to stay below the rate limits of Discord, and the
+        tick stops once LIVE_UPDATE_BUDGET is spent. The next tick starts where this one stopped, so
+        every message is updated in turn when there are too many for one tick.
+
+        Usage:
+            Automatically triggered every LIVE_UPDATE_MINUTES minutes.
+
+        Returns:
+            None
+        """
+        lives = guilds.settings.items('live')
+        if not lives:
+            return
+
+        # Wait for the next tick if the ephemeris kernel is still being downloaded, or the compute service is unavailable
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            return
+        if status['state'] != 'ready':
+            return
+
+        start = time.monotonic()
+        self._next %= len(lives)
+        for guild_id, live in lives[self._next:] + lives[:self._next]:
+            if time.monotonic() - start > LIVE_UPDATE_BUDGET:
+                break
+            self._next += 1
+            await self._update(guild_id, live)
+            await asyncio.sleep(LIVE_EDIT_INTERVAL)
+
+    async def _update(
+        self,
+        guild_id: int,
+        live: dict
+    ) -> None:
+        """
+        Update the live message of a server, and forget it if it was deleted.
+
+        Args:
+            guild_id (int): The id of the guild.
+            live (dict): The live message settings of the guild.
+        """
+        try:
+            # Fetch the message once, then edit it directly
+            message = self._messages.get(guild_id)
+            if message is None or message.id != live['message_id']:
+                channel = self.bot.get_channel(live['channel_id'])
+                if channel is None:
+                    return
+                message = self._messages[guild_id] = await channel.fetch_message(live['message_id'])
+
+            embed, file = await self._render(guild_id, live)
+            await message.edit(embed=embed, file=file, attachments=[])
+        except QueueFullError:
+            # The commands of the users come first, the message is updated at the next tick
+            return
+        except ServiceError as error:
+            # The compute service is unavailable, the message is updated at the next tick
+            print(f'AstroBot - Live message of guild {guild_id} not updated: {error}')
+        except (discord.NotFound, discord.Forbidden):
+            # The message was deleted or can no longer be edited, stop updating it
+            guilds.settings.set(guild_id, 'live', None)
+            self._messages.pop(guild_id, None)
+        except discord.HTTPException as error:
+            print(f'AstroBot - Live message of guild {guild_id} not updated: {error}')
+
+    @update_live_messages.before_loop
+    async def before_update_live_messages(
+        self
+    ):
+        """
+        Wait for the bot to be ready before starting the task.
+
+        Returns:
+            None
+        """
+        await self.bot.wait_until_ready()
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(Live(bot))
@@ -0,0 +1,79 @@
+"""
+This module contains the cog for the server settings of AstroBot.
+
+Settings:
+    - Sets whether the astronomy commands of a server answer with text only by default.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import discord
+from discord import Option
+from discord.ext import commands
+
+import guilds
+
+class Settings(commands.Cog):
+    """
+    Settings cog for AstroBot.
+
+    This cog provides a command to set the default answer mode of the server.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        lite: Set whether the commands answer with text only by default.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+    @discord.slash_command(description='Set whether the astronomy commands answer with text only by default')
+    @discord.guild_only()
+    @discord.default_permissions(manage_guild=True)
+    async def lite(
+        self,
+        ctx,
+        enabled: Option(bool, description='Answer with text only, without image')
+    ):
+        """
+        Set whether the /sun, /moon and /planet commands of the server answer with text only by default.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+            enabled (bool): Whether to answer with text only.
+
+        Usage:
+            /lite enabled
+
+        Example:
+            /lite True
+
+        Returns:
+            None
+        """
+        guilds.settings.set(ctx.guild_id, 'lite', enabled)
+
+        if enabled:
+            await ctx.respond('Les commandes répondront désormais en texte seul, sans image.')
+        else:
+            await ctx.respond('Les commandes répondront désormais avec une image.')
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(Settings(bot))
@@ -0,0 +1,324 @@
+"""
+This module contains the Sky cog for AstroBot.
+
+The Sky cog provides commands to find which bodies are worth observing during a night, and when,
+to see where every body is right now, and to compare the rise and set times of several locations.
+
+Attributes:
+    bot (commands.Bot): The bot instance.
+
+Methods:
+    tonight: Get the best observing windows of every body for a given location and night.
+    sky: Get a sky map of every body for a given location, right now.
+    compare: Compare the rise and set times of a body for several locations.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+from io import BytesIO
+from zoneinfo import ZoneInfo
+
+import discord
+from discord import Embed, File, Option
+from discord.ext import commands
+
+from constants import BODY_NAMES, COMPARE_LOCATIONS, DIRECTIONS, EPHEMERIS_KERNEL, MAX_YEAR, MIN_YEAR, TWILIGHTS
+import pipeline
+from service import ServiceError
+import timezones
+import utils
+from workqueue import QueueFullError
+
+# English name of a body: French name, for the fields of the embed
+FRENCH_NAMES = {body: name for name, body in BODY_NAMES.items()}
+
+class Sky(commands.Cog):
+    """
+    Sky cog for AstroBot.
+
+    This cog provides a command to get, for one location and night, the time ranges when each body
+    is above a minimum altitude while the sun is below a chosen twilight, ranked by peak altitude,
+    a command to get a sky map of every body at once, and a command to compare the rise and set
+    times of several locations, computed for every location in one vectorized pass.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        tonight: Get the best observing windows of every body for a given location and night.
+        sky: Get a sky map of every body for a given location, right now.
+        compare: Compare the rise and set times of a body for several locations.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+    @discord.slash_command(description='Get the best observing windows of every body for a given location and night')
+    async def tonight(
+        self,
+        ctx,
+        latitude: Option(float, description='Latitude of the location'),
+        longitude: Option(float, description='Longitude of the location'),
+        altitude: Option(int, default=0, description='Altitude of the location'),
+        twilight: Option(str, choices=TWILIGHTS.keys(), default='Nautique', description='Darkness of the sky (default: nautical twilight)'),
+        min_altitude: Option(int, default=15, min_value=0, max_value=89, description='Minimum altitude of the bodies in degrees (default: 15)'),
+        day: Option(int, default=0, min_value=1, max_value=31, description='Day of the month (default: today)'),
+        month: Option(int, default=0, min_value=1, max_value=12, description='Month of the year (default: this month)'),
+        year: Option(int, default=0, min_value=MIN_YEAR, max_value=MAX_YEAR, description='Year (default: this year)')
+    ):
+        """
+        Get the best observing windows of every body for a given location and night.
+
+        Args:
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            altitude (int): The altitude of the location.
+            twilight (str): The twilight below which the sky is dark enough (default: nautical).
+            min_altitude (int): The minimum altitude of the bodies in degrees (default: 15).
+            day (int): The day of the month of the evening (default: today).
+            month (int): The month of the year (default: this month).
+            year (int): The year (default: this year).
+
+        Usage:
+            /tonight latitude longitude altitude twilight min_altitude day month year
+
+        Example:
+            /tonight 48.8566 2.3522 0 Astronomique 20 15 8 2024
+
+        Returns:
+            None
+        """
+        await ctx.defer() # Defer the response to avoid the "This interaction failed" error
+
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
+
+        # Get the current date if no date is provided
+        # Use the local time of the timezone of the location
+        timezone = timezones.get_timezone(latitude, longitude)
+        current_datetime = datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
+        day = current_datetime.day if day == 0 else day
+        month = current_datetime.month if month == 0 else month
+        year = current_datetime.year if year == 0 else year
+
+        # Compute the windows of every body in one pass, off the event loop
+        try:
+            windows = await pipeline.compute_tonight(latitude, longitude, altitude, timezone, datetime(year, month, day), TWILIGHTS[twilight], min_altitude, ctx.author.id, ctx.guild_id)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+
+        google_maps_url = utils.get_google_maps_url(latitude, longitude)
+        bing_maps_url = utils.get_bing_maps_url(latitude, longitude)
+
+        embed = Embed(
+            title=f'Que voir la nuit du {day}/{month}/{year} ?',
+            description=(
+                f'À {latitude}° de latitude et {longitude}° de longitude, au-dessus de {min_altitude}° '
+                f'pendant le crépuscule {twilight.lower()} ou la nuit.'
+            ),
+            color=discord.Color.dark_blue()
+        )
+        if not windows:
+            embed.add_field(name='Aucun astre observable', value='Aucun astre ne passe au-dessus de l\'altitude minimale pendant la nuit.', inline=False)
+        for window in windows:
+            direction = DIRECTIONS[round(window.peak_azimuth / 45) % 8]
+            embed.add_field(
+                name=FRENCH_NAMES[window.body],
+                value=(
+                    f'{window.start.strftime("%H:%M")} → {window.end.strftime("%H:%M")}, '
+                    f'au plus haut à {window.peak_time.strftime("%H:%M")} ({window.peak_altitude:.1f}° {direction})'
+                ),
+                inline=False
+            )
+        embed.add_field(name='Cartes du lieu d\'observation', value=f'[Google Maps]({google_maps_url}) - [Bing Maps]({bing_maps_url})', inline=False)
+
+        await ctx.respond(embed=embed)
+
+    @discord.slash_command(description='Get a sky map of every body for a given location, right now')
+    async def sky(
+        self,
+        ctx,
+        latitude: Option(float, description='Latitude of the location'),
+        longitude: Option(float, description='Longitude of the location'),
+        altitude: Option(int, default=0, description='Altitude of the location'),
+        trail: Option(int, default=0, min_value=0, max_value=12, description='Hours of trail behind each body (default: none)')
+    ):
+        """
+        Get a sky map of every body for a given location, right now.
+
+        Args:
+            latitude (float): The latitude of the location.
+            longitude (float): The longitude of the location.
+            altitude (int): The altitude of the location.
+            trail (int): The number of hours of trail behind each body (default: none).
+
+        Usage:
+            /sky latitude longitude altitude trail
+
+        Example:
+            /sky 48.8566 2.3522 0 3
+
+        Returns:
+            None
+        """
+        await ctx.defer() # Defer the response to avoid the "This interaction failed" error
+
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
+
+        # Compute every position in one call and render the map once, off the event loop, at the local time
+        timezone = timezones.get_timezone(latitude, longitude)
+        try:
+            positions, image = await pipeline.compute_sky(latitude, longitude, altitude, timezone, datetime.now(ZoneInfo(timezone)).replace(tzinfo=None), trail, ctx.author.id, ctx.guild_id)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+
+        file = File(BytesIO(image), filename='sky_map.png')
+
+        google_maps_url = utils.get_google_maps_url(latitude, longitude)
+        bing_maps_url = utils.get_bing_maps_url(latitude, longitude)
+
+        # List the bodies above the horizon, highest first
+        visible = sorted(
+            (
+                (float(altitudes[-1]), FRENCH_NAMES[body], DIRECTIONS[round(float(azimuths[-1]) / 45) % 8])
+                for body, altitudes, azimuths in zip(positions.bodies, positions.altitudes, positions.azimuths)
+                if altitudes[-1] >= 0
+            ),
+            reverse=True
+        )
+
+        embed = Embed(
+            title='Le ciel en ce moment',
+            description=f'À {latitude}° de latitude et {longitude}° de longitude, le {positions.now.strftime("%d/%m/%Y à %H:%M")}.',
+            color=discord.Color.dark_blue()
+        )
+        embed.set_image(url=f'attachment://{file.filename}')
+        embed.add_field(
+            name='Au-dessus de l\'horizon',
+            value='\n'.join(f'{name} : {body_altitude:.1f}° {direction}' for body_altitude, name, direction in visible) or 'Aucun astre',
+            inline=False
+        )
+        embed.add_field(name='Cartes du lieu d\'observation', value=f'[Google Maps]({google_maps_url}) - [Bing Maps]({bing_maps_url})', inline=False)
+
+        await ctx.respond(embed=embed, file=file)
+
+    @discord.slash_command(description='Compare the rise and set times of a body for several locations')
+    async def compare(
+        self,
+        ctx,
+        locations: Option(str, description='Locations separated by semicolons, e.g. Paris: 48.8566, 2.3522; Lyon: 45.764, 4.8357'),
+        body: Option(str, choices=BODY_NAMES.keys(), default='Soleil', description='Body to compare (default: the sun)'),
+        day: Option(int, default=0, min_value=1, max_value=31, description='Day of the month (default: today)'),
+        month: Option(int, default=0, min_value=1, max_value=12, description='Month of the year (default: this month)'),
+        year: Option(int, default=0, min_value=MIN_YEAR, max_value=MAX_YEAR, description='Year (default: this year)')
+    ):
+        """
+        Compare the rise and set times of a body for several locations, in their local timezones.
+
+        Args:
+            locations (str): The locations, as latitude,longitude with an optional name, separated by semicolons.
+            body (str): The body to compare (default: the sun).
+            day (int): The day of the month (default: today).
+            month (int): The month of the year (default: this month).
+            year (int): The year (default: this year).
+
+        Usage:
+            /compare locations body day month year
+
+        Example:
+            /compare "Paris: 48.8566, 2.3522; Lyon: 45.764, 4.8357" Soleil 21 6 2024
+
+        Returns:
+            None
+        """
+        try:
+            parsed = utils.parse_locations(locations)
+        except ValueError:
+            await ctx.respond('Les lieux doivent être donnés sous la forme latitude, longitude, séparés par des points-virgules (par exemple : Paris: 48.8566, 2.3522; Lyon: 45.764, 4.8357).', ephemeral=True)
+            return
+        if not 1 <= len(parsed) <= COMPARE_LOCATIONS:
+            await ctx.respond(f'Donnez entre 1 et {COMPARE_LOCATIONS} lieux à comparer.', ephemeral=True)
+            return
+
+        await ctx.defer() # Defer the response to avoid the "This interaction failed" error
+
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
+
+        # Get the current date if no date is provided, in the timezone of the first location
+        sites = [(latitude, longitude, 0, timezones.get_timezone(latitude, longitude)) for _, latitude, longitude in parsed]
+        current_datetime = datetime.now(ZoneInfo(sites[0][3])).replace(tzinfo=None)
+        day = current_datetime.day if day == 0 else day
+        month = current_datetime.month if month == 0 else month
+        year = current_datetime.year if year == 0 else year
+
+        # Compute the rise and set times of every location in one pass, off the event loop
+        try:
+            rise_times, set_times = await pipeline.compute_compare(sites, BODY_NAMES[body], datetime(year, month, day), ctx.author.id, ctx.guild_id)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+
+        embed = Embed(
+            title=f'{body} le {day}/{month}/{year}',
+            description='Heures de lever et de coucher de chaque lieu, à l\'heure locale.',
+            color=discord.Color.dark_blue()
+        )
+        for (name, latitude, longitude), rise_time, set_time in zip(parsed, rise_times, set_times):
+            rise_text = rise_time.strftime('%H:%M') if rise_time is not None else '—'
+            set_text = set_time.strftime('%H:%M') if set_time is not None else '—'
+            embed.add_field(name=name or f'{latitude}°, {longitude}°', value=f'Lever : {rise_text}\nCoucher : {set_text}', inline=True)
+
+        await ctx.respond(embed=embed)
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(Sky(bot))
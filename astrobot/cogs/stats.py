@@ -0,0 +1,89 @@
+"""
+This module contains the cog for the load statistics of AstroBot.
+
+Stats:
+    - Shows the work queue and single-flight metrics of the compute commands.
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import discord
+from discord import Embed
+from discord.ext import commands
+
+from singleflight import flights
+from workqueue import queue
+
+class Stats(commands.Cog):
+    """
+    Stats cog for AstroBot.
+
+    This cog provides a command to show the load of the compute commands.
+
+    Attributes:
+        bot (commands.Bot): The bot instance.
+
+    Methods:
+        stats: Show the work queue and single-flight metrics.
+    """
+    def __init__(
+        self,
+        bot
+    ):
+        self.bot = bot
+
+    @discord.slash_command(description='Show the load of the astronomy commands')
+    async def stats(
+        self,
+        ctx
+    ):
+        """
+        Show the work queue and single-flight metrics.
+
+        Args:
+            ctx (discord.ApplicationContext): The context of the command.
+
+        Usage:
+            /stats
+
+        Returns:
+            None
+        """
+        queue_metrics = queue.metrics()
+        flight_metrics = flights.metrics()
+
+        embed = Embed(
+            title='Charge d\'AstroBot',
+            color=discord.Color.og_blurple()
+        )
+        embed.add_field(name='Calculs en cours', value=f'{queue_metrics["running"]} / {queue.concurrency}', inline=True)
+        embed.add_field(name='En attente', value=f'{queue_metrics["waiting"]} / {queue.max_size} (max. {queue_metrics["max_waiting"]})', inline=True)
+        embed.add_field(name='Refusés', value=str(queue_metrics['rejected']), inline=True)
+        embed.add_field(
+            name='Attente',
+            value=f'moy. {queue_metrics["wait_mean"]:.2f} s - p95 {queue_metrics["wait_p95"]:.2f} s - max. {queue_metrics["wait_max"]:.2f} s',
+            inline=False
+        )
+        embed.add_field(
+            name='Requêtes',
+            value=f'{flight_metrics["requests"]} requêtes, {flight_metrics["computations"]} calculs, {flight_metrics["coalesced"]} regroupées, {flight_metrics["errors"]} erreurs, {flight_metrics["rejected"]} refusées',
+            inline=False
+        )
+
+        await ctx.respond(embed=embed)
+
+def setup(
+    bot
+):
+    """
+    Setup function to add the cog to the bot.
+
+    Args:
+        bot (commands.Bot): The bot instance.
+
+    Returns:
+        None
+    """
+    bot.add_cog(Stats(bot))
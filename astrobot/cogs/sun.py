@@ -15,15 +15,20 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from datetime import datetime
+from io import BytesIO
+from zoneinfo import ZoneInfo
 
 import discord
 from discord import Embed, File, Option
 from discord.ext import commands
 
-from ephemeris import Ephemeris
-from constants import PLOT_TYPES
-import plots
+from constants import ANIMATION_FORMATS, EPHEMERIS_KERNEL, MAX_YEAR, MIN_YEAR, PLOT_TYPES
+import guilds
+import pipeline
+from service import ServiceError
+import timezones
 import utils
+from workqueue import QueueFullError
 
 class Sun(commands.Cog):
     """
@@ -53,7 +58,9 @@ class Sun(commands.Cog):
         plot_type: Option(str, choices=PLOT_TYPES.keys(), default='Polaire', description='Type of plot (default: polar sky)'),
         day: Option(int, default=0, min_value=1, max_value=31, description='Day of the month (default: today)'),
         month: Option(int, default=0, min_value=1, max_value=12, description='Month of the year (default: this month)'),
-        year: Option(int, default=0, min_value=1550, max_value=2650, description='Year (default: this year)')
+        year: Option(int, default=0, min_value=MIN_YEAR, max_value=MAX_YEAR, description='Year (default: this year)'),
+        animation: Option(str, choices=ANIMATION_FORMATS.keys(), default=None, description='Animate the daily path (default: still image)'),
+        lite: Option(bool, default=None, description='Answer with text only, without image (default: server setting)')
     ):
         """
         Get sunrise and sunset times for a given location and date.
@@ -65,6 +72,8 @@ class Sun(commands.Cog):
             day (int): The day of the month (default: today).
             month (int): The month of the year (default: this month).
             year (int): The year (default: this year).
+            animation (str): The format of the animated daily path (default: still image).
+            lite (bool): Whether to answer with text only (default: the setting of the server).
 
         Usage:
             /sun latitude longitude altitude day month year
@@ -77,7 +86,15 @@ class Sun(commands.Cog):
         """
         await ctx.defer() # Defer the response to avoid the "This interaction failed" error
 
-        eph = Ephemeris(latitude, longitude, altitude, 'Europe/Paris')
+        # Answer right away if the ephemeris kernel is still being downloaded
+        try:
+            status = await pipeline.kernel_status(EPHEMERIS_KERNEL)
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        if status['state'] != 'ready':
+            await ctx.respond(utils.get_kernel_not_ready_message(status))
+            return
 
         if day != 0 or month != 0 or year != 0:
             custom_date = True
@@ -85,15 +102,13 @@ class Sun(commands.Cog):
             custom_date = False
 
         # Get the current date if no date is provided
-        current_datetime = datetime.now()
+        # Use the local time of the timezone of the location
+        timezone = timezones.get_timezone(latitude, longitude)
+        current_datetime = datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
         day = current_datetime.day if day == 0 else day
         month = current_datetime.month if month == 0 else month
         year = current_datetime.year if year == 0 else year
 
-        # Get sunrise and sunset times
-        sunrise = eph.get_sunrise_time(datetime(year, month, day))
-        sunset = eph.get_sunset_time(datetime(year, month, day))
-
         google_maps_url = utils.get_google_maps_url(latitude, longitude)
         bing_maps_url = utils.get_bing_maps_url(latitude, longitude)
 
@@ -103,22 +118,47 @@ class Sun(commands.Cog):
         else:
             compute_datetime = datetime(year, month, day)
 
-        # Plot the polar sky map or the xy path of the sun
-        if plot_type == 'Polaire':
-            file = File(plots.plot_polar_sky(eph, 'sun', compute_datetime), filename='polar_sky.png')
-        else:
-            file = File(plots.plot_xy_path(eph, 'sun', compute_datetime), filename='xy_path.png')
+        # Use the setting of the server if the answer mode is not given
+        if lite is None:
+            lite = guilds.settings.get(ctx.guild_id, 'lite', False)
+
+        # Compute the report and render the plot off the event loop, coalescing identical requests
+        # A text-only answer skips the plot entirely, and waits in the queue with a higher priority
+        plot = None if lite else PLOT_TYPES[plot_type]
+        animation_format = None if lite else ANIMATION_FORMATS.get(animation)
+        try:
+            report, image = await pipeline.compute('sun', plot, latitude, longitude, altitude, timezone, datetime(year, month, day), compute_datetime, ctx.author.id, ctx.guild_id, animation_format)
+        except QueueFullError as error:
+            await ctx.respond(utils.get_busy_message(error.waiting))
+            return
+        except ServiceError:
+            await ctx.followup.send(utils.get_service_error_message())
+            return
+        sunrise, sunset = report.rise_time, report.set_time
 
         embed = Embed(
             title='Éphémérides du soleil',
             description=f'Pour la date du {day}/{month}/{year} à {latitude}° de latitude et {longitude}° de longitude.',
             color=discord.Color.gold()
         )
-        embed.set_image(url=f'attachment://{file.filename}')
         embed.add_field(name='Lever du soleil', value=sunrise.strftime('%H:%M:%S'), inline=False)
         embed.add_field(name='Coucher du soleil', value=sunset.strftime('%H:%M:%S'), inline=False)
+        embed.add_field(name='Culmination', value=f'{report.transit_time.strftime("%H:%M:%S")} ({report.transit_altitude:.1f}°)', inline=False)
+        if lite:
+            embed.add_field(name='Position heure par heure', value=utils.get_hourly_table(report.path), inline=False)
+            embed.add_field(name='Crépuscules', value=utils.get_twilight_lines(report.twilight), inline=False)
         embed.add_field(name='Cartes du lieu d\'observation', value=f'[Google Maps]({google_maps_url}) - [Bing Maps]({bing_maps_url})', inline=False)
 
+        if lite:
+            await ctx.respond(embed=embed)
+            return
+
+        # Attach the polar sky map or the xy path
+        extension = ANIMATION_FORMATS.get(animation, 'png')
+        filename = f'polar_sky.{extension}' if plot_type == 'Polaire' else f'xy_path.{extension}'
+        file = File(BytesIO(image), filename=filename)
+
+        embed.set_image(url=f'attachment://{file.filename}')
         await ctx.respond(embed=embed, file=file)
 
 def setup(
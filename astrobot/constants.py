@@ -2,6 +2,18 @@
 This module contains constants used in the AstroBot application.
 """
 
+# Animation format name: image format of the animated daily paths
+ANIMATION_FORMATS = {
+    'GIF': 'gif',
+    'APNG': 'png'
+}
+
+# Bounds of the animated daily paths: frames, resolution, frame duration (ms) and file size
+ANIMATION_DPI = 72
+ANIMATION_FRAME_DURATION = 100
+ANIMATION_FRAMES = 48
+ANIMATION_MAX_BYTES = 8 * 1024 * 1024
+
 ASTROBIN_API_IOTD_URL = 'imageoftheday/?limit=1'
 ASTROBIN_API_URL = 'api/v1/'
 ASTROBIN_BASE_URL = 'https://astrobin.com'
@@ -21,8 +33,77 @@ BODIES = {
     'pluto': ('peru', 5),
 }
 
+BODY_NAMES = {
+    'Soleil': 'sun',
+    'Lune': 'moon',
+    'Mercure': 'mercury',
+    'Vénus': 'venus',
+    'Mars': 'mars',
+    'Jupiter': 'jupiter',
+    'Saturne': 'saturn',
+    'Uranus': 'uranus',
+    'Neptune': 'neptune',
+    'Pluton': 'pluto'
+}
+
+# Maximum number of locations compared at once (one field of the embed each)
+COMPARE_LOCATIONS = 20
+
+# Number of worker threads computing and rendering the astronomy commands
+COMPUTE_WORKERS = 4
+
+# Timezone of the locations until the timezone index is built
+DEFAULT_TIMEZONE = 'Europe/Paris'
+
+# Number of sites computed by a worker at once for the daily digests
+DIGEST_CHUNK = 256
+
+# Time before the posting time when the daily digests are computed, in minutes
+DIGEST_LEAD = 60
+
+# Minimum time between two daily digests posted, in seconds, to stay below the rate limits of Discord
+DIGEST_SEND_INTERVAL = 0.05
+
+# Lock file held by the one bot process posting the daily digests, in the data directory
+DIGEST_SCHEDULER_LOCK = 'digest_scheduler.lock'
+
+# File of the daily digest subscriptions, in the data directory
+DIGEST_SUBSCRIPTIONS = 'digest_subscriptions.json'
+
 DIRECTIONS = ['N', 'NE', 'E', 'SE', 'S', 'SO', 'O', 'NO', '']
 
+EPHEMERIS_KERNEL = 'de440s.bsp'
+
+# File of the settings of each guild, in the data directory
+GUILD_SETTINGS = 'guild_settings.json'
+
+# Kernel name: (download URL, expected SHA-256 digest or None to skip the digest check)
+KERNELS = {
+    'de440s.bsp': ('https://ssd.jpl.nasa.gov/ftp/eph/planets/bsp/de440s.bsp', None),
+}
+
+# Bodies of the live sky map messages
+LIVE_BODIES = ['sun', 'moon']
+
+# Minimum time between two edits of the live messages, in seconds, to stay below the rate limits of Discord
+LIVE_EDIT_INTERVAL = 1.0
+
+# Maximum number of live sky map backgrounds kept (one per location and day)
+LIVE_MAPS = 64
+
+# Maximum time spent updating the live messages at each tick, in seconds (the others wait for the next tick)
+LIVE_UPDATE_BUDGET = 60
+
+# Time between two updates of the live messages, in minutes
+LIVE_UPDATE_MINUTES = 5
+
+MAX_YEAR = 2650
+MIN_YEAR = 1550
+
+MOON_PHASES = ['Nouvelle lune', 'Premier quartier', 'Pleine lune', 'Dernier quartier']
+
+MONTHS = ['janvier', 'février', 'mars', 'avril', 'mai', 'juin', 'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre']
+
 NASA_API_APOD_URL = 'https://api.nasa.gov/planetary/apod'
 NASA_APOD_URL = 'https://apod.nasa.gov/apod/astropix.html'
 NASA_LOGO_URL = 'https://gpm.nasa.gov/sites/default/files/document_files/NASA-Logo-Large.png'
@@ -38,7 +119,40 @@ PLANETS = {
     'Pluton': 'pluto'
 }
 
+# Precision of the plotted daily paths and current positions
+PLOT_PRECISION = 'approximate'
+
 PLOT_TYPES = {
     'Polaire': 'polar',
     'Cartésien': 'cartesian'
 }
+
+# Plot type of a report holding the data of the plots (the solstice paths), without an image
+PLOT_DATA = 'data'
+
+# Precision mode of the positions: maximum angular error against the reference mode, in degrees
+# - reference: apparent positions (light time, aberration, deflection), for the printed times
+# - fast: astrometric positions (light time only), without the cached fits
+# - approximate: cached Chebyshev fits of the reference positions, for the plots
+PRECISIONS = {
+    'reference': 0.0,
+    'fast': 0.01,
+    'approximate': 0.01,
+}
+
+QUEUE_SIZE = 32
+
+# Directory of the timezone index, in the data directory
+TIMEZONE_INDEX = 'timezones'
+
+# Twilight name: highest altitude of the sun, in degrees
+TWILIGHTS = {
+    'Civil': -6.0,
+    'Nautique': -12.0,
+    'Astronomique': -18.0
+}
+
+# Level of almanac.dark_twilight_day: name of the light reached at a twilight transition
+TWILIGHT_LEVELS = ['Nuit', 'Crépuscule astronomique', 'Crépuscule nautique', 'Crépuscule civil', 'Jour']
+
+WEEKDAYS = ['Lun', 'Mar', 'Mer', 'Jeu', 'Ven', 'Sam', 'Dim']
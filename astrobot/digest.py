@@ -0,0 +1,508 @@
+"""
+This module contains the daily digests of AstroBot.
+
+Users and channels subscribe a location to a morning digest: the sunrise and sunset of the day,
+the dusks of the evening, the moon phase and the planets visible during the night. The
+subscriptions are stored in one JSON file of the data directory, shared by the bot processes of
+the host: every change re-reads and rewrites it under an exclusive lock of a companion lock file.
+Only the process holding the scheduler lock posts the digests, another one takes over if it stops.
+
+The digests of a day are computed ahead of their posting time for many sites at once: the
+subscriptions are deduplicated by quantized location, and the sun, the moon and the planets of
+every site are sampled over its own local day and night in one multi-observer call of the
+Chebyshev engine. The events are then found with array operations over every site together.
+
+Attributes:
+    SITE_DECIMALS (int): The number of decimals kept in the latitude and longitude of a site (about 1 km).
+    ALTITUDE_STEP (int): The altitude quantization step of a site, in meters.
+    STEP (timedelta): The time interval between the samples.
+    SPAN (timedelta): The time sampled from the local midnight of the day (until the next noon).
+    HORIZON (float): The altitude of the center of the sun at sunrise and sunset, in degrees.
+    NIGHT (float): The highest altitude of the sun for the planets to be visible, in degrees.
+    MIN_ALTITUDE (float): The lowest altitude of the visible planets, in degrees.
+    subscriptions (Subscriptions): The subscriptions shared by the bot.
+    scheduler (SchedulerLock): The lock electing the one process posting the digests.
+
+Methods:
+    get_site: Get the quantized site of a subscription.
+    get_next_post: Get the next posting time of a subscription.
+    compute_digests: Compute the digests of several sites for one day, in one batch.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date as Date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from constants import DIGEST_SCHEDULER_LOCK, DIGEST_SUBSCRIPTIONS, PLANETS, TWILIGHTS
+from ephemeris import ObservingWindow, get_sky_object, ts
+import chebyshev
+import kernels
+
+try:
+    import fcntl
+except ImportError:
+    # Without file locks (Windows), the subscriptions are only safe within one process
+    fcntl = None
+
+SITE_DECIMALS = 2
+ALTITUDE_STEP = 10
+STEP = timedelta(minutes=10)
+SPAN = timedelta(hours=36)
+HORIZON = -0.8333
+NIGHT = -12.0
+MIN_ALTITUDE = 10.0
+
+@dataclass
+class Digest:
+    """
+    A class to hold the morning digest of a site for one day.
+
+    Attributes:
+        date (datetime.date): The local date of the digest.
+        sunrise (datetime.datetime): The sunrise in the local timezone, or None.
+        sunset (datetime.datetime): The sunset in the local timezone, or None.
+        dusks (dict): The time of each evening dusk, by name as in constants.TWILIGHTS, or None.
+        moon_phase (float): The moon phase at local noon, in degrees (0 for the new moon, 180 for the full moon).
+        moon_illumination (float): The illuminated fraction of the moon at local noon.
+        planets (list): The observing windows of the planets during the night, highest first.
+    """
+    date: Date
+    sunrise: datetime
+    sunset: datetime
+    dusks: dict
+    moon_phase: float
+    moon_illumination: float
+    planets: list[ObservingWindow]
+
+class Subscriptions:
+    """
+    A class to store the digest subscriptions in a JSON file.
+
+    A subscription is a dict with the target ('channel' or 'user'), the target_id, the latitude,
+    longitude, altitude and timezone of the location, the local posting time ('HH:MM'), the
+    user_id who subscribed, and the local date of the last digest posted ('YYYY-MM-DD' or None).
+    Each target has at most one subscription.
+
+    Several processes can share the file: the changes are made under an exclusive lock of the
+    file `path`.lock, and the file is read again whenever another process replaced it.
+
+    Attributes:
+        path (str): The path of the JSON file.
+
+    Methods:
+        add(subscription): Add a subscription, replacing the one of the same target.
+        remove(target, target_id): Remove the subscription of a target.
+        all(): Get every subscription.
+        mark_posted(subscriptions, date): Record the date of the last digest posted.
+    """
+
+    def __init__(
+        self,
+        path: str = None
+    ) -> None:
+        """
+        Initialize the Subscriptions object.
+
+        Args:
+            path (str, optional): The path of the JSON file. Defaults to the file of the data directory.
+        """
+        self.path = path or os.path.join(kernels.get_data_dir(), DIGEST_SUBSCRIPTIONS)
+
+        self._lock = threading.Lock()
+        self._subscriptions = None
+        self._stamp = None
+
+    @contextmanager
+    def _locked(
+        self,
+        exclusive: bool = True
+    ):
+        """
+        Hold the lock of the threads of this process, and the lock of the file shared with the other processes.
+
+        Args:
+            exclusive (bool, optional): Whether to take the file lock for a change, else for a read. Defaults to True.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f'{self.path}.lock', 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(
+        self
+    ) -> dict:
+        """
+        Read the file, again if it was replaced since the last read. The locks must be held.
+
+        Returns:
+            dict: The subscriptions, keyed by target and target id.
+        """
+        try:
+            status = os.stat(self.path)
+            stamp = (status.st_ino, status.st_mtime_ns, status.st_size)
+        except OSError:
+            stamp = None
+
+        if self._subscriptions is None or stamp != self._stamp:
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    self._subscriptions = json.load(file)
+            except (OSError, ValueError):
+                self._subscriptions = {}
+            self._stamp = stamp
+        return self._subscriptions
+
+    def _save(
+        self
+    ) -> None:
+        """
+        Write a temporary file and replace the file, so it is never half written. The locks must be held.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self._subscriptions, file, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+        status = os.stat(self.path)
+        self._stamp = (status.st_ino, status.st_mtime_ns, status.st_size)
+
+    def add(
+        self,
+        subscription: dict
+    ) -> None:
+        """
+        Add a subscription, replacing the one of the same target.
+
+        Args:
+            subscription (dict): The subscription.
+        """
+        with self._locked():
+            self._load()[f'{subscription["target"]}:{subscription["target_id"]}'] = subscription
+            self._save()
+
+    def remove(
+        self,
+        target: str,
+        target_id: int
+    ) -> bool:
+        """
+        Remove the subscription of a target.
+
+        Args:
+            target (str): 'channel' or 'user'.
+            target_id (int): The id of the channel or of the user.
+
+        Returns:
+            bool: Whether the target had a subscription.
+        """
+        with self._locked():
+            if self._load().pop(f'{target}:{target_id}', None) is None:
+                return False
+            self._save()
+            return True
+
+    def all(
+        self
+    ) -> list[dict]:
+        """
+        Get every subscription.
+
+        Returns:
+            list: The subscriptions.
+        """
+        with self._locked(exclusive=False):
+            return list(self._load().values())
+
+    def mark_posted(
+        self,
+        subscriptions: list[dict],
+        date: Date
+    ) -> None:
+        """
+        Record the local date of the last digest posted to some subscriptions, in one write.
+
+        Args:
+            subscriptions (list): The subscriptions.
+            date (datetime.date): The local date of the digests.
+        """
+        with self._locked():
+            stored = self._load()
+            for subscription in subscriptions:
+                key = f'{subscription["target"]}:{subscription["target_id"]}'
+                if key in stored:
+                    stored[key]['last_posted'] = date.isoformat()
+            self._save()
+
+class SchedulerLock:
+    """
+    A class to elect the one process posting the digests among the bot processes of a host.
+
+    The process holding an exclusive lock of the lock file is the scheduler. The lock is released
+    by the system when the process stops, and another process acquires it at its next try.
+
+    Attributes:
+        path (str): The path of the lock file.
+
+    Methods:
+        acquire(): Try to become the scheduler.
+        release(): Stop being the scheduler.
+    """
+
+    def __init__(
+        self,
+        path: str = None
+    ) -> None:
+        """
+        Initialize the SchedulerLock object.
+
+        Args:
+            path (str, optional): The path of the lock file. Defaults to the file of the data directory.
+        """
+        self.path = path or os.path.join(kernels.get_data_dir(), DIGEST_SCHEDULER_LOCK)
+
+        self._file = None
+
+    def acquire(
+        self
+    ) -> bool:
+        """
+        Try to become the scheduler, without waiting.
+
+        Returns:
+            bool: Whether this process is the scheduler.
+        """
+        if self._file is not None or fcntl is None:
+            return True
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        file = open(self.path, 'a')
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        self._file = file
+        return True
+
+    def release(
+        self
+    ) -> None:
+        """
+        Stop being the scheduler, so that another process can acquire the lock.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def get_site(
+    subscription: dict
+) -> tuple:
+    """
+    Get the quantized site of a subscription, shared by the subscriptions of nearby locations.
+
+    Args:
+        subscription (dict): The subscription.
+
+    Returns:
+        tuple: The latitude, longitude, altitude and timezone of the site.
+    """
+    return (
+        round(subscription['latitude'], SITE_DECIMALS),
+        round(subscription['longitude'], SITE_DECIMALS),
+        round(subscription['altitude'] / ALTITUDE_STEP) * ALTITUDE_STEP,
+        subscription['timezone'],
+    )
+
+def get_next_post(
+    subscription: dict,
+    now: datetime
+) -> datetime:
+    """
+    Get the next posting time of a subscription: today, unless the digest of today was already posted.
+
+    Args:
+        subscription (dict): The subscription.
+        now (datetime): The current time, timezone aware.
+
+    Returns:
+        datetime: The posting time in the timezone of the subscription, possibly already passed.
+    """
+    zone = ZoneInfo(subscription['timezone'])
+    hour, minute = map(int, subscription['time'].split(':'))
+    day = now.astimezone(zone).date()
+    if (subscription.get('last_posted') or '') >= day.isoformat():
+        day += timedelta(days=1)
+    return datetime.combine(day, time(hour, minute), zone)
+
+def _first_crossing(
+    tt: np.ndarray,
+    values: np.ndarray,
+    rising: bool
+) -> np.ndarray:
+    """
+    Interpolate the first time each row of values crosses zero.
+
+    Args:
+        tt (np.ndarray): The TT Julian dates of the samples, with shape (rows, samples).
+        values (np.ndarray): The values of the samples, with the same shape.
+        rising (bool): Whether to find an upward crossing, else a downward one.
+
+    Returns:
+        np.ndarray: The TT Julian date of the crossing of each row, or NaN if there is none.
+    """
+    before, after = values[:, :-1], values[:, 1:]
+    crossings = (before < 0) & (after >= 0) if rising else (before >= 0) & (after < 0)
+    rows, first = np.arange(len(values)), crossings.argmax(axis=1)
+
+    v0, v1 = values[rows, first], values[rows, first + 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        times = tt[rows, first] + (tt[rows, first + 1] - tt[rows, first]) * v0 / (v0 - v1)
+    return np.where(crossings.any(axis=1), times, np.nan)
+
+def _moon_phases(
+    tt: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the moon phase and the illuminated fraction of the moon at the given times.
+
+    Args:
+        tt (np.ndarray): The TT Julian dates.
+
+    Returns:
+        tuple: The moon phases in degrees (difference of ecliptic longitudes) and the illuminated fractions.
+    """
+    sun, _ = chebyshev.engine.geocentric(get_sky_object('sun'), tt)
+    moon, _ = chebyshev.engine.geocentric(get_sky_object('moon'), tt)
+
+    # Rotate the positions from the true equator to the ecliptic of date (mean obliquity)
+    obliquity = np.radians(23.439291 - 0.0130042 * (tt - 2451545.0) / 36525)
+    def longitude(xyz):
+        return np.arctan2(xyz[1] * np.cos(obliquity) + xyz[2] * np.sin(obliquity), xyz[0])
+    phases = np.degrees(longitude(moon) - longitude(sun)) % 360
+
+    # The illuminated fraction follows the elongation of the moon from the sun
+    cos_elongation = np.sum(sun * moon, axis=0) / (np.linalg.norm(sun, axis=0) * np.linalg.norm(moon, axis=0))
+    return phases, (1 - cos_elongation) / 2
+
+def compute_digests(
+    sites: list[tuple],
+    date: Date
+) -> list[Digest]:
+    """
+    Compute the digests of several sites for one day, in one batch.
+
+    Every site is sampled from its local midnight to the next noon. The sunrise and sunset are
+    searched over the local day, the dusks and the planets over the night from the local noon. A
+    planet hidden for part of the night has one window before and one after.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each site.
+        date (datetime.date): The local date of the digests.
+
+    Returns:
+        list: The digest of each site, in the same order.
+    """
+    if not sites:
+        return []
+    latitudes, longitudes, altitudes, zones = zip(*sites)
+
+    # The local midnight of every site, then a shared grid of offsets from it
+    zone_infos = {zone: ZoneInfo(zone) for zone in set(zones)}
+    midnights = ts.from_datetimes([datetime(date.year, date.month, date.day, tzinfo=zone_infos[zone]) for zone in zones]).tt
+    step = STEP / timedelta(days=1)
+    offsets = np.arange(round(SPAN / STEP) + 1) * step
+    tt = midnights[:, None] + offsets
+    day = offsets <= 1
+    night = offsets >= 0.5
+
+    bodies = list(PLANETS.values())
+    sky_objects = [get_sky_object(body) for body in ['sun', *bodies]]
+    alt, az = chebyshev.engine.altaz_observers(sky_objects, tt, latitudes, longitudes, altitudes)
+    sun = alt[0]
+
+    # Events of the sun, as TT Julian dates with NaN when they do not happen
+    events = {
+        'sunrise': _first_crossing(tt[:, day], sun[:, day] - HORIZON, rising=True),
+        'sunset': _first_crossing(tt[:, day], sun[:, day] - HORIZON, rising=False),
+    }
+    for name, sun_altitude in TWILIGHTS.items():
+        events[name] = _first_crossing(tt[:, night], sun[:, night] - sun_altitude, rising=False)
+
+    # The margin is positive while the sun is low enough and the planet high enough
+    night_tt, night_alt, night_az = tt[:, night], alt[1:, :, night], az[1:, :, night]
+    margin = np.minimum(NIGHT - sun[None, :, night], night_alt - MIN_ALTITUDE)
+    samples = margin.shape[2]
+
+    # Find the first and last visible sample of every window, a planet may be seen in several windows
+    changes = np.diff(np.pad(margin > 0, ((0, 0), (0, 0), (1, 1))).astype(np.int8), axis=2)
+    objects, rows, first = np.nonzero(changes == 1)
+    _, _, last = np.nonzero(changes == -1)
+    last -= 1
+    peaks = np.array([
+        first_sample + np.argmax(night_alt[index, row, first_sample:last_sample + 1])
+        for index, row, first_sample, last_sample in zip(objects, rows, first, last)
+    ], dtype=int)
+
+    # Interpolate the edges where the margin crosses zero, unless the window is cut by the end of the samples
+    before, after = np.maximum(first - 1, 0), np.minimum(last + 1, samples - 1)
+    m_before, m_first = margin[objects, rows, before], margin[objects, rows, first]
+    m_last, m_after = margin[objects, rows, last], margin[objects, rows, after]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        starts = np.where(first > 0, night_tt[rows, before] + step * m_before / (m_before - m_first), night_tt[rows, first])
+        ends = np.where(last < samples - 1, night_tt[rows, last] + step * m_last / (m_last - m_after), night_tt[rows, last])
+
+    # Convert every time to UTC in one call, then to the timezone of each site
+    event_times = np.stack(list(events.values()))
+    times = np.concatenate([event_times.ravel(), starts, ends, night_tt[rows, peaks]])
+    utc = np.array(ts.tt_jd(np.nan_to_num(times, nan=midnights[0])).utc_datetime(), dtype=object)
+    event_utc, window_utc = utc[:event_times.size].reshape(event_times.shape), utc[event_times.size:].reshape(3, -1)
+
+    planets = [[] for _ in sites]
+    for window, (index, row, peak) in enumerate(zip(objects, rows, peaks)):
+        start, end, peak_time = (utc_time.astimezone(zone_infos[zones[row]]) for utc_time in window_utc[:, window])
+        planets[row].append(ObservingWindow(
+            body=bodies[index],
+            start=start,
+            end=end,
+            peak_time=peak_time,
+            peak_altitude=float(night_alt[index, row, peak]),
+            peak_azimuth=float(night_az[index, row, peak])
+        ))
+
+    moon_phases, moon_illuminations = _moon_phases(midnights + 0.5)
+
+    digests = []
+    for site, zone in enumerate(zones):
+        zone_info = zone_infos[zone]
+        local = [None if np.isnan(event_times[column, site]) else event_utc[column, site].astimezone(zone_info) for column in range(len(events))]
+        named = dict(zip(events, local))
+        planets[site].sort(key=lambda window: window.peak_altitude, reverse=True)
+
+        digests.append(Digest(
+            date=date,
+            sunrise=named['sunrise'],
+            sunset=named['sunset'],
+            dusks={name: named[name] for name in TWILIGHTS},
+            moon_phase=float(moon_phases[site]),
+            moon_illumination=float(moon_illuminations[site]),
+            planets=planets[site]
+        ))
+
+    return digests
+
+subscriptions = Subscriptions()
+scheduler = SchedulerLock()
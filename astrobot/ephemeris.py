@@ -1,26 +1,377 @@
+import calendar
 import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from zoneinfo import ZoneInfo
 
 import datetime
 from datetime import timedelta
+import numpy as np
 import skyfield
 from skyfield import almanac
-from skyfield.api import N, E, load, load_file, Loader, wgs84
+from skyfield.api import N, E, load, wgs84
+from skyfield.units import Distance
+
+import chebyshev
+import kernels
+import timezones
+from constants import BODIES, PLOT_PRECISION, PRECISIONS
+from results import DailyPath, SeasonEvents, TwilightEvents
+
+POOL_SIZE = 256
+
+# Mean synodic month and first new moon of 2000 (TT Julian dates), to number the lunations
+SYNODIC_MONTH = 29.530588861
+LUNATION_EPOCH = 2451550.09766
+LUNATION_CACHE_SIZE = 240
+
+_lunation_events = OrderedDict()
+_lunation_lock = threading.Lock()
+
+ts = load.timescale()
+
+def get_sky_object(
+    body: str
+) -> str:
+    """
+    Get the name of the given body in the ephemeris kernel.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES (e.g. 'sun' or 'mars').
+
+    Returns:
+        str: The name of the body in the kernel (e.g. 'sun' or 'mars barycenter').
+    """
+    return body if body in ('sun', 'moon', 'earth') else f'{body} barycenter'
+
+@dataclass
+class DailyReport:
+    """
+    A class to hold everything the commands need about a body for one day.
+
+    Attributes:
+        body (str): The name of the body, as in constants.BODIES.
+        date (datetime.date): The date of the report.
+        now (datetime.datetime): The time of the current position, in the local timezone.
+        rise_time (datetime.time): The rise time in the local timezone, or None.
+        set_time (datetime.time): The set time in the local timezone, or None.
+        transit_time (datetime.time): The time of the highest point in the local timezone.
+        transit_altitude (float): The altitude of the highest point, in degrees.
+        path (DailyPath): The daily path of the body.
+        current_altitude (float): The altitude of the body at `now`, in degrees.
+        current_azimuth (float): The azimuth of the body at `now`, in degrees.
+        twilight (TwilightEvents): The twilight times and events (sun only).
+        moon_phase (float): The moon phase in degrees (moon only).
+        moon_phase_events (list): The next principal moon phases from `now`, as (time, phase) (moon only).
+        moon_illumination (float): The illuminated fraction of the moon at `now` (moon only).
+        solstice_paths (dict): The daily paths at the summer and winter solstices (sun only).
+
+    Methods:
+        altitudes: Get the altitudes of the daily path, in degrees.
+        azimuths: Get the azimuths of the daily path, in degrees.
+        peak_hours_altaz: Get the altitude and azimuth of the body every hour.
+    """
+    body: str
+    date: datetime.date
+    now: datetime.datetime
+    rise_time: datetime.time
+    set_time: datetime.time
+    transit_time: datetime.time
+    transit_altitude: float
+    path: DailyPath
+    current_altitude: float
+    current_azimuth: float
+    twilight: TwilightEvents = None
+    moon_phase: float = None
+    moon_phase_events: list = None
+    moon_illumination: float = None
+    solstice_paths: dict = field(default_factory=dict)
+
+    @property
+    def altitudes(
+        self
+    ) -> np.ndarray:
+        """
+        Get the altitudes of the daily path, in degrees, as float32.
+        """
+        return self.path.altitudes
+
+    @property
+    def azimuths(
+        self
+    ) -> np.ndarray:
+        """
+        Get the azimuths of the daily path, in degrees, as float32.
+        """
+        return self.path.azimuths
+
+    @property
+    def peak_hours_altaz(
+        self
+    ) -> dict:
+        """
+        Get the altitude and azimuth of the body every hour, keyed by local time.
+        """
+        return self.path.peak_hours_altaz
+
+@dataclass
+class MonthCalendar:
+    """
+    A class to hold the daily rise and set times of a body over a month.
+
+    Attributes:
+        body (str): The name of the body, as in constants.BODIES.
+        year (int): The year of the month.
+        month (int): The month.
+        dates (list): The dates of the month.
+        rise_times (list): The first rise time of each day in the local timezone, or None.
+        set_times (list): The first set time of each day in the local timezone, or None.
+        durations (list): The time spent above the horizon each day (the day length for the sun).
+        moon_phases (list): The moon phase at local noon each day, in degrees.
+    """
+    body: str
+    year: int
+    month: int
+    dates: list[datetime.date]
+    rise_times: list[datetime.time]
+    set_times: list[datetime.time]
+    durations: list[timedelta]
+    moon_phases: list[float]
+
+@dataclass
+class TwilightRange:
+    """
+    A class to hold the twilight levels of the sun over a time range.
+
+    The levels are those of almanac.dark_twilight_day: 0 for the night, 1 for the astronomical
+    twilight, 2 for the nautical twilight, 3 for the civil twilight and 4 for the day. During the
+    polar day or night there is no transition, and the level stays start_level.
+
+    Attributes:
+        t0 (float): The TT Julian date of the start of the range.
+        t1 (float): The TT Julian date of the end of the range.
+        start_level (int): The level at the start of the range.
+        tt (np.ndarray): The TT Julian dates of the transitions.
+        levels (np.ndarray): The level after each transition.
+
+    Methods:
+        level_at(tt): Get the level at the given times.
+        intervals(max_level): Get the intervals when the level is at most the given one.
+    """
+    t0: float
+    t1: float
+    start_level: int
+    tt: np.ndarray
+    levels: np.ndarray
+
+    def level_at(
+        self,
+        tt: np.ndarray
+    ) -> np.ndarray:
+        """
+        Get the level at the given times.
+
+        Args:
+            tt (np.ndarray): The TT Julian dates, within the range.
+
+        Returns:
+            np.ndarray: The levels.
+        """
+        index = np.searchsorted(self.tt, tt, side='right') - 1
+        return np.where(index < 0, self.start_level, self.levels[np.maximum(index, 0)] if len(self.levels) else self.start_level)
+
+    def intervals(
+        self,
+        max_level: int = 0
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the intervals when the level is at most the given one (0 for the astronomical night).
+
+        Args:
+            max_level (int, optional): The highest level included. Defaults to 0.
+
+        Returns:
+            tuple: The TT Julian dates of the starts and of the ends of the intervals.
+        """
+        return _state_intervals(self.t0, self.t1, self.tt, self.levels <= max_level, self.start_level <= max_level)
+
+@dataclass
+class DarkWindows:
+    """
+    A class to hold the astronomical dark windows of consecutive nights.
+
+    A night runs from the local noon of its date to the local noon of the next day. A night can
+    hold several windows (for example when the moon rises in the middle of the night), or none.
+
+    Attributes:
+        nights (list): The dates of the evenings of the nights.
+        night_index (np.ndarray): The index in nights of each window.
+        start (np.ndarray): The TT Julian dates of the starts of the windows.
+        end (np.ndarray): The TT Julian dates of the ends of the windows.
+        durations (np.ndarray): The total duration of the windows of each night, in hours.
+    """
+    nights: list[datetime.date]
+    night_index: np.ndarray
+    start: np.ndarray
+    end: np.ndarray
+    durations: np.ndarray
+
+@dataclass
+class ObservingWindow:
+    """
+    A class to hold a time range when a body can be observed during a night.
+
+    Attributes:
+        body (str): The name of the body, as in constants.BODIES.
+        start (datetime.datetime): The start of the window, in the local timezone.
+        end (datetime.datetime): The end of the window, in the local timezone.
+        peak_time (datetime.datetime): The time of the highest point within the window.
+        peak_altitude (float): The altitude of the highest point within the window, in degrees.
+        peak_azimuth (float): The azimuth of the highest point within the window, in degrees.
+    """
+    body: str
+    start: datetime.datetime
+    end: datetime.datetime
+    peak_time: datetime.datetime
+    peak_altitude: float
+    peak_azimuth: float
+
+@dataclass
+class SkyPositions:
+    """
+    A class to hold the positions of several bodies at the same times.
+
+    Attributes:
+        now (datetime.datetime): The time of the current positions, in the local timezone.
+        bodies (list): The names of the bodies, as in constants.BODIES.
+        tt (np.ndarray): The TT Julian dates of the samples, the last one being `now`.
+        altitudes (np.ndarray): The altitudes in degrees, with shape (bodies, samples).
+        azimuths (np.ndarray): The azimuths in degrees, with shape (bodies, samples).
+    """
+    now: datetime.datetime
+    bodies: list[str]
+    tt: np.ndarray
+    altitudes: np.ndarray
+    azimuths: np.ndarray
+
+def _to_timestamps(
+    times: skyfield.timelib.Time
+) -> np.ndarray:
+    """
+    Convert skyfield times to POSIX timestamps, to the microsecond like their UTC datetimes.
+
+    Args:
+        times (skyfield.timelib.Time): The times, as a vector.
+
+    Returns:
+        np.ndarray: The POSIX timestamps.
+    """
+    return np.array([time.timestamp() for time in times.utc_datetime()], dtype=float)
+
+def _state_intervals(
+    t0: float,
+    t1: float,
+    tt: np.ndarray,
+    states: np.ndarray,
+    start_state: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the intervals when a state is true, from the times it changes.
+
+    Args:
+        t0 (float): The start of the range.
+        t1 (float): The end of the range.
+        tt (np.ndarray): The sorted times of the changes.
+        states (np.ndarray): The state after each change.
+        start_state (bool): The state at the start of the range.
+
+    Returns:
+        tuple: The starts and the ends of the intervals.
+    """
+    points = np.concatenate([[t0], tt, [t1]])
+    states = np.concatenate([[start_state], states]).astype(bool)
+
+    # Merge the consecutive segments in the same state, and keep the true ones
+    change = np.concatenate([[True], states[1:] != states[:-1]])
+    starts, segment_states = points[:-1][change], states[change]
+    ends = np.concatenate([starts[1:], [t1]])
+
+    return starts[segment_states], ends[segment_states]
+
+def _intersect_intervals(
+    first: tuple[np.ndarray, np.ndarray],
+    second: tuple[np.ndarray, np.ndarray]
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get the intersection of two sets of sorted, disjoint intervals.
+
+    Args:
+        first (tuple): The starts and the ends of the first intervals.
+        second (tuple): The starts and the ends of the second intervals.
+
+    Returns:
+        tuple: The starts and the ends of the intersection.
+    """
+    starts, ends = [], []
+    i = j = 0
+    while i < len(first[0]) and j < len(second[0]):
+        start, end = max(first[0][i], second[0][j]), min(first[1][i], second[1][j])
+        if start < end:
+            starts.append(start)
+            ends.append(end)
+        if first[1][i] < second[1][j]:
+            i += 1
+        else:
+            j += 1
+    return np.array(starts), np.array(ends)
+
+def _get_precision(
+    precision: str,
+    default: str = None
+) -> str:
+    """
+    Get the precision mode of a call, checking it.
+
+    Args:
+        precision (str): The precision mode, as in constants.PRECISIONS.
+        default (str, optional): The precision mode when none is given. Defaults to None.
+
+    Returns:
+        str: The precision mode.
+
+    Raises:
+        ValueError: If the precision mode is unknown.
+    """
+    precision = precision or default
+    if precision not in PRECISIONS:
+        raise ValueError(f'Unknown precision {precision!r}, expected one of {", ".join(PRECISIONS)}')
+
+    return precision
 
 class Ephemeris:
     """
     A class to represent an observer's location, and compute ephemeris.
+
+    The observer and the bodies resolved from the kernel are kept between calls, and an instance can
+    be shared by several threads. Use Ephemeris.for_location to get a pooled instance.
     
     Attributes:
         latitude (float): The latitude of the observer, in decimal notation.
         longitude (float): The longitude of the observer, in decimal notation.
         altitude (float): The altitude of the observer in meters.
         timezone (str): The timezone of the observer.
+        precision (str): The default precision mode of the positions, as in constants.PRECISIONS.
     
     Methods:
-        _load_ephemeris(filename): Load the ephemeris file.
+        for_location(latitude, longitude, altitude, timezone): Get a pooled Ephemeris object for the given location.
+        _load_ephemeris(filename, bodies, t0, t1): Load the ephemeris file, or a subset covering the request.
+        _get_bodies(eph, *names): Get the observer and the given bodies, resolved once per kernel.
         _set_time_range(date): Set the time range for the given date.
-        _compute_position(date, object, eph): Compute the position of the given object on the given date.
+        _get_precision(precision): Get the precision mode of a call, checking it.
+        _compute_altaz(tt, object, precision, eph): Compute the altitudes and azimuths of the given object at the given times.
+        _compute_position(date, object, eph, precision): Compute the position of the given object on the given date.
+        _find_horizon_crossings(eph, object, tt, altitudes): Find the rise and set times bracketed by sampled altitudes.
         get_sunrise_time(date): Get the sunrise time for the given date.
         get_sunset_time(date): Get the sunset time for the given date.
         get_moonrise_time(date): Get the moonrise time for the given date.
@@ -28,12 +379,14 @@ class Ephemeris:
         get_moon_phase(date): Get the moon phase for the given date.
         get_planet_rising_time(date, planet): Get the rise time for the given planet on the given date.
         get_planet_setting_time(date, planet): Get the set time for the given planet on the given date.
+        get_rise_set_times(date, object, path, delta): Get the rise and set times of the given object, reusing its daily path.
         get_twilight_times_events(date): Get the start and end times of civil, nautical, and astronomical twilight for the given date.
-        compute_daily_path(date, object, delta): Compute the daily path of the given object on the given date.
-        compute_current_position(date, object): Compute the current position of the given object on the given date.
+        compute_daily_path(date, object, delta, precision): Compute the daily path of the given object on the given date.
+        compute_current_position(date, object, precision): Compute the current position of the given object on the given date.
         get_seasons(year): Get the seasons for the given date, based on year.
         get_solstices(year): Get the solstices for the given date, based on year.
         get_equinoxes(year): Get the equinoxes for the given date, based on year.
+        daily_report(date, body, now, delta, precision): Compute everything the commands need about a body for one day.
     """
 
     def __init__(
@@ -41,7 +394,8 @@ class Ephemeris:
         latitude: float,
         longitude: float,
         altitude: float,
-        timezone: str = None
+        timezone: str = None,
+        precision: str = 'reference'
     ) -> None:
         """
         Initialize the Ephemeris object.
@@ -50,37 +404,100 @@ class Ephemeris:
             latitude (float): The latitude of the observer.
             longitude (float): The longitude of the observer.
             altitude (float): The altitude of the observer in meters.
-            timezone (str, optional): The timezone of the observer. Defaults to 'UTC'.
+            timezone (str, optional): The timezone of the observer. Defaults to the timezone of the location.
+            precision (str, optional): The default precision mode of the positions, as in constants.PRECISIONS. Defaults to 'reference'.
         """
         self.latitude = latitude
         self.longitude = longitude
         self.altitude = altitude
-        self.timezone = ZoneInfo(timezone) if timezone else ZoneInfo('UTC')
+        self.timezone = ZoneInfo(timezone or timezones.get_timezone(latitude, longitude))
+        self.precision = _get_precision(precision)
 
         # Create an observer object
         self.observer = wgs84.latlon(self.latitude * N, self.longitude * E, elevation_m=self.altitude)
 
+        # The earth + observer sum and the bodies, resolved once per kernel
+        self._lock = threading.Lock()
+        self._bodies = {}
+
+    @classmethod
+    def for_location(
+        cls,
+        latitude: float,
+        longitude: float,
+        altitude: float,
+        timezone: str = None
+    ) -> 'Ephemeris':
+        """
+        Get a pooled Ephemeris object for the given location, creating it if needed, with the precision PLOT_PRECISION.
+
+        Args:
+            latitude (float): The latitude of the observer.
+            longitude (float): The longitude of the observer.
+            altitude (float): The altitude of the observer in meters.
+            timezone (str, optional): The timezone of the observer. Defaults to the timezone of the location.
+
+        Returns:
+            Ephemeris: The shared Ephemeris object of the location.
+        """
+        return pool.get(latitude, longitude, altitude, timezone)
+
     def _load_ephemeris(
         self,
-        filename: str
+        filename: str,
+        bodies: list[str] = None,
+        t0: skyfield.timelib.Time = None,
+        t1: skyfield.timelib.Time = None
     ):
         """
         Load the ephemeris file.
 
+        The kernel is downloaded in the background by the kernel manager, it is never downloaded here.
+        When the bodies and time range are given, a registered subset covering them is used instead.
+
         Args:
             filename (str): The name of the ephemeris file.
+            bodies (list, optional): The bodies needed by the computation.
+            t0 (skyfield.timelib.Time, optional): The start of the time range needed by the computation.
+            t1 (skyfield.timelib.Time, optional): The end of the time range needed by the computation.
 
         Returns:
-            skyfield.api.Loader: The ephemeris object.
+            skyfield.jpllib.SpiceKernel: The ephemeris object.
+
+        Raises:
+            kernels.KernelNotReadyError: If the ephemeris file is not downloaded and verified yet.
         """
-        try:
-            eph = load_file(f'files/{filename}')
-        except FileNotFoundError:
-            loader = Loader('files')
-            eph = loader(filename)
+        start_jd = t0.tt if t0 is not None else None
+        end_jd = t1.tt if t1 is not None else start_jd
+        eph = kernels.manager.load(filename, bodies, start_jd, end_jd)
 
         return eph
 
+    def _get_bodies(
+        self,
+        eph: skyfield.jpllib.SpiceKernel,
+        *names: str
+    ) -> tuple:
+        """
+        Get the observer and the given bodies, resolved once per kernel.
+
+        Args:
+            eph (skyfield.jpllib.SpiceKernel): The ephemeris object.
+            *names (str): The names of the bodies (e.g. 'sun' or 'mars barycenter').
+
+        Returns:
+            tuple: The earth + observer vector sum, followed by the bodies.
+        """
+        with self._lock:
+            bodies = self._bodies.get(eph.path)
+            if bodies is None:
+                bodies = self._bodies[eph.path] = {None: eph['earth'] + self.observer}
+            for name in names:
+                if name not in bodies:
+                    bodies[name] = eph[name]
+
+            return (bodies[None],) + tuple(bodies[name] for name in names)
+
     def _set_time_range(
         self,
         date: datetime.datetime
@@ -94,17 +511,78 @@ class Ephemeris:
         Returns:
             tuple: A tuple containing the start and end times of the time range.
         """
-        ts = load.timescale()
         t0 = ts.from_datetime(date)
         t1 = ts.from_datetime(date + timedelta(days=1))
 
         return t0, t1
 
+    def _get_precision(
+        self,
+        precision: str = None
+    ) -> str:
+        """
+        Get the precision mode of a call, checking it.
+
+        Args:
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
+
+        Returns:
+            str: The precision mode.
+
+        Raises:
+            ValueError: If the precision mode is unknown.
+        """
+        return _get_precision(precision, self.precision)
+
+    def _compute_altaz(
+        self,
+        tt: np.ndarray,
+        sky_object: str,
+        precision: str = None,
+        eph: skyfield.jpllib.SpiceKernel = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the altitudes and azimuths of the given object at the given times, in one vectorized call.
+
+        The reference mode computes apparent positions (light time, aberration and deflection). The
+        fast mode skips the aberration and the deflection, which moves the positions by at most 20.5″.
+        The approximate mode evaluates the cached Chebyshev fits, which is the cheapest once the fits
+        of the day are cached. The maximum errors are listed in constants.PRECISIONS.
+
+        Args:
+            tt (np.ndarray): The TT Julian dates.
+            sky_object (str): The name of the object.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
+            eph (skyfield.jpllib.SpiceKernel, optional): The ephemeris object. Loaded for the times if not given.
+
+        Returns:
+            tuple: The altitudes and azimuths of the object, in degrees.
+        """
+        precision = self._get_precision(precision)
+        tt = np.atleast_1d(np.asarray(tt, dtype=float))
+
+        if precision == 'approximate':
+            return chebyshev.engine.altaz(sky_object, tt, self.latitude, self.longitude, self.altitude)
+
+        # Load  ephemeris
+        if eph is None:
+            eph = self._load_ephemeris('de440s.bsp', ['earth', sky_object], ts.tt_jd(tt.min()), ts.tt_jd(tt.max()))
+
+        observer, obj = self._get_bodies(eph, sky_object)
+        astrometric = observer.at(ts.tt_jd(tt)).observe(obj)
+        if precision == 'fast':
+            alt, az, _ = astrometric.frame_latlon(self.observer)
+        else:
+            alt, az, _ = astrometric.apparent().altaz()
+
+        return alt.degrees, az.degrees
+
     def _compute_position(
         self,
         date: datetime.datetime,
         sky_object: str,
-        eph: skyfield.api.Loader
+        eph: skyfield.api.Loader,
+        precision: str = None
     ) -> tuple[float, float]:
         """
         Compute the position of the given object on the given date.
@@ -113,6 +591,7 @@ class Ephemeris:
             date (datetime.datetime): The date for which to compute the position.
             sky_object (str): The name of the object for which to compute the position.
             eph (skyfield.api.Loader): The ephemeris object.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
 
         Returns:
             tuple: A tuple containing the altitude and azimuth of the object.
@@ -121,14 +600,78 @@ class Ephemeris:
         t0, _ = self._set_time_range(date)
 
         # Compute the position of the object
-        earth, obj = eph['earth'], eph[sky_object]
-        observer = earth + self.observer
-        alt, az, _ = observer.at(t0).observe(obj).apparent().altaz()
-        alt = alt.degrees
-        az = az.degrees
+        alt, az = self._compute_altaz(t0.tt, sky_object, precision, eph)
 
-        #return alt.degrees, az.degrees
-        return alt, az
+        return float(alt[0]), float(az[0])
+
+    def _get_horizon_altitude(
+        self,
+        eph: skyfield.jpllib.SpiceKernel,
+        sky_object: str
+    ) -> float:
+        """
+        Get the altitude of the horizon used to bracket the rise and set times of the given object.
+
+        Args:
+            eph (skyfield.jpllib.SpiceKernel): The ephemeris object.
+            sky_object (str): The name of the object.
+
+        Returns:
+            float: The altitude of the horizon at the mean lunar distance (exact for other bodies), in degrees.
+        """
+        _, target = self._get_bodies(eph, sky_object)
+        return float(np.degrees(almanac.build_horizon_function(target)(Distance(km=384400.0))))
+
+    def _find_horizon_crossings(
+        self,
+        eph: skyfield.jpllib.SpiceKernel,
+        sky_object: str,
+        tt: np.ndarray,
+        altitudes: np.ndarray,
+        iterations: int = 3
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rise and set times bracketed by sampled altitudes of the given object.
+
+        The crossings are bracketed between consecutive samples, interpolated linearly, then refined
+        with a few Newton steps on the apparent altitude and its rate. The horizon is the same as
+        almanac.find_risings and almanac.find_settings (refraction, and radius for the sun and moon).
+
+        Args:
+            eph (skyfield.jpllib.SpiceKernel): The ephemeris object.
+            sky_object (str): The name of the object.
+            tt (np.ndarray): The TT Julian dates of the samples.
+            altitudes (np.ndarray): The altitudes of the object at the samples, in degrees.
+            iterations (int, optional): The number of Newton steps. Defaults to 3.
+
+        Returns:
+            tuple: The TT Julian dates of the risings and of the settings.
+        """
+        tt = np.asarray(tt, dtype=float)
+        altitudes = np.asarray(altitudes, dtype=float)
+        observer, target = self._get_bodies(eph, sky_object)
+        horizon = almanac.build_horizon_function(target)
+
+        # Bracket the crossings with the horizon at the mean lunar distance (exact for other bodies)
+        threshold = self._get_horizon_altitude(eph, sky_object)
+        above = altitudes > threshold
+        i, = np.nonzero(above[:-1] != above[1:])
+        if not len(i):
+            return np.empty(0), np.empty(0)
+
+        is_rising = above[i + 1]
+        fraction = (altitudes[i] - threshold) / (altitudes[i] - altitudes[i + 1])
+        guess = tt[i] + fraction * (tt[i + 1] - tt[i])
+
+        # Refine all the crossings at once with Newton steps, bounded to one sample interval
+        max_step = np.max(np.diff(tt))
+        for _ in range(iterations):
+            apparent = observer.at(ts.tt_jd(guess)).observe(target).apparent()
+            alt, _, distance, alt_rate, _, _ = apparent.frame_latlon_and_rates(self.observer)
+            step = (alt.radians - horizon(distance)) / alt_rate.radians.per_day
+            guess = guess - np.clip(step, -max_step, max_step)
+
+        return guess[is_rising], guess[~is_rising]
 
     def get_sunrise_time(
         self,
@@ -150,11 +693,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, sun = eph['earth'], eph['sun']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, sun = self._get_bodies(eph, 'sun')
 
         # Compute the sunrise time
         sunrise_time, _ = almanac.find_risings(observer, sun, t0, t1)
@@ -188,11 +730,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, sun = eph['earth'], eph['sun']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, sun = self._get_bodies(eph, 'sun')
 
         # Compute the sunset time
         sunset_time, _ = almanac.find_settings(observer, sun, t0, t1)
@@ -226,11 +767,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, moon = eph['earth'], eph['moon']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'moon'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, moon = self._get_bodies(eph, 'moon')
 
         # Compute the moonrise time
         moonrise_time, _ = almanac.find_risings(observer, moon, t0, t1)
@@ -264,11 +804,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, moon = eph['earth'], eph['moon']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'moon'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, moon = self._get_bodies(eph, 'moon')
 
         # Compute the moonset time
         moonset_time, _ = almanac.find_settings(observer, moon, t0, t1)
@@ -302,13 +841,121 @@ class Ephemeris:
         t0, _ = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun', 'moon'], t0)
 
         # Compute the moon phase
         phase = almanac.moon_phase(eph, t0)
 
         return phase.degrees
 
+    def _get_lunation_events(
+        self,
+        lunation: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the principal moon phases of the given lunation, computing them if needed.
+
+        The lunations split the time in spans of a mean synodic month. The phases do not depend on
+        the observer, so they are cached for every location.
+
+        Args:
+            lunation (int): The number of the lunation since the first new moon of 2000.
+
+        Returns:
+            tuple: The TT Julian dates of the phases within the lunation, and the phases
+            (0 new moon, 1 first quarter, 2 full moon, 3 last quarter).
+        """
+        with _lunation_lock:
+            events = _lunation_events.get(lunation)
+            if events is not None:
+                _lunation_events.move_to_end(lunation)
+                return events
+
+        # Find the phases of the whole lunation with a single search
+        t0 = ts.tt_jd(LUNATION_EPOCH + lunation * SYNODIC_MONTH)
+        t1 = ts.tt_jd(LUNATION_EPOCH + (lunation + 1) * SYNODIC_MONTH)
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun', 'moon'], t0, t1)
+        times, phases = almanac.find_discrete(t0, t1, almanac.moon_phases(eph))
+        keep = times.tt < t1.tt
+        events = (times.tt[keep], phases[keep])
+
+        with _lunation_lock:
+            _lunation_events[lunation] = events
+            while len(_lunation_events) > LUNATION_CACHE_SIZE:
+                _lunation_events.popitem(last=False)
+
+        return events
+
+    def get_moon_phase_events(
+        self,
+        date: datetime.datetime,
+        count: int = 4
+    ) -> list[tuple[datetime.datetime, int]]:
+        """
+        Get the next principal moon phases (new moon, first quarter, full moon, last quarter) from the given date.
+
+        Args:
+            date (datetime.datetime): The date from which to search, in the local timezone if naive.
+            count (int, optional): The number of phases. Defaults to 4.
+
+        Returns:
+            list: The times in the local timezone and the phases
+            (0 new moon, 1 first quarter, 2 full moon, 3 last quarter).
+        """
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=self.timezone)
+        start = ts.from_datetime(date).tt
+
+        # Walk the cached lunations until enough phases are found
+        lunation = math.floor((start - LUNATION_EPOCH) / SYNODIC_MONTH)
+        tt, phases = [], []
+        while len(tt) < count:
+            lunation_tt, lunation_phases = self._get_lunation_events(lunation)
+            keep = lunation_tt >= start
+            tt.extend(lunation_tt[keep])
+            phases.extend(lunation_phases[keep])
+            lunation += 1
+
+        times = ts.tt_jd(np.array(tt[:count])).astimezone(self.timezone)
+        return [(time, int(phase)) for time, phase in zip(times, phases[:count])]
+
+    def get_moon_illumination(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime,
+        delta: timedelta = timedelta(hours=1)
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the illuminated fraction and the phase angle of the moon over a date range.
+
+        The geocentric positions of the sun and the moon come from the cached fits of the fast engine.
+
+        Args:
+            start (datetime.datetime): The start of the range, in the local timezone if naive.
+            end (datetime.datetime): The end of the range (included), in the local timezone if naive.
+            delta (timedelta, optional): The time interval between each sample. Defaults to 1 hour.
+
+        Returns:
+            tuple: The TT Julian dates, the illuminated fractions (0 to 1) and the phase angles
+            (sun-moon-earth angle, 0° at full moon) in degrees.
+        """
+        start, end = (
+            date.replace(tzinfo=self.timezone) if date.tzinfo is None else date
+            for date in (start, end)
+        )
+        t0, t1 = ts.from_datetime(start).tt, ts.from_datetime(end).tt
+        tt = np.arange(t0, t1 + 1e-9, delta / timedelta(days=1))
+
+        moon, _ = chebyshev.engine.geocentric('moon', tt)
+        sun, _ = chebyshev.engine.geocentric('sun', tt)
+
+        # Angle between the directions of the sun and of the earth, seen from the moon
+        to_sun, to_earth = sun - moon, -moon
+        cos_angle = np.sum(to_sun * to_earth, axis=0) / (np.linalg.norm(to_sun, axis=0) * np.linalg.norm(to_earth, axis=0))
+        phase_angle = np.arccos(np.clip(cos_angle, -1, 1))
+
+        return tt, (1 + np.cos(phase_angle)) / 2, np.degrees(phase_angle)
+
     def get_planet_rise_time(
         self,
         date: datetime.datetime,
@@ -331,11 +978,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, planet = eph['earth'], eph[f'{planet} barycenter']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', f'{planet} barycenter'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, planet = self._get_bodies(eph, f'{planet} barycenter')
 
         # Compute the rise time
         rise_time, _ = almanac.find_risings(observer, planet, t0, t1)
@@ -371,11 +1017,10 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-        earth, planet = eph['earth'], eph[f'{planet} barycenter']
+        eph = self._load_ephemeris('de440s.bsp', ['earth', f'{planet} barycenter'], t0, t1)
 
-        # Compute the position of the observer
-        observer = earth + self.observer
+        # Get the observer and the body, resolved once per kernel
+        observer, planet = self._get_bodies(eph, f'{planet} barycenter')
 
         # Compute the set time
         set_time, _ = almanac.find_settings(observer, planet, t0, t1)
@@ -389,10 +1034,127 @@ class Ephemeris:
 
         return set_time.time()
 
+    def get_rise_set_times(
+        self,
+        date: datetime.datetime,
+        sky_object: str,
+        path: tuple = None,
+        delta: timedelta = timedelta(minutes=20)
+    ) -> tuple[datetime.time, datetime.time]:
+        """
+        Get the rise and set times of the given object, reusing its daily path.
+
+        The daily path already samples the altitude of the object over the day, so the horizon
+        crossings are bracketed from it and refined, instead of sampling the day again.
+
+        Args:
+            date (datetime.datetime): The date for which to compute the rise and set times.
+            sky_object (str): The name of the object (e.g. 'sun', 'moon' or 'mars barycenter').
+            path (DailyPath, optional): The result of compute_daily_path for the same date and delta. Computed if not given.
+            delta (timedelta, optional): The time interval between each position of the path. Defaults to 20 minutes.
+
+        Returns:
+            tuple: The rise and set times in the local timezone, or None when they do not happen.
+        """
+        # Add timezone information to the date object, and replace the time with midnight
+        date = date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=self.timezone)
+
+        # Create time range
+        t0, t1 = self._set_time_range(date)
+
+        if path is None:
+            path = self.compute_daily_path(date, sky_object, delta, precision='approximate')
+        altitudes = path.altitudes.astype(float)
+        tt = t0.tt + np.arange(len(altitudes)) * (delta / timedelta(days=1))
+
+        # Load  ephemeris
+        eph = self._load_ephemeris('de440s.bsp', ['earth', sky_object], t0, t1)
+
+        return self._select_rise_set(eph, sky_object, t0, t1, tt, altitudes)
+
+    def _select_rise_set(
+        self,
+        eph: skyfield.jpllib.SpiceKernel,
+        sky_object: str,
+        t0: skyfield.timelib.Time,
+        t1: skyfield.timelib.Time,
+        tt: np.ndarray,
+        altitudes: np.ndarray
+    ) -> tuple[datetime.time, datetime.time]:
+        """
+        Select the first rise and set of the day from sampled altitudes of the given object.
+
+        Args:
+            eph (skyfield.jpllib.SpiceKernel): The ephemeris object.
+            sky_object (str): The name of the object.
+            t0 (skyfield.timelib.Time): The start of the day.
+            t1 (skyfield.timelib.Time): The end of the day.
+            tt (np.ndarray): The TT Julian dates of the samples, evenly spaced from t0.
+            altitudes (np.ndarray): The altitudes of the object at the samples, in degrees.
+
+        Returns:
+            tuple: The rise and set times in the local timezone, or None when they do not happen.
+        """
+        step = tt[1] - tt[0]
+
+        # Extend the samples to the end of the day when it lasts more than the path (daylight saving time)
+        if tt[-1] < t1.tt:
+            extra_tt = np.arange(tt[-1] + step, t1.tt + step, step)
+            observer, target = self._get_bodies(eph, sky_object)
+            extra_alt, _, _ = observer.at(ts.tt_jd(extra_tt)).observe(target).apparent().altaz()
+            tt = np.concatenate([tt, extra_tt])
+            altitudes = np.concatenate([altitudes, extra_alt.degrees])
+
+        risings, settings = self._find_horizon_crossings(eph, sky_object, tt, altitudes)
+
+        # Keep the first rise and set of the day, adjusted to the local timezone
+        times = []
+        for crossings in risings, settings:
+            crossings = crossings[(crossings >= t0.tt) & (crossings < t1.tt)]
+            if len(crossings):
+                times.append(ts.tt_jd(crossings[0]).astimezone(self.timezone).time())
+            else:
+                times.append(None)
+
+        return times[0], times[1]
+
+    def _find_transit(
+        self,
+        sky_object: str,
+        tt: np.ndarray,
+        altitudes: np.ndarray
+    ) -> tuple[float, float]:
+        """
+        Find the time and altitude of the highest point of the given object from sampled altitudes.
+
+        The maximum is located with a parabola through the three samples around it, then refined
+        with a second parabola through reference positions two minutes apart, since it is printed.
+
+        Args:
+            sky_object (str): The name of the object.
+            tt (np.ndarray): The TT Julian dates of the samples, evenly spaced.
+            altitudes (np.ndarray): The altitudes of the object at the samples, in degrees.
+
+        Returns:
+            tuple: The TT Julian date and the altitude in degrees of the transit.
+        """
+        i = int(np.clip(np.argmax(altitudes), 1, len(altitudes) - 2))
+        transit, step = tt[i], tt[1] - tt[0]
+        samples = altitudes[i - 1:i + 2]
+        for _ in range(2):
+            a, b, c = samples
+            curvature = a - 2 * b + c
+            offset = 0.5 * (a - c) / curvature if curvature < 0 else 0.0
+            transit = transit + np.clip(offset, -1, 1) * step
+            step = 2 / 1440
+            samples, _ = self._compute_altaz(transit + np.array([-step, 0, step]), sky_object, 'reference')
+
+        return float(transit), float(samples[1])
+
     def get_twilight_times_events(
         self,
         date: datetime.datetime
-    ) -> tuple[list[datetime.time], list[str]]:
+    ) -> TwilightEvents:
         """
         Get the start and end times of civil, nautical, and astronomical twilight for the given date.
 
@@ -400,7 +1162,7 @@ class Ephemeris:
             date (datetime.datetime): The date for which to compute the twilight times.
 
         Returns:
-            tuple: A tuple containing the twilight times and events in the local timezone.
+            TwilightEvents: The twilight times and events, which unpack as (times, events) in the local timezone, or None.
         """
         # Add timezone information to the date object, and replace the time with noon
         date = date.replace(hour=12, minute=0, second=0, microsecond=0, tzinfo=self.timezone)
@@ -409,29 +1171,253 @@ class Ephemeris:
         t0, t1 = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t1)
 
         # Compute the dark twilight times
         f = almanac.dark_twilight_day(eph, self.observer)
         times, twilight_events = almanac.find_discrete(t0, t1, f)
 
-        # Adjust the twilight times to the local timezone
-        if times:
-            twilight_times = []
-            for time in times:
-                time = time.astimezone(self.timezone)
-                twilight_times.append(time.time())
-        else:
+        if not len(times):
             return None
 
-        return twilight_times, twilight_events
+        return TwilightEvents(self.timezone.key, _to_timestamps(times), twilight_events)
+
+    def get_twilight_range(
+        self,
+        start: datetime.datetime,
+        end: datetime.datetime
+    ) -> TwilightRange:
+        """
+        Get the civil, nautical and astronomical twilight transitions over a time range, in one search.
+
+        Args:
+            start (datetime.datetime): The start of the range, in the local timezone if naive.
+            end (datetime.datetime): The end of the range, in the local timezone if naive.
+
+        Returns:
+            TwilightRange: The level at the start of the range and the transitions.
+        """
+        start, end = (
+            date.replace(tzinfo=self.timezone) if date.tzinfo is None else date
+            for date in (start, end)
+        )
+        t0, t1 = ts.from_datetime(start), ts.from_datetime(end)
+
+        # Load  ephemeris
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t1)
+
+        # Find every transition of the range with a single search
+        f = almanac.dark_twilight_day(eph, self.observer)
+        times, levels = almanac.find_discrete(t0, t1, f)
+
+        return TwilightRange(
+            t0=t0.tt,
+            t1=t1.tt,
+            start_level=int(f(t0)),
+            tt=times.tt,
+            levels=np.asarray(levels, dtype=int)
+        )
+
+    def get_dark_windows(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        moonless: bool = False,
+        delta: timedelta = timedelta(minutes=20)
+    ) -> DarkWindows:
+        """
+        Get the astronomical dark windows of the nights between two dates.
+
+        Args:
+            start (datetime.date): The date of the evening of the first night.
+            end (datetime.date): The date of the evening of the last night (included).
+            moonless (bool, optional): Whether to keep only the dark time with the moon below the horizon. Defaults to False.
+            delta (timedelta, optional): The time interval between the moon samples. Defaults to 20 minutes.
+
+        Returns:
+            DarkWindows: The windows of each night.
+        """
+        nights = [start + timedelta(days=day) for day in range((end - start).days + 1)]
+        noons = [datetime.datetime(night.year, night.month, night.day, 12, tzinfo=self.timezone) for night in nights]
+        noons.append(noons[-1] + timedelta(days=1))
+        bounds = ts.from_datetimes(noons).tt
+
+        twilight = self.get_twilight_range(noons[0], noons[-1])
+        windows = twilight.intervals(max_level=0)
+
+        if moonless:
+            # Sample the moon over the whole range, and refine all its crossings at once
+            eph = self._load_ephemeris('de440s.bsp', ['earth', 'moon'], ts.tt_jd(bounds[0]), ts.tt_jd(bounds[-1]))
+            step = delta / timedelta(days=1)
+            tt = np.arange(bounds[0], bounds[-1] + step, step)
+            altitudes, _ = chebyshev.engine.altaz('moon', tt, self.latitude, self.longitude, self.altitude)
+            risings, settings = self._find_horizon_crossings(eph, 'moon', tt, altitudes)
+
+            crossings = np.concatenate([risings, settings])
+            order = np.argsort(crossings)
+            is_setting = np.concatenate([np.zeros(len(risings), dtype=bool), np.ones(len(settings), dtype=bool)])[order]
+            below_at_start = (not is_setting[0]) if len(crossings) else altitudes[0] < 0
+            keep = (crossings[order] > bounds[0]) & (crossings[order] < bounds[-1])
+            moon_down = _state_intervals(bounds[0], bounds[-1], crossings[order][keep], is_setting[keep], below_at_start)
+            windows = _intersect_intervals(windows, moon_down)
+
+        # Split the windows at the noons, so that each one belongs to a single night
+        starts, ends = windows
+        cuts = np.sort(np.concatenate([starts, ends, bounds[1:-1]]))
+        middles = (cuts[:-1] + cuts[1:]) / 2
+        inside = np.searchsorted(starts, middles, side='right') - 1
+        inside = (inside >= 0) & (middles < ends[np.maximum(inside, 0)]) if len(starts) else np.zeros(len(middles), dtype=bool)
+        inside &= cuts[1:] > cuts[:-1]
+        starts, ends = cuts[:-1][inside], cuts[1:][inside]
+        night_index = np.searchsorted(bounds, starts, side='right') - 1
+
+        return DarkWindows(
+            nights=nights,
+            night_index=night_index,
+            start=starts,
+            end=ends,
+            durations=np.bincount(night_index, weights=(ends - starts) * 24, minlength=len(nights))
+        )
+
+    def get_observing_windows(
+        self,
+        date: datetime.date,
+        sun_altitude: float = -12.0,
+        min_altitude: float = 15.0,
+        bodies: list[str] = None,
+        delta: timedelta = timedelta(minutes=5)
+    ) -> list[ObservingWindow]:
+        """
+        Get the windows when the bodies can be observed during a night, best first.
+
+        A body can be observed while the sun is below the given altitude and the body is above the
+        minimum altitude. The altitudes of the sun and of every body are computed on one shared
+        time grid in a single vectorized call, and the edges of the windows are interpolated
+        between the samples.
+
+        Args:
+            date (datetime.date): The date of the evening of the night (local noon to noon).
+            sun_altitude (float, optional): The highest altitude of the sun, in degrees. Defaults to -12 (nautical twilight).
+            min_altitude (float, optional): The lowest altitude of the bodies, in degrees. Defaults to 15.
+            bodies (list, optional): The names of the bodies, as in constants.BODIES. Defaults to every body but the sun.
+            delta (timedelta, optional): The time interval between each sample. Defaults to 5 minutes.
+
+        Returns:
+            list: The observing windows, sorted by decreasing peak altitude.
+        """
+        bodies = [body for body in BODIES if body != 'sun'] if bodies is None else list(bodies)
+        noon = datetime.datetime(date.year, date.month, date.day, 12, tzinfo=self.timezone)
+        t0, t1 = ts.from_datetimes([noon, noon + timedelta(days=1)]).tt
+
+        # Sample the sun and every body on the same grid at once
+        step = delta / timedelta(days=1)
+        tt = np.linspace(t0, t1, round((t1 - t0) / step) + 1)
+        step = tt[1] - tt[0]
+        sky_objects = [get_sky_object(body) for body in ['sun', *bodies]]
+        altitudes, azimuths = chebyshev.engine.altaz_many(sky_objects, tt, self.latitude, self.longitude, self.altitude)
+
+        # The margin is positive while the sun is low enough and the body high enough
+        margin = np.minimum(sun_altitude - altitudes[0], altitudes[1:] - min_altitude)
+        altitudes, azimuths = altitudes[1:], azimuths[1:]
+
+        # Find the first and last visible sample of every window of every body
+        changes = np.diff(np.pad(margin > 0, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+        rows, first = np.nonzero(changes == 1)
+        _, last = np.nonzero(changes == -1)
+        last -= 1
+
+        # Interpolate the edges where the margin crosses zero, unless the window is cut by the night
+        # (the discarded branch of np.where divides by zero at the edges of the night)
+        before, after = np.maximum(first - 1, 0), np.minimum(last + 1, len(tt) - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            starts = np.where(first > 0, tt[before] + step * margin[rows, before] / (margin[rows, before] - margin[rows, first]), tt[first])
+            ends = np.where(last < len(tt) - 1, tt[last] + step * margin[rows, last] / (margin[rows, last] - margin[rows, after]), tt[last])
+
+        peaks = np.array([
+            first_sample + np.argmax(altitudes[row, first_sample:last_sample + 1])
+            for row, first_sample, last_sample in zip(rows, first, last)
+        ], dtype=int)
+        if not len(peaks):
+            return []
+
+        # Convert every time to the local timezone in one call
+        times = ts.tt_jd(np.concatenate([starts, ends, tt[peaks]])).astimezone(self.timezone)
+        count = len(rows)
+
+        windows = [
+            ObservingWindow(
+                body=bodies[row],
+                start=times[index],
+                end=times[count + index],
+                peak_time=times[2 * count + index],
+                peak_altitude=float(altitudes[row, peak]),
+                peak_azimuth=float(azimuths[row, peak])
+            )
+            for index, (row, peak) in enumerate(zip(rows, peaks))
+        ]
+        windows.sort(key=lambda window: window.peak_altitude, reverse=True)
+
+        return windows
+
+    def _sample_path(
+        self,
+        t0: skyfield.timelib.Time,
+        sky_object: str,
+        delta: timedelta,
+        precision: str = 'approximate'
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sample the daily path of the given object, by default with the Chebyshev engine.
+
+        Args:
+            t0 (skyfield.timelib.Time): The start of the day.
+            sky_object (str): The name of the object.
+            delta (timedelta): The time interval between each position.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to 'approximate'.
+
+        Returns:
+            tuple: The TT Julian dates, altitudes and azimuths of the samples.
+        """
+        # Compute all the samples at once
+        tt = t0.tt + np.arange(24 * 3 + 1) * (delta / timedelta(days=1))
+        alt, az = self._compute_altaz(tt, sky_object, precision)
+
+        return tt, alt, az
+
+    def _pack_path(
+        self,
+        t0: skyfield.timelib.Time,
+        delta: timedelta,
+        alt: np.ndarray,
+        az: np.ndarray
+    ) -> DailyPath:
+        """
+        Pack sampled altitudes and azimuths into the daily path of compute_daily_path.
+
+        Args:
+            t0 (skyfield.timelib.Time): The start of the day.
+            delta (timedelta): The time interval between each position.
+            alt (np.ndarray): The altitudes of the samples, in degrees.
+            az (np.ndarray): The azimuths of the samples, in degrees.
+
+        Returns:
+            DailyPath: The daily path, with a marker every hour (every third sample).
+        """
+        return DailyPath(
+            start=t0.utc_datetime().timestamp(),
+            step=delta.total_seconds(),
+            timezone=self.timezone.key,
+            samples=np.stack([alt, az]),
+            hours=np.arange(0, len(alt), 3)
+        )
 
     def compute_daily_path(
         self,
         date: datetime.datetime,
         sky_object: str,
-        delta: timedelta = timedelta(minutes=20)
-    ) -> tuple[list[float], list[float], dict]:
+        delta: timedelta = timedelta(minutes=20),
+        precision: str = None
+    ) -> DailyPath:
         """
         Compute the daily path of the given object on the given date.
 
@@ -439,9 +1425,10 @@ class Ephemeris:
             sky_object (str): The name of the object for which to compute the path.
             date (datetime.datetime): The date for which to compute the path.
             delta (timedelta, optional): The time interval between each position. Defaults to 20 minutes.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
 
         Returns:
-            tuple: A tuple containing the altitudes, azimuths, and altaz for peak hours of the object.
+            DailyPath: The daily path, which unpacks as (altitudes, azimuths, peak_hours_altaz).
         """
         # Add timezone information to the date object, and replace the time with midnight
         date = date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=self.timezone)
@@ -449,28 +1436,16 @@ class Ephemeris:
         # Create the time object for the given date
         t0, _ = self._set_time_range(date)
 
-        # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
-
         # Compute the position of the object at each interval
-        altitudes, azimuths = [], []
-        peak_hours_altaz = {}
-        for interval in range(24 * 3 + 1):
-            t = t0 + delta * interval
-            alt, az = self._compute_position(t.astimezone(self.timezone), sky_object, eph)
-            altitudes.append(round(alt, 2))
-            azimuths.append(round(az, 2))
-
-            # Store the position of the object every hour
-            if interval % 3 == 0:
-                peak_hours_altaz[t.astimezone(self.timezone).time()] = (round(alt, 2), round(az, 2))
+        _, alt, az = self._sample_path(t0, sky_object, delta, self._get_precision(precision))
 
-        return altitudes, azimuths, peak_hours_altaz
+        return self._pack_path(t0, delta, alt, az)
 
     def compute_current_position(
         self,
         date: datetime.datetime,
-        sky_object: str
+        sky_object: str,
+        precision: str = None
     ) -> tuple[float, float]:
         """
         Compute the current position of the given object on the given date.
@@ -478,6 +1453,7 @@ class Ephemeris:
         Args:
             date (datetime.datetime): The date for which to compute the position.
             sky_object (str): The name of the object for which to compute the position.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
 
         Returns:
             tuple: A tuple containing the altitude and azimuth of the object.
@@ -485,18 +1461,93 @@ class Ephemeris:
         # Add timezone information to the date object
         date = date.replace(tzinfo=self.timezone)
 
+        # Create the time object for the given date
+        t0, _ = self._set_time_range(date)
+
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', sky_object], t0)
 
         # Compute the current position of the object
-        alt, az = self._compute_position(date, sky_object, eph)
+        alt, az = self._compute_position(date, sky_object, eph, precision)
 
         return alt, az
 
+    def get_sky_positions(
+        self,
+        now: datetime.datetime,
+        bodies: list[str] = None,
+        trail: timedelta = timedelta(0),
+        delta: timedelta = timedelta(minutes=10)
+    ) -> SkyPositions:
+        """
+        Compute the positions of several bodies, and optionally their trails, in one vectorized call.
+
+        Args:
+            now (datetime.datetime): The time of the current positions.
+            bodies (list, optional): The names of the bodies, as in constants.BODIES. Defaults to every body.
+            trail (timedelta, optional): The time covered by the trails before `now`. Defaults to no trail.
+            delta (timedelta, optional): The time interval between the samples of the trails. Defaults to 10 minutes.
+
+        Returns:
+            SkyPositions: The positions of the bodies on a shared time grid ending at `now`.
+        """
+        bodies = list(BODIES) if bodies is None else list(bodies)
+        now = now.replace(tzinfo=self.timezone) if now.tzinfo is None else now.astimezone(self.timezone)
+
+        # Shared time grid, from the start of the trails to now
+        samples = int(trail / delta)
+        tt = ts.from_datetime(now).tt - np.arange(samples, -1, -1) * (delta / timedelta(days=1))
+
+        sky_objects = [get_sky_object(body) for body in bodies]
+        altitudes, azimuths = chebyshev.engine.altaz_many(sky_objects, tt, self.latitude, self.longitude, self.altitude)
+
+        return SkyPositions(now=now, bodies=bodies, tt=tt, altitudes=altitudes, azimuths=azimuths)
+
+    def compute_timelapse(
+        self,
+        date: datetime.datetime,
+        sky_object: str,
+        frames: int,
+        delta: timedelta = timedelta(minutes=20)
+    ) -> tuple[list[datetime.datetime], np.ndarray, np.ndarray]:
+        """
+        Compute the positions of the frames of an animated daily path, with the Chebyshev engine.
+
+        The frames are spread evenly over the time the object spends above the horizon (over the
+        whole day if it never rises), and all their positions are computed in one vectorized call.
+
+        Args:
+            date (datetime.datetime): The date of the path.
+            sky_object (str): The name of the object.
+            frames (int): The number of frames.
+            delta (timedelta, optional): The time interval of the samples locating the horizon. Defaults to 20 minutes.
+
+        Returns:
+            tuple: The local times, altitudes and azimuths of the frames.
+        """
+        # Add timezone information to the date object, and replace the time with midnight
+        date = date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=self.timezone)
+        t0, _ = self._set_time_range(date)
+
+        # Keep the intervals between samples where the object is above the horizon
+        tt, alt, _ = self._sample_path(t0, sky_object, delta)
+        above = (alt[:-1] >= 0) | (alt[1:] >= 0)
+        if not above.any():
+            above[:] = True
+
+        # Spread the frames evenly over the kept intervals (at the middle of equal shares), skipping the others
+        kept = np.concatenate([[0], np.cumsum(above)])
+        targets = (np.arange(frames) + 0.5) * kept[-1] / frames
+        interval = np.searchsorted(kept, targets, side='right') - 1
+        tt = tt[interval] + (targets - kept[interval]) * (tt[1] - tt[0])
+        alt, az = chebyshev.engine.altaz(sky_object, tt, self.latitude, self.longitude, self.altitude)
+
+        return list(ts.tt_jd(tt).astimezone(self.timezone)), alt, az
+
     def get_seasons(
         self,
         year: int
-    ) -> tuple[list[datetime.datetime], list[str]]:
+    ) -> SeasonEvents:
         """
         Get the seasons for the given date, based on year.
 
@@ -504,7 +1555,7 @@ class Ephemeris:
             year (int): The year for which to compute the seasons.
 
         Returns:
-            tuple: A tuple containing the seasons in the local timezone.
+            SeasonEvents: The starts of the seasons, which unpack as (dates, names) in the local timezone.
         """
         # Add timezone information to the date object
         date = datetime.datetime(year=year, month=1, day=1, tzinfo=self.timezone)
@@ -513,18 +1564,12 @@ class Ephemeris:
         t0, _ = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t0 + timedelta(days=365))
 
         # Compute the seasons
-        seasons = almanac.find_discrete(t0, t0 + timedelta(days=365), almanac.seasons(eph))
-
-        # Adjust the seasons to the local timezone
-        seasons_date = [s.astimezone(self.timezone) for s in seasons[0]]
+        times, seasons = almanac.find_discrete(t0, t0 + timedelta(days=365), almanac.seasons(eph))
 
-        # Set the names of the seasons
-        seasons_name = ['spring', 'summer', 'autumn', 'winter']
-
-        return seasons_date, seasons_name
+        return SeasonEvents(self.timezone.key, _to_timestamps(times), seasons)
 
     def get_solstices(
         self,
@@ -546,7 +1591,7 @@ class Ephemeris:
         t0, _ = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t0 + timedelta(days=365))
 
         # Compute the solstices
         solstices = almanac.find_discrete(t0, t0 + timedelta(days=365), almanac.seasons(eph))
@@ -576,7 +1621,7 @@ class Ephemeris:
         t0, _ = self._set_time_range(date)
 
         # Load  ephemeris
-        eph = self._load_ephemeris('de440s.bsp')
+        eph = self._load_ephemeris('de440s.bsp', ['earth', 'sun'], t0, t0 + timedelta(days=365))
 
         # Compute the equinoxes
         equinoxes = almanac.find_discrete(t0, t0 + timedelta(days=365), almanac.seasons(eph))
@@ -585,3 +1630,440 @@ class Ephemeris:
         equinoxes = [e.astimezone(self.timezone) for e in equinoxes[0]]
 
         return equinoxes[0], equinoxes[2] # 0 = vernal equinox, 2 = autumnal equinox
+
+    def daily_report(
+        self,
+        date: datetime.datetime,
+        body: str,
+        now: datetime.datetime = None,
+        delta: timedelta = timedelta(minutes=20),
+        precision: str = None,
+        plot: bool = True
+    ) -> DailyReport:
+        """
+        Compute everything the commands need about a body for one day, in a single pass.
+
+        The daily path is sampled once, and the same samples bracket the rise, set and transit
+        times. The paths and the current position are only plotted, so they use the given precision,
+        while the printed times and altitude are always refined with reference positions. The time
+        range, the kernel and the observer are shared by every step.
+
+        Args:
+            date (datetime.datetime): The date of the report.
+            body (str): The name of the body, as in constants.BODIES (e.g. 'sun' or 'mars').
+            now (datetime.datetime, optional): The time of the current position. Defaults to `date`.
+            delta (timedelta, optional): The time interval between each position. Defaults to 20 minutes.
+            precision (str, optional): The precision mode of the plotted positions, as in constants.PRECISIONS. Defaults to the precision of the object.
+            plot (bool, optional): Whether the report will be plotted. The solstice paths are only computed for the plots. Defaults to True.
+
+        Returns:
+            DailyReport: The report of the body for the given date.
+
+        Raises:
+            ValueError: If the precision mode is unknown.
+        """
+        precision = self._get_precision(precision)
+        sky_object = get_sky_object(body)
+        now = now or date
+        now = now.replace(tzinfo=self.timezone) if now.tzinfo is None else now.astimezone(self.timezone)
+
+        # Add timezone information to the date object, and replace the time with midnight
+        date = date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=self.timezone)
+
+        # Create time range
+        t0, t1 = self._set_time_range(date)
+
+        # Load  ephemeris
+        eph = self._load_ephemeris('de440s.bsp', ['earth', sky_object], t0, t1)
+
+        # Sample the daily path once, and derive the rise, set and transit from the same samples
+        tt, alt, az = self._sample_path(t0, sky_object, delta, precision)
+        path = self._pack_path(t0, delta, alt, az)
+        rise_time, set_time = self._select_rise_set(eph, sky_object, t0, t1, tt, alt)
+        transit_tt, transit_altitude = self._find_transit(sky_object, tt, alt)
+
+        # Compute the current position of the body
+        current_alt, current_az = self._compute_altaz(ts.from_datetime(now).tt, sky_object, precision)
+
+        report = DailyReport(
+            body=body,
+            date=date.date(),
+            now=now,
+            rise_time=rise_time,
+            set_time=set_time,
+            transit_time=ts.tt_jd(transit_tt).astimezone(self.timezone).time(),
+            transit_altitude=transit_altitude,
+            path=path,
+            current_altitude=float(current_alt[0]),
+            current_azimuth=float(current_az[0])
+        )
+
+        if body == 'sun':
+            report.twilight = self.get_twilight_times_events(date)
+            if plot:
+                summer_solstice, winter_solstice = self.get_solstices(date.year)
+                report.solstice_paths = {
+                    'summer': self.compute_daily_path(summer_solstice, sky_object, delta, precision),
+                    'winter': self.compute_daily_path(winter_solstice, sky_object, delta, precision),
+                }
+        elif body == 'moon':
+            report.moon_phase = self.get_moon_phase(date)
+            report.moon_phase_events = self.get_moon_phase_events(now)
+            _, illumination, _ = self.get_moon_illumination(now, now)
+            report.moon_illumination = float(illumination[0])
+
+        return report
+
+    def monthly_calendar(
+        self,
+        year: int,
+        month: int,
+        body: str,
+        delta: timedelta = timedelta(minutes=20)
+    ) -> MonthCalendar:
+        """
+        Compute the rise and set times, the time above the horizon and the moon phase of every day of a month.
+
+        The whole month is computed in one pass: the altitudes are sampled once on a single time
+        grid with the fast engine, all the horizon crossings are refined together, then assigned to
+        their local day. The moon phases of every day are computed in one vectorized call.
+
+        Args:
+            year (int): The year of the month.
+            month (int): The month.
+            body (str): The name of the body, as in constants.BODIES (e.g. 'sun' or 'mars').
+            delta (timedelta, optional): The time interval between each sample. Defaults to 20 minutes.
+
+        Returns:
+            MonthCalendar: The calendar of the body for the given month.
+        """
+        sky_object = get_sky_object(body)
+        days = calendar.monthrange(year, month)[1]
+
+        # Local midnights bounding each day, which may last 23 or 25 hours (daylight saving time)
+        first_day = datetime.datetime(year, month, 1, tzinfo=self.timezone)
+        midnights = [first_day + timedelta(days=day) for day in range(days + 1)]
+        bounds = ts.from_datetimes(midnights).tt
+        t0, t1 = ts.tt_jd(bounds[0]), ts.tt_jd(bounds[-1])
+
+        # Load  ephemeris
+        eph = self._load_ephemeris('de440s.bsp', list(dict.fromkeys(['earth', 'sun', 'moon', sky_object])), t0, t1)
+
+        # Sample the whole month once, and refine every horizon crossing at once
+        step = delta / timedelta(days=1)
+        tt = np.arange(bounds[0], bounds[-1] + step, step)
+        altitudes, _ = chebyshev.engine.altaz(sky_object, tt, self.latitude, self.longitude, self.altitude)
+        risings, settings = self._find_horizon_crossings(eph, sky_object, tt, altitudes)
+        risings = risings[(risings >= bounds[0]) & (risings < bounds[-1])]
+        settings = settings[(settings >= bounds[0]) & (settings < bounds[-1])]
+
+        # Keep the first rise and set of each day, converted to local times in one call
+        first_times = []
+        for crossings in risings, settings:
+            day_index = np.searchsorted(bounds, crossings, side='right') - 1
+            day_index, first = np.unique(day_index, return_index=True)
+            times = [None] * days
+            if len(first):
+                for index, time in zip(day_index, ts.tt_jd(crossings[first]).astimezone(self.timezone)):
+                    times[index] = time.time()
+            first_times.append(times)
+
+        # Integrate the time above the horizon, piecewise between the crossings, over each day
+        crossings = np.concatenate([risings, settings])
+        order = np.argsort(crossings)
+        crossings = crossings[order]
+        is_rising = np.concatenate([np.ones(len(risings)), np.zeros(len(settings))])[order]
+        above_at_start = (not is_rising[0]) if len(crossings) else altitudes[0] > self._get_horizon_altitude(eph, sky_object)
+        points = np.concatenate([[bounds[0]], crossings, [bounds[-1]]])
+        above = np.concatenate([[float(above_at_start)], is_rising])
+        time_above = np.concatenate([[0.0], np.cumsum(np.diff(points) * above)])
+        durations = np.diff(np.interp(bounds, points, time_above))
+
+        # Compute the moon phase at local noon of every day at once
+        noons = ts.from_datetimes([midnight.replace(hour=12) for midnight in midnights[:-1]])
+        moon_phases = almanac.moon_phase(eph, noons).degrees
+
+        return MonthCalendar(
+            body=body,
+            year=year,
+            month=month,
+            dates=[midnight.date() for midnight in midnights[:-1]],
+            rise_times=first_times[0],
+            set_times=first_times[1],
+            durations=[timedelta(days=float(duration)) for duration in durations],
+            moon_phases=[float(phase) for phase in moon_phases]
+        )
+
+class Observers:
+    """
+    A class to represent several observers at once, and compute their ephemeris in vectorized calls.
+
+    Where an Ephemeris object is bound to one observer, an Observers object holds arrays of
+    locations. The positions of every observer are computed on a shared grid of time offsets in one
+    call, and the horizon crossings of every observer are bracketed and refined together, so that
+    comparing many locations costs about one computation.
+
+    Attributes:
+        latitudes (np.ndarray): The latitudes of the observers, in decimal notation.
+        longitudes (np.ndarray): The longitudes of the observers, in decimal notation.
+        altitudes (np.ndarray): The altitudes of the observers in meters.
+        timezones (list): The timezone of each observer.
+        precision (str): The default precision mode of the positions, as in constants.PRECISIONS.
+
+    Methods:
+        compute_altaz(tt, object, precision): Compute the altitudes and azimuths of the given object for every observer.
+        get_rise_set_times(date, object, delta): Get the rise and set times of the given object for every observer.
+    """
+
+    def __init__(
+        self,
+        latitudes: list[float],
+        longitudes: list[float],
+        altitudes: list[float] = None,
+        timezone_names: list[str] = None,
+        precision: str = 'reference'
+    ) -> None:
+        """
+        Initialize the Observers object.
+
+        Args:
+            latitudes (list): The latitudes of the observers.
+            longitudes (list): The longitudes of the observers.
+            altitudes (list, optional): The altitudes of the observers in meters. Defaults to 0.
+            timezone_names (list, optional): The timezones of the observers. Defaults to the timezone of each location.
+            precision (str, optional): The default precision mode of the positions, as in constants.PRECISIONS. Defaults to 'reference'.
+        """
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.altitudes = np.zeros(len(self.latitudes)) if altitudes is None else np.asarray(altitudes, dtype=float)
+        if timezone_names is None:
+            timezone_names = [timezones.get_timezone(latitude, longitude) for latitude, longitude in zip(self.latitudes, self.longitudes)]
+        self.timezones = [ZoneInfo(name) for name in timezone_names]
+        self.precision = _get_precision(precision)
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self.latitudes)
+
+    def _get_observers(
+        self,
+        rows: np.ndarray
+    ):
+        """
+        Get the observers of the given rows, one per element.
+
+        Args:
+            rows (np.ndarray): The index of the observer of each element.
+
+        Returns:
+            skyfield.toposlib.GeographicPosition: The observers, as one vector position.
+        """
+        return wgs84.latlon(self.latitudes[rows] * N, self.longitudes[rows] * E, elevation_m=self.altitudes[rows])
+
+    def compute_altaz(
+        self,
+        tt: np.ndarray,
+        sky_object: str,
+        precision: str = None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the altitudes and azimuths of the given object for every observer, in one vectorized call.
+
+        The precision modes are the ones of Ephemeris._compute_altaz. The approximate mode evaluates
+        the cached Chebyshev fits for every observer at once, the other modes compute the positions
+        of every observer and time as one skyfield vector.
+
+        Args:
+            tt (np.ndarray): The TT Julian dates, shared by every observer (times,) or per observer (observers, times).
+            sky_object (str): The name of the object.
+            precision (str, optional): The precision mode, as in constants.PRECISIONS. Defaults to the precision of the object.
+
+        Returns:
+            tuple: The altitudes and azimuths of the object, in degrees, with shape (observers, times).
+        """
+        precision = _get_precision(precision, self.precision)
+        tt = np.asarray(tt, dtype=float)
+        tt = np.broadcast_to(tt, (len(self), tt.shape[-1]))
+
+        if precision == 'approximate':
+            alt, az = chebyshev.engine.altaz_observers([sky_object], tt, self.latitudes, self.longitudes, self.altitudes)
+            return alt[0], az[0]
+
+        # Flatten the observers and the times into one vector of positions
+        rows = np.repeat(np.arange(len(self)), tt.shape[1])
+        eph = kernels.manager.load('de440s.bsp', ['earth', sky_object], tt.min(), tt.max())
+        observers = self._get_observers(rows)
+        astrometric = (eph['earth'] + observers).at(ts.tt_jd(tt.ravel())).observe(eph[sky_object])
+        if precision == 'fast':
+            alt, az, _ = astrometric.frame_latlon(observers)
+        else:
+            alt, az, _ = astrometric.apparent().altaz()
+
+        return alt.degrees.reshape(tt.shape), az.degrees.reshape(tt.shape)
+
+    def _find_horizon_crossings(
+        self,
+        sky_object: str,
+        tt: np.ndarray,
+        altitudes: np.ndarray,
+        iterations: int = 3
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the rise and set times bracketed by sampled altitudes of the given object, for every observer.
+
+        The crossings of every observer are bracketed and interpolated like in
+        Ephemeris._find_horizon_crossings, then refined together with the same Newton steps.
+
+        Args:
+            sky_object (str): The name of the object.
+            tt (np.ndarray): The TT Julian dates of the samples, with shape (observers, times).
+            altitudes (np.ndarray): The altitudes of the object at the samples, in degrees, with the same shape.
+            iterations (int, optional): The number of Newton steps. Defaults to 3.
+
+        Returns:
+            tuple: The index of the observer, the TT Julian date and whether it is a rising, of each crossing.
+        """
+        eph = kernels.manager.load('de440s.bsp', ['earth', sky_object], tt.min(), tt.max())
+        target = eph[sky_object]
+        horizon = almanac.build_horizon_function(target)
+
+        # Bracket the crossings with the horizon at the mean lunar distance (exact for other bodies)
+        limit = np.degrees(horizon(Distance(km=384400.0)))
+        above = altitudes > limit
+        rows, i = np.nonzero(above[:, :-1] != above[:, 1:])
+        if not len(rows):
+            return rows, np.empty(0), np.empty(0, dtype=bool)
+
+        is_rising = above[rows, i + 1]
+        fraction = (altitudes[rows, i] - limit) / (altitudes[rows, i] - altitudes[rows, i + 1])
+        guess = tt[rows, i] + fraction * (tt[rows, i + 1] - tt[rows, i])
+
+        # Refine the crossings of every observer at once, bounded to one sample interval
+        max_step = np.max(np.diff(tt, axis=1))
+        observers = self._get_observers(rows)
+        observer = eph['earth'] + observers
+        for _ in range(iterations):
+            apparent = observer.at(ts.tt_jd(guess)).observe(target).apparent()
+            alt, _, distance, alt_rate, _, _ = apparent.frame_latlon_and_rates(observers)
+            step = (alt.radians - horizon(distance)) / alt_rate.radians.per_day
+            guess = guess - np.clip(step, -max_step, max_step)
+
+        return rows, guess, is_rising
+
+    def get_rise_set_times(
+        self,
+        date: datetime.date,
+        sky_object: str,
+        delta: timedelta = timedelta(minutes=20)
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Get the first rise and set times of the given object during the local day of every observer.
+
+        The local days are sampled on a shared grid of offsets from the local midnight of each
+        observer, with the approximate precision, then the crossings are refined with the reference
+        precision, like Ephemeris.get_rise_set_times.
+
+        Args:
+            date (datetime.date): The local date.
+            sky_object (str): The name of the object (e.g. 'sun', 'moon' or 'mars barycenter').
+            delta (timedelta, optional): The time interval between each sample. Defaults to 20 minutes.
+
+        Returns:
+            tuple: The rise and set times of every observer in its local timezone (datetime.time), or None when they do not happen.
+        """
+        day = datetime.date(date.year, date.month, date.day)
+        t0 = ts.from_datetimes([datetime.datetime.combine(day, datetime.time(), zone) for zone in self.timezones]).tt
+        t1 = ts.from_datetimes([datetime.datetime.combine(day + timedelta(days=1), datetime.time(), zone) for zone in self.timezones]).tt
+
+        # One grid of offsets long enough for the longest local day (daylight saving time)
+        step = delta / timedelta(days=1)
+        tt = t0[:, None] + np.arange(int(np.ceil(np.max(t1 - t0) / step)) + 1) * step
+        altitudes, _ = self.compute_altaz(tt, sky_object, 'approximate')
+
+        rows, crossings, is_rising = self._find_horizon_crossings(sky_object, tt, altitudes)
+
+        # Keep the first rise and set of each local day
+        inside = (crossings >= t0[rows]) & (crossings < t1[rows])
+        firsts = []
+        for kind in is_rising, ~is_rising:
+            first = np.full(len(self), np.nan)
+            np.fmin.at(first, rows[inside & kind], crossings[inside & kind])
+            firsts.append(first)
+
+        # Convert every time to UTC in one call, then to the timezone of each observer
+        times = np.stack(firsts)
+        utc = ts.tt_jd(np.nan_to_num(times, nan=t0[0]).ravel()).utc_datetime()
+        results = np.empty(times.shape, dtype=object)
+        for (kind, row), value in zip(np.ndindex(times.shape), utc):
+            if not np.isnan(times[kind, row]):
+                results[kind, row] = value.astimezone(self.timezones[row]).time()
+
+        return results[0], results[1]
+
+class EphemerisPool:
+    """
+    A class to keep a bounded number of Ephemeris objects, reused by location and timezone.
+
+    The least recently used location is dropped when the pool is full. The pooled objects serve the
+    commands, whose positions are only plotted, so their default precision is PLOT_PRECISION.
+
+    Attributes:
+        size (int): The maximum number of Ephemeris objects kept.
+
+    Methods:
+        get(latitude, longitude, altitude, timezone): Get the Ephemeris object of the given location.
+    """
+
+    def __init__(
+        self,
+        size: int = POOL_SIZE
+    ) -> None:
+        """
+        Initialize the EphemerisPool object.
+
+        Args:
+            size (int, optional): The maximum number of Ephemeris objects kept. Defaults to POOL_SIZE.
+        """
+        self.size = size
+        self._lock = threading.Lock()
+        self._ephemerides = OrderedDict()
+
+    def __len__(
+        self
+    ) -> int:
+        return len(self._ephemerides)
+
+    def get(
+        self,
+        latitude: float,
+        longitude: float,
+        altitude: float,
+        timezone: str = None
+    ) -> Ephemeris:
+        """
+        Get the Ephemeris object of the given location, creating it if needed.
+
+        Args:
+            latitude (float): The latitude of the observer.
+            longitude (float): The longitude of the observer.
+            altitude (float): The altitude of the observer in meters.
+            timezone (str, optional): The timezone of the observer. Defaults to the timezone of the location.
+
+        Returns:
+            Ephemeris: The shared Ephemeris object of the location.
+        """
+        key = (round(latitude, 6), round(longitude, 6), round(altitude, 1), timezone)
+        with self._lock:
+            eph = self._ephemerides.get(key)
+            if eph is not None:
+                self._ephemerides.move_to_end(key)
+                return eph
+
+            eph = self._ephemerides[key] = Ephemeris(latitude, longitude, altitude, timezone, PLOT_PRECISION)
+            while len(self._ephemerides) > self.size:
+                self._ephemerides.popitem(last=False)
+
+        return eph
+
+pool = EphemerisPool()
@@ -0,0 +1,183 @@
+"""
+This module contains the settings of each guild of AstroBot.
+
+The settings are a small JSON object per guild (for example whether the commands answer with text
+only), stored in one file of the data directory, shared by the bot processes of the host. The file is
+read again whenever another process replaced it, and every change re-reads and rewrites it
+atomically under an exclusive lock of a companion lock file, so a change of one process never
+erases the ones of the others and a crash never leaves it half written.
+
+Attributes:
+    settings (GuildSettings): The settings shared by the commands.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from constants import GUILD_SETTINGS
+import kernels
+
+try:
+    import fcntl
+except ImportError:
+    # Without file locks (Windows), the settings are only safe within one process
+    fcntl = None
+
+class GuildSettings:
+    """
+    A class to store the settings of each guild in a JSON file.
+
+    Several processes can share the file: the changes are made under an exclusive lock of the
+    file `path`.lock, and the file is read again whenever another process replaced it.
+
+    Attributes:
+        path (str): The path of the JSON file.
+
+    Methods:
+        get(guild_id, name, default): Get a setting of a guild.
+        set(guild_id, name, value): Set a setting of a guild.
+        items(name): Get the guilds where a setting is set, with its value.
+    """
+
+    def __init__(
+        self,
+        path: str = None
+    ) -> None:
+        """
+        Initialize the GuildSettings object.
+
+        Args:
+            path (str, optional): The path of the JSON file. Defaults to the file of the data directory.
+        """
+        self.path = path or os.path.join(kernels.get_data_dir(), GUILD_SETTINGS)
+
+        self._lock = threading.Lock()
+        self._settings = None
+        self._stamp = None
+
+    @contextmanager
+    def _locked(
+        self,
+        exclusive: bool = True
+    ):
+        """
+        Hold the lock of the threads of this process, and the lock of the file shared with the other processes.
+
+        Args:
+            exclusive (bool, optional): Whether to take the file lock for a change, else for a read. Defaults to True.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f'{self.path}.lock', 'a') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load(
+        self
+    ) -> dict:
+        """
+        Read the file, again if it was replaced since the last read. The locks must be held.
+
+        Returns:
+            dict: The settings of each guild, keyed by the guild id as a string.
+        """
+        try:
+            status = os.stat(self.path)
+            stamp = (status.st_ino, status.st_mtime_ns, status.st_size)
+        except OSError:
+            stamp = None
+
+        if self._settings is None or stamp != self._stamp:
+            try:
+                with open(self.path, encoding='utf-8') as file:
+                    self._settings = json.load(file)
+            except (OSError, ValueError):
+                # No settings yet, or an unreadable file: every guild uses the defaults
+                self._settings = {}
+            self._stamp = stamp
+        return self._settings
+
+    def _save(
+        self
+    ) -> None:
+        """
+        Write a temporary file and replace the file, so it is never half written. The locks must be held.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self._settings, file, indent=2, sort_keys=True)
+        os.replace(temporary, self.path)
+
+        status = os.stat(self.path)
+        self._stamp = (status.st_ino, status.st_mtime_ns, status.st_size)
+
+    def get(
+        self,
+        guild_id,
+        name: str,
+        default=None
+    ):
+        """
+        Get a setting of a guild.
+
+        Args:
+            guild_id (int): The id of the guild, or None outside of a guild.
+            name (str): The name of the setting.
+            default (optional): The value if the setting is not set. Defaults to None.
+
+        Returns:
+            The value of the setting.
+        """
+        if guild_id is None:
+            return default
+        with self._locked(exclusive=False):
+            return self._load().get(str(guild_id), {}).get(name, default)
+
+    def set(
+        self,
+        guild_id,
+        name: str,
+        value
+    ) -> None:
+        """
+        Set a setting of a guild, and save the file.
+
+        Args:
+            guild_id (int): The id of the guild.
+            name (str): The name of the setting.
+            value: The value of the setting, serializable to JSON.
+        """
+        with self._locked():
+            self._load().setdefault(str(guild_id), {})[name] = value
+            self._save()
+
+    def items(
+        self,
+        name: str
+    ) -> list[tuple[int, object]]:
+        """
+        Get the guilds where a setting is set, with its value.
+
+        Args:
+            name (str): The name of the setting.
+
+        Returns:
+            list: The id of each guild and its value, for the values other than None.
+        """
+        with self._locked(exclusive=False):
+            return [
+                (int(guild_id), values[name])
+                for guild_id, values in self._load().items()
+                if values.get(name) is not None
+            ]
+
+settings = GuildSettings()
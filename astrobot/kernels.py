@@ -0,0 +1,651 @@
+"""
+This module contains the kernel manager for AstroBot.
+
+The kernel manager owns the JPL ephemeris kernels: it downloads them in the background at startup
+(with resume, checksum verification and an atomic rename), reports progress, and hands the loaded
+kernels to the Ephemeris class once they are ready.
+
+It can also write trimmed kernels (subsets) that only cover the bodies and years served by the bot.
+A registered subset is loaded instead of the full kernel whenever it covers the request.
+
+Attributes:
+    DATA_DIR (str): The default absolute directory where the kernels are stored.
+    SUBSET_BODIES (list): The bodies kept in a subset by default.
+    manager (KernelManager): The kernel manager shared by the application.
+
+Methods:
+    get_data_dir: Get the configured data directory.
+    get_body_code: Get the NAIF code of the given body.
+    write_subset(source_path, output_path, bodies, start_jd, end_jd): Write a trimmed SPK kernel.
+
+Usage:
+    python astrobot/kernels.py download [filename]
+    python astrobot/kernels.py subset de440s.bsp de440s_subset.bsp --start-year 1900 --end-year 2100
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from jplephem.calendar import compute_julian_date
+from jplephem.daf import DAF
+from jplephem.excerpter import write_excerpt
+from jplephem.names import target_name_pairs
+from jplephem.spk import SPK
+from skyfield.api import load_file
+
+from constants import KERNELS, MAX_YEAR, MIN_YEAR, PLANETS
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'files'))
+
+CHUNK_SIZE = 1024 * 1024
+
+SUBSET_BODIES = ['sun', 'moon', 'earth'] + [f'{planet} barycenter' for planet in PLANETS.values()]
+
+# Margin kept around a request when checking the coverage of a subset, to allow for light-time
+SUBSET_MARGIN_DAYS = 1.0
+
+_BODY_CODES = {name: code for code, name in target_name_pairs}
+
+class KernelNotReadyError(Exception):
+    """
+    Raised when a kernel is requested before it has been downloaded and verified.
+
+    Attributes:
+        filename (str): The name of the kernel.
+        status (dict): The status of the kernel when the error was raised.
+    """
+    def __init__(
+        self,
+        filename: str,
+        status: dict
+    ) -> None:
+        self.filename = filename
+        self.status = status
+        super().__init__(f'Kernel {filename} is not ready ({status["state"]})')
+
+def get_data_dir() -> str:
+    """
+    Get the configured data directory.
+
+    The directory can be set with the ASTROBOT_DATA_DIR environment variable, and defaults to the
+    `files` directory at the root of the repository.
+
+    Returns:
+        str: The absolute path of the data directory.
+    """
+    return os.path.abspath(os.getenv('ASTROBOT_DATA_DIR', DATA_DIR))
+
+def get_body_code(
+    body
+) -> int:
+    """
+    Get the NAIF code of the given body.
+
+    Args:
+        body (str | int): The name of the body (e.g. 'mars barycenter') or its NAIF code.
+
+    Returns:
+        int: The NAIF code of the body.
+    """
+    if isinstance(body, int):
+        return body
+    return _BODY_CODES[body.upper()]
+
+def write_subset(
+    source_path: str,
+    output_path: str,
+    bodies: list,
+    start_jd: float,
+    end_jd: float
+) -> dict:
+    """
+    Write a trimmed SPK kernel covering only the given bodies and dates.
+
+    The segments linking each body to the solar system barycenter are kept, so that the subset
+    can be used exactly like the source kernel for these bodies.
+
+    Args:
+        source_path (str): The path of the source kernel.
+        output_path (str): The path of the trimmed kernel.
+        bodies (list): The names or NAIF codes of the bodies to keep.
+        start_jd (float): The first Julian date to cover.
+        end_jd (float): The last Julian date to cover.
+
+    Returns:
+        dict: The coverage metadata of the subset.
+    """
+    with open(source_path, 'rb') as f:
+        spk = SPK(DAF(f))
+        centers = {segment.target: segment.center for segment in spk.segments}
+
+        # Keep the chain of segments from each body down to the solar system barycenter
+        targets = set()
+        for body in bodies:
+            code = get_body_code(body)
+            while code != 0:
+                if code not in centers:
+                    raise ValueError(f'{body} is not covered by {os.path.basename(source_path)}')
+                targets.add(code)
+                code = centers[code]
+
+        # Clip the requested window to the coverage of the source kernel
+        start_jd = max(start_jd, max(s.start_jd for s in spk.segments if s.target in targets))
+        end_jd = min(end_jd, min(s.end_jd for s in spk.segments if s.target in targets))
+
+        summaries = [
+            summary for summary, segment in zip(spk.daf.summaries(), spk.segments)
+            if segment.target in targets
+        ]
+        with open(output_path, 'w+b') as output_file:
+            write_excerpt(spk, output_file, start_jd, end_jd, summaries)
+
+    return {
+        'source': os.path.basename(source_path),
+        'targets': sorted(targets),
+        'start_jd': start_jd,
+        'end_jd': end_jd,
+    }
+
+class KernelManager:
+    """
+    A class to download, verify and load the ephemeris kernels.
+
+    Attributes:
+        data_dir (str): The absolute directory where the kernels are stored.
+        kernels (dict): The known kernels, as {filename: (url, sha256)}.
+        retries (int): The number of download attempts before giving up.
+        retry_delay (float): The delay in seconds before the first retry, doubled at each attempt.
+
+    Methods:
+        path(filename): Get the absolute path of the given kernel.
+        status(filename): Get the download status of the given kernel.
+        is_ready(filename): Check whether the given kernel is ready to be loaded.
+        start(filenames, retries): Start downloading the missing kernels in the background.
+        wait(filename, timeout): Wait until the given kernel is ready or has failed.
+        download(filename, retries): Download and verify the given kernel.
+        create_subset(filename, subset_filename, bodies, start_year, end_year): Write and register a subset.
+        select(filename, bodies, start_jd, end_jd): Select the smallest kernel covering a request.
+        load(filename, bodies, start_jd, end_jd): Load the given kernel, or a subset covering the request.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = None,
+        kernels: dict = None,
+        retries: int = 5,
+        retry_delay: float = 5.0
+    ) -> None:
+        """
+        Initialize the KernelManager object.
+
+        Args:
+            data_dir (str, optional): The directory where the kernels are stored. Defaults to get_data_dir().
+            kernels (dict, optional): The known kernels. Defaults to constants.KERNELS.
+            retries (int, optional): The number of download attempts. Defaults to 5.
+            retry_delay (float, optional): The delay before the first retry. Defaults to 5 seconds.
+        """
+        self.data_dir = os.path.abspath(data_dir) if data_dir else get_data_dir()
+        self.kernels = kernels if kernels is not None else KERNELS
+        self.retries = retries
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._status = {}
+        self._events = {}
+        self._threads = {}
+        self._loaded = {}
+        self._subsets = None
+
+    def path(
+        self,
+        filename: str
+    ) -> str:
+        """
+        Get the absolute path of the given kernel.
+
+        Args:
+            filename (str): The name of the kernel.
+
+        Returns:
+            str: The absolute path of the kernel.
+        """
+        return os.path.join(self.data_dir, filename)
+
+    def _set_status(
+        self,
+        filename: str,
+        **status
+    ) -> None:
+        """
+        Update the status of the given kernel.
+
+        Args:
+            filename (str): The name of the kernel.
+            **status: The status fields to update.
+        """
+        with self._lock:
+            current = self._status.setdefault(filename, {'state': 'missing', 'downloaded': 0, 'total': None, 'error': None})
+            current.update(status)
+            if current['state'] in ('ready', 'failed'):
+                self._events.setdefault(filename, threading.Event()).set()
+
+    def status(
+        self,
+        filename: str
+    ) -> dict:
+        """
+        Get the download status of the given kernel.
+
+        The state is one of 'missing', 'downloading', 'verifying', 'ready' and 'failed'.
+
+        Args:
+            filename (str): The name of the kernel.
+
+        Returns:
+            dict: The state, downloaded bytes, total bytes and last error of the kernel.
+        """
+        if os.path.exists(self.path(filename)):
+            self._set_status(filename, state='ready', error=None)
+
+        with self._lock:
+            status = dict(self._status.get(filename, {'state': 'missing', 'downloaded': 0, 'total': None, 'error': None}))
+
+        if status['total']:
+            status['progress'] = status['downloaded'] / status['total']
+        else:
+            status['progress'] = 1.0 if status['state'] == 'ready' else 0.0
+
+        return status
+
+    def is_ready(
+        self,
+        filename: str
+    ) -> bool:
+        """
+        Check whether the given kernel is ready to be loaded.
+
+        Args:
+            filename (str): The name of the kernel.
+
+        Returns:
+            bool: True if the kernel is ready, False otherwise.
+        """
+        return self.status(filename)['state'] == 'ready'
+
+    def start(
+        self,
+        filenames: list[str] = None,
+        retries: int = None
+    ) -> None:
+        """
+        Start downloading the missing kernels in background threads.
+
+        Args:
+            filenames (list, optional): The kernels to download. Defaults to all the known kernels.
+            retries (int, optional): The number of download attempts. Defaults to self.retries.
+        """
+        for filename in filenames or self.kernels.keys():
+            if self.is_ready(filename):
+                continue
+
+            with self._lock:
+                thread = self._threads.get(filename)
+                if thread is not None and thread.is_alive():
+                    continue
+                self._events[filename] = threading.Event()
+                thread = threading.Thread(
+                    target=self._download_quietly,
+                    args=(filename, retries),
+                    name=f'kernel-download-{filename}',
+                    daemon=True
+                )
+                self._threads[filename] = thread
+
+            thread.start()
+
+    def wait(
+        self,
+        filename: str,
+        timeout: float = None
+    ) -> bool:
+        """
+        Wait until the given kernel is ready or its download has failed.
+
+        Args:
+            filename (str): The name of the kernel.
+            timeout (float, optional): The maximum time to wait, in seconds. Defaults to no limit.
+
+        Returns:
+            bool: True if the kernel is ready, False otherwise.
+        """
+        if self.is_ready(filename):
+            return True
+
+        with self._lock:
+            event = self._events.get(filename)
+        if event is not None:
+            event.wait(timeout)
+
+        return self.is_ready(filename)
+
+    def _download_quietly(
+        self,
+        filename: str,
+        retries: int = None
+    ) -> None:
+        """
+        Download the given kernel, logging the error instead of raising it.
+
+        Args:
+            filename (str): The name of the kernel.
+            retries (int, optional): The number of download attempts. Defaults to self.retries.
+        """
+        try:
+            self.download(filename, retries)
+        except Exception as e:
+            print(f'AstroBot - Kernel {filename} download failed: {e}')
+
+    def download(
+        self,
+        filename: str,
+        retries: int = None
+    ) -> str:
+        """
+        Download and verify the given kernel, retrying with an exponential backoff.
+
+        The file is written to `<filename>.part`, resumed with an HTTP range request if a previous
+        attempt was interrupted, verified, and only then renamed to its final name.
+
+        Args:
+            filename (str): The name of the kernel.
+            retries (int, optional): The number of download attempts. Defaults to self.retries.
+
+        Returns:
+            str: The absolute path of the kernel.
+        """
+        if self.is_ready(filename):
+            return self.path(filename)
+
+        url, sha256 = self.kernels[filename]
+        retries = retries if retries is not None else self.retries
+        os.makedirs(self.data_dir, exist_ok=True)
+
+        delay = self.retry_delay
+        for attempt in range(1, retries + 1):
+            try:
+                self._fetch(filename, url)
+                self._set_status(filename, state='verifying')
+                self._verify(filename, sha256)
+                os.replace(self.path(filename) + '.part', self.path(filename))
+                self._set_status(filename, state='ready', error=None)
+                print(f'AstroBot - Kernel {filename} ready')
+                return self.path(filename)
+            except (requests.exceptions.RequestException, OSError, ValueError) as e:
+                self._set_status(filename, state='downloading', error=str(e))
+                print(f'AstroBot - Kernel {filename} attempt {attempt}/{retries} failed: {e}')
+                if attempt < retries:
+                    time.sleep(delay)
+                    delay *= 2
+
+        self._set_status(filename, state='failed')
+        raise KernelNotReadyError(filename, self.status(filename))
+
+    def _fetch(
+        self,
+        filename: str,
+        url: str
+    ) -> None:
+        """
+        Download the given kernel to its partial file, resuming a previous attempt if possible.
+
+        Args:
+            filename (str): The name of the kernel.
+            url (str): The URL of the kernel.
+        """
+        part_path = self.path(filename) + '.part'
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+            if response.status_code == 416:
+                # The partial file is already complete
+                return
+            response.raise_for_status()
+
+            if response.status_code != 206:
+                offset = 0 # The server ignored the range request, restart from scratch
+            length = response.headers.get('Content-Length')
+            total = offset + int(length) if length is not None else None
+            self._set_status(filename, state='downloading', downloaded=offset, total=total)
+
+            last_report = 0
+            with open(part_path, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
+                    offset += len(chunk)
+                    self._set_status(filename, downloaded=offset)
+
+                    if total and offset * 10 // total > last_report:
+                        last_report = offset * 10 // total
+                        print(f'AstroBot - Kernel {filename}: {last_report * 10}%')
+
+        if total is not None and offset != total:
+            raise OSError(f'incomplete download ({offset}/{total} bytes)')
+
+    def _verify(
+        self,
+        filename: str,
+        sha256: str = None
+    ) -> None:
+        """
+        Verify the partial file of the given kernel, removing it if it is corrupted.
+
+        Args:
+            filename (str): The name of the kernel.
+            sha256 (str, optional): The expected SHA-256 digest. Defaults to no digest check.
+
+        Raises:
+            ValueError: If the file does not match the digest or is not a valid SPK kernel.
+        """
+        part_path = self.path(filename) + '.part'
+
+        try:
+            if sha256:
+                digest = hashlib.sha256()
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                if digest.hexdigest() != sha256.lower():
+                    raise ValueError(f'checksum mismatch for {filename}')
+
+            try:
+                with open(part_path, 'rb') as f:
+                    segments = SPK(DAF(f)).segments
+            except Exception as e:
+                raise ValueError(f'{filename} is not a valid SPK kernel: {e}') from e
+            if not segments:
+                raise ValueError(f'{filename} contains no segments')
+        except ValueError:
+            os.remove(part_path)
+            raise
+
+    def _load_subsets(
+        self
+    ) -> dict:
+        """
+        Read the coverage metadata of the subsets registered in the data directory.
+
+        Returns:
+            dict: The subsets metadata, keyed by subset filename.
+        """
+        with self._lock:
+            if self._subsets is not None:
+                return self._subsets
+
+        subsets = {}
+        if os.path.isdir(self.data_dir):
+            for name in os.listdir(self.data_dir):
+                if not name.endswith('.bsp.json') or not os.path.exists(self.path(name[:-5])):
+                    continue
+                with open(self.path(name), encoding='utf-8') as f:
+                    subsets[name[:-5]] = json.load(f)
+
+        with self._lock:
+            self._subsets = subsets
+        return subsets
+
+    def create_subset(
+        self,
+        filename: str,
+        subset_filename: str,
+        bodies: list = None,
+        start_year: int = MIN_YEAR,
+        end_year: int = MAX_YEAR
+    ) -> dict:
+        """
+        Write a subset of the given kernel and register it with its coverage metadata.
+
+        Args:
+            filename (str): The name of the source kernel.
+            subset_filename (str): The name of the subset.
+            bodies (list, optional): The bodies to keep. Defaults to SUBSET_BODIES.
+            start_year (int, optional): The first year to cover. Defaults to MIN_YEAR.
+            end_year (int, optional): The last year to cover. Defaults to MAX_YEAR.
+
+        Returns:
+            dict: The coverage metadata of the subset.
+        """
+        if not self.is_ready(filename):
+            raise KernelNotReadyError(filename, self.status(filename))
+
+        part_path = self.path(subset_filename) + '.part'
+        metadata = write_subset(
+            self.path(filename),
+            part_path,
+            bodies or SUBSET_BODIES,
+            compute_julian_date(start_year),
+            compute_julian_date(end_year + 1)
+        )
+        os.replace(part_path, self.path(subset_filename))
+
+        with open(self.path(subset_filename) + '.json', 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=4)
+
+        with self._lock:
+            self._subsets = None
+            self._loaded.pop(subset_filename, None)
+
+        return metadata
+
+    def select(
+        self,
+        filename: str,
+        bodies: list = None,
+        start_jd: float = None,
+        end_jd: float = None
+    ) -> str:
+        """
+        Select the smallest registered kernel that covers the given bodies and dates.
+
+        Args:
+            filename (str): The name of the full kernel.
+            bodies (list, optional): The bodies needed by the request. Defaults to any body.
+            start_jd (float, optional): The first Julian date needed by the request.
+            end_jd (float, optional): The last Julian date needed by the request.
+
+        Returns:
+            str: The name of the subset covering the request, or the full kernel name otherwise.
+        """
+        if bodies is None or start_jd is None:
+            return filename
+        end_jd = start_jd if end_jd is None else end_jd
+
+        try:
+            codes = {get_body_code(body) for body in bodies}
+        except KeyError:
+            return filename
+
+        candidates = []
+        for subset_filename, metadata in self._load_subsets().items():
+            if (
+                metadata['source'] == filename
+                and codes.issubset(metadata['targets'])
+                and metadata['start_jd'] <= start_jd - SUBSET_MARGIN_DAYS
+                and end_jd + SUBSET_MARGIN_DAYS <= metadata['end_jd']
+            ):
+                candidates.append((os.path.getsize(self.path(subset_filename)), subset_filename))
+
+        return min(candidates)[1] if candidates else filename
+
+    def load(
+        self,
+        filename: str,
+        bodies: list = None,
+        start_jd: float = None,
+        end_jd: float = None
+    ):
+        """
+        Load the given kernel, reusing the already loaded instance.
+
+        When the bodies and dates of the request are given, a registered subset covering them is
+        loaded instead of the full kernel.
+
+        Args:
+            filename (str): The name of the kernel.
+            bodies (list, optional): The bodies needed by the request.
+            start_jd (float, optional): The first Julian date needed by the request.
+            end_jd (float, optional): The last Julian date needed by the request.
+
+        Returns:
+            skyfield.jpllib.SpiceKernel: The loaded kernel.
+
+        Raises:
+            KernelNotReadyError: If the kernel has not been downloaded and verified yet.
+        """
+        filename = self.select(filename, bodies, start_jd, end_jd)
+
+        with self._lock:
+            kernel = self._loaded.get(filename)
+        if kernel is not None:
+            return kernel
+
+        if not self.is_ready(filename):
+            raise KernelNotReadyError(filename, self.status(filename))
+
+        with self._lock:
+            kernel = self._loaded.get(filename)
+            if kernel is None:
+                kernel = load_file(self.path(filename))
+                self._loaded[filename] = kernel
+
+        return kernel
+
+manager = KernelManager()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage the AstroBot ephemeris kernels.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    download_parser = subparsers.add_parser('download', help='Download and verify a kernel')
+    download_parser.add_argument('filename', nargs='?', default='de440s.bsp')
+
+    subset_parser = subparsers.add_parser('subset', help='Write and register a trimmed kernel')
+    subset_parser.add_argument('filename', help='Name of the source kernel')
+    subset_parser.add_argument('subset_filename', help='Name of the trimmed kernel')
+    subset_parser.add_argument('--bodies', nargs='+', default=SUBSET_BODIES, help='Bodies to keep')
+    subset_parser.add_argument('--start-year', type=int, default=MIN_YEAR)
+    subset_parser.add_argument('--end-year', type=int, default=MAX_YEAR)
+
+    args = parser.parse_args()
+    if args.command == 'download':
+        print(manager.download(args.filename))
+    else:
+        metadata = manager.create_subset(args.filename, args.subset_filename, args.bodies, args.start_year, args.end_year)
+        size = os.path.getsize(manager.path(args.subset_filename))
+        full_size = os.path.getsize(manager.path(args.filename))
+        print(f'{args.subset_filename}: {size / full_size:.0%} of {args.filename}, JD {metadata["start_jd"]} - {metadata["end_jd"]}')
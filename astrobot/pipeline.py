@@ -0,0 +1,632 @@
+"""
+This module contains the compute pipeline shared by the astronomy commands.
+
+The commands describe what they need (body, plot type, location and date), and the pipeline
+computes the daily report and renders the plot in a worker thread, off the event loop. Identical
+concurrent requests are normalized to the same key and coalesced by the single-flight layer,
+then admitted by the work queue. When a compute service is configured, the requests are sent to
+it instead of being computed in this process.
+
+Attributes:
+    LOCATION_DECIMALS (int): The number of decimals kept in the latitude and longitude (about 100 m).
+    ALTITUDE_STEP (int): The altitude quantization step, in meters.
+    TIME_BUCKET (timedelta): The quantization step of the current time.
+    executor (ThreadPoolExecutor): The worker threads of the pipeline.
+    client (ComputeClient): The client of the compute service, or None to compute in this process.
+    live_maps (OrderedDict): The live sky maps, by location and day, the least recently used first.
+
+Methods:
+    get_request_key: Get the normalized key of a request.
+    render: Compute the daily report and render the plot of a request.
+    compute: Compute the daily report and the plot of a request, coalescing identical requests.
+    render_calendar: Compute and render the calendar of a body over a month.
+    compute_calendar: Compute and render the calendar of a month, coalescing identical requests.
+    render_tonight: Compute the observing windows of every body for a night.
+    compute_tonight: Compute the observing windows of a night, coalescing identical requests.
+    render_sky: Compute the positions of every body and render them on one sky map.
+    compute_sky: Compute and render the sky map of every body, coalescing identical requests.
+    get_live_map: Get the live sky map of a location and a day, drawing its background if needed.
+    render_live: Compute the current positions of the live bodies and render them on the live sky map.
+    compute_live: Render the live sky map of a location, coalescing identical requests.
+    compute_digests: Compute the daily digests of several sites in one batch.
+    render_compare: Compute the rise and set times of a body for several locations at once.
+    compute_compare: Compute the rise and set times of a body for several locations, coalescing identical requests.
+    kernel_status: Get the status of a kernel where the requests are computed.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as Date, datetime, timedelta
+
+from constants import ANIMATION_FRAMES, COMPUTE_WORKERS, LIVE_BODIES, LIVE_MAPS, PLOT_DATA
+from ephemeris import DailyReport, Ephemeris, MonthCalendar, ObservingWindow, Observers, SkyPositions, get_sky_object
+from singleflight import flights
+from workqueue import PRIORITY_BACKGROUND, PRIORITY_IMAGE, PRIORITY_TEXT, queue
+import digest
+import kernels
+import plots
+
+LOCATION_DECIMALS = 3
+ALTITUDE_STEP = 10
+TIME_BUCKET = timedelta(minutes=1)
+
+executor = ThreadPoolExecutor(max_workers=COMPUTE_WORKERS, thread_name_prefix='astrobot-compute')
+client = None
+live_maps = OrderedDict()
+_live_lock = threading.Lock()
+
+def get_request_key(
+    body: str,
+    plot_type: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    now: datetime,
+    animation: str = None
+) -> tuple:
+    """
+    Get the normalized key of a request.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        plot_type (str): The type of plot, as in constants.PLOT_TYPES values, PLOT_DATA for the data of the plots without an image, or None for text only.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the report.
+        now (datetime): The time of the current position.
+        animation (str, optional): The format of the animated path, as in constants.ANIMATION_FORMATS values. Defaults to None.
+
+    Returns:
+        tuple: The key, whose values are also the quantized arguments of the computation.
+    """
+    # Floor the current time to its bucket, counted from midnight
+    now = now - (now - now.replace(hour=0, minute=0, second=0, microsecond=0)) % TIME_BUCKET
+
+    # A text-only answer or the data of the plots have no animation
+    if plot_type in (None, PLOT_DATA):
+        animation = None
+
+    return (
+        body,
+        plot_type,
+        round(latitude, LOCATION_DECIMALS),
+        round(longitude, LOCATION_DECIMALS),
+        round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP,
+        timezone,
+        date.date(),
+        now,
+        animation,
+    )
+
+def render(
+    body: str,
+    plot_type: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date,
+    now: datetime,
+    animation: str = None
+) -> tuple[DailyReport, bytes]:
+    """
+    Compute the daily report and render the plot of a request.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        plot_type (str): The type of plot, as in constants.PLOT_TYPES values, PLOT_DATA for the data of the plots without an image, or None for text only.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime.date): The date of the report.
+        now (datetime): The time of the current position.
+        animation (str, optional): The format of the animated path ('gif' or 'png'), or None for a still image. Defaults to None.
+
+    Returns:
+        tuple: The daily report and the image of the plot (None for text only).
+    """
+    eph = Ephemeris.for_location(latitude, longitude, altitude, timezone)
+    date = datetime(date.year, date.month, date.day)
+    # The pooled object plots the paths with PLOT_PRECISION, the printed times of the report always use the reference precision
+    # A text-only answer never computes what only the plots need
+    report = eph.daily_report(date, body, now=now, plot=plot_type is not None)
+
+    if plot_type in (None, PLOT_DATA):
+        return report, None
+    if animation is not None:
+        times, altitudes, azimuths = eph.compute_timelapse(date, get_sky_object(body), ANIMATION_FRAMES)
+        return report, plots.animate_path(eph, body, now, report, plot_type, times, altitudes, azimuths, animation)
+    if plot_type == 'polar':
+        buffer = plots.plot_polar_sky(eph, body, now, report)
+    else:
+        buffer = plots.plot_xy_path(eph, body, now, report)
+
+    return report, buffer.getvalue()
+
+async def compute(
+    body: str,
+    plot_type: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    now: datetime,
+    user_id=None,
+    guild_id=None,
+    animation: str = None
+) -> tuple[DailyReport, bytes]:
+    """
+    Compute the daily report and the plot of a request in a worker thread.
+
+    The request is normalized (quantized location and time) and concurrent identical requests
+    await the same computation, which waits for a slot of the work queue.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        plot_type (str): The type of plot, as in constants.PLOT_TYPES values, PLOT_DATA for the data of the plots without an image, or None for text only.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the report.
+        now (datetime): The time of the current position.
+        user_id (hashable, optional): The user who sent the request. Defaults to None.
+        guild_id (hashable, optional): The guild of the request. Defaults to None.
+        animation (str, optional): The format of the animated path ('gif' or 'png'), or None for a still image. Defaults to None.
+
+    Returns:
+        tuple: The daily report and the image of the plot (None for text only).
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute(body, plot_type, latitude, longitude, altitude, timezone, date, now, user_id, guild_id, animation)
+
+    key = get_request_key(body, plot_type, latitude, longitude, altitude, timezone, date, now, animation)
+    loop = asyncio.get_running_loop()
+
+    priority = PRIORITY_TEXT if plot_type in (None, PLOT_DATA) else PRIORITY_IMAGE
+
+    return await flights.run(key, queue.run, user_id, guild_id, priority, loop.run_in_executor, executor, render, *key)
+
+def render_calendar(
+    body: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    year: int,
+    month: int
+) -> tuple[MonthCalendar, bytes]:
+    """
+    Compute and render the calendar of a body over a month.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        year (int): The year of the month.
+        month (int): The month.
+
+    Returns:
+        tuple: The calendar and its PNG image.
+    """
+    eph = Ephemeris.for_location(latitude, longitude, altitude, timezone)
+    month_calendar = eph.monthly_calendar(year, month, body)
+
+    return month_calendar, plots.plot_calendar(eph, month_calendar).getvalue()
+
+async def compute_calendar(
+    body: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    year: int,
+    month: int,
+    user_id=None,
+    guild_id=None
+) -> tuple[MonthCalendar, bytes]:
+    """
+    Compute and render the calendar of a month in a worker thread, coalescing identical requests.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        year (int): The year of the month.
+        month (int): The month.
+        user_id (hashable, optional): The user who sent the request. Defaults to None.
+        guild_id (hashable, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        tuple: The calendar and its PNG image.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_calendar(body, latitude, longitude, altitude, timezone, year, month, user_id, guild_id)
+
+    arguments = (
+        body,
+        round(latitude, LOCATION_DECIMALS),
+        round(longitude, LOCATION_DECIMALS),
+        round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP,
+        timezone,
+        year,
+        month,
+    )
+    loop = asyncio.get_running_loop()
+
+    return await flights.run(('calendar', *arguments), queue.run, user_id, guild_id, PRIORITY_IMAGE, loop.run_in_executor, executor, render_calendar, *arguments)
+
+def render_tonight(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date,
+    sun_altitude: float,
+    min_altitude: float
+) -> list[ObservingWindow]:
+    """
+    Compute the observing windows of every body for a night.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime.date): The date of the evening of the night.
+        sun_altitude (float): The highest altitude of the sun, in degrees.
+        min_altitude (float): The lowest altitude of the bodies, in degrees.
+
+    Returns:
+        list: The observing windows, sorted by decreasing peak altitude.
+    """
+    eph = Ephemeris.for_location(latitude, longitude, altitude, timezone)
+    return eph.get_observing_windows(date, sun_altitude, min_altitude)
+
+async def compute_tonight(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    sun_altitude: float,
+    min_altitude: float,
+    user_id=None,
+    guild_id=None
+) -> list[ObservingWindow]:
+    """
+    Compute the observing windows of a night in a worker thread, coalescing identical requests.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the evening of the night.
+        sun_altitude (float): The highest altitude of the sun, in degrees.
+        min_altitude (float): The lowest altitude of the bodies, in degrees.
+        user_id (hashable, optional): The user who sent the request. Defaults to None.
+        guild_id (hashable, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        list: The observing windows, sorted by decreasing peak altitude.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_tonight(latitude, longitude, altitude, timezone, date, sun_altitude, min_altitude, user_id, guild_id)
+
+    arguments = (
+        round(latitude, LOCATION_DECIMALS),
+        round(longitude, LOCATION_DECIMALS),
+        round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP,
+        timezone,
+        date.date(),
+        float(sun_altitude),
+        float(min_altitude),
+    )
+    loop = asyncio.get_running_loop()
+
+    return await flights.run(('tonight', *arguments), queue.run, user_id, guild_id, PRIORITY_TEXT, loop.run_in_executor, executor, render_tonight, *arguments)
+
+def render_sky(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime,
+    trail_hours: int
+) -> tuple[SkyPositions, bytes]:
+    """
+    Compute the positions of every body and render them on one sky map.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The time of the positions.
+        trail_hours (int): The number of hours covered by the trails (0 for no trail).
+
+    Returns:
+        tuple: The positions and the PNG image of the sky map.
+    """
+    eph = Ephemeris.for_location(latitude, longitude, altitude, timezone)
+    positions = eph.get_sky_positions(now, trail=timedelta(hours=trail_hours))
+
+    return positions, plots.plot_sky_map(eph, positions).getvalue()
+
+async def compute_sky(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime,
+    trail_hours: int = 0,
+    user_id=None,
+    guild_id=None
+) -> tuple[SkyPositions, bytes]:
+    """
+    Compute and render the sky map of every body in a worker thread, coalescing identical requests.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The time of the positions.
+        trail_hours (int, optional): The number of hours covered by the trails. Defaults to 0.
+        user_id (hashable, optional): The user who sent the request. Defaults to None.
+        guild_id (hashable, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        tuple: The positions and the PNG image of the sky map.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_sky(latitude, longitude, altitude, timezone, now, trail_hours, user_id, guild_id)
+
+    arguments = (
+        round(latitude, LOCATION_DECIMALS),
+        round(longitude, LOCATION_DECIMALS),
+        round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP,
+        timezone,
+        now - (now - now.replace(hour=0, minute=0, second=0, microsecond=0)) % TIME_BUCKET,
+        int(trail_hours),
+    )
+    loop = asyncio.get_running_loop()
+
+    return await flights.run(('sky', *arguments), queue.run, user_id, guild_id, PRIORITY_IMAGE, loop.run_in_executor, executor, render_sky, *arguments)
+
+def get_live_map(
+    eph: Ephemeris,
+    date: Date
+) -> plots.LiveSkyMap:
+    """
+    Get the live sky map of a location and a day, drawing its background if needed.
+
+    The daily paths and the background are computed once per location and day, and kept for the
+    next updates. The least recently used maps are dropped when there are more than LIVE_MAPS.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object of the location.
+        date (datetime.date): The local date of the map.
+
+    Returns:
+        LiveSkyMap: The live sky map.
+    """
+    key = (eph.latitude, eph.longitude, eph.altitude, str(eph.timezone), date)
+    with _live_lock:
+        live_map = live_maps.get(key)
+        if live_map is not None:
+            live_maps.move_to_end(key)
+            return live_map
+
+    # Draw the background without the lock, the first map drawn is kept if two threads race
+    midnight = datetime(date.year, date.month, date.day)
+    paths = {body: eph.compute_daily_path(midnight, get_sky_object(body)) for body in LIVE_BODIES}
+    live_map = plots.LiveSkyMap(eph, paths)
+
+    with _live_lock:
+        live_map = live_maps.setdefault(key, live_map)
+        live_maps.move_to_end(key)
+        while len(live_maps) > LIVE_MAPS:
+            live_maps.popitem(last=False)
+
+    return live_map
+
+def render_live(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime
+) -> tuple[SkyPositions, bytes]:
+    """
+    Compute the current positions of the live bodies and render them on the live sky map.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The local time of the positions.
+
+    Returns:
+        tuple: The positions and the PNG image of the live sky map.
+    """
+    eph = Ephemeris.for_location(latitude, longitude, altitude, timezone)
+    positions = eph.get_sky_positions(now, bodies=LIVE_BODIES)
+
+    return positions, get_live_map(eph, now.date()).render(positions)
+
+async def compute_live(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime,
+    user_id=None,
+    guild_id=None
+) -> tuple[SkyPositions, bytes]:
+    """
+    Render the live sky map of a location in a worker thread, coalescing identical requests.
+
+    The updates wait in the work queue behind the requests of the users.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The local time of the positions.
+        user_id (hashable, optional): The user who created the live message. Defaults to None.
+        guild_id (hashable, optional): The guild of the live message. Defaults to None.
+
+    Returns:
+        tuple: The positions and the PNG image of the live sky map.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_live(latitude, longitude, altitude, timezone, now, user_id, guild_id)
+
+    arguments = (
+        round(latitude, LOCATION_DECIMALS),
+        round(longitude, LOCATION_DECIMALS),
+        round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP,
+        timezone,
+        now - (now - now.replace(hour=0, minute=0, second=0, microsecond=0)) % TIME_BUCKET,
+    )
+    loop = asyncio.get_running_loop()
+
+    return await flights.run(('live', *arguments), queue.run, user_id, guild_id, PRIORITY_BACKGROUND, loop.run_in_executor, executor, render_live, *arguments)
+
+async def compute_digests(
+    sites: list[tuple],
+    date: Date
+) -> list:
+    """
+    Compute the daily digests of several sites in one batch, in a worker thread.
+
+    The batch waits in the work queue behind the requests of the users.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each site.
+        date (datetime.date): The local date of the digests.
+
+    Returns:
+        list: The digest of each site, in the same order.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_digests(sites, date)
+
+    loop = asyncio.get_running_loop()
+
+    return await queue.run(None, None, PRIORITY_BACKGROUND, loop.run_in_executor, executor, digest.compute_digests, sites, date)
+
+def render_compare(
+    sites: tuple,
+    body: str,
+    date
+) -> tuple:
+    """
+    Compute the rise and set times of a body for several locations at once.
+
+    Args:
+        sites (tuple): The latitude, longitude, altitude and timezone of each location.
+        body (str): The name of the body, as in constants.BODIES.
+        date (datetime.date): The local date.
+
+    Returns:
+        tuple: The rise and set times of each location in its local timezone, or None when they do not happen.
+    """
+    latitudes, longitudes, altitudes, timezone_names = zip(*sites)
+    observers = Observers(latitudes, longitudes, altitudes, timezone_names)
+    return observers.get_rise_set_times(date, get_sky_object(body))
+
+async def compute_compare(
+    sites: list[tuple],
+    body: str,
+    date: datetime,
+    user_id=None,
+    guild_id=None
+) -> tuple:
+    """
+    Compute the rise and set times of a body for several locations in a worker thread, coalescing identical requests.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each location.
+        body (str): The name of the body, as in constants.BODIES.
+        date (datetime): The local date.
+        user_id (hashable, optional): The user who sent the request. Defaults to None.
+        guild_id (hashable, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        tuple: The rise and set times of each location in its local timezone, or None when they do not happen.
+
+    Raises:
+        QueueFullError: If the work queue is full.
+        ServiceError: If the compute service failed to compute the request.
+    """
+    if client is not None:
+        return await client.compute_compare(sites, body, date, user_id, guild_id)
+
+    arguments = (
+        tuple(
+            (round(latitude, LOCATION_DECIMALS), round(longitude, LOCATION_DECIMALS), round(altitude / ALTITUDE_STEP) * ALTITUDE_STEP, timezone)
+            for latitude, longitude, altitude, timezone in sites
+        ),
+        body,
+        date.date(),
+    )
+    loop = asyncio.get_running_loop()
+
+    return await flights.run(('compare', *arguments), queue.run, user_id, guild_id, PRIORITY_TEXT, loop.run_in_executor, executor, render_compare, *arguments)
+
+async def kernel_status(
+    filename: str
+) -> dict:
+    """
+    Get the status of a kernel where the requests are computed.
+
+    Args:
+        filename (str): The name of the kernel.
+
+    Returns:
+        dict: The status of the kernel, as returned by KernelManager.status.
+    """
+    if client is not None:
+        return await client.kernel_status(filename)
+    return kernels.manager.status(filename)
@@ -1,9 +1,13 @@
+import threading
 from datetime import datetime
 from io import BytesIO
 
-import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle, Ellipse, Wedge
 import numpy as np
-from constants import BODIES, DIRECTIONS
+from PIL import Image
+from constants import ANIMATION_DPI, ANIMATION_FRAME_DURATION, ANIMATION_MAX_BYTES, BODIES, BODY_NAMES, DIRECTIONS, MONTHS, WEEKDAYS
 
 def correct_azimuth(
     az
@@ -12,23 +16,61 @@ def correct_azimuth(
     Correct the azimuth values for the southern hemisphere.
     
     Args:
-        az (list): The azimuth values.
+        az (np.ndarray): The azimuth values.
     
     Returns:
-        list: The corrected azimuth values.
+        np.ndarray: The corrected azimuth values.
     """
-    corrected_az = []
-    for value in az:
-        if value > 180:
-            corrected_az.append(round(value - 180, 2))
-        else:
-            corrected_az.append(round(value + 180, 2))
-    return corrected_az
+    az = np.asarray(az)
+    return np.where(az > 180, az - 180, az + 180)
+
+def _visible_hours(
+    path
+):
+    """
+    Get the hourly markers of a daily path that are above the horizon.
+
+    Args:
+        path (DailyPath): The daily path.
+
+    Returns:
+        np.ndarray: The indices of the samples of the visible hourly markers.
+    """
+    return path.hours[path.altitudes[path.hours] >= 0]
+
+def _polar_axes(
+    fig,
+    eph
+):
+    """
+    Create the polar axes of a sky map, with the cardinal directions and the horizon.
+
+    Args:
+        fig (Figure): The figure.
+        eph (Ephemeris): The Ephemeris object.
+
+    Returns:
+        Axes: The polar axes, with the zenith at the center and the horizon at 90.
+    """
+    ax = fig.subplots(subplot_kw={'projection': 'polar'})
+    ax.set_theta_zero_location('N' if eph.latitude >= 0 else 'S', offset=0)
+    ax.set_theta_direction(-1)
+    ax.set_thetagrids(np.linspace(0, 360, 9), DIRECTIONS)
+    ax.set_rgrids(np.linspace(0, 90, 10), [f'{int(i)}°' for i in np.linspace(90, 0, 10)])
+    ax.set_rlabel_position(0 if eph.latitude >= 0 else 180)
+    ax.tick_params(axis='y', labelsize=8)
+    ax.set_ylim([0, 90])
+
+    # Plot a wide circle for the horizon
+    ax.plot(np.linspace(0, 2 * np.pi, 100), np.full(100, 90), color='k', linewidth=2.5, zorder=11)
+
+    return ax
 
 def plot_polar_sky(
     eph,
     obj,
-    date
+    date,
+    report=None
 ):
     """
     Plot a polar sky map of the celestial sphere.
@@ -37,111 +79,142 @@ def plot_polar_sky(
         eph (Ephemeris): The Ephemeris object.
         obj (str): The sky object.
         date (datetime): The date.
+        report (DailyReport, optional): The daily report of the object. Computed if not given.
     
     Returns:
         BytesIO: The BytesIO image.
     """
-    # Compute the daily path and the current position of the object
-    if obj.lower() not in 'sun, moon':
-        planet_obj = f'{obj} barycenter'
-        alt, az, peak_hours_altaz = eph.compute_daily_path(date, planet_obj)
-        current_alt, current_az = eph.compute_current_position(date, planet_obj)
-    else:
-        alt, az, peak_hours_altaz = eph.compute_daily_path(date, obj)
-        current_alt, current_az = eph.compute_current_position(date, obj)
+    fig, _, _, _ = _draw_polar_sky(eph, obj, date, report)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    buffer.seek(0)
+
+    return buffer
+
+def _draw_polar_sky(
+    eph,
+    obj,
+    date,
+    report=None
+):
+    """
+    Draw a polar sky map of the celestial sphere.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object.
+        obj (str): The sky object.
+        date (datetime): The date.
+        report (DailyReport, optional): The daily report of the object. Computed if not given.
+
+    Returns:
+        tuple: The figure, the axes, the marker of the current position and the date label.
+    """
+    # Get the daily path and the current position of the object from the daily report
+    if report is None:
+        report = eph.daily_report(date, obj)
+    path = report.path
+    alt, az = path.altitudes, path.azimuths
+    current_alt, current_az = report.current_altitude, report.current_azimuth
 
     # Get the color and size of the object
     color, size = BODIES[obj]
 
     # Plot the polar sky map
-    fig, ax = plt.subplots(subplot_kw={'projection': 'polar'})
-    ax.set_theta_zero_location('N' if eph.latitude >= 0 else 'S', offset=0)
-    ax.set_theta_direction(-1)
-    ax.set_thetagrids(np.linspace(0, 360, 9), DIRECTIONS)
-    ax.set_rgrids(np.linspace(0, 90, 10), [f'{int(i)}°' for i in np.linspace(90, 0, 10)])
-    ax.set_rlabel_position(0 if eph.latitude >= 0 else 180)
-    ax.tick_params(axis='y', labelsize=8)
-    ax.set_ylim([0, 90])
-
-    # Plot a wide circle for the horizon
-    ax.plot(np.linspace(0, 2 * np.pi, 100), np.full(100, 90), color='k', linewidth=2.5, zorder=11)
+    fig = Figure() # Not attached to pyplot, so that plots can be rendered from several threads
+    ax = _polar_axes(fig, eph)
 
     # Plot the daily path and the current position of the object
-    ax.plot(np.radians(az), [90 - a for a in alt], color='k', linewidth=0.8, zorder=9)
-    ax.plot(np.radians(current_az), 90 - current_alt, 'o', color=color, markersize=size, markeredgecolor='black', zorder=10)
+    ax.plot(np.radians(az), 90 - alt, color='k', linewidth=0.8, zorder=9)
+    marker, = ax.plot(np.radians(current_az), 90 - current_alt, 'o', color=color, markersize=size, markeredgecolor='black', zorder=10)
 
     # Plot the markers and label for the peak hours altitude and azimuth
-    for hour, (hour_alt, hour_az) in peak_hours_altaz.items():
-        if hour_alt < 0:
-            continue
-        else:
-            ax.plot(np.radians(hour_az), 90 - hour_alt, 'o', color='k', markersize=3, zorder=9)
-            ax.text(np.radians(hour_az), 90 - hour_alt, hour.hour, fontsize=7, ha='center', va='bottom')
+    hours = _visible_hours(path)
+    ax.plot(np.radians(az[hours]), 90 - alt[hours], 'o', color='k', markersize=3, zorder=9)
+    for hour, hour_alt, hour_az in zip(path.hour_times(hours), alt[hours], az[hours]):
+        ax.text(np.radians(hour_az), 90 - hour_alt, hour.hour, fontsize=7, ha='center', va='bottom')
 
     # Plot the solstices for the sun
     if obj == 'sun':
-        summer_solstice, winter_solstice = eph.get_solstices(date.year)
-
-        solstices = [summer_solstice, winter_solstice]
+        solstice_paths = [report.solstice_paths['summer'], report.solstice_paths['winter']]
         solstice_colors = ['gold', 'blue']
         solstice_labels = ['Solstice d\'été', 'Solstice d\'hiver']
         style = {'linestyle': '--', 'linewidth': 0.8}
 
-        for solstice, color, label in zip(solstices, solstice_colors, solstice_labels):
-            solstice_alt, solstice_az, peak_hours_altaz = eph.compute_daily_path(solstice, obj)
+        for solstice_path, color, label in zip(solstice_paths, solstice_colors, solstice_labels):
+            solstice_alt, solstice_az = solstice_path.altitudes, solstice_path.azimuths
 
             # Plot the daily path of the solstice
-            ax.plot(np.radians(solstice_az), [90 - a for a in solstice_alt], color=color, label=label, **style)
+            ax.plot(np.radians(solstice_az), 90 - solstice_alt, color=color, label=label, **style)
 
             # Plot the markers for the peak hours altitude and azimuth
-            for hour, (hour_alt, hour_az) in peak_hours_altaz.items():
-                if hour_alt < 0:
-                    continue
-                else:
-                    ax.plot(np.radians(hour_az), 90 - hour_alt, 'o', color=color, markersize=3)
+            hours = _visible_hours(solstice_path)
+            ax.plot(np.radians(solstice_az[hours]), 90 - solstice_alt[hours], 'o', color=color, markersize=3)
 
         ax.legend(loc='upper left', bbox_to_anchor=(0.85, 1.1))
 
     ax.grid(True)
-    ax.annotate(date.strftime('%Y-%m-%d %H:%M:%S'), xy=(0, 0), xytext=(150, 140), fontsize=8, color='black')
+    label = ax.annotate(date.strftime('%Y-%m-%d %H:%M:%S'), xy=(0, 0), xytext=(150, 140), fontsize=8, color='black')
+
+    return fig, ax, marker, label
+
+def plot_xy_path(
+    eph,
+    obj,
+    date,
+    report=None
+):
+    """
+    Plot an XY path of the object.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object.
+        obj (str): The sky object.
+        date (datetime): The date.
+        report (DailyReport, optional): The daily report of the object. Computed if not given.
+
+    Returns:
+        BytesIO: The BytesIO image.
+    """
+    fig, _, _, _ = _draw_xy_path(eph, obj, date, report)
 
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    plt.close()
+    fig.savefig(buffer, format='png')
     buffer.seek(0)
 
     return buffer
 
-def plot_xy_path(
+def _draw_xy_path(
     eph,
     obj,
-    date
+    date,
+    report=None
 ):
     """
-    Plot an XY path of the object.
+    Draw an XY path of the object.
 
     Args:
         eph (Ephemeris): The Ephemeris object.
         obj (str): The sky object.
         date (datetime): The date.
+        report (DailyReport, optional): The daily report of the object. Computed if not given.
 
     Returns:
-        BytesIO: The BytesIO image.
+        tuple: The figure, the axes, the marker of the current position and the date label.
     """
-    # Compute the daily path and the current position of the object
-    if obj.lower() not in 'sun, moon':
-        planet_obj = f'{obj} barycenter'
-        alt, az, peak_hours_altaz = eph.compute_daily_path(date, planet_obj)
-        current_alt, current_az = eph.compute_current_position(date, planet_obj)
-    else:
-        alt, az, peak_hours_altaz = eph.compute_daily_path(date, obj)
-        current_alt, current_az = eph.compute_current_position(date, obj)
+    # Get the daily path and the current position of the object from the daily report
+    if report is None:
+        report = eph.daily_report(date, obj)
+    path = report.path
+    alt, az = path.altitudes, path.azimuths
+    current_alt, current_az = report.current_altitude, report.current_azimuth
 
     # Get the color and size of the object
     color, size = BODIES[obj]
 
     # Plot the XY path
-    fig, ax = plt.subplots(figsize=(10, 5))
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
     ax.set_xlim(0, 360)
     ax.set_ylim(0, 90)
     ax.set_xlabel('Azimuth (°)')
@@ -160,27 +233,23 @@ def plot_xy_path(
 
     # Plot the daily path and the current position of the object
     ax.plot(az, alt, color='k', linewidth=0.8, zorder=9)
-    ax.plot(current_az, current_alt, 'o', color=color, markersize=size, markeredgecolor='black', zorder=10)
+    marker, = ax.plot(current_az, current_alt, 'o', color=color, markersize=size, markeredgecolor='black', zorder=10)
 
     # Plot the markers and label for the peak hours altitude and azimuth
-    for hour, (hour_alt, hour_az) in peak_hours_altaz.items():
-        if hour_alt < 0:
-            continue
-        else:
-            ax.plot(hour_az, hour_alt, 'o', color='k', markersize=3, zorder=9)
-            ax.text(hour_az, hour_alt, hour.hour, fontsize=7, ha='center', va='bottom')
+    hours = _visible_hours(path)
+    ax.plot(az[hours], alt[hours], 'o', color='k', markersize=3, zorder=9)
+    for hour, hour_alt, hour_az in zip(path.hour_times(hours), alt[hours], az[hours]):
+        ax.text(hour_az, hour_alt, hour.hour, fontsize=7, ha='center', va='bottom')
 
     # Plot the solstices for the sun
     if obj == 'sun':
-        summer_solstice, winter_solstice = eph.get_solstices(date.year)
-
-        solstices = [summer_solstice, winter_solstice]
+        solstice_paths = [report.solstice_paths['summer'], report.solstice_paths['winter']]
         solstice_colors = ['gold', 'blue']
         solstice_labels = ['Solstice d\'été', 'Solstice d\'hiver']
         style = {'linestyle': '--', 'linewidth': 0.8}
 
-        for solstice, color, label in zip(solstices, solstice_colors, solstice_labels):
-            solstice_alt, solstice_az, peak_hours_altaz = eph.compute_daily_path(solstice, obj)
+        for solstice_path, color, label in zip(solstice_paths, solstice_colors, solstice_labels):
+            solstice_alt, solstice_az = solstice_path.altitudes, solstice_path.azimuths
             if eph.latitude < 0:
                 solstice_az = correct_azimuth(solstice_az) # Correct the azimuth values for the southern hemisphere
 
@@ -188,19 +257,307 @@ def plot_xy_path(
             ax.plot(solstice_az, solstice_alt, color=color, label=label, **style)
 
             # Plot the markers for the peak hours altitude and azimuth
-            for hour, (hour_alt, hour_az) in peak_hours_altaz.items():
-                if hour_alt < 0:
+            hours = _visible_hours(solstice_path)
+            ax.plot(solstice_az[hours], solstice_alt[hours], 'o', color=color, markersize=3)
+
+        ax.legend(loc='upper right')
+
+    label = ax.annotate(date.strftime('%Y-%m-%d %H:%M:%S'), xy=(0, 0), xytext=(2, 86), fontsize=8, color='black')
+
+    return fig, ax, marker, label
+
+def animate_path(
+    eph,
+    obj,
+    date,
+    report,
+    plot_type,
+    times,
+    altitudes,
+    azimuths,
+    image_format='gif',
+    max_bytes=ANIMATION_MAX_BYTES
+):
+    """
+    Animate the object moving along its daily path, on the polar sky map or the XY path.
+
+    The static frame and the daily path are drawn once. For each frame, the background is restored
+    and only the marker and the time label are drawn again (blitting), so a frame costs a small
+    fraction of a full render. When the file is larger than max_bytes, every other frame is
+    dropped until it fits.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object.
+        obj (str): The sky object.
+        date (datetime): The date.
+        report (DailyReport): The daily report of the object.
+        plot_type (str): The type of plot ('polar' or 'cartesian').
+        times (list): The local times of the frames.
+        altitudes (np.ndarray): The altitudes of the object at each frame, in degrees.
+        azimuths (np.ndarray): The azimuths of the object at each frame, in degrees.
+        image_format (str, optional): The format of the animation ('gif' or 'png' for APNG). Defaults to 'gif'.
+        max_bytes (int, optional): The maximum size of the file. Defaults to ANIMATION_MAX_BYTES.
+
+    Returns:
+        bytes: The animated image.
+    """
+    if plot_type == 'polar':
+        fig, ax, marker, label = _draw_polar_sky(eph, obj, date, report)
+        x, y = np.radians(azimuths), 90 - np.asarray(altitudes)
+    else:
+        fig, ax, marker, label = _draw_xy_path(eph, obj, date, report)
+        x = correct_azimuth(azimuths) if eph.latitude < 0 else azimuths
+        y = altitudes
+
+    # Draw the static frame once, without the moving artists
+    fig.set_dpi(ANIMATION_DPI)
+    canvas = FigureCanvasAgg(fig)
+    marker.set_animated(True)
+    label.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    frames = []
+    for time, frame_x, frame_y in zip(times, x, y):
+        canvas.restore_region(background)
+        marker.set_data([frame_x], [frame_y])
+        label.set_text(time.strftime('%Y-%m-%d %H:%M'))
+        ax.draw_artist(marker)
+        ax.draw_artist(label)
+        frames.append(Image.fromarray(np.asarray(canvas.buffer_rgba())[..., :3].copy()))
+
+    # Share the palette of the first frame, the frames only differ by the marker and the label
+    if image_format == 'gif':
+        palette = frames[0].quantize(colors=255)
+        frames = [frame.quantize(palette=palette, dither=Image.Dither.NONE) for frame in frames]
+
+    while True:
+        buffer = BytesIO()
+        frames[0].save(
+            buffer,
+            format='GIF' if image_format == 'gif' else 'PNG',
+            save_all=True,
+            append_images=frames[1:],
+            duration=ANIMATION_FRAME_DURATION,
+            loop=0
+        )
+        if buffer.tell() <= max_bytes or len(frames) <= 2:
+            return buffer.getvalue()
+        frames = frames[::2]
+
+def plot_sky_map(
+    eph,
+    positions
+):
+    """
+    Plot a polar sky map of every body at once, with their trails.
+
+    Args:
+        eph (Ephemeris): The Ephemeris object.
+        positions (SkyPositions): The positions of the bodies, the last sample being the current one.
+
+    Returns:
+        BytesIO: The BytesIO image.
+    """
+    fig = Figure(figsize=(7, 6))
+    ax = _polar_axes(fig, eph)
+    names = {body: name for name, body in BODY_NAMES.items()}
+
+    # Hide the positions below the horizon
+    r = np.where(positions.altitudes >= 0, 90 - positions.altitudes, np.nan)
+    theta = np.radians(positions.azimuths)
+
+    below = []
+    for body, body_theta, body_r in zip(positions.bodies, theta, r):
+        color, size = BODIES[body]
+        if len(body_r) > 1:
+            ax.plot(body_theta, body_r, color=color, linewidth=1.5, alpha=0.7, zorder=9)
+        if np.isnan(body_r[-1]):
+            below.append(names[body])
+            continue
+        ax.plot(body_theta[-1], body_r[-1], 'o', color=color, markersize=size, markeredgecolor='black', zorder=10)
+        ax.annotate(names[body], (body_theta[-1], body_r[-1]), xytext=(0, size / 2 + 2), textcoords='offset points', fontsize=8, ha='center', va='bottom', zorder=12)
+
+    ax.grid(True)
+    ax.annotate(positions.now.strftime('%Y-%m-%d %H:%M:%S'), xy=(0, 0), xytext=(150, 140), fontsize=8, color='black')
+    if below:
+        fig.text(0.02, 0.02, f'Sous l\'horizon : {", ".join(below)}', fontsize=8)
+
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png')
+    buffer.seek(0)
+
+    return buffer
+
+class LiveSkyMap:
+    """
+    A class to render a polar sky map of a few bodies for one day, redrawing only their current positions.
+
+    The axes, the daily paths and their hourly markers are drawn once, and the pixels of this
+    background are kept. Each render restores the background, moves the markers and the time
+    label, and encodes the image, so a render costs a small fraction of a full plot.
+
+    Attributes:
+        bodies (list): The names of the bodies, as in constants.BODIES.
+
+    Methods:
+        render(positions): Render the current positions of the bodies on the background.
+    """
+
+    def __init__(
+        self,
+        eph,
+        paths: dict
+    ) -> None:
+        """
+        Draw the background of the map.
+
+        Args:
+            eph (Ephemeris): The Ephemeris object.
+            paths (dict): The daily path of each body, as DailyPath.
+        """
+        self.bodies = list(paths)
+
+        fig = Figure(figsize=(7, 6)) # Not attached to pyplot, so that maps can be rendered from several threads
+        ax = _polar_axes(fig, eph)
+        names = {body: name for name, body in BODY_NAMES.items()}
+
+        # Plot the daily paths, with their visible hourly markers
+        self._markers = {}
+        for body, path in paths.items():
+            color, size = BODIES[body]
+            alt, az = path.altitudes, path.azimuths
+            ax.plot(np.radians(az), 90 - alt, color=color, linewidth=1.2, zorder=9, label=names[body])
+            hours = _visible_hours(path)
+            ax.plot(np.radians(az[hours]), 90 - alt[hours], 'o', color=color, markersize=3, zorder=9)
+            for hour, hour_alt, hour_az in zip(path.hour_times(hours), alt[hours], az[hours]):
+                ax.text(np.radians(hour_az), 90 - hour_alt, hour.hour, fontsize=7, ha='center', va='bottom')
+            self._markers[body], = ax.plot([], [], 'o', color=color, markersize=size, markeredgecolor='black', zorder=10, animated=True)
+
+        ax.grid(True)
+        ax.legend(loc='upper left', bbox_to_anchor=(0.85, 1.1))
+        self._label = ax.annotate('', xy=(0, 0), xytext=(150, 140), fontsize=8, color='black', animated=True)
+
+        # Draw the static background once, without the moving artists
+        self._ax = ax
+        self._canvas = FigureCanvasAgg(fig)
+        self._canvas.draw()
+        self._background = self._canvas.copy_from_bbox(fig.bbox)
+        self._lock = threading.Lock()
+
+    def render(
+        self,
+        positions
+    ) -> bytes:
+        """
+        Render the current positions of the bodies on the background.
+
+        Args:
+            positions (SkyPositions): The positions of the bodies, the last sample being the current one.
+
+        Returns:
+            bytes: The PNG image.
+        """
+        with self._lock:
+            self._canvas.restore_region(self._background)
+            for body, altitudes, azimuths in zip(positions.bodies, positions.altitudes, positions.azimuths):
+                marker = self._markers.get(body)
+                if marker is None:
                     continue
+                # Hide the bodies below the horizon
+                if altitudes[-1] >= 0:
+                    marker.set_data([np.radians(azimuths[-1])], [90 - altitudes[-1]])
                 else:
-                    ax.plot(hour_az, hour_alt, 'o', color=color, markersize=3)
+                    marker.set_data([], [])
+                self._ax.draw_artist(marker)
+            self._label.set_text(positions.now.strftime('%Y-%m-%d %H:%M'))
+            self._ax.draw_artist(self._label)
+            image = Image.fromarray(np.asarray(self._canvas.buffer_rgba())[..., :3].copy())
+
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+def draw_moon_phase(
+    ax,
+    x,
+    y,
+    radius,
+    phase
+):
+    """
+    Draw the moon as seen for the given phase.
 
-        ax.legend(loc='upper right')
+    Args:
+        ax (Axes): The axes, with an equal aspect ratio.
+        x (float): The x coordinate of the center of the moon.
+        y (float): The y coordinate of the center of the moon.
+        radius (float): The radius of the moon.
+        phase (float): The moon phase in degrees (0 for the new moon, 180 for the full moon).
+    """
+    dark, lit = '#404040', '#f5f3ce'
+    ax.add_patch(Circle((x, y), radius, color=dark))
+
+    # Light the right half while waxing and the left half while waning
+    theta1, theta2 = (-90, 90) if phase % 360 < 180 else (90, 270)
+    ax.add_patch(Wedge((x, y), radius, theta1, theta2, color=lit))
+
+    # The terminator hides part of the lit half (crescent) or lights part of the dark half (gibbous)
+    cos_phase = np.cos(np.radians(phase))
+    ax.add_patch(Ellipse((x, y), 2 * radius * abs(cos_phase), 2 * radius, color=dark if cos_phase > 0 else lit))
+
+def plot_calendar(
+    eph,
+    month_calendar
+):
+    """
+    Plot the calendar of a body over a month.
 
-    ax.annotate(date.strftime('%Y-%m-%d %H:%M:%S'), xy=(0, 0), xytext=(2, 86), fontsize=8, color='black')
+    Args:
+        eph (Ephemeris): The Ephemeris object.
+        month_calendar (MonthCalendar): The calendar of the body.
+
+    Returns:
+        BytesIO: The BytesIO image.
+    """
+    first_weekday = month_calendar.dates[0].weekday()
+    weeks = (first_weekday + len(month_calendar.dates) + 6) // 7
+
+    fig = Figure(figsize=(10, 1.2 * weeks + 1))
+    ax = fig.subplots()
+    ax.set_xlim(0, 7)
+    ax.set_ylim(weeks, -0.4)
+    ax.set_aspect('equal')
+    ax.axis('off')
+
+    names = {body: name for name, body in BODY_NAMES.items()}
+    ax.set_title(
+        f'{names[month_calendar.body]} - {MONTHS[month_calendar.month - 1]} {month_calendar.year} '
+        f'({eph.latitude:.2f}°, {eph.longitude:.2f}°)'
+    )
+
+    # Plot the weekdays above the grid
+    for column, weekday in enumerate(WEEKDAYS):
+        ax.text(column + 0.5, -0.2, weekday, fontsize=9, ha='center', va='center', weight='bold')
+
+    # Plot one cell per day, with the rise and set times, the time above the horizon and the moon phase
+    for index, date in enumerate(month_calendar.dates):
+        column, row = (first_weekday + index) % 7, (first_weekday + index) // 7
+        ax.plot([column, column + 1, column + 1, column, column], [row, row, row + 1, row + 1, row], color='lightgrey', linewidth=0.8)
+        ax.text(column + 0.06, row + 0.08, date.day, fontsize=9, ha='left', va='top', weight='bold')
+        draw_moon_phase(ax, column + 0.84, row + 0.16, 0.1, month_calendar.moon_phases[index])
+
+        rise_time, set_time = month_calendar.rise_times[index], month_calendar.set_times[index]
+        hours, seconds = divmod(round(month_calendar.durations[index].total_seconds() / 60) * 60, 3600)
+        lines = [
+            f'↑ {rise_time.strftime("%H:%M") if rise_time else "--:--"}',
+            f'↓ {set_time.strftime("%H:%M") if set_time else "--:--"}',
+            f'{hours}h{seconds // 60:02}',
+        ]
+        ax.text(column + 0.5, row + 0.62, '\n'.join(lines), fontsize=7, ha='center', va='center', linespacing=1.3)
 
     buffer = BytesIO()
-    plt.savefig(buffer, format='png')
-    plt.close()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
     buffer.seek(0)
 
     return buffer
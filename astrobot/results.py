@@ -0,0 +1,384 @@
+"""
+This module contains the compact result types of AstroBot.
+
+A daily path or a list of events used to be a few lists and dicts of Python floats, times and
+datetimes, which is many small objects per request and slow to cache or to send to another
+process. These types keep the same values in contiguous NumPy arrays instead: the times as POSIX
+timestamps, the positions as float32. They convert to and from bytes without copying the arrays
+(and pickle through those bytes), and still unpack like the tuples they replace.
+
+Attributes:
+    SEASON_NAMES (tuple): The names of the seasons, by their code in almanac.seasons.
+
+Methods:
+    None
+"""
+
+import struct
+from dataclasses import dataclass
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+SEASON_NAMES = ('spring', 'summer', 'autumn', 'winter')
+
+# Header of the bytes: start, step, number of samples, number of hourly markers, length of the timezone
+_PATH_HEADER = struct.Struct('<ddHHB')
+# Header of the bytes: number of events, length of the timezone
+_EVENTS_HEADER = struct.Struct('<HB')
+
+@dataclass(slots=True, eq=False)
+class DailyPath:
+    """
+    A class to hold the positions of a body sampled evenly over a day.
+
+    Attributes:
+        start (float): The POSIX timestamp of the first sample.
+        step (float): The time interval between the samples, in seconds.
+        timezone (str): The IANA name of the local timezone.
+        samples (np.ndarray): The altitudes and azimuths of the samples in degrees, as float32 of shape (2, samples).
+        hours (np.ndarray): The indices of the samples marked every hour.
+
+    Methods:
+        times: Get the POSIX timestamps of the samples.
+        altitudes: Get the altitudes of the samples.
+        azimuths: Get the azimuths of the samples.
+        hour_times(indices): Get the local times of samples.
+        peak_hours_altaz: Get the altitude and azimuth every hour, as a dict keyed by local time.
+        to_bytes(): Convert the path to bytes.
+        from_bytes(data): Read a path from bytes.
+    """
+    start: float
+    step: float
+    timezone: str
+    samples: np.ndarray
+    hours: np.ndarray
+
+    def __post_init__(
+        self
+    ) -> None:
+        """
+        Store the samples and the hourly markers as contiguous compact arrays.
+        """
+        self.samples = np.ascontiguousarray(self.samples, dtype=np.float32)
+        self.hours = np.ascontiguousarray(self.hours, dtype=np.uint16)
+
+    @property
+    def times(
+        self
+    ) -> np.ndarray:
+        """
+        Get the POSIX timestamps of the samples.
+
+        Returns:
+            np.ndarray: The timestamps, as float64.
+        """
+        return self.start + np.arange(self.samples.shape[1]) * self.step
+
+    @property
+    def altitudes(
+        self
+    ) -> np.ndarray:
+        """
+        Get the altitudes of the samples.
+
+        Returns:
+            np.ndarray: The altitudes in degrees, as float32.
+        """
+        return self.samples[0]
+
+    @property
+    def azimuths(
+        self
+    ) -> np.ndarray:
+        """
+        Get the azimuths of the samples.
+
+        Returns:
+            np.ndarray: The azimuths in degrees, as float32.
+        """
+        return self.samples[1]
+
+    def hour_times(
+        self,
+        indices: np.ndarray = None
+    ) -> list:
+        """
+        Get the local times of samples.
+
+        Args:
+            indices (np.ndarray, optional): The indices of the samples. Defaults to the hourly markers.
+
+        Returns:
+            list: The times of the samples, as datetime.time in the local timezone.
+        """
+        indices = self.hours if indices is None else indices
+        timezone = ZoneInfo(self.timezone)
+        return [datetime.fromtimestamp(self.start + int(index) * self.step, timezone).time() for index in indices]
+
+    @property
+    def peak_hours_altaz(
+        self
+    ) -> dict:
+        """
+        Get the altitude and azimuth every hour, as a dict keyed by local time.
+
+        Returns:
+            dict: The rounded altitude and azimuth of each hourly marker.
+        """
+        altitudes, azimuths = self.samples[:, self.hours].astype(float).round(2)
+        return dict(zip(self.hour_times(), zip(altitudes.tolist(), azimuths.tolist())))
+
+    def _rounded(
+        self,
+        row: int
+    ) -> list[float]:
+        """
+        Get the altitudes (row 0) or the azimuths (row 1) of the samples, as Python floats rounded to 0.01°.
+        """
+        return self.samples[row].astype(float).round(2).tolist()
+
+    def __iter__(
+        self
+    ):
+        """
+        Unpack the path as the (altitudes, azimuths, peak_hours_altaz) tuple of Python values.
+        """
+        return iter((self._rounded(0), self._rounded(1), self.peak_hours_altaz))
+
+    def __getitem__(
+        self,
+        index: int
+    ):
+        """
+        Get an item of the (altitudes, azimuths, peak_hours_altaz) tuple, converting only that item.
+        """
+        if isinstance(index, slice):
+            return tuple(self)[index]
+        items = (lambda: self._rounded(0), lambda: self._rounded(1), lambda: self.peak_hours_altaz)
+        return items[index]()
+
+    def __eq__(
+        self,
+        other
+    ) -> bool:
+        """
+        Compare the values of two paths.
+        """
+        if not isinstance(other, DailyPath):
+            return NotImplemented
+        return (
+            (self.start, self.step, self.timezone) == (other.start, other.step, other.timezone)
+            and np.array_equal(self.samples, other.samples)
+            and np.array_equal(self.hours, other.hours)
+        )
+
+    def to_bytes(
+        self
+    ) -> bytes:
+        """
+        Convert the path to bytes.
+
+        Returns:
+            bytes: The header, the timezone, the samples and the hourly markers.
+        """
+        timezone = self.timezone.encode()
+        header = _PATH_HEADER.pack(self.start, self.step, self.samples.shape[1], len(self.hours), len(timezone))
+        return b''.join((header, timezone, self.samples.astype('<f4', copy=False).tobytes(), self.hours.astype('<u2', copy=False).tobytes()))
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes
+    ) -> 'DailyPath':
+        """
+        Read a path from bytes, without copying the arrays.
+
+        Args:
+            data (bytes): The bytes returned by to_bytes.
+
+        Returns:
+            DailyPath: The path.
+        """
+        start, step, samples, hours, timezone_length = _PATH_HEADER.unpack_from(data)
+        offset = _PATH_HEADER.size + timezone_length
+        timezone = bytes(data[_PATH_HEADER.size:offset]).decode()
+        samples_array = np.frombuffer(data, dtype='<f4', count=2 * samples, offset=offset).reshape(2, samples)
+        hours_array = np.frombuffer(data, dtype='<u2', count=hours, offset=offset + 8 * samples)
+        return cls(start, step, timezone, samples_array, hours_array)
+
+    def __reduce__(
+        self
+    ):
+        """
+        Pickle through the bytes of to_bytes.
+        """
+        return self.from_bytes, (self.to_bytes(),)
+
+@dataclass(slots=True, eq=False)
+class Events:
+    """
+    A class to hold discrete events, such as twilight transitions or seasons.
+
+    Attributes:
+        timezone (str): The IANA name of the local timezone.
+        times (np.ndarray): The POSIX timestamps of the events, as float64.
+        codes (np.ndarray): The code of each event, as int8.
+
+    Methods:
+        datetimes(): Get the times of the events in the local timezone.
+        to_bytes(): Convert the events to bytes.
+        from_bytes(data): Read events from bytes.
+    """
+    timezone: str
+    times: np.ndarray
+    codes: np.ndarray
+
+    def __post_init__(
+        self
+    ) -> None:
+        """
+        Store the times and the codes as contiguous compact arrays.
+        """
+        self.times = np.ascontiguousarray(self.times, dtype=np.float64)
+        self.codes = np.ascontiguousarray(self.codes, dtype=np.int8)
+
+    def __len__(
+        self
+    ) -> int:
+        """
+        Get the length of the tuple of Python values that the events replace, like iteration and indexing.
+        The number of events is len(events.times).
+        """
+        return 2
+
+    def datetimes(
+        self
+    ) -> list[datetime]:
+        """
+        Get the times of the events in the local timezone.
+
+        Returns:
+            list: The times of the events, as aware datetimes.
+        """
+        timezone = ZoneInfo(self.timezone)
+        return [datetime.fromtimestamp(time, timezone) for time in self.times.tolist()]
+
+    def _legacy(
+        self
+    ) -> tuple:
+        """
+        Get the tuple of Python values that the events replace.
+        """
+        return self.datetimes(), self.codes
+
+    def __iter__(
+        self
+    ):
+        """
+        Unpack the events as the tuple of Python values that they replace.
+        """
+        return iter(self._legacy())
+
+    def __getitem__(
+        self,
+        index: int
+    ):
+        """
+        Get an item of the tuple of Python values that the events replace.
+        """
+        return self._legacy()[index]
+
+    def __eq__(
+        self,
+        other
+    ) -> bool:
+        """
+        Compare the values of two lists of events.
+        """
+        if not isinstance(other, Events):
+            return NotImplemented
+        return (
+            type(self) is type(other)
+            and self.timezone == other.timezone
+            and np.array_equal(self.times, other.times)
+            and np.array_equal(self.codes, other.codes)
+        )
+
+    def to_bytes(
+        self
+    ) -> bytes:
+        """
+        Convert the events to bytes.
+
+        Returns:
+            bytes: The header, the timezone, the times and the codes.
+        """
+        timezone = self.timezone.encode()
+        header = _EVENTS_HEADER.pack(len(self.times), len(timezone))
+        return b''.join((header, timezone, self.times.astype('<f8', copy=False).tobytes(), self.codes.tobytes()))
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes
+    ) -> 'Events':
+        """
+        Read events from bytes, without copying the arrays.
+
+        Args:
+            data (bytes): The bytes returned by to_bytes.
+
+        Returns:
+            Events: The events.
+        """
+        count, timezone_length = _EVENTS_HEADER.unpack_from(data)
+        offset = _EVENTS_HEADER.size + timezone_length
+        timezone = bytes(data[_EVENTS_HEADER.size:offset]).decode()
+        times = np.frombuffer(data, dtype='<f8', count=count, offset=offset)
+        codes = np.frombuffer(data, dtype=np.int8, count=count, offset=offset + 8 * count)
+        return cls(timezone, times, codes)
+
+    def __reduce__(
+        self
+    ):
+        """
+        Pickle through the bytes of to_bytes.
+        """
+        return self.from_bytes, (self.to_bytes(),)
+
+@dataclass(slots=True, eq=False)
+class TwilightEvents(Events):
+    """
+    A class to hold the twilight transitions of a day.
+
+    The codes are the levels of almanac.dark_twilight_day reached at each transition: 0 for the
+    night, 1 for the astronomical twilight, 2 for the nautical twilight, 3 for the civil twilight
+    and 4 for the day. It unpacks as the (times, events) tuple, with the times as datetime.time.
+    """
+
+    def _legacy(
+        self
+    ) -> tuple:
+        """
+        Get the (times, events) tuple, with the local times as datetime.time.
+        """
+        return [time.time() for time in self.datetimes()], self.codes
+
+@dataclass(slots=True, eq=False)
+class SeasonEvents(Events):
+    """
+    A class to hold the starts of the seasons of a year.
+
+    The codes are those of almanac.seasons, named by SEASON_NAMES. It unpacks as the (dates, names)
+    tuple, with the dates as aware datetimes.
+    """
+
+    def _legacy(
+        self
+    ) -> tuple:
+        """
+        Get the (dates, names) tuple.
+        """
+        return self.datetimes(), [SEASON_NAMES[code] for code in self.codes.tolist()]
@@ -0,0 +1,1048 @@
+"""
+This module contains the compute service of AstroBot and its client.
+
+In service mode, one long-running process owns the ephemeris kernels, the caches and the render
+threads, and serves the requests of the bot processes over a Unix-domain socket. Several bot
+processes (or gateway shards) on the same host then share one warm cache and one set of mapped
+kernels.
+
+Every message is a frame made of a fixed header (message type, request id, payload length)
+followed by its payload. Requests are multiplexed on one connection by their id, so a client can
+have many requests in flight. Compute requests are packed with struct; the report or calendar
+of the answer is pickled, since the socket is local: it is created only readable by its owner, and
+both ends check that the process at the other end runs as the same user before exchanging frames.
+
+Attributes:
+    HEADER (struct.Struct): The header of every frame (message type, request id, payload length).
+    COMPUTE (struct.Struct): The fixed part of a compute request, followed by the timezone.
+    CALENDAR (struct.Struct): The fixed part of a calendar request, followed by the timezone.
+    TONIGHT (struct.Struct): The fixed part of an observing windows request, followed by the timezone.
+    SKY (struct.Struct): The fixed part of a sky map request, followed by the timezone.
+    LIVE (struct.Struct): The fixed part of a live sky map request, followed by the timezone.
+    DIGESTS (struct.Struct): The fixed part of a digests request (date, number of sites).
+    SITE (struct.Struct): The location of one site of a digests or comparison request, followed by the timezones.
+    COMPARE (struct.Struct): The fixed part of a comparison request (body, date, number of sites, user, guild).
+    RESULT (struct.Struct): The fixed part of a result (report length, image length or -1).
+    BUSY (struct.Struct): The payload of a busy answer (waiting requests).
+    MESSAGE_COMPUTE (int): The type of a compute request.
+    MESSAGE_STATUS (int): The type of a kernel status request, followed by the kernel name.
+    MESSAGE_RESULT (int): The type of a compute result.
+    MESSAGE_STATUS_RESULT (int): The type of a kernel status result, as JSON.
+    MESSAGE_BUSY (int): The type of the answer sent when the work queue is full.
+    MESSAGE_ERROR (int): The type of the answer sent when a request failed, followed by the error.
+    MESSAGE_CALENDAR (int): The type of a calendar request, answered like a compute request.
+    MESSAGE_TONIGHT (int): The type of an observing windows request, answered like a text-only compute request.
+    MESSAGE_SKY (int): The type of a sky map request, answered like a compute request.
+    MESSAGE_LIVE (int): The type of a live sky map request, answered like a compute request.
+    MESSAGE_DIGESTS (int): The type of a digests request, answered like a text-only compute request.
+    MESSAGE_COMPARE (int): The type of a comparison request, answered like a text-only compute request.
+
+Methods:
+    encode_compute: Encode a compute request.
+    decode_compute: Decode a compute request.
+    encode_calendar: Encode a calendar request.
+    decode_calendar: Decode a calendar request.
+    encode_tonight: Encode an observing windows request.
+    decode_tonight: Decode an observing windows request.
+    encode_sky: Encode a sky map request.
+    decode_sky: Decode a sky map request.
+    encode_live: Encode a live sky map request.
+    decode_live: Decode a live sky map request.
+    encode_digests: Encode a digests request.
+    decode_digests: Decode a digests request.
+    encode_compare: Encode a comparison request.
+    decode_compare: Decode a comparison request.
+    serve: Serve the compute requests on a Unix-domain socket until cancelled.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import pickle
+import socket
+import struct
+from datetime import date as Date, datetime, timedelta
+
+from constants import ANIMATION_FORMATS, BODIES, PLOT_DATA, PLOT_TYPES
+from workqueue import QueueFullError
+import kernels
+import pipeline
+
+HEADER = struct.Struct('!BII')
+COMPUTE = struct.Struct('!BBBdddiqQQ')
+CALENDAR = struct.Struct('!BdddHBQQ')
+TONIGHT = struct.Struct('!dddiddQQ')
+SKY = struct.Struct('!dddqBQQ')
+LIVE = struct.Struct('!dddqQQ')
+DIGESTS = struct.Struct('!iI')
+SITE = struct.Struct('!ddd')
+COMPARE = struct.Struct('!BiIQQ')
+RESULT = struct.Struct('!Ii')
+BUSY = struct.Struct('!I')
+
+MESSAGE_COMPUTE = 1
+MESSAGE_STATUS = 2
+MESSAGE_RESULT = 3
+MESSAGE_STATUS_RESULT = 4
+MESSAGE_BUSY = 5
+MESSAGE_ERROR = 6
+MESSAGE_CALENDAR = 7
+MESSAGE_TONIGHT = 8
+MESSAGE_SKY = 9
+MESSAGE_LIVE = 10
+MESSAGE_DIGESTS = 11
+MESSAGE_COMPARE = 12
+
+_BODY_NAMES = list(BODIES)
+_PLOT_TYPE_NAMES = [None, *PLOT_TYPES.values(), PLOT_DATA]
+_ANIMATION_NAMES = [None, *ANIMATION_FORMATS.values()]
+_EPOCH = datetime(1, 1, 1)
+
+class ServiceError(Exception):
+    """
+    Raised when the compute service fails to answer a request.
+    """
+
+def encode_compute(
+    body: str,
+    plot_type: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    now: datetime,
+    user_id: int = None,
+    guild_id: int = None,
+    animation: str = None
+) -> bytes:
+    """
+    Encode a compute request.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        plot_type (str): The type of plot, as in constants.PLOT_TYPES values, PLOT_DATA for the data of the plots without an image, or None for text only.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the report.
+        now (datetime): The time of the current position.
+        user_id (int, optional): The user who sent the request. Defaults to None.
+        guild_id (int, optional): The guild of the request. Defaults to None.
+        animation (str, optional): The format of the animated path, or None. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return COMPUTE.pack(
+        _BODY_NAMES.index(body),
+        _PLOT_TYPE_NAMES.index(plot_type),
+        _ANIMATION_NAMES.index(animation),
+        latitude,
+        longitude,
+        altitude,
+        date.toordinal(),
+        (now - _EPOCH) // timedelta(microseconds=1),
+        user_id or 0,
+        guild_id or 0,
+    ) + timezone.encode()
+
+def decode_compute(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a compute request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute, with the date as a datetime at midnight.
+    """
+    body, plot_type, animation, latitude, longitude, altitude, ordinal, now, user_id, guild_id = COMPUTE.unpack_from(payload)
+    date = Date.fromordinal(ordinal)
+
+    return (
+        _BODY_NAMES[body],
+        _PLOT_TYPE_NAMES[plot_type],
+        latitude,
+        longitude,
+        altitude,
+        payload[COMPUTE.size:].decode(),
+        datetime(date.year, date.month, date.day),
+        _EPOCH + timedelta(microseconds=now),
+        user_id or None,
+        guild_id or None,
+        _ANIMATION_NAMES[animation],
+    )
+
+def encode_calendar(
+    body: str,
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    year: int,
+    month: int,
+    user_id: int = None,
+    guild_id: int = None
+) -> bytes:
+    """
+    Encode a calendar request.
+
+    Args:
+        body (str): The name of the body, as in constants.BODIES.
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        year (int): The year of the month.
+        month (int): The month.
+        user_id (int, optional): The user who sent the request. Defaults to None.
+        guild_id (int, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return CALENDAR.pack(
+        _BODY_NAMES.index(body),
+        latitude,
+        longitude,
+        altitude,
+        year,
+        month,
+        user_id or 0,
+        guild_id or 0,
+    ) + timezone.encode()
+
+def decode_calendar(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a calendar request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_calendar.
+    """
+    body, latitude, longitude, altitude, year, month, user_id, guild_id = CALENDAR.unpack_from(payload)
+
+    return (
+        _BODY_NAMES[body],
+        latitude,
+        longitude,
+        altitude,
+        payload[CALENDAR.size:].decode(),
+        year,
+        month,
+        user_id or None,
+        guild_id or None,
+    )
+
+def encode_tonight(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    date: datetime,
+    sun_altitude: float,
+    min_altitude: float,
+    user_id: int = None,
+    guild_id: int = None
+) -> bytes:
+    """
+    Encode an observing windows request.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        date (datetime): The date of the evening of the night.
+        sun_altitude (float): The highest altitude of the sun, in degrees.
+        min_altitude (float): The lowest altitude of the bodies, in degrees.
+        user_id (int, optional): The user who sent the request. Defaults to None.
+        guild_id (int, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return TONIGHT.pack(
+        latitude,
+        longitude,
+        altitude,
+        date.toordinal(),
+        sun_altitude,
+        min_altitude,
+        user_id or 0,
+        guild_id or 0,
+    ) + timezone.encode()
+
+def decode_tonight(
+    payload: bytes
+) -> tuple:
+    """
+    Decode an observing windows request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_tonight, with the date as a datetime at midnight.
+    """
+    latitude, longitude, altitude, ordinal, sun_altitude, min_altitude, user_id, guild_id = TONIGHT.unpack_from(payload)
+    date = Date.fromordinal(ordinal)
+
+    return (
+        latitude,
+        longitude,
+        altitude,
+        payload[TONIGHT.size:].decode(),
+        datetime(date.year, date.month, date.day),
+        sun_altitude,
+        min_altitude,
+        user_id or None,
+        guild_id or None,
+    )
+
+def encode_sky(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime,
+    trail_hours: int = 0,
+    user_id: int = None,
+    guild_id: int = None
+) -> bytes:
+    """
+    Encode a sky map request.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The time of the positions.
+        trail_hours (int, optional): The number of hours covered by the trails. Defaults to 0.
+        user_id (int, optional): The user who sent the request. Defaults to None.
+        guild_id (int, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return SKY.pack(
+        latitude,
+        longitude,
+        altitude,
+        (now - _EPOCH) // timedelta(microseconds=1),
+        trail_hours,
+        user_id or 0,
+        guild_id or 0,
+    ) + timezone.encode()
+
+def decode_sky(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a sky map request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_sky.
+    """
+    latitude, longitude, altitude, now, trail_hours, user_id, guild_id = SKY.unpack_from(payload)
+
+    return (
+        latitude,
+        longitude,
+        altitude,
+        payload[SKY.size:].decode(),
+        _EPOCH + timedelta(microseconds=now),
+        trail_hours,
+        user_id or None,
+        guild_id or None,
+    )
+
+def _pack_result(
+    result,
+    image: bytes
+) -> bytes:
+    """
+    Pack the payload of a result.
+
+    Args:
+        result: The daily report or the calendar.
+        image (bytes): The image, or None.
+
+    Returns:
+        bytes: The payload of the result.
+    """
+    result = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    return RESULT.pack(len(result), -1 if image is None else len(image)) + result + (image or b'')
+
+def _unpack_result(
+    payload: bytes
+) -> tuple:
+    """
+    Unpack the payload of a result.
+
+    Args:
+        payload (bytes): The payload of the result.
+
+    Returns:
+        tuple: The daily report or the calendar, and the image or None.
+    """
+    result_length, image_length = RESULT.unpack_from(payload)
+    result = pickle.loads(payload[RESULT.size:RESULT.size + result_length])
+    image = None if image_length < 0 else payload[RESULT.size + result_length:]
+    return result, image
+
+async def _read_frame(
+    reader: asyncio.StreamReader
+) -> tuple[int, int, bytes]:
+    """
+    Read one frame.
+
+    Args:
+        reader (asyncio.StreamReader): The stream of the connection.
+
+    Returns:
+        tuple: The message type, the request id and the payload.
+    """
+    message, request_id, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return message, request_id, await reader.readexactly(length)
+
+def encode_live(
+    latitude: float,
+    longitude: float,
+    altitude: float,
+    timezone: str,
+    now: datetime,
+    user_id: int = None,
+    guild_id: int = None
+) -> bytes:
+    """
+    Encode a live sky map request.
+
+    Args:
+        latitude (float): The latitude of the observer.
+        longitude (float): The longitude of the observer.
+        altitude (float): The altitude of the observer in meters.
+        timezone (str): The timezone of the observer.
+        now (datetime): The local time of the positions.
+        user_id (int, optional): The user who created the live message. Defaults to None.
+        guild_id (int, optional): The guild of the live message. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return LIVE.pack(
+        latitude,
+        longitude,
+        altitude,
+        (now - _EPOCH) // timedelta(microseconds=1),
+        user_id or 0,
+        guild_id or 0,
+    ) + timezone.encode()
+
+def decode_live(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a live sky map request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_live.
+    """
+    latitude, longitude, altitude, now, user_id, guild_id = LIVE.unpack_from(payload)
+
+    return (
+        latitude,
+        longitude,
+        altitude,
+        payload[LIVE.size:].decode(),
+        _EPOCH + timedelta(microseconds=now),
+        user_id or None,
+        guild_id or None,
+    )
+
+def _pack_sites(
+    sites: list[tuple]
+) -> bytes:
+    """
+    Pack the locations of several sites, followed by their timezones.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each site.
+
+    Returns:
+        bytes: The packed sites.
+    """
+    return (
+        b''.join(SITE.pack(latitude, longitude, altitude) for latitude, longitude, altitude, _ in sites)
+        + '\n'.join(timezone for *_, timezone in sites).encode()
+    )
+
+def _unpack_sites(
+    payload: bytes,
+    count: int
+) -> list[tuple]:
+    """
+    Unpack the locations of several sites, followed by their timezones.
+
+    Args:
+        payload (bytes): The packed sites.
+        count (int): The number of sites.
+
+    Returns:
+        list: The latitude, longitude, altitude and timezone of each site.
+    """
+    locations = SITE.iter_unpack(payload[:count * SITE.size])
+    timezones = payload[count * SITE.size:].decode().split('\n') if count else []
+    return [(*location, timezone) for location, timezone in zip(locations, timezones)]
+
+def encode_digests(
+    sites: list[tuple],
+    date: Date
+) -> bytes:
+    """
+    Encode a digests request.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each site.
+        date (datetime.date): The local date of the digests.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return DIGESTS.pack(date.toordinal(), len(sites)) + _pack_sites(sites)
+
+def decode_digests(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a digests request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_digests.
+    """
+    date, count = DIGESTS.unpack_from(payload)
+
+    return _unpack_sites(payload[DIGESTS.size:], count), Date.fromordinal(date)
+
+def encode_compare(
+    sites: list[tuple],
+    body: str,
+    date: datetime,
+    user_id: int = None,
+    guild_id: int = None
+) -> bytes:
+    """
+    Encode a comparison request.
+
+    Args:
+        sites (list): The latitude, longitude, altitude and timezone of each location.
+        body (str): The name of the body, as in constants.BODIES.
+        date (datetime): The local date.
+        user_id (int, optional): The user who sent the request. Defaults to None.
+        guild_id (int, optional): The guild of the request. Defaults to None.
+
+    Returns:
+        bytes: The payload of the request.
+    """
+    return COMPARE.pack(
+        _BODY_NAMES.index(body),
+        date.toordinal(),
+        len(sites),
+        user_id or 0,
+        guild_id or 0,
+    ) + _pack_sites(sites)
+
+def decode_compare(
+    payload: bytes
+) -> tuple:
+    """
+    Decode a comparison request.
+
+    Args:
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The arguments of pipeline.compute_compare, with the date as a datetime at midnight.
+    """
+    body, ordinal, count, user_id, guild_id = COMPARE.unpack_from(payload)
+    date = Date.fromordinal(ordinal)
+
+    return (
+        _unpack_sites(payload[COMPARE.size:], count),
+        _BODY_NAMES[body],
+        datetime(date.year, date.month, date.day),
+        user_id or None,
+        guild_id or None,
+    )
+
+def _peer_uid(
+    writer: asyncio.StreamWriter
+) -> int | None:
+    """
+    Get the user id of the process at the other end of a connection.
+
+    Args:
+        writer (asyncio.StreamWriter): The outgoing stream of the connection.
+
+    Returns:
+        int: The user id of the peer, or None where the platform cannot tell (no SO_PEERCRED).
+    """
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    credentials = writer.get_extra_info('socket').getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    _, uid, _ = struct.unpack('3i', credentials)
+    return uid
+
+def _pack_frame(
+    message: int,
+    request_id: int,
+    payload: bytes
+) -> bytes:
+    """
+    Pack one frame.
+
+    Args:
+        message (int): The message type.
+        request_id (int): The request id.
+        payload (bytes): The payload.
+
+    Returns:
+        bytes: The frame.
+    """
+    return HEADER.pack(message, request_id, len(payload)) + payload
+
+async def _answer(
+    message: int,
+    payload: bytes
+) -> tuple[int, bytes]:
+    """
+    Compute the answer of one request.
+
+    Args:
+        message (int): The message type of the request.
+        payload (bytes): The payload of the request.
+
+    Returns:
+        tuple: The message type and the payload of the answer.
+    """
+    try:
+        if message == MESSAGE_STATUS:
+            return MESSAGE_STATUS_RESULT, json.dumps(kernels.manager.status(payload.decode())).encode()
+        if message == MESSAGE_COMPUTE:
+            return MESSAGE_RESULT, _pack_result(*await pipeline.compute(*decode_compute(payload)))
+        if message == MESSAGE_CALENDAR:
+            return MESSAGE_RESULT, _pack_result(*await pipeline.compute_calendar(*decode_calendar(payload)))
+        if message == MESSAGE_TONIGHT:
+            return MESSAGE_RESULT, _pack_result(await pipeline.compute_tonight(*decode_tonight(payload)), None)
+        if message == MESSAGE_SKY:
+            return MESSAGE_RESULT, _pack_result(*await pipeline.compute_sky(*decode_sky(payload)))
+        if message == MESSAGE_LIVE:
+            return MESSAGE_RESULT, _pack_result(*await pipeline.compute_live(*decode_live(payload)))
+        if message == MESSAGE_DIGESTS:
+            return MESSAGE_RESULT, _pack_result(await pipeline.compute_digests(*decode_digests(payload)), None)
+        if message == MESSAGE_COMPARE:
+            return MESSAGE_RESULT, _pack_result(await pipeline.compute_compare(*decode_compare(payload)), None)
+        return MESSAGE_ERROR, f'Unknown message type {message}'.encode()
+    except QueueFullError as error:
+        return MESSAGE_BUSY, BUSY.pack(error.waiting)
+    except Exception as error:
+        return MESSAGE_ERROR, repr(error).encode()
+
+async def _handle(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter
+) -> None:
+    """
+    Serve the requests of one connection, answering each one as soon as it is computed.
+
+    Args:
+        reader (asyncio.StreamReader): The incoming stream of the connection.
+        writer (asyncio.StreamWriter): The outgoing stream of the connection.
+    """
+    # Only serve the processes of the same user
+    if _peer_uid(writer) not in (None, os.getuid()):
+        writer.close()
+        return
+
+    async def respond(message, request_id, payload):
+        message, payload = await _answer(message, payload)
+        writer.write(_pack_frame(message, request_id, payload))
+        await writer.drain()
+
+    tasks = set()
+    try:
+        while True:
+            message, request_id, payload = await _read_frame(reader)
+            task = asyncio.create_task(respond(message, request_id, payload))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        writer.close()
+
+async def serve(
+    path: str
+) -> None:
+    """
+    Serve the compute requests on a Unix-domain socket until cancelled.
+
+    Args:
+        path (str): The path of the socket.
+    """
+    if os.path.exists(path):
+        os.remove(path)
+
+    # Create the socket only readable by its owner, there is no window where another user can connect
+    umask = os.umask(0o077)
+    try:
+        server = await asyncio.start_unix_server(_handle, path)
+    finally:
+        os.umask(umask)
+
+    print(f'AstroBot - Compute service listening on {path}')
+    async with server:
+        await server.serve_forever()
+
+class ComputeClient:
+    """
+    A class to send the requests of a bot process to the compute service.
+
+    The client opens one connection on the first request and reopens it if the service restarts.
+
+    Attributes:
+        path (str): The path of the socket of the service.
+
+    Methods:
+        compute(...): Compute the daily report and the plot of a request on the service.
+        compute_calendar(...): Compute and render the calendar of a month on the service.
+        compute_tonight(...): Compute the observing windows of a night on the service.
+        compute_sky(...): Compute and render the sky map of every body on the service.
+        compute_live(...): Render the live sky map of a location on the service.
+        compute_digests(...): Compute the daily digests of several sites on the service.
+        compute_compare(...): Compute the rise and set times of a body for several locations on the service.
+        kernel_status(filename): Get the status of a kernel on the service.
+        close(): Close the connection.
+    """
+
+    def __init__(
+        self,
+        path: str
+    ) -> None:
+        """
+        Initialize the ComputeClient object.
+
+        Args:
+            path (str): The path of the socket of the service.
+        """
+        self.path = path
+
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._writer = None
+        self._reader_task = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(
+        self
+    ) -> asyncio.StreamWriter:
+        """
+        Open the connection if needed.
+
+        Returns:
+            asyncio.StreamWriter: The outgoing stream of the connection.
+
+        Raises:
+            ServiceError: If the service is not running, or runs as another user.
+        """
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.path)
+                except OSError as error:
+                    raise ServiceError(f'Cannot connect to the compute service at {self.path}: {error!r}') from error
+
+                # The answers are unpickled, only trust a service of the same user
+                owner = _peer_uid(writer)
+                if owner is None:
+                    owner = os.stat(self.path).st_uid
+                if owner != os.getuid():
+                    writer.close()
+                    raise ServiceError(f'The compute service at {self.path} runs as another user')
+
+                self._writer = writer
+                self._reader_task = asyncio.create_task(self._read(reader))
+            return self._writer
+
+    async def _read(
+        self,
+        reader: asyncio.StreamReader
+    ) -> None:
+        """
+        Give the answers of the service to the pending requests, until the connection closes.
+
+        Args:
+            reader (asyncio.StreamReader): The incoming stream of the connection.
+        """
+        try:
+            while True:
+                message, request_id, payload = await _read_frame(reader)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((message, payload))
+        except (asyncio.IncompleteReadError, ConnectionError) as error:
+            # Fail the requests of the closed connection, the next request reconnects
+            self._writer.close()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ServiceError(f'Connection to the compute service lost: {error!r}'))
+            self._pending.clear()
+
+    async def _request(
+        self,
+        message: int,
+        payload: bytes
+    ) -> tuple[int, bytes]:
+        """
+        Send a request and wait for its answer.
+
+        Args:
+            message (int): The message type.
+            payload (bytes): The payload.
+
+        Returns:
+            tuple: The message type and the payload of the answer.
+
+        Raises:
+            ServiceError: If the service is not running, or the connection was lost.
+        """
+        writer = await self._connect()
+        request_id = next(self._ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            try:
+                writer.write(_pack_frame(message, request_id, payload))
+                await writer.drain()
+            except ConnectionError as error:
+                raise ServiceError(f'Connection to the compute service lost: {error!r}') from error
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def compute(
+        self,
+        *args
+    ) -> tuple:
+        """
+        Compute the daily report and the plot of a request on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute.
+
+        Returns:
+            tuple: The daily report and the image of the plot (None for text only).
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        return await self._request_result(MESSAGE_COMPUTE, encode_compute(*args))
+
+    async def compute_calendar(
+        self,
+        *args
+    ) -> tuple:
+        """
+        Compute and render the calendar of a month on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_calendar.
+
+        Returns:
+            tuple: The calendar and its PNG image.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        return await self._request_result(MESSAGE_CALENDAR, encode_calendar(*args))
+
+    async def compute_tonight(
+        self,
+        *args
+    ) -> list:
+        """
+        Compute the observing windows of a night on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_tonight.
+
+        Returns:
+            list: The observing windows, sorted by decreasing peak altitude.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        windows, _ = await self._request_result(MESSAGE_TONIGHT, encode_tonight(*args))
+        return windows
+
+    async def compute_sky(
+        self,
+        *args
+    ) -> tuple:
+        """
+        Compute and render the sky map of every body on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_sky.
+
+        Returns:
+            tuple: The positions and the PNG image of the sky map.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        return await self._request_result(MESSAGE_SKY, encode_sky(*args))
+
+    async def compute_live(
+        self,
+        *args
+    ) -> tuple:
+        """
+        Render the live sky map of a location on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_live.
+
+        Returns:
+            tuple: The positions and the PNG image of the live sky map.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        return await self._request_result(MESSAGE_LIVE, encode_live(*args))
+
+    async def compute_digests(
+        self,
+        *args
+    ) -> list:
+        """
+        Compute the daily digests of several sites on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_digests.
+
+        Returns:
+            list: The digest of each site, in the same order.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        digests, _ = await self._request_result(MESSAGE_DIGESTS, encode_digests(*args))
+        return digests
+
+    async def compute_compare(
+        self,
+        *args
+    ) -> tuple:
+        """
+        Compute the rise and set times of a body for several locations on the service.
+
+        Args:
+            *args: The arguments of pipeline.compute_compare.
+
+        Returns:
+            tuple: The rise and set times of each location in its local timezone, or None when they do not happen.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        times, _ = await self._request_result(MESSAGE_COMPARE, encode_compare(*args))
+        return times
+
+    async def _request_result(
+        self,
+        message: int,
+        payload: bytes
+    ) -> tuple:
+        """
+        Send a computation request and unpack its result.
+
+        Args:
+            message (int): The message type.
+            payload (bytes): The payload.
+
+        Returns:
+            tuple: The result and the image or None.
+
+        Raises:
+            QueueFullError: If the work queue of the service is full.
+            ServiceError: If the service failed to compute the request.
+        """
+        message, payload = await self._request(message, payload)
+
+        if message == MESSAGE_BUSY:
+            raise QueueFullError(*BUSY.unpack(payload))
+        if message != MESSAGE_RESULT:
+            raise ServiceError(payload.decode())
+        return _unpack_result(payload)
+
+    async def kernel_status(
+        self,
+        filename: str
+    ) -> dict:
+        """
+        Get the status of a kernel on the service.
+
+        Args:
+            filename (str): The name of the kernel.
+
+        Returns:
+            dict: The status of the kernel, as returned by KernelManager.status.
+
+        Raises:
+            ServiceError: If the service failed to answer.
+        """
+        message, payload = await self._request(MESSAGE_STATUS, filename.encode())
+        if message != MESSAGE_STATUS_RESULT:
+            raise ServiceError(payload.decode())
+        return json.loads(payload)
+
+    async def close(
+        self
+    ) -> None:
+        """
+        Close the connection.
+        """
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
@@ -0,0 +1,133 @@
+"""
+This module contains the single-flight layer of AstroBot.
+
+Identical concurrent requests (for example a whole channel asking /moon for the same town during a
+full moon) await one in-flight computation instead of each running the full pipeline.
+
+Attributes:
+    flights (SingleFlight): The single-flight layer shared by the commands.
+"""
+
+import asyncio
+
+from workqueue import QueueFullError
+
+class SingleFlight:
+    """
+    A class to coalesce concurrent calls with the same key into one computation.
+
+    The computation runs in its own task, so cancelling one of the callers does not cancel it for
+    the others, and its result or exception is given to every caller.
+
+    Attributes:
+        requests (int): The number of calls.
+        computations (int): The number of computations actually started.
+        coalesced (int): The number of calls that awaited a computation started by another call.
+        errors (int): The number of computations that raised an exception, other than a full work queue.
+        rejected (int): The number of computations rejected because the work queue was full.
+
+    Methods:
+        run(key, func, *args): Run the given function, or await the in-flight call with the same key.
+        in_flight(): Get the number of computations currently running.
+        metrics(): Get the counters of the single-flight layer.
+    """
+
+    def __init__(
+        self
+    ) -> None:
+        """
+        Initialize the SingleFlight object.
+        """
+        self.requests = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.rejected = 0
+
+        self._tasks = {}
+
+    async def run(
+        self,
+        key,
+        func,
+        *args
+    ):
+        """
+        Run the given function, or await the in-flight call with the same key.
+
+        Args:
+            key (hashable): The normalized key of the request.
+            func (callable): A function returning an awaitable (coroutine function, run_in_executor, ...).
+            *args: The arguments of the function.
+
+        Returns:
+            The result of the computation.
+
+        Raises:
+            Exception: The exception raised by the computation, for every caller.
+        """
+        self.requests += 1
+
+        task = self._tasks.get(key)
+        if task is None:
+            self.computations += 1
+            task = asyncio.ensure_future(func(*args))
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _done(
+        self,
+        key,
+        task: asyncio.Future
+    ) -> None:
+        """
+        Forget the finished computation of the given key, and count its error or its rejection.
+
+        Args:
+            key (hashable): The normalized key of the request.
+            task (asyncio.Future): The finished computation.
+        """
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if task.cancelled() or task.exception() is None:
+            return
+        if isinstance(task.exception(), QueueFullError):
+            # A busy answer is load shedding, not a failure of the computation
+            self.rejected += 1
+        else:
+            self.errors += 1
+
+    def in_flight(
+        self
+    ) -> int:
+        """
+        Get the number of computations currently running.
+
+        Returns:
+            int: The number of computations currently running.
+        """
+        return len(self._tasks)
+
+    def metrics(
+        self
+    ) -> dict:
+        """
+        Get the counters of the single-flight layer.
+
+        Returns:
+            dict: The requests, computations, coalesced requests, errors, rejections and in-flight computations.
+        """
+        return {
+            'requests': self.requests,
+            'computations': self.computations,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'rejected': self.rejected,
+            'in_flight': self.in_flight(),
+        }
+
+flights = SingleFlight()
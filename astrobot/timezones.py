@@ -0,0 +1,403 @@
+"""
+This module contains the offline timezone resolver of AstroBot.
+
+The resolver finds the IANA timezone of a location without any network request. The timezone
+boundaries (the GeoJSON released by timezone-boundary-builder) are preprocessed once into a grid
+index stored as NumPy arrays in the data directory. Each cell of the grid holds either the zone
+covering the whole cell, or a reference to the boundary edges crossing it with the zone at its
+center. Most lookups are then a single array read, and the lookups near a border only test the
+few edges of their cell: walking from the center of the cell to the location, each crossed edge
+of a zone toggles whether the location is inside it.
+
+The index is memory-mapped and loaded on the first lookup. Locations outside every zone (the high
+seas) get their nautical timezone (Etc/GMT+N). A coarse index, built from boundaries simplified to
+BUNDLED_TOLERANCE, ships with AstroBot and is used until the full index is built in the data
+directory. Without any index, every location gets DEFAULT_TIMEZONE.
+
+Attributes:
+    GRID_RESOLUTION (float): The default size of the cells of the grid, in degrees.
+    BUNDLED_INDEX (str): The directory of the coarse index shipped with AstroBot.
+    BUNDLED_RESOLUTION (float): The size of the cells of the coarse index, in degrees.
+    BUNDLED_TOLERANCE (float): The tolerance of the simplified boundaries of the coarse index, in degrees.
+    resolver (TimezoneResolver): The timezone resolver shared by the application.
+
+Methods:
+    get_nautical_timezone: Get the nautical timezone of a longitude.
+    build_index: Build the grid index of the timezone boundaries of a GeoJSON file.
+    get_timezone: Get the IANA timezone of a location.
+
+Usage:
+    python astrobot/timezones.py build combined.json [--resolution 0.25] [--tolerance 0]
+    python astrobot/timezones.py bundle combined.json
+    python astrobot/timezones.py lookup 48.8566 2.3522
+"""
+
+import argparse
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from constants import DEFAULT_TIMEZONE, TIMEZONE_INDEX
+import kernels
+
+GRID_RESOLUTION = 0.25
+
+BUNDLED_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'timezones')
+BUNDLED_RESOLUTION = 1.0
+BUNDLED_TOLERANCE = 0.05
+
+def get_nautical_timezone(
+    longitude: float
+) -> str:
+    """
+    Get the nautical timezone of a longitude, used on the high seas.
+
+    Args:
+        longitude (float): The longitude, in degrees.
+
+    Returns:
+        str: The IANA name of the timezone (e.g. 'Etc/GMT-2' for UTC+2).
+    """
+    offset = round(longitude / 15)
+    if offset == 0:
+        return 'Etc/GMT'
+    return f'Etc/GMT{-offset:+d}'
+
+def _get_rings(
+    geometry: dict
+) -> list[np.ndarray]:
+    """
+    Get the rings (exterior and holes) of a GeoJSON Polygon or MultiPolygon.
+
+    Args:
+        geometry (dict): The GeoJSON geometry.
+
+    Returns:
+        list: The rings, as arrays of (longitude, latitude) vertices.
+    """
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    return [np.asarray(ring, dtype=float)[:, :2] for polygon in polygons for ring in polygon]
+
+def _simplify(
+    ring: np.ndarray,
+    tolerance: float
+) -> np.ndarray:
+    """
+    Simplify a closed ring with the Douglas-Peucker algorithm, keeping the small rings as coarse quadrilaterals.
+
+    Args:
+        ring (np.ndarray): The vertices of the ring, the last one repeating the first one.
+        tolerance (float): The largest distance between the ring and its simplification, in degrees.
+
+    Returns:
+        np.ndarray: The vertices of the simplified ring.
+    """
+    if len(ring) < 5:
+        return ring
+
+    # Split the ring at its farthest vertex from the first one, then split every span at its farthest vertex
+    keep = np.zeros(len(ring), dtype=bool)
+    farthest = int(np.argmax(np.sum((ring - ring[0]) ** 2, axis=1)))
+    keep[[0, farthest, -1]] = True
+    spans = [(0, farthest), (farthest, len(ring) - 1)]
+    while spans:
+        first, last = spans.pop()
+        if last - first < 2:
+            continue
+        (x0, y0), (x1, y1) = ring[first], ring[last]
+        x, y = ring[first + 1:last].T
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length:
+            distances = np.abs((x1 - x0) * (y - y0) - (y1 - y0) * (x - x0)) / length
+        else:
+            distances = np.hypot(x - x0, y - y0)
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            keep[first + 1 + index] = True
+            spans += [(first, first + 1 + index), (first + 1 + index, last)]
+
+    # An island smaller than the tolerance would vanish
+    if np.count_nonzero(keep) < 5:
+        keep[np.linspace(0, len(ring) - 1, 5).astype(int)] = True
+    return ring[keep]
+
+def _rasterize(
+    edges: np.ndarray,
+    resolution: float,
+    shape: tuple[int, int]
+) -> np.ndarray:
+    """
+    Find the cell centers inside a set of rings with the even-odd rule, one scanline per row.
+
+    Args:
+        edges (np.ndarray): The edges of the rings, as (x0, y0, x1, y1) rows.
+        resolution (float): The size of the cells, in degrees.
+        shape (tuple): The number of rows and columns of the grid.
+
+    Returns:
+        np.ndarray: Whether the center of each cell is inside.
+    """
+    height, width = shape
+    x0, y0, x1, y1 = edges.T
+
+    # Rows whose center latitude is crossed by each edge (half-open, so shared vertices count once)
+    first_row = np.ceil((np.minimum(y0, y1) + 90) / resolution - 0.5).astype(int)
+    end_row = np.ceil((np.maximum(y0, y1) + 90) / resolution - 0.5).astype(int)
+    first_row, end_row = np.clip(first_row, 0, height), np.clip(end_row, 0, height)
+    counts = end_row - first_row
+
+    edge = np.repeat(np.arange(len(edges)), counts)
+    row = first_row[edge] + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    latitude = -90 + (row + 0.5) * resolution
+    x = x0[edge] + (latitude - y0[edge]) * (x1[edge] - x0[edge]) / (y1[edge] - y0[edge])
+
+    # Pair the sorted crossings of each row, and fill the cells between each pair
+    order = np.lexsort((x, row))
+    row, x = row[order], x[order]
+    column = np.clip(np.ceil((x + 180) / resolution - 0.5).astype(int), 0, width)
+    fill = np.zeros((height, width + 1), dtype=np.int32)
+    np.add.at(fill, (row[0::2], column[0::2]), 1)
+    np.add.at(fill, (row[1::2], column[1::2]), -1)
+
+    return np.cumsum(fill, axis=1)[:, :width] > 0
+
+def build_index(
+    geojson_path: str,
+    directory: str,
+    resolution: float = GRID_RESOLUTION,
+    tolerance: float = 0.0
+) -> int:
+    """
+    Build the grid index of the timezone boundaries of a GeoJSON file.
+
+    Args:
+        geojson_path (str): The path of the GeoJSON file, whose features have a tzid property.
+        directory (str): The directory of the index.
+        resolution (float, optional): The size of the cells, in degrees. Defaults to GRID_RESOLUTION.
+        tolerance (float, optional): The tolerance of the simplified boundaries, in degrees. Defaults to 0 (not simplified).
+
+    Returns:
+        int: The number of timezones in the index.
+    """
+    with open(geojson_path, encoding='utf-8') as file:
+        features = json.load(file)['features']
+
+    zones = sorted({feature['properties']['tzid'] for feature in features})
+    zone_ids = {zone: index for index, zone in enumerate(zones)}
+    height, width = round(180 / resolution), round(360 / resolution)
+
+    # Rasterize the center of every cell, and collect the edges of every zone
+    centers = np.full((height, width), -1, dtype=np.int16)
+    edges, edge_zones = [], []
+    for feature in features:
+        rings = _get_rings(feature['geometry'])
+        if tolerance > 0:
+            rings = [_simplify(ring, tolerance) for ring in rings]
+        feature_edges = np.concatenate([np.hstack([ring[:-1], ring[1:]]) for ring in rings])
+        centers[_rasterize(feature_edges, resolution, (height, width))] = zone_ids[feature['properties']['tzid']]
+        edges.append(feature_edges)
+        edge_zones.append(np.full(len(feature_edges), zone_ids[feature['properties']['tzid']], dtype=np.int16))
+    edges, edge_zones = np.concatenate(edges), np.concatenate(edge_zones)
+
+    # Assign every edge to the cells overlapped by its bounding box
+    x0, y0, x1, y1 = edges.T
+    first_column = np.clip(np.floor((np.minimum(x0, x1) + 180) / resolution).astype(int), 0, width - 1)
+    last_column = np.clip(np.floor((np.maximum(x0, x1) + 180) / resolution).astype(int), 0, width - 1)
+    first_row = np.clip(np.floor((np.minimum(y0, y1) + 90) / resolution).astype(int), 0, height - 1)
+    last_row = np.clip(np.floor((np.maximum(y0, y1) + 90) / resolution).astype(int), 0, height - 1)
+    columns = last_column - first_column + 1
+    counts = columns * (last_row - first_row + 1)
+
+    edge = np.repeat(np.arange(len(edges)), counts)
+    position = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    cell = (first_row[edge] + position // columns[edge]) * width + first_column[edge] + position % columns[edge]
+
+    # Group the edges by cell; the cells with edges are border cells, numbered -2, -3...
+    order = np.argsort(cell, kind='stable')
+    cell, edge = cell[order], edge[order]
+    border_cells, starts = np.unique(cell, return_index=True)
+
+    grid = centers.astype(np.int32).ravel()
+    grid[border_cells] = -2 - np.arange(len(border_cells))
+
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'grid.npy'), grid.reshape(height, width))
+    np.save(os.path.join(directory, 'border_centers.npy'), centers.ravel()[border_cells])
+    np.save(os.path.join(directory, 'border_offsets.npy'), np.append(starts, len(cell)).astype(np.int64))
+    np.save(os.path.join(directory, 'border_edges.npy'), edge.astype(np.int32))
+    np.save(os.path.join(directory, 'edges.npy'), edges.astype(np.float32))
+    np.save(os.path.join(directory, 'edge_zones.npy'), edge_zones)
+
+    # Written last, a missing zones.json marks an incomplete index
+    with open(os.path.join(directory, 'zones.json'), 'w', encoding='utf-8') as file:
+        json.dump({'resolution': resolution, 'zones': zones}, file)
+
+    return len(zones)
+
+class TimezoneResolver:
+    """
+    A class to resolve the timezone of a location from the memory-mapped grid index.
+
+    Attributes:
+        directory (str): The directory of the index.
+        fallback (str): The directory of the index used while the first one is not built, or None.
+
+    Methods:
+        lookup(latitude, longitude): Get the timezone of a location from the index.
+        get_timezone(latitude, longitude): Get the timezone of a location, with the fallbacks.
+    """
+
+    def __init__(
+        self,
+        directory: str = None
+    ) -> None:
+        """
+        Initialize the TimezoneResolver object. The index is loaded on the first lookup.
+
+        Args:
+            directory (str, optional): The directory of the index. Defaults to the index of the data directory,
+                or the bundled index while it is not built.
+        """
+        self.directory = directory or os.path.join(kernels.get_data_dir(), TIMEZONE_INDEX)
+        self.fallback = None if directory else BUNDLED_INDEX
+
+        self._lock = threading.Lock()
+        self._index = None
+
+    def _load(
+        self
+    ) -> dict:
+        """
+        Memory-map the index, once.
+
+        Returns:
+            dict: The arrays of the index, or an empty dict if no index is built.
+        """
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = {}
+                    for directory in (self.directory, self.fallback):
+                        if directory is None or not os.path.exists(os.path.join(directory, 'zones.json')):
+                            continue
+                        with open(os.path.join(directory, 'zones.json'), encoding='utf-8') as file:
+                            index = json.load(file)
+                        for name in ('grid', 'border_centers', 'border_offsets', 'border_edges', 'edges', 'edge_zones'):
+                            index[name] = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                        self._index = index
+                        break
+        return self._index
+
+    def lookup(
+        self,
+        latitude: float,
+        longitude: float
+    ) -> str | None:
+        """
+        Get the timezone of a location from the index.
+
+        Args:
+            latitude (float): The latitude of the location, in degrees.
+            longitude (float): The longitude of the location, in degrees.
+
+        Returns:
+            str: The IANA name of the timezone, or None outside every zone or without an index.
+        """
+        index = self._load()
+        if not index:
+            return None
+
+        resolution, grid = index['resolution'], index['grid']
+        height, width = grid.shape
+        row = min(max(math.floor((latitude + 90) / resolution), 0), height - 1)
+        column = min(max(math.floor((longitude + 180) / resolution), 0), width - 1)
+        value = int(grid[row, column])
+        if value >= 0:
+            return index['zones'][value]
+        if value == -1:
+            return None
+
+        # Walk from the center of the border cell, whose zone is known, to the location
+        border = -value - 2
+        center_zone = int(index['border_centers'][border])
+        edge_ids = index['border_edges'][index['border_offsets'][border]:index['border_offsets'][border + 1]]
+        x0, y0, x1, y1 = np.asarray(index['edges'][edge_ids], dtype=float).T
+        cx, cy = -180 + (column + 0.5) * resolution, -90 + (row + 0.5) * resolution
+
+        def side(ax, ay, bx, by, px, py):
+            return (bx - ax) * (py - ay) - (by - ay) * (px - ax) > 0
+
+        crossed = (
+            (side(x0, y0, x1, y1, cx, cy) != side(x0, y0, x1, y1, longitude, latitude))
+            & (side(cx, cy, longitude, latitude, x0, y0) != side(cx, cy, longitude, latitude, x1, y1))
+        )
+        zones, crossings = np.unique(index['edge_zones'][edge_ids][crossed], return_counts=True)
+        inside = {int(zone) for zone in zones[crossings % 2 == 1]} ^ ({center_zone} if center_zone >= 0 else set())
+
+        return index['zones'][min(inside)] if inside else None
+
+    def get_timezone(
+        self,
+        latitude: float,
+        longitude: float
+    ) -> str:
+        """
+        Get the timezone of a location, with the nautical timezone on the high seas.
+
+        Args:
+            latitude (float): The latitude of the location, in degrees.
+            longitude (float): The longitude of the location, in degrees.
+
+        Returns:
+            str: The IANA name of the timezone, or DEFAULT_TIMEZONE if no index is built.
+        """
+        if not self._load():
+            return DEFAULT_TIMEZONE
+        return self.lookup(latitude, longitude) or get_nautical_timezone(longitude)
+
+resolver = TimezoneResolver()
+
+def get_timezone(
+    latitude: float,
+    longitude: float
+) -> str:
+    """
+    Get the IANA timezone of a location with the shared resolver.
+
+    Args:
+        latitude (float): The latitude of the location, in degrees.
+        longitude (float): The longitude of the location, in degrees.
+
+    Returns:
+        str: The IANA name of the timezone.
+    """
+    return resolver.get_timezone(latitude, longitude)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage the AstroBot timezone index.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build the index from the GeoJSON of timezone-boundary-builder')
+    build_parser.add_argument('geojson', help='GeoJSON file of the timezone boundaries (e.g. combined.json)')
+    build_parser.add_argument('--resolution', type=float, default=GRID_RESOLUTION, help=f'Size of the cells in degrees (default: {GRID_RESOLUTION})')
+    build_parser.add_argument('--tolerance', type=float, default=0.0, help='Tolerance of the simplified boundaries in degrees (default: 0, not simplified)')
+
+    bundle_parser = subparsers.add_parser('bundle', help='Build the coarse index shipped with AstroBot')
+    bundle_parser.add_argument('geojson', help='GeoJSON file of the timezone boundaries (e.g. combined.json)')
+
+    lookup_parser = subparsers.add_parser('lookup', help='Get the timezone of a location')
+    lookup_parser.add_argument('latitude', type=float)
+    lookup_parser.add_argument('longitude', type=float)
+
+    args = parser.parse_args()
+    if args.command == 'build':
+        count = build_index(args.geojson, resolver.directory, args.resolution, args.tolerance)
+        print(f'{count} timezones indexed in {resolver.directory}')
+    elif args.command == 'bundle':
+        count = build_index(args.geojson, BUNDLED_INDEX, BUNDLED_RESOLUTION, BUNDLED_TOLERANCE)
+        print(f'{count} timezones indexed in {BUNDLED_INDEX}')
+    else:
+        print(get_timezone(args.latitude, args.longitude))
@@ -1,5 +1,9 @@
+import re
+
 from skyfield.api import Angle
 
+from constants import DIRECTIONS, TWILIGHT_LEVELS
+
 def deg_to_dms(
     deg: float
 ) -> str:
@@ -30,6 +34,30 @@ def get_bing_maps_url(
     """
     return f'https://www.bing.com/maps?cp={latitude}~{longitude}&lvl=17'
 
+def get_busy_message(
+    waiting: int
+) -> str:
+    """
+    Get the message sent when a command arrives while the work queue is full.
+
+    Args:
+        waiting (int): The number of requests waiting in the queue.
+
+    Returns:
+        str: The message to send to the user.
+    """
+    return f'AstroBot est très sollicité ({waiting} calculs en attente), veuillez réessayer dans quelques instants.'
+
+def get_service_error_message(
+) -> str:
+    """
+    Get the message sent when the compute service cannot answer a command.
+
+    Returns:
+        str: The message to send to the user.
+    """
+    return 'Le service de calcul d\'AstroBot est momentanément indisponible, veuillez réessayer dans quelques instants.'
+
 def get_google_maps_url(
     latitude: float,
     longitude: float
@@ -49,3 +77,87 @@ def get_google_maps_url(
     latitude_position = 'N' if latitude >= 0 else 'S'
     longitude_position = 'E' if longitude >= 0 else 'W'
     return f'https://www.google.com/maps/place/{latitude_dms}{latitude_position}+{longitude_dms}{longitude_position}'
+
+def get_hourly_table(
+    path
+) -> str:
+    """
+    Get the altitude and azimuth of a body every hour while it is above the horizon, as a text table.
+
+    Args:
+        path (DailyPath): The daily path of the body.
+
+    Returns:
+        str: The table as a code block, or a sentence if the body stays below the horizon.
+    """
+    # The last hourly marker is the next midnight
+    hours = path.hours[path.hours < path.samples.shape[1] - 1]
+    altitudes, azimuths = path.samples[:, hours].astype(float)
+
+    lines = [
+        f'{time:%H:%M}  {altitude:5.1f}°  {azimuth:5.1f}° {DIRECTIONS[round(azimuth / 45) % 8]}'
+        for time, altitude, azimuth in zip(path.hour_times(hours), altitudes.tolist(), azimuths.tolist())
+        if altitude >= 0
+    ]
+    if not lines:
+        return 'Sous l\'horizon toute la journée'
+    return '```\nHeure   Alt.    Azim.\n' + '\n'.join(lines) + '\n```'
+
+def get_kernel_not_ready_message(
+    status: dict
+) -> str:
+    """
+    Get the message sent when a command arrives before the ephemeris kernel is ready.
+
+    Args:
+        status (dict): The kernel status, as returned by KernelManager.status.
+
+    Returns:
+        str: The message to send to the user.
+    """
+    if status['state'] == 'failed':
+        return 'Les éphémérides n\'ont pas pu être téléchargées, veuillez contacter un administrateur.'
+    return f'Les éphémérides sont en cours de téléchargement ({status["progress"]:.0%}), veuillez réessayer dans quelques instants.'
+
+def get_twilight_lines(
+    twilight
+) -> str:
+    """
+    Get the twilight transitions of a day, one per line.
+
+    Args:
+        twilight (TwilightEvents): The twilight events of the day, or None.
+
+    Returns:
+        str: The local time and the light reached at each transition.
+    """
+    if not twilight:
+        return 'Aucun changement de luminosité'
+    times, events = twilight
+    return '\n'.join(f'{time:%H:%M} : {TWILIGHT_LEVELS[event]}' for time, event in zip(times, events.tolist()))
+
+def parse_locations(
+    text: str
+) -> list[tuple[str, float, float]]:
+    """
+    Parse a list of locations separated by semicolons, each one as latitude,longitude with an optional name.
+
+    Args:
+        text (str): The locations, e.g. 'Paris: 48.8566, 2.3522; Lyon: 45.764, 4.8357'.
+
+    Returns:
+        list: The name (or None), latitude and longitude of each location.
+
+    Raises:
+        ValueError: If a location cannot be parsed, or its coordinates are out of range.
+    """
+    locations = []
+    for entry in filter(None, (entry.strip() for entry in text.split(';'))):
+        match = re.fullmatch(r'(?:(.+?)\s*:\s*)?([-+]?\d+(?:\.\d+)?)\s*,\s*([-+]?\d+(?:\.\d+)?)', entry)
+        if match is None:
+            raise ValueError(f'Invalid location {entry!r}')
+        name, latitude, longitude = match.group(1), float(match.group(2)), float(match.group(3))
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValueError(f'Coordinates out of range in {entry!r}')
+        locations.append((name, latitude, longitude))
+    return locations
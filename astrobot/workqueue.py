@@ -0,0 +1,223 @@
+"""
+This module contains the admission control of the compute commands of AstroBot.
+
+The work queue limits the number of computations running at once and the number of requests
+waiting for a slot. Waiting requests are served by priority (cheap text answers before image
+renders, and both before the background updates), then round-robin between guilds and between the users of a guild, so a burst from one
+guild or one user does not starve the others. When the queue is full, requests are rejected at
+once so that the commands can answer "busy" instead of piling up.
+
+Attributes:
+    PRIORITY_TEXT (int): The priority of the requests answered with text only.
+    PRIORITY_IMAGE (int): The priority of the requests rendering an image.
+    PRIORITY_BACKGROUND (int): The priority of the updates that no user is waiting for.
+    WAIT_SAMPLES (int): The number of recent wait times kept for the percentiles.
+    queue (WorkQueue): The work queue shared by the commands.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from constants import COMPUTE_WORKERS, QUEUE_SIZE
+
+PRIORITY_TEXT = 0
+PRIORITY_IMAGE = 1
+PRIORITY_BACKGROUND = 2
+WAIT_SAMPLES = 1000
+
+class QueueFullError(Exception):
+    """
+    Raised when a request arrives while the work queue is full.
+
+    Attributes:
+        waiting (int): The number of requests waiting in the queue.
+    """
+
+    def __init__(
+        self,
+        waiting: int
+    ) -> None:
+        super().__init__(f'The work queue is full ({waiting} waiting requests)')
+        self.waiting = waiting
+
+class WorkQueue:
+    """
+    A class to run the computations with a concurrency cap, a bounded queue and fair scheduling.
+
+    Attributes:
+        concurrency (int): The maximum number of computations running at once.
+        max_size (int): The maximum number of requests waiting for a slot.
+        running (int): The number of computations running.
+        waiting (int): The number of requests waiting for a slot.
+
+    Methods:
+        run(user_id, guild_id, priority, func, *args): Wait for a slot, then run the given function.
+        metrics(): Get the depth and wait-time metrics of the queue.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = COMPUTE_WORKERS,
+        max_size: int = QUEUE_SIZE
+    ) -> None:
+        """
+        Initialize the WorkQueue object.
+
+        Args:
+            concurrency (int, optional): The maximum number of running computations. Defaults to COMPUTE_WORKERS.
+            max_size (int, optional): The maximum number of waiting requests. Defaults to QUEUE_SIZE.
+        """
+        self.concurrency = concurrency
+        self.max_size = max_size
+        self.running = 0
+        self.waiting = 0
+
+        self.admitted = 0
+        self.rejected = 0
+        self.max_waiting = 0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+
+        # Waiting requests by priority, then guild, then user, in round-robin order
+        self._queues = {PRIORITY_TEXT: OrderedDict(), PRIORITY_IMAGE: OrderedDict(), PRIORITY_BACKGROUND: OrderedDict()}
+
+    async def run(
+        self,
+        user_id,
+        guild_id,
+        priority: int,
+        func,
+        *args
+    ):
+        """
+        Wait for a slot, then run the given function.
+
+        Args:
+            user_id (hashable): The user who sent the request.
+            guild_id (hashable): The guild of the request (None in direct messages).
+            priority (int): PRIORITY_TEXT, PRIORITY_IMAGE or PRIORITY_BACKGROUND.
+            func (callable): A function returning an awaitable.
+            *args: The arguments of the function.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            QueueFullError: If no slot is free and the queue is full.
+        """
+        if self.running < self.concurrency and self.waiting == 0:
+            self.running += 1
+            self._waits.append(0.0)
+        else:
+            if self.waiting >= self.max_size:
+                self.rejected += 1
+                raise QueueFullError(self.waiting)
+            await self._wait(user_id, guild_id, priority)
+        self.admitted += 1
+
+        try:
+            return await func(*args)
+        finally:
+            self.running -= 1
+            self._dispatch()
+
+    async def _wait(
+        self,
+        user_id,
+        guild_id,
+        priority: int
+    ) -> None:
+        """
+        Queue the request and wait until a slot is given to it.
+
+        Args:
+            user_id (hashable): The user who sent the request.
+            guild_id (hashable): The guild of the request.
+            priority (int): PRIORITY_TEXT, PRIORITY_IMAGE or PRIORITY_BACKGROUND.
+        """
+        slot = asyncio.get_running_loop().create_future()
+        users = self._queues[priority].setdefault(guild_id, OrderedDict())
+        users.setdefault(user_id, deque()).append(slot)
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+
+        start = time.monotonic()
+        try:
+            await slot
+        except asyncio.CancelledError:
+            if slot.done() and not slot.cancelled():
+                # The slot was given just before the cancellation, hand it to the next request
+                self.running -= 1
+                self._dispatch()
+            else:
+                # The cancelled slot stays queued and is skipped by the dispatcher
+                self.waiting -= 1
+            raise
+        self._waits.append(time.monotonic() - start)
+
+    def _dispatch(
+        self
+    ) -> None:
+        """
+        Give the free slots to the next waiting requests.
+        """
+        while self.running < self.concurrency:
+            slot = self._next()
+            if slot is None:
+                return
+            self.waiting -= 1
+            self.running += 1
+            slot.set_result(None)
+
+    def _next(
+        self
+    ) -> asyncio.Future | None:
+        """
+        Pop the next waiting request, by priority then round-robin between guilds and users.
+
+        Returns:
+            asyncio.Future: The slot of the request, or None if no request is waiting.
+        """
+        for priority in (PRIORITY_TEXT, PRIORITY_IMAGE, PRIORITY_BACKGROUND):
+            guilds = self._queues[priority]
+            while guilds:
+                guild_id, users = next(iter(guilds.items()))
+                user_id, slots = next(iter(users.items()))
+                slot = slots.popleft()
+
+                # Move the user and the guild to the end of the round
+                del users[user_id]
+                if slots:
+                    users[user_id] = slots
+                del guilds[guild_id]
+                if users:
+                    guilds[guild_id] = users
+
+                if not slot.cancelled():
+                    return slot
+        return None
+
+    def metrics(
+        self
+    ) -> dict:
+        """
+        Get the depth and wait-time metrics of the queue.
+
+        Returns:
+            dict: The running and waiting requests, the counters and the recent wait times in seconds.
+        """
+        waits = np.array(self._waits) if self._waits else np.zeros(1)
+        return {
+            'running': self.running,
+            'waiting': self.waiting,
+            'max_waiting': self.max_waiting,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'wait_mean': float(waits.mean()),
+            'wait_p95': float(np.percentile(waits, 95)),
+            'wait_max': float(waits.max()),
+        }
+
+queue = WorkQueue()
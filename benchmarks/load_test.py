@@ -0,0 +1,348 @@
+"""
+Offline load test of the compute commands, driving the real cog coroutines without Discord.
+
+Each request builds a fake application context, with the defer and respond methods of the slash
+commands, and awaits the callback of the command, so the whole path of a request is measured: the
+argument handling of the cog, the work queue, the single flight, the render in the compute threads
+and the building of the embed. The requests are spread over random locations and users, and run by
+a fixed number of concurrent clients. A probe measures how late the event loop wakes up meanwhile.
+
+The report gives the throughput, the latency percentiles of each command, the answers of the
+work queue (busy) and the errors, the event loop lag and the peak RSS of the process.
+
+Usage:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --requests 500 --concurrency 32 --mix sun=2,moon=1,planet=1
+    python benchmarks/load_test.py --mix tonight=1,sky=1 --locations 5
+    python benchmarks/load_test.py --lite
+"""
+
+import argparse
+import asyncio
+import importlib
+import os
+import random
+import resource
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'astrobot'))
+
+import numpy as np
+
+from constants import EPHEMERIS_KERNEL
+import kernels
+from workqueue import queue
+
+# Command name: module, cog class and method of the command
+COMMANDS = {
+    'sun': ('sun', 'Sun', 'sun'),
+    'moon': ('moon', 'Moon', 'moon'),
+    'planet': ('planets', 'Planets', 'planet'),
+    'calendar': ('calendar', 'Calendar', 'calendar'),
+    'tonight': ('sky', 'Sky', 'tonight'),
+    'sky': ('sky', 'Sky', 'sky'),
+}
+LAG_INTERVAL = 0.01
+
+class FakeAuthor:
+    """
+    A class to stand in for the author of an interaction.
+
+    Attributes:
+        id (int): The id of the user.
+    """
+
+    def __init__(
+        self,
+        user_id: int
+    ) -> None:
+        self.id = user_id
+
+class FakeContext:
+    """
+    A class to stand in for the application context of a slash command.
+
+    Attributes:
+        author (FakeAuthor): The author of the interaction.
+        guild_id (int): The id of the guild.
+        deferred (bool): Whether the answer was deferred.
+        responses (list): The positional and keyword arguments of each answer.
+        answered_at (float): The perf_counter time of the first answer, or None.
+
+    Methods:
+        defer(): Defer the answer.
+        respond(*args, **kwargs): Answer the interaction.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        guild_id: int
+    ) -> None:
+        self.author = FakeAuthor(user_id)
+        self.guild_id = guild_id
+        self.deferred = False
+        self.responses = []
+        self.answered_at = None
+
+    async def defer(
+        self,
+        **kwargs
+    ) -> None:
+        """
+        Defer the answer.
+        """
+        self.deferred = True
+
+    async def respond(
+        self,
+        *args,
+        **kwargs
+    ) -> None:
+        """
+        Answer the interaction, and record the time of the first answer.
+        """
+        if self.answered_at is None:
+            self.answered_at = time.perf_counter()
+        self.responses.append((args, kwargs))
+
+    followup_send = respond
+
+class FakeBot:
+    """
+    A class to stand in for the bot given to the cogs.
+
+    Methods:
+        get_channel(channel_id): Get a channel, always None offline.
+    """
+
+    def get_channel(
+        self,
+        channel_id: int
+    ):
+        """
+        Get a channel, always None offline.
+        """
+        return None
+
+def parse_mix(
+    mix: str
+) -> dict:
+    """
+    Parse a request mix such as sun=2,moon=1.
+
+    Args:
+        mix (str): The weight of each command, separated by commas.
+
+    Returns:
+        dict: The weight of each command.
+    """
+    weights = {}
+    for item in mix.split(','):
+        name, _, weight = item.partition('=')
+        if name not in COMMANDS:
+            raise SystemExit(f'unknown command {name} (choose from {", ".join(COMMANDS)})')
+        weights[name] = float(weight or 1)
+    return weights
+
+def load_commands(
+    names: list[str]
+) -> dict:
+    """
+    Instantiate the cogs and get the callbacks and options of the given commands.
+
+    Args:
+        names (list): The names of the commands.
+
+    Returns:
+        dict: The cog, the callback and the options of each command.
+    """
+    bot, cogs, commands = FakeBot(), {}, {}
+    for name in names:
+        module, cog_class, method = COMMANDS[name]
+        if (module, cog_class) not in cogs:
+            cogs[module, cog_class] = getattr(importlib.import_module(f'astrobot.cogs.{module}'), cog_class)(bot)
+        cog = cogs[module, cog_class]
+        command = getattr(cog, method)
+        options = [option for option in command.options if option.name != 'ctx']
+        commands[name] = (cog, command.callback, options)
+    return commands
+
+def get_arguments(
+    options: list,
+    location: tuple[float, float],
+    rng: random.Random,
+    lite: bool = False
+) -> dict:
+    """
+    Get the arguments of a request: the defaults, the location, and a random choice for the required choices.
+
+    Args:
+        options (list): The options of the command.
+        location (tuple): The latitude and longitude of the request.
+        rng (random.Random): The random generator.
+        lite (bool, optional): Whether to ask for text-only answers. Defaults to False.
+
+    Returns:
+        dict: The arguments of the callback.
+    """
+    arguments = {}
+    for option in options:
+        if option.name in ('latitude', 'longitude'):
+            arguments[option.name] = location[option.name == 'longitude']
+        elif option.name == 'lite':
+            arguments[option.name] = lite
+        elif option.required and option.choices:
+            arguments[option.name] = rng.choice(option.choices).value
+        else:
+            arguments[option.name] = option.default
+    return arguments
+
+async def measure_lag(
+    lags: list,
+    stop: asyncio.Event
+) -> None:
+    """
+    Measure how late the event loop wakes up from short sleeps, until stopped.
+
+    Args:
+        lags (list): The list receiving the lags, in seconds.
+        stop (asyncio.Event): Set to stop the measure.
+    """
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL)
+
+async def run(
+    weights: dict,
+    requests: int,
+    concurrency: int,
+    locations: int,
+    users: int,
+    guilds: int,
+    seed: int,
+    lite: bool = False
+) -> dict:
+    """
+    Run the load test.
+
+    Args:
+        weights (dict): The weight of each command.
+        requests (int): The total number of requests.
+        concurrency (int): The number of concurrent clients.
+        locations (int): The number of distinct random locations.
+        users (int): The number of distinct users.
+        guilds (int): The number of distinct guilds.
+        seed (int): The seed of the random generator.
+        lite (bool, optional): Whether to ask for text-only answers. Defaults to False.
+
+    Returns:
+        dict: The measures of the run.
+    """
+    rng = random.Random(seed)
+    commands = load_commands(list(weights))
+    places = [(round(rng.uniform(-60, 65), 4), round(rng.uniform(-180, 180), 4)) for _ in range(locations)]
+    plan = rng.choices(list(weights), weights=list(weights.values()), k=requests)
+
+    latencies = {name: [] for name in weights}
+    outcomes = {'ok': 0, 'busy': 0, 'not ready': 0, 'error': 0}
+    errors = []
+    pending = iter(plan)
+
+    async def client():
+        for name in pending:
+            cog, callback, options = commands[name]
+            ctx = FakeContext(rng.randrange(users), rng.randrange(guilds))
+            arguments = get_arguments(options, rng.choice(places), rng, lite)
+            start = time.perf_counter()
+            try:
+                await callback(cog, ctx, **arguments)
+            except Exception as error:
+                outcomes['error'] += 1
+                errors.append(f'{name}: {error!r}')
+                continue
+            latencies[name].append((ctx.answered_at or time.perf_counter()) - start)
+
+            # Text-only answers are the busy and not-ready messages of the commands
+            args, kwargs = ctx.responses[0] if ctx.responses else ((), {})
+            if kwargs.get('embed') is not None:
+                outcomes['ok'] += 1
+            elif args and 'éphémérides' in str(args[0]):
+                outcomes['not ready'] += 1
+            else:
+                outcomes['busy'] += 1
+
+    lags, stop = [], asyncio.Event()
+    probe = asyncio.create_task(measure_lag(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+
+    return {
+        'elapsed': elapsed,
+        'latencies': latencies,
+        'outcomes': outcomes,
+        'errors': errors,
+        'lags': lags,
+        'queue': queue.metrics(),
+    }
+
+def report(
+    results: dict,
+    requests: int,
+    concurrency: int
+) -> None:
+    """
+    Print the measures of a run.
+
+    Args:
+        results (dict): The measures returned by run.
+        requests (int): The total number of requests.
+        concurrency (int): The number of concurrent clients.
+    """
+    elapsed = results['elapsed']
+    print(f'{requests} requests, {concurrency} concurrent clients, {elapsed:.2f} s, {requests / elapsed:.1f} requests/s')
+    print(f'{"command":<10} {"count":>6} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"max ms":>9}')
+    everything = []
+    for name, latencies in results['latencies'].items():
+        everything.extend(latencies)
+        if latencies:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+            print(f'{name:<10} {len(latencies):>6} {p50:9.1f} {p95:9.1f} {p99:9.1f} {max(latencies) * 1000:9.1f}')
+    if everything:
+        p50, p95, p99 = np.percentile(everything, [50, 95, 99]) * 1000
+        print(f'{"all":<10} {len(everything):>6} {p50:9.1f} {p95:9.1f} {p99:9.1f} {max(everything) * 1000:9.1f}')
+
+    print('answers: ' + ', '.join(f'{outcome} {count}' for outcome, count in results['outcomes'].items()))
+    for error in results['errors'][:5]:
+        print(f'  {error}')
+
+    lags = np.array(results['lags'] or [0.0]) * 1000
+    print(f'event loop lag: p50 {np.percentile(lags, 50):.1f} ms, p99 {np.percentile(lags, 99):.1f} ms, max {lags.max():.1f} ms')
+    metrics = results['queue']
+    print(f'work queue: {metrics["admitted"]} admitted, {metrics["rejected"]} rejected, wait p95 {metrics["wait_p95"] * 1000:.1f} ms')
+    print(f'peak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the compute commands offline, without Discord.')
+    parser.add_argument('--requests', type=int, default=200, help='Total number of requests (default: 200)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Number of concurrent clients (default: 8)')
+    parser.add_argument('--mix', default='sun=1,moon=1,planet=1', help=f'Weight of each command, among {", ".join(COMMANDS)} (default: sun=1,moon=1,planet=1)')
+    parser.add_argument('--locations', type=int, default=50, help='Number of distinct random locations (default: 50)')
+    parser.add_argument('--users', type=int, default=100, help='Number of distinct users (default: 100)')
+    parser.add_argument('--guilds', type=int, default=10, help='Number of distinct guilds (default: 10)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator (default: 0)')
+    parser.add_argument('--lite', action='store_true', help='Ask the commands that have the option for text-only answers')
+
+    args = parser.parse_args()
+    weights = parse_mix(args.mix)
+
+    # Load the kernel before measuring, as the bot does at startup
+    kernels.manager.start([EPHEMERIS_KERNEL])
+    kernels.manager.wait(EPHEMERIS_KERNEL)
+    results = asyncio.run(run(weights, args.requests, args.concurrency, args.locations, args.users, args.guilds, args.seed, args.lite))
+    report(results, args.requests, args.concurrency)
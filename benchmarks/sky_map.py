@@ -0,0 +1,92 @@
+"""
+Benchmark of the all-bodies sky map against ten separate single-body renders.
+
+The sky map computes the positions of every body of constants.BODIES in one vectorized call on a
+shared time grid and renders one image. The baseline renders the polar sky map of each body with
+its own daily report, as ten /sun, /moon and /planet commands would. Both are measured warm (the
+kernel is loaded and the Chebyshev fits are cached), which is the steady state of the bot.
+
+Usage:
+    python benchmarks/sky_map.py
+    python benchmarks/sky_map.py --repeat 20 --trail 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'astrobot'))
+
+from constants import BODIES, EPHEMERIS_KERNEL
+from ephemeris import Ephemeris, get_sky_object
+import chebyshev
+import kernels
+import pipeline
+
+LOCATION = (48.857, 2.352, 0, 'Europe/Paris')
+
+def measure(
+    func,
+    repeat: int
+) -> float:
+    """
+    Measure the median duration of a function, after a warm-up call.
+
+    Args:
+        func (callable): The function to measure.
+        repeat (int): The number of measured calls.
+
+    Returns:
+        float: The median duration in milliseconds.
+    """
+    func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+def main(
+    repeat: int,
+    trail: int
+) -> None:
+    """
+    Run the benchmark and print the median durations.
+
+    Args:
+        repeat (int): The number of measured calls of each case.
+        trail (int): The number of hours of trail of the sky map.
+    """
+    kernels.manager.download(EPHEMERIS_KERNEL)
+    now = datetime.now().replace(second=0, microsecond=0)
+    date = now.replace(hour=0, minute=0)
+    eph = Ephemeris.for_location(*LOCATION)
+    tt = eph.get_sky_positions(now, trail=timedelta(hours=trail)).tt
+
+    cases = {
+        'positions, one batched call': lambda: eph.get_sky_positions(now, trail=timedelta(hours=trail)),
+        'positions, ten single-body calls': lambda: [
+            chebyshev.engine.altaz(get_sky_object(body), tt, eph.latitude, eph.longitude, eph.altitude)
+            for body in BODIES
+        ],
+        'sky map, one render': lambda: pipeline.render_sky(*LOCATION, now, trail),
+        'polar maps, ten renders': lambda: [
+            pipeline.render(body, 'polar', *LOCATION, date, now)
+            for body in BODIES
+        ],
+    }
+
+    print(f'{len(BODIES)} bodies, {len(tt)} samples per body, median of {repeat} calls')
+    for name, func in cases.items():
+        print(f'{name:<34} {measure(func, repeat):9.2f} ms')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the all-bodies sky map against ten single-body renders.')
+    parser.add_argument('--repeat', type=int, default=10, help='Number of measured calls of each case (default: 10)')
+    parser.add_argument('--trail', type=int, default=0, help='Hours of trail of the sky map (default: 0)')
+
+    args = parser.parse_args()
+    main(args.repeat, args.trail)
@@ -4,10 +4,22 @@ AstroBot - Discord Bot for Astronomy
 This script initializes and runs the AstroBot Discord bot.
 It loads the necessary cogs and synchronizes commands when the bot is ready.
 
+It can also run the compute service, a process owning the kernels, caches and render threads that
+several bot processes on the same host can share through a Unix-domain socket, and a headless
+HTTP JSON API serving the same reports and plots:
+
+    python main.py service --socket /run/astrobot.sock
+    python main.py bot --socket /run/astrobot.sock
+    python main.py api --host 127.0.0.1 --port 8080
+
 Author: Lucas Mourey
 """
 
+import argparse
+import asyncio
 import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'astrobot'))
 
 import discord
 from dotenv import load_dotenv
@@ -15,6 +27,38 @@ from dotenv import load_dotenv
 load_dotenv()
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 
+import api
+import kernels
+import pipeline
+import service
+
+parser = argparse.ArgumentParser(description='AstroBot - Discord Bot for Astronomy')
+parser.add_argument('mode', nargs='?', choices=['api', 'bot', 'service'], default='bot', help='Run the bot, the HTTP API or the compute service (default: bot)')
+parser.add_argument('--socket', default=os.getenv('ASTROBOT_COMPUTE_SOCKET'), help='Socket of the compute service (default: $ASTROBOT_COMPUTE_SOCKET, compute in the bot process if unset)')
+parser.add_argument('--host', default='127.0.0.1', help='Address of the HTTP API (default: 127.0.0.1)')
+parser.add_argument('--port', type=int, default=8080, help='Port of the HTTP API (default: 8080)')
+args = parser.parse_args()
+
+if args.mode == 'service':
+    if not args.socket:
+        parser.error('the compute service needs a --socket path')
+
+    # Download the missing ephemeris kernels in the background, requests answer "not ready" meanwhile
+    kernels.manager.start()
+    asyncio.run(service.serve(args.socket))
+    sys.exit()
+
+if args.socket:
+    # Send the computations to the shared compute service
+    pipeline.client = service.ComputeClient(args.socket)
+else:
+    # Download the missing ephemeris kernels in the background, commands answer "not ready" meanwhile
+    kernels.manager.start()
+
+if args.mode == 'api':
+    asyncio.run(api.serve(args.host, args.port))
+    sys.exit()
+
 bot = discord.Bot()
 
 @bot.event
@@ -22,7 +66,7 @@ async def on_ready():
     """
     Load cogs and sync commands when the bot is ready.
     """
-    cogs = ['moon', 'pictures', 'planets', 'sun']
+    cogs = ['calendar', 'digest', 'live', 'moon', 'pictures', 'planets', 'settings', 'sky', 'stats', 'sun']
     for cog in cogs:
         bot.load_extension(f'astrobot.cogs.{cog}')
         print(f'AstroBot - Loaded cog: {cog}')
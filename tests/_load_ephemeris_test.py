@@ -9,9 +9,11 @@ Methods:
     setUp: Initialize the Ephemeris object.
     test_load_ephemeris: Test the load_ephemeris method.
 """
+import os
 import unittest
 from context import astrobot
 from astrobot import ephemeris
+import kernels
 
 class TestLoadEphemeris(unittest.TestCase):
     """
@@ -32,11 +34,12 @@ class TestLoadEphemeris(unittest.TestCase):
         Test case for the load_ephemeris method.
         
         This method tests the load_ephemeris method of the Ephemeris class.
-        It verifies that the ephemeris file is loaded correctly and the path is set.
+        It verifies that the ephemeris file is loaded correctly from the absolute data directory.
         """
         filename = 'de440s.bsp'
         eph = self.eph._load_ephemeris(filename)
-        self.assertEqual(eph.path, f'files/{filename}')
+        self.assertEqual(eph.path, os.path.join(kernels.manager.data_dir, filename))
+        self.assertTrue(os.path.isabs(eph.path))
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+This module contains the tests for the animate_path function of the plots module.
+The animate_path function renders the animated daily path of a body.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Compute the daily report and the frames of the moon.
+    test_animate_path_gif: Test the GIF animation on the polar sky map.
+    test_animate_path_png: Test the APNG animation on the XY path.
+    test_max_bytes: Test that frames are dropped to bound the file size.
+"""
+
+import datetime
+import io
+import unittest
+from PIL import Image
+from context import astrobot
+from astrobot import ephemeris, plots
+
+class TestAnimatePath(unittest.TestCase):
+    """
+    Test the animate_path function of the plots module.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+        report (DailyReport): The daily report of the moon.
+        frames (tuple): The times, altitudes and azimuths of the frames.
+
+    Methods:
+        setUp: Compute the daily report and the frames of the moon.
+        test_animate_path_gif: Test the GIF animation on the polar sky map.
+        test_animate_path_png: Test the APNG animation on the XY path.
+        test_max_bytes: Test that frames are dropped to bound the file size.
+    """
+    def setUp(self):
+        self.date = datetime.datetime(2024, 6, 21)
+        self.eph = ephemeris.Ephemeris(-33.8688, 151.2093, 0, 'Australia/Sydney')
+        self.report = self.eph.daily_report(self.date, 'moon', now=self.date.replace(hour=22))
+        self.frames = self.eph.compute_timelapse(self.date, 'moon', 12)
+
+    def test_animate_path_gif(self):
+        """
+        Test case for the GIF animation.
+        It verifies that every frame is in the file, and that the frames differ.
+        """
+        image = Image.open(io.BytesIO(plots.animate_path(self.eph, 'moon', self.date, self.report, 'polar', *self.frames)))
+        self.assertEqual(image.format, 'GIF')
+        self.assertEqual(image.n_frames, 12)
+
+        first = image.convert('RGB').tobytes()
+        image.seek(6)
+        self.assertNotEqual(image.convert('RGB').tobytes(), first)
+
+    def test_animate_path_png(self):
+        """
+        Test case for the APNG animation.
+        It verifies that every frame is in the file.
+        """
+        image = Image.open(io.BytesIO(plots.animate_path(self.eph, 'moon', self.date, self.report, 'cartesian', *self.frames, image_format='png')))
+        self.assertEqual(image.format, 'PNG')
+        self.assertEqual(image.n_frames, 12)
+
+    def test_max_bytes(self):
+        """
+        Test case for the max_bytes argument.
+        It verifies that frames are dropped until the file is small enough.
+        """
+        image = plots.animate_path(self.eph, 'moon', self.date, self.report, 'polar', *self.frames, max_bytes=1)
+        self.assertEqual(Image.open(io.BytesIO(image)).n_frames, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+This script tests the batch almanac tool of the batch module.
+The batch module computes rise, set and twilight tables for many sites and dates.
+
+Attributes:
+    None
+
+Methods:
+    test_rows: Test that the rows hold the times computed by the Ephemeris class.
+    test_resume: Test that an interrupted run is completed without duplicated rows.
+    test_jsonl: Test the JSON lines output.
+    test_parquet: Test that the Parquet output is written in one row group.
+"""
+
+import csv
+import datetime
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from context import astrobot
+from astrobot import batch, ephemeris
+
+class TestBatchAlmanac(unittest.TestCase):
+    """
+    Test the batch almanac tool of the batch module.
+
+    Attributes:
+        directory (TemporaryDirectory): The directory of the input and output files.
+        sites (list): The sites of the input file.
+
+    Methods:
+        test_rows: Test that the rows hold the times computed by the Ephemeris class.
+        test_resume: Test that an interrupted run is completed without duplicated rows.
+        test_jsonl: Test the JSON lines output.
+        test_parquet: Test that the Parquet output is written in one row group.
+    """
+    def setUp(self):
+        """
+        Write the sites to a CSV file.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'sites.csv')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('name,latitude,longitude,altitude,timezone,end\n')
+            file.write('Paris,48.8566,2.3522,35,Europe/Paris,\n')
+            file.write('Sydney,-33.8688,151.2093,0,Australia/Sydney,2024-06-02\n')
+        self.sites = batch.read_sites(path, datetime.date(2024, 6, 1), datetime.date(2024, 6, 3))
+
+    def tearDown(self):
+        """
+        Remove the input and output files.
+        """
+        self.directory.cleanup()
+
+    def read_csv(self, path):
+        """
+        Read the rows of a CSV output file.
+        """
+        with open(path, newline='', encoding='utf-8') as file:
+            return list(csv.DictReader(file))
+
+    def test_rows(self):
+        """
+        Test case for the rows of the output file.
+        It verifies the sites and dates, and the times against the Ephemeris class.
+        """
+        output = os.path.join(self.directory.name, 'almanac.csv')
+        self.assertEqual(batch.run(self.sites, output, workers=1, progress=None), 5)
+
+        rows = self.read_csv(output)
+        self.assertEqual(
+            sorted((row['name'], row['date']) for row in rows),
+            [('Paris', '2024-06-01'), ('Paris', '2024-06-02'), ('Paris', '2024-06-03'), ('Sydney', '2024-06-01'), ('Sydney', '2024-06-02')]
+        )
+
+        paris = next(row for row in rows if row['name'] == 'Paris' and row['date'] == '2024-06-01')
+        eph = ephemeris.Ephemeris(48.8566, 2.3522, 35, 'Europe/Paris')
+        sunrise, sunset = eph.get_rise_set_times(datetime.datetime(2024, 6, 1), 'sun')
+        self.assertEqual((paris['sunrise'], paris['sunset']), (sunrise.strftime('%H:%M:%S'), sunset.strftime('%H:%M:%S')))
+
+        # The night starting on June 1st in Paris has a short astronomical darkness after midnight
+        self.assertLess(paris['sunset'], paris['civil_dusk'])
+        self.assertLess(paris['civil_dusk'], paris['nautical_dusk'])
+        self.assertLess(paris['astronomical_dusk'], paris['astronomical_dawn'])
+        self.assertLess(paris['astronomical_dawn'], paris['nautical_dawn'])
+        self.assertLess(paris['nautical_dawn'], paris['civil_dawn'])
+
+    def test_resume(self):
+        """
+        Test case for the resume option.
+        It verifies that a cut row is dropped and that every row is written once.
+        """
+        output = os.path.join(self.directory.name, 'almanac.csv')
+        batch.run(self.sites[:1], output, workers=1, progress=None)
+        with open(output, 'rb+') as file:
+            file.truncate(os.path.getsize(output) - 10)
+
+        self.assertEqual(batch.run(self.sites, output, workers=1, resume=True, progress=None), 3)
+        rows = self.read_csv(output)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(len({(row['name'], row['date']) for row in rows}), 5)
+
+    def test_jsonl(self):
+        """
+        Test case for the JSON lines output.
+        It verifies that every line is a row with every column.
+        """
+        output = os.path.join(self.directory.name, 'almanac.jsonl')
+        batch.run(self.sites[1:], output, workers=1, progress=None)
+        with open(output, encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual([row['date'] for row in rows], ['2024-06-01', '2024-06-02'])
+        self.assertEqual(list(rows[0]), batch.COLUMNS)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_parquet(self):
+        """
+        Test case for the Parquet output.
+        It verifies that the rows of every chunk are written in one row group.
+        """
+        import pyarrow.parquet
+
+        output = os.path.join(self.directory.name, 'almanac.parquet')
+        batch.run(self.sites, output, workers=1, progress=None)
+        metadata = pyarrow.parquet.ParquetFile(output).metadata
+        self.assertEqual(metadata.num_rows, 5)
+        self.assertEqual(metadata.num_row_groups, 1)
+        self.assertEqual(metadata.schema.names, batch.COLUMNS)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+This script tests the Chebyshev fast position engine.
+The chebyshev module computes plotting-grade positions from cached Chebyshev fits.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris objects.
+    test_validate: Test the accuracy of the engine against the reference positions.
+    test_compute_daily_path_approximate: Test the approximate precision of the compute_daily_path method.
+    test_altaz_observers: Test that several observers at once get the positions of each observer alone.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+import chebyshev
+
+class TestChebyshevEngine(unittest.TestCase):
+    """
+    Test the Chebyshev fast position engine.
+
+    Attributes:
+        observers (list): The Ephemeris objects of several observers.
+
+    Methods:
+        setUp: Initialize the Ephemeris objects.
+        test_validate: Test the accuracy of the engine against the reference positions.
+        test_compute_daily_path_approximate: Test the approximate precision of the compute_daily_path method.
+        test_altaz_observers: Test that several observers at once get the positions of each observer alone.
+    """
+    def setUp(self):
+        self.observers = [
+            ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris'),
+            ephemeris.Ephemeris(-33.8688, 151.2093, 50, 'Australia/Sydney'),
+            ephemeris.Ephemeris(69.6496, 18.9560, 0, 'Europe/Oslo'),
+        ]
+
+    def test_validate(self):
+        """
+        Test case for the validate function.
+        It verifies that the fast positions stay within 0.01° of the reference positions.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        for eph in self.observers:
+            for sky_object in ['sun', 'moon', 'mars barycenter', 'saturn barycenter']:
+                self.assertLess(chebyshev.validate(eph, date, sky_object), 0.01)
+
+    def test_compute_daily_path_approximate(self):
+        """
+        Test case for the approximate precision of the compute_daily_path method.
+        It verifies that the approximate path has the same shape and values as the reference path.
+        """
+        eph = self.observers[0]
+        date = datetime.datetime(2024, 6, 22)
+        altitudes, azimuths, peak_hours_altaz = eph.compute_daily_path(date, 'sun', precision='approximate')
+        self.assertEqual(len(altitudes), 24*3+1)
+        self.assertEqual(list(peak_hours_altaz.keys()), list(eph.compute_daily_path(date, 'sun')[2].keys()))
+        self.assertAlmostEqual(altitudes[18], 0.83, delta=0.01)
+        self.assertAlmostEqual(azimuths[18], 54.0, delta=0.01)
+
+        current_alt, current_az = eph.compute_current_position(datetime.datetime(2024, 6, 22, 12), 'sun', precision='approximate')
+        self.assertAlmostEqual(current_alt, 56.26, delta=0.01)
+        self.assertAlmostEqual(current_az, 128.72, delta=0.1)
+
+    def test_altaz_observers(self):
+        """
+        Test case for the altaz_observers method of the engine.
+        It verifies that each observer gets the positions of the altaz_many method over its own times.
+        """
+        sky_objects = [ephemeris.get_sky_object(body) for body in ['sun', 'moon', 'mars']]
+        tt = ephemeris.ts.utc(2024, 6, 22).tt + np.arange(3)[:, None] * 0.3 + np.arange(5) * 0.1
+        latitudes = [eph.latitude for eph in self.observers]
+        longitudes = [eph.longitude for eph in self.observers]
+        elevations = [eph.altitude for eph in self.observers]
+
+        alt, az = chebyshev.engine.altaz_observers(sky_objects, tt, latitudes, longitudes, elevations)
+        self.assertEqual(alt.shape, (3, 3, 5))
+        for index in range(3):
+            expected_alt, expected_az = chebyshev.engine.altaz_many(sky_objects, tt[index], latitudes[index], longitudes[index], elevations[index])
+            np.testing.assert_allclose(alt[:, index], expected_alt, atol=1e-9)
+            np.testing.assert_allclose(az[:, index], expected_az, atol=1e-9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,218 @@
+"""
+This script tests the compute service and its client in the service module.
+The compute service serves the requests of the bot processes over a Unix-domain socket.
+
+Attributes:
+    None
+
+Methods:
+    test_encode_compute: Test that a compute request survives its binary encoding.
+    test_compute: Test that the client gets the same report and image as the local pipeline.
+    test_compute_calendar: Test that the client gets the calendar of a month and its image.
+    test_compute_tonight: Test that the client gets the observing windows of a night.
+    test_compute_sky: Test that the client gets the sky map of every body.
+    test_compute_live: Test that the client gets the live sky map of a location.
+    test_compute_digests: Test that the client gets the daily digests of several sites.
+    test_compute_compare: Test that the client gets the rise and set times of several locations.
+    test_kernel_status: Test that the client gets the kernel status of the service.
+    test_socket_permissions: Test that the socket is only accessible by its owner.
+    test_other_user: Test that the client refuses a service of another user.
+    test_service_stopped: Test that the client raises a ServiceError when the service is not running.
+"""
+
+import asyncio
+import datetime
+import os
+import tempfile
+import unittest
+from context import astrobot
+from astrobot import pipeline, service
+from constants import PLOT_DATA
+
+class TestComputeService(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the compute service and its client in the service module.
+
+    Attributes:
+        directory (TemporaryDirectory): The directory of the socket.
+        server (asyncio.Task): The task serving the requests.
+        client (ComputeClient): The client of the service.
+
+    Methods:
+        test_encode_compute: Test that a compute request survives its binary encoding.
+        test_compute: Test that the client gets the same report and image as the local pipeline.
+        test_compute_calendar: Test that the client gets the calendar of a month and its image.
+        test_compute_tonight: Test that the client gets the observing windows of a night.
+        test_compute_sky: Test that the client gets the sky map of every body.
+        test_compute_live: Test that the client gets the live sky map of a location.
+        test_compute_digests: Test that the client gets the daily digests of several sites.
+        test_compute_compare: Test that the client gets the rise and set times of several locations.
+        test_kernel_status: Test that the client gets the kernel status of the service.
+        test_socket_permissions: Test that the socket is only accessible by its owner.
+        test_other_user: Test that the client refuses a service of another user.
+        test_service_stopped: Test that the client raises a ServiceError when the service is not running.
+    """
+    async def asyncSetUp(self):
+        """
+        Start a compute service on a temporary socket.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        path = os.path.join(self.directory.name, 'compute.sock')
+        self.server = asyncio.create_task(service.serve(path))
+        while not os.path.exists(path):
+            await asyncio.sleep(0.01)
+        self.client = service.ComputeClient(path)
+
+    async def asyncTearDown(self):
+        """
+        Stop the compute service.
+        """
+        await self.client.close()
+        self.server.cancel()
+        await asyncio.gather(self.server, return_exceptions=True)
+        self.directory.cleanup()
+
+    def test_encode_compute(self):
+        """
+        Test case for the encode_compute and decode_compute functions.
+        It verifies that the arguments are decoded as sent, with the date at midnight.
+        """
+        args = ('moon', 'polar', 48.8566, -2.3522, 35.0, 'Europe/Paris', datetime.datetime(2024, 6, 21, 15), datetime.datetime(2024, 6, 21, 15, 30, 12, 5), 123456789012345678, None, 'gif')
+        decoded = service.decode_compute(service.encode_compute(*args))
+        self.assertEqual(decoded, (*args[:6], datetime.datetime(2024, 6, 21), *args[7:]))
+
+    async def test_compute(self):
+        """
+        Test case for the compute method of the client.
+        It verifies that the report and the image are the ones computed in this process.
+        """
+        args = ('mars', 'polar', 48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 6, 21), datetime.datetime(2024, 6, 21, 22, 15))
+        report, image = await self.client.compute(*args, 1, 2)
+        expected_report, expected_image = pipeline.render(*pipeline.get_request_key(*args))
+        self.assertEqual(report, expected_report)
+        self.assertEqual(image[:8], b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(len(image), len(expected_image))
+
+        report, image = await self.client.compute('sun', None, *args[2:])
+        self.assertEqual(report.body, 'sun')
+        self.assertIsNone(image)
+
+        report, image = await self.client.compute('sun', PLOT_DATA, *args[2:])
+        self.assertEqual(set(report.solstice_paths), {'summer', 'winter'})
+        self.assertIsNone(image)
+
+    async def test_compute_calendar(self):
+        """
+        Test case for the compute_calendar method of the client.
+        It verifies that the calendar is the one computed in this process.
+        """
+        month_calendar, image = await self.client.compute_calendar('moon', 48.8566, 2.3522, 0, 'Europe/Paris', 2024, 3)
+        expected, _ = pipeline.render_calendar('moon', 48.857, 2.352, 0, 'Europe/Paris', 2024, 3)
+        self.assertEqual(month_calendar, expected)
+        self.assertEqual(image[:8], b'\x89PNG\r\n\x1a\n')
+
+    async def test_compute_tonight(self):
+        """
+        Test case for the compute_tonight method of the client.
+        It verifies that the observing windows are the ones computed in this process.
+        """
+        windows = await self.client.compute_tonight(48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 8, 15), -12.0, 15.0)
+        expected = pipeline.render_tonight(48.857, 2.352, 0, 'Europe/Paris', datetime.date(2024, 8, 15), -12.0, 15.0)
+        self.assertEqual(windows, expected)
+        self.assertTrue(windows)
+
+    async def test_compute_sky(self):
+        """
+        Test case for the compute_sky method of the client.
+        It verifies that the positions are the ones computed in this process.
+        """
+        positions, image = await self.client.compute_sky(48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 4, 0, 30), 2)
+        expected, _ = pipeline.render_sky(48.857, 2.352, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 4), 2)
+        self.assertEqual(positions.bodies, expected.bodies)
+        self.assertEqual(positions.altitudes.tolist(), expected.altitudes.tolist())
+        self.assertEqual(image[:8], b'\x89PNG\r\n\x1a\n')
+
+    async def test_compute_live(self):
+        """
+        Test case for the compute_live method of the client.
+        It verifies that the positions of the live bodies are the ones computed in this process.
+        """
+        positions, image = await self.client.compute_live(48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 4, 0, 30))
+        expected, _ = pipeline.render_live(48.857, 2.352, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 4))
+        self.assertEqual(positions.bodies, ['sun', 'moon'])
+        self.assertEqual(positions.altitudes.tolist(), expected.altitudes.tolist())
+        self.assertEqual(image[:8], b'\x89PNG\r\n\x1a\n')
+
+    async def test_compute_digests(self):
+        """
+        Test case for the compute_digests method of the client.
+        It verifies that the sites survive their encoding and get the digests computed in this process.
+        """
+        sites = [(48.86, 2.35, 40, 'Europe/Paris'), (-33.87, 151.21, 0, 'Australia/Sydney')]
+        date = datetime.date(2024, 6, 1)
+        self.assertEqual(service.decode_digests(service.encode_digests(sites, date)), (sites, date))
+
+        digests = await self.client.compute_digests(sites, date)
+        self.assertEqual(digests, await pipeline.compute_digests(sites, date))
+
+    async def test_compute_compare(self):
+        """
+        Test case for the compute_compare method of the client.
+        It verifies that the request survives its encoding and gets the times computed in this process.
+        """
+        sites = [(48.8566, 2.3522, 0, 'Europe/Paris'), (-33.8688, 151.2093, 50, 'Australia/Sydney')]
+        date = datetime.datetime(2024, 6, 1)
+        self.assertEqual(service.decode_compare(service.encode_compare(sites, 'sun', date, 1, 2)), (sites, 'sun', date, 1, 2))
+
+        rise_times, set_times = await self.client.compute_compare(sites, 'sun', date)
+        expected = pipeline.render_compare(((48.857, 2.352, 0, 'Europe/Paris'), (-33.869, 151.209, 50, 'Australia/Sydney')), 'sun', date.date())
+        self.assertEqual(rise_times.tolist(), expected[0].tolist())
+        self.assertEqual(set_times.tolist(), expected[1].tolist())
+
+    async def test_kernel_status(self):
+        """
+        Test case for the kernel_status method of the client.
+        It verifies that the ephemeris kernel is ready on the service.
+        """
+        status = await self.client.kernel_status('de440s.bsp')
+        self.assertEqual(status['state'], 'ready')
+
+    async def test_socket_permissions(self):
+        """
+        Test case for the permissions of the socket.
+        It verifies that the socket is created without any access for the group and the other users.
+        """
+        mode = os.stat(self.client.path).st_mode
+        self.assertEqual(mode & 0o077, 0)
+
+    async def test_other_user(self):
+        """
+        Test case for a service running as another user.
+        It verifies that the client refuses to connect, before reading any answer.
+        """
+        peer_uid = service._peer_uid
+        service._peer_uid = lambda writer: os.getuid() + 1
+        try:
+            with self.assertRaises(service.ServiceError):
+                await self.client.kernel_status('de440s.bsp')
+        finally:
+            service._peer_uid = peer_uid
+
+    async def test_service_stopped(self):
+        """
+        Test case for a service that is not running.
+        It verifies that the client raises a ServiceError, before and after the service stops.
+        """
+        client = service.ComputeClient(os.path.join(self.directory.name, 'missing.sock'))
+        with self.assertRaises(service.ServiceError):
+            await client.kernel_status('de440s.bsp')
+
+        await self.client.kernel_status('de440s.bsp')
+        self.server.cancel()
+        await asyncio.gather(self.server, return_exceptions=True)
+        await self.client.close()
+        with self.assertRaises(service.ServiceError):
+            await self.client.kernel_status('de440s.bsp')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+This module contains the tests for the compute_timelapse method of the Ephemeris class.
+The Ephemeris class provides methods to calculate the positions of the bodies.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_compute_timelapse: Test that the frames follow the body above the horizon.
+    test_never_rises: Test that the frames cover the whole day when the body never rises.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+
+class TestComputeTimelapse(unittest.TestCase):
+    """
+    Test the compute_timelapse method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_compute_timelapse: Test that the frames follow the body above the horizon.
+        test_never_rises: Test that the frames cover the whole day when the body never rises.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_compute_timelapse(self):
+        """
+        Test case for the compute_timelapse method.
+        It verifies that the frames are in order, between the rise and the set of the body.
+        """
+        date = datetime.datetime(2024, 6, 21)
+        times, altitudes, azimuths = self.eph.compute_timelapse(date, 'sun', 48)
+        self.assertEqual(len(times), 48)
+        self.assertEqual(altitudes.shape, (48,))
+        self.assertTrue(all(first < second for first, second in zip(times, times[1:])))
+
+        sunrise, sunset = self.eph.get_rise_set_times(date, 'sun')
+        self.assertGreaterEqual(times[0].time(), (datetime.datetime.combine(date, sunrise) - datetime.timedelta(minutes=20)).time())
+        self.assertLessEqual(times[-1].time(), (datetime.datetime.combine(date, sunset) + datetime.timedelta(minutes=20)).time())
+        self.assertGreater(altitudes.min(), -5)
+
+        # The moon sets in the morning and rises in the evening, the frames skip the day
+        times, altitudes, _ = self.eph.compute_timelapse(date, 'moon', 48)
+        self.assertGreater(altitudes.min(), -5)
+        self.assertFalse(any(datetime.time(6) < time.time() < datetime.time(21) for time in times))
+
+    def test_never_rises(self):
+        """
+        Test case for the polar night.
+        It verifies that the frames cover the whole day when the sun never rises.
+        """
+        eph = ephemeris.Ephemeris(78.2232, 15.6267, 0, 'Arctic/Longyearbyen')
+        times, altitudes, _ = eph.compute_timelapse(datetime.datetime(2024, 12, 21), 'sun', 24)
+        self.assertEqual([time.hour for time in times], list(range(24)))
+        self.assertTrue(np.all(altitudes < 0))
+
+if __name__ == '__main__':
+    unittest.main()
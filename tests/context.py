@@ -1,7 +1,8 @@
 """
 This module provides the necessary context for running tests for the AstroBot project.
 
-It adds the project directory to the sys.path, allowing the tests to import the required modules.
+It adds the project directory to the sys.path, allowing the tests to import the required modules,
+and downloads the ephemeris kernel if it is missing.
 
 Usage:
     import context
@@ -11,5 +12,12 @@ Usage:
 import os
 import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'astrobot')))
 
 import astrobot
+import kernels
+from constants import EPHEMERIS_KERNEL
+
+# Make sure the ephemeris kernel is available before running the tests
+kernels.manager.start([EPHEMERIS_KERNEL], retries=1)
+kernels.manager.wait(EPHEMERIS_KERNEL)
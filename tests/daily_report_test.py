@@ -0,0 +1,105 @@
+"""
+This script tests the daily_report method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as rise and set times.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_daily_report_sun: Test the daily report of the sun.
+    test_daily_report_moon: Test the daily report of the moon.
+    test_daily_report_text: Test the daily report of a text-only answer.
+    test_daily_report_precision: Test that the plotted positions use the precision of the object by default.
+    test_daily_report_aware_now: Test that an aware current time is converted to the timezone of the observer.
+"""
+
+import datetime
+import unittest
+from context import astrobot
+from astrobot import ephemeris
+
+class TestDailyReport(unittest.TestCase):
+    """
+    Test the daily_report method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_daily_report_sun: Test the daily report of the sun.
+        test_daily_report_moon: Test the daily report of the moon.
+        test_daily_report_text: Test the daily report of a text-only answer.
+        test_daily_report_precision: Test that the plotted positions use the precision of the object by default.
+        test_daily_report_aware_now: Test that an aware current time is converted to the timezone of the observer.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_daily_report_sun(self):
+        """
+        Test case for the daily report of the sun.
+        It verifies that the report matches the separate Ephemeris methods.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        report = self.eph.daily_report(date, 'sun', now=datetime.datetime(2024, 6, 22, 12))
+        self.assertEqual(report.rise_time.strftime('%H:%M:%S'), '05:47:18')
+        self.assertEqual(report.set_time.strftime('%H:%M:%S'), self.eph.get_sunset_time(date).strftime('%H:%M:%S'))
+        self.assertEqual(report.transit_time.strftime('%H:%M'), '13:52')
+        self.assertAlmostEqual(report.transit_altitude, 64.58, delta=0.01)
+        self.assertAlmostEqual(report.current_altitude, 56.26, delta=0.01)
+        self.assertEqual(len(report.altitudes), 24*3+1)
+        self.assertAlmostEqual(float(report.altitudes[18]), 0.83, delta=0.005)
+        self.assertEqual(len(report.twilight[0]), 6)
+        self.assertEqual(set(report.solstice_paths.keys()), {'summer', 'winter'})
+        self.assertIsNone(report.moon_phase)
+
+    def test_daily_report_moon(self):
+        """
+        Test case for the daily report of the moon.
+        It verifies that the report holds the moon phase and the rise and set times.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        report = self.eph.daily_report(date, 'moon')
+        self.assertEqual(report.rise_time.strftime('%H:%M'), self.eph.get_moonrise_time(date).strftime('%H:%M'))
+        self.assertAlmostEqual(report.moon_phase, self.eph.get_moon_phase(date))
+        self.assertIsNone(report.twilight)
+
+    def test_daily_report_text(self):
+        """
+        Test case for the daily report of a text-only answer.
+        It verifies that the printed values are the same, and that the solstice paths are skipped.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        report = self.eph.daily_report(date, 'sun', plot=False)
+        plotted = self.eph.daily_report(date, 'sun')
+        self.assertEqual(report.rise_time, plotted.rise_time)
+        self.assertEqual(report.path, plotted.path)
+        self.assertEqual(report.twilight, plotted.twilight)
+        self.assertEqual(report.solstice_paths, {})
+
+    def test_daily_report_precision(self):
+        """
+        Test case for the precision of the daily report.
+        It verifies that the precision of the object is used by default, and that an unknown precision is refused.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris', precision='approximate')
+        self.assertEqual(eph.daily_report(date, 'sun').path, self.eph.daily_report(date, 'sun', precision='approximate').path)
+        self.assertNotEqual(eph.daily_report(date, 'sun').path, self.eph.daily_report(date, 'sun').path)
+        with self.assertRaises(ValueError):
+            self.eph.daily_report(date, 'sun', precision='exact')
+
+    def test_daily_report_aware_now(self):
+        """
+        Test case for the daily report with a current time in another timezone.
+        It verifies that the current time is converted, not relabeled, to the timezone of the observer.
+        """
+        now = datetime.datetime(2024, 6, 22, 10, tzinfo=datetime.timezone.utc) # 12:00 in Paris
+        report = self.eph.daily_report(datetime.datetime(2024, 6, 22), 'sun', now=now, plot=False)
+        self.assertEqual(report.now.replace(tzinfo=None), datetime.datetime(2024, 6, 22, 12))
+        self.assertAlmostEqual(report.current_altitude, 56.26, delta=0.01)
+
+if __name__ == '__main__':
+    unittest.main()
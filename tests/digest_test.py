@@ -0,0 +1,202 @@
+"""
+This script tests the daily digests of the digest module.
+The digest module computes the digests of many subscribed sites in one batch.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the sites and the date of the digests.
+    test_compute_digests: Test the digests of a batch against the Ephemeris of each site.
+    test_polar_day: Test that the events that do not happen are None.
+    test_split_windows: Test that a planet hidden for part of the night has several windows.
+    test_get_site: Test that nearby subscriptions share one site.
+    test_get_next_post: Test the next posting time of a subscription.
+    test_subscriptions: Test that the subscriptions are stored in the JSON file.
+    test_shared_subscriptions: Test that the changes of several processes sharing the file are kept.
+    test_scheduler_lock: Test that one process at a time is the scheduler.
+"""
+
+import datetime
+import os
+import tempfile
+import unittest
+from zoneinfo import ZoneInfo
+from context import astrobot
+from astrobot import ephemeris
+from constants import PLANETS
+import digest
+
+class TestDigest(unittest.TestCase):
+    """
+    Test the daily digests of the digest module.
+
+    Attributes:
+        sites (list): The sites of the digests.
+        date (datetime.date): The date of the digests.
+
+    Methods:
+        setUp: Initialize the sites and the date of the digests.
+        test_compute_digests: Test the digests of a batch against the Ephemeris of each site.
+        test_polar_day: Test that the events that do not happen are None.
+        test_split_windows: Test that a planet hidden for part of the night has several windows.
+        test_get_site: Test that nearby subscriptions share one site.
+        test_get_next_post: Test the next posting time of a subscription.
+        test_subscriptions: Test that the subscriptions are stored in the JSON file.
+        test_shared_subscriptions: Test that the changes of several processes sharing the file are kept.
+        test_scheduler_lock: Test that one process at a time is the scheduler.
+    """
+    def setUp(self):
+        self.sites = [
+            (48.86, 2.35, 40, 'Europe/Paris'),
+            (-33.87, 151.21, 0, 'Australia/Sydney'),
+            (40.71, -74.01, 10, 'America/New_York'),
+        ]
+        self.date = datetime.date(2024, 6, 1)
+
+    def test_compute_digests(self):
+        """
+        Test case for the compute_digests function.
+        It verifies that the sunrise, the sunset and the planet windows of each site are within a minute of its Ephemeris.
+        """
+        digests = digest.compute_digests(self.sites, self.date)
+        self.assertEqual(len(digests), len(self.sites))
+
+        for site, result in zip(self.sites, digests):
+            eph = ephemeris.Ephemeris(*site)
+            sunrise = datetime.datetime.combine(self.date, eph.get_sunrise_time(datetime.datetime(2024, 6, 1)))
+            sunset = datetime.datetime.combine(self.date, eph.get_sunset_time(datetime.datetime(2024, 6, 1)))
+            self.assertEqual(result.sunrise.tzinfo, ZoneInfo(site[3]))
+            self.assertLess(abs(result.sunrise.replace(tzinfo=None) - sunrise), datetime.timedelta(minutes=1))
+            self.assertLess(abs(result.sunset.replace(tzinfo=None) - sunset), datetime.timedelta(minutes=1))
+            self.assertLess(result.dusks['Civil'], result.dusks['Nautique'])
+
+            windows = eph.get_observing_windows(self.date, min_altitude=digest.MIN_ALTITUDE, bodies=list(PLANETS.values()))
+            self.assertEqual([window.body for window in result.planets], [window.body for window in windows])
+            for window, expected in zip(result.planets, windows):
+                self.assertLess(abs(window.start - expected.start), datetime.timedelta(minutes=1))
+                self.assertLess(abs(window.end - expected.end), datetime.timedelta(minutes=1))
+
+        # The moon phase at the local noon of Paris
+        eph = ephemeris.Ephemeris(*self.sites[0])
+        noon = datetime.datetime(2024, 6, 1, 12)
+        _, illumination, _ = eph.get_moon_illumination(noon, noon)
+        self.assertAlmostEqual(digests[0].moon_phase, eph.get_moon_phase(noon), delta=0.01)
+        self.assertAlmostEqual(digests[0].moon_illumination, illumination[0], delta=0.01)
+
+    def test_polar_day(self):
+        """
+        Test case for the compute_digests function during the polar day.
+        It verifies that the sunrise, the sunset and the dusks are None.
+        """
+        result, = digest.compute_digests([(69.65, 18.96, 0, 'Europe/Oslo')], self.date)
+        self.assertIsNone(result.sunrise)
+        self.assertIsNone(result.sunset)
+        self.assertEqual(set(result.dusks.values()), {None})
+
+    def test_split_windows(self):
+        """
+        Test case for the compute_digests function during the polar night.
+        It verifies that a planet dipping below the minimum altitude gets one window before and one after, like get_observing_windows.
+        """
+        site = (80.0, 30.0, 0, 'UTC') # Uranus dips below the minimum altitude in the middle of the polar night
+        date = datetime.date(2024, 12, 20)
+        result, = digest.compute_digests([site], date)
+        windows = ephemeris.Ephemeris(*site).get_observing_windows(date, sun_altitude=digest.NIGHT, min_altitude=digest.MIN_ALTITUDE, bodies=list(PLANETS.values()))
+
+        bodies = [window.body for window in result.planets]
+        self.assertGreater(len(bodies), len(set(bodies)))
+        key = lambda window: (window.body, window.start)
+        for window, expected in zip(sorted(result.planets, key=key), sorted(windows, key=key)):
+            self.assertEqual(window.body, expected.body)
+            self.assertLess(abs(window.start - expected.start), datetime.timedelta(minutes=1))
+            self.assertLess(abs(window.end - expected.end), datetime.timedelta(minutes=1))
+            self.assertLessEqual(window.end, window.start + datetime.timedelta(days=1))
+        self.assertEqual(len(result.planets), len(windows))
+
+    def test_get_site(self):
+        """
+        Test case for the get_site function.
+        It verifies that the subscriptions within the quantization steps share one site.
+        """
+        subscription = {'latitude': 48.8566, 'longitude': 2.3522, 'altitude': 34, 'timezone': 'Europe/Paris'}
+        nearby = {'latitude': 48.8601, 'longitude': 2.3488, 'altitude': 28, 'timezone': 'Europe/Paris'}
+        self.assertEqual(digest.get_site(subscription), (48.86, 2.35, 30, 'Europe/Paris'))
+        self.assertEqual(digest.get_site(subscription), digest.get_site(nearby))
+
+    def test_get_next_post(self):
+        """
+        Test case for the get_next_post function.
+        It verifies that the posting time is today in the local timezone, or tomorrow once posted.
+        """
+        subscription = {'timezone': 'Australia/Sydney', 'time': '08:30', 'last_posted': None}
+        now = datetime.datetime(2024, 6, 1, 20, tzinfo=datetime.timezone.utc) # 06:00 in Sydney
+        self.assertEqual(digest.get_next_post(subscription, now), datetime.datetime(2024, 6, 2, 8, 30, tzinfo=ZoneInfo('Australia/Sydney')))
+
+        subscription['last_posted'] = '2024-06-02'
+        self.assertEqual(digest.get_next_post(subscription, now), datetime.datetime(2024, 6, 3, 8, 30, tzinfo=ZoneInfo('Australia/Sydney')))
+
+    def test_subscriptions(self):
+        """
+        Test case for the Subscriptions class.
+        It verifies that one subscription is kept per target, and that the changes are saved.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'subscriptions.json')
+            subscriptions = digest.Subscriptions(path)
+            subscription = {'target': 'channel', 'target_id': 1, 'time': '08:00', 'last_posted': None}
+            subscriptions.add(subscription)
+            subscriptions.add({**subscription, 'time': '09:00'})
+            subscriptions.add({**subscription, 'target': 'user'})
+            subscriptions.mark_posted([subscription], self.date)
+
+            stored = digest.Subscriptions(path).all()
+            self.assertEqual(len(stored), 2)
+            self.assertEqual(stored[0]['time'], '09:00')
+            self.assertEqual(stored[0]['last_posted'], '2024-06-01')
+            self.assertIsNone(stored[1]['last_posted'])
+
+            self.assertTrue(subscriptions.remove('user', 1))
+            self.assertFalse(subscriptions.remove('user', 1))
+            self.assertEqual(len(digest.Subscriptions(path).all()), 1)
+
+    def test_shared_subscriptions(self):
+        """
+        Test case for the Subscriptions class shared by several processes.
+        It verifies that each object reads the changes of the other ones before its own change.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'subscriptions.json')
+            first, second = digest.Subscriptions(path), digest.Subscriptions(path)
+            subscription = {'target': 'channel', 'target_id': 1, 'time': '08:00', 'last_posted': None}
+            self.assertEqual(second.all(), [])
+
+            first.add(subscription)
+            second.add({**subscription, 'target': 'user'})
+            first.mark_posted([subscription], self.date)
+            self.assertEqual(len(second.all()), 2)
+
+            stored = {item['target']: item for item in digest.Subscriptions(path).all()}
+            self.assertEqual(set(stored), {'channel', 'user'})
+            self.assertEqual(stored['channel']['last_posted'], '2024-06-01')
+            self.assertTrue(os.path.exists(f'{path}.lock'))
+
+    def test_scheduler_lock(self):
+        """
+        Test case for the SchedulerLock class.
+        It verifies that a second lock of the same file is refused until the first one is released.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'scheduler.lock')
+            first, second = digest.SchedulerLock(path), digest.SchedulerLock(path)
+            self.assertTrue(first.acquire())
+            self.assertTrue(first.acquire())
+            self.assertFalse(second.acquire())
+
+            first.release()
+            self.assertTrue(second.acquire())
+            self.assertFalse(first.acquire())
+            second.release()
+
+if __name__ == '__main__':
+    unittest.main()
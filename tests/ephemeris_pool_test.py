@@ -0,0 +1,71 @@
+"""
+This script tests the pooling and thread safety of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as rise and set times.
+
+Attributes:
+    None
+
+Methods:
+    test_for_location: Test that the same Ephemeris object is reused for the same location.
+    test_pool_size: Test that the pool drops the least recently used locations.
+    test_threads: Test that a shared Ephemeris object gives the same results from several threads.
+"""
+
+import datetime
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from context import astrobot
+from astrobot import ephemeris
+from constants import PLOT_PRECISION
+
+class TestEphemerisPool(unittest.TestCase):
+    """
+    Test the pooling and thread safety of the Ephemeris class.
+
+    Attributes:
+        None
+
+    Methods:
+        test_for_location: Test that the same Ephemeris object is reused for the same location.
+        test_pool_size: Test that the pool drops the least recently used locations.
+        test_threads: Test that a shared Ephemeris object gives the same results from several threads.
+    """
+    def test_for_location(self):
+        """
+        Test case for the for_location method.
+        It verifies that a location and timezone always give the same Ephemeris object, with the precision of the plots.
+        """
+        eph = ephemeris.Ephemeris.for_location(48.8566, 2.3522, 0, 'Europe/Paris')
+        self.assertIs(eph, ephemeris.Ephemeris.for_location(48.8566, 2.3522, 0, 'Europe/Paris'))
+        self.assertIsNot(eph, ephemeris.Ephemeris.for_location(48.8566, 2.3522, 0, 'UTC'))
+        self.assertIsNot(eph, ephemeris.Ephemeris.for_location(48.8566, 2.3522, 100, 'Europe/Paris'))
+        self.assertEqual(eph.precision, PLOT_PRECISION)
+
+    def test_pool_size(self):
+        """
+        Test case for the size of the EphemerisPool.
+        It verifies that the least recently used location is dropped when the pool is full.
+        """
+        pool = ephemeris.EphemerisPool(size=2)
+        first = pool.get(0, 0, 0)
+        pool.get(1, 1, 0)
+        self.assertIs(pool.get(0, 0, 0), first)
+        pool.get(2, 2, 0)
+        self.assertEqual(len(pool), 2)
+        self.assertIs(pool.get(0, 0, 0), first)
+        self.assertEqual(len(pool), 2)
+
+    def test_threads(self):
+        """
+        Test case for a shared Ephemeris object used by several threads.
+        It verifies that concurrent computations give the same results as a single thread.
+        """
+        eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+        dates = [datetime.datetime(2024, 6, day) for day in range(1, 9)]
+        expected = [eph.get_sunrise_time(date) for date in dates]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(eph.get_sunrise_time, dates))
+        self.assertEqual(results, expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""
+This script tests the get_busy_message function in the utils module.
+The utils module provides utility functions for the AstroBot project.
+
+Attributes:
+    None
+
+Methods:
+    test_get_busy_message: Test the get_busy_message function.
+"""
+
+import unittest
+from context import astrobot
+from astrobot import utils
+
+class TestGetBusyMessage(unittest.TestCase):
+    """
+    Test the get_busy_message function in the utils module.
+
+    Attributes:
+        None
+
+    Methods:
+        test_get_busy_message: Test the get_busy_message function.
+    """
+    def test_get_busy_message(self):
+        """
+        Test case for the get_busy_message function.
+        It verifies that the message reports the number of waiting requests.
+        """
+        message = utils.get_busy_message(12)
+        self.assertIn('12 calculs en attente', message)
+
+if __name__ == '__main__':
+    unittest.main()
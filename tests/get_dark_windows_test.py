@@ -0,0 +1,86 @@
+"""
+This module contains the tests for the get_dark_windows method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as twilight times.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_dark_windows: Test the astronomical dark windows of a month.
+    test_moonless: Test the dark windows with the moon below the horizon.
+    test_polar_night: Test the dark windows of the polar night.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import chebyshev, ephemeris
+
+class TestGetDarkWindows(unittest.TestCase):
+    """
+    Test the get_dark_windows method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_dark_windows: Test the astronomical dark windows of a month.
+        test_moonless: Test the dark windows with the moon below the horizon.
+        test_polar_night: Test the dark windows of the polar night.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_get_dark_windows(self):
+        """
+        Test case for the get_dark_windows method.
+        It verifies one window per night, from the end of the astronomical dusk to the astronomical dawn.
+        """
+        windows = self.eph.get_dark_windows(datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))
+        self.assertEqual(len(windows.nights), 31)
+        np.testing.assert_array_equal(windows.night_index, np.arange(31))
+
+        times, levels = self.eph.get_twilight_times_events(datetime.datetime(2024, 3, 1))
+        start = ephemeris.ts.tt_jd(windows.start[0]).astimezone(self.eph.timezone)
+        end = ephemeris.ts.tt_jd(windows.end[0]).astimezone(self.eph.timezone)
+        self.assertEqual(start.time().replace(microsecond=0), times[list(levels).index(0)].replace(microsecond=0))
+        self.assertEqual(end.date(), datetime.date(2024, 3, 2))
+        self.assertAlmostEqual(windows.durations[0], 9.42, places=2)
+
+        # The nights get shorter in March
+        self.assertTrue(np.all(np.diff(windows.durations) < 0))
+
+    def test_moonless(self):
+        """
+        Test case for the moonless option.
+        It verifies that the windows are within the dark windows, with the moon below the horizon.
+        """
+        dark = self.eph.get_dark_windows(datetime.date(2024, 3, 1), datetime.date(2024, 3, 31))
+        windows = self.eph.get_dark_windows(datetime.date(2024, 3, 1), datetime.date(2024, 3, 31), moonless=True)
+        self.assertTrue(np.all(windows.durations <= dark.durations + 1e-9))
+
+        # The moon is up all night around the full moon of March 25
+        self.assertEqual(windows.durations[23], 0)
+
+        middles = (windows.start + windows.end) / 2
+        altitudes, _ = chebyshev.engine.altaz('moon', middles, self.eph.latitude, self.eph.longitude, self.eph.altitude)
+        self.assertTrue(np.all(altitudes < 0))
+
+    def test_polar_night(self):
+        """
+        Test case for the polar night.
+        It verifies that the dark windows are found without any sunrise or sunset.
+        """
+        eph = ephemeris.Ephemeris(78.2232, 15.6267, 0, 'Arctic/Longyearbyen')
+        windows = eph.get_dark_windows(datetime.date(2024, 12, 20), datetime.date(2024, 12, 22))
+        np.testing.assert_allclose(windows.durations, 15.39, atol=0.01)
+
+        windows = eph.get_dark_windows(datetime.date(2024, 6, 1), datetime.date(2024, 6, 3))
+        np.testing.assert_array_equal(windows.durations, 0)
+        self.assertEqual(len(windows.start), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+This script tests the get_hourly_table function in the utils module.
+The utils module provides utility functions for the AstroBot project.
+
+Attributes:
+    None
+
+Methods:
+    test_get_hourly_table: Test the table of a body above the horizon.
+    test_get_hourly_table_below_horizon: Test the table of a body below the horizon all day.
+"""
+
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import utils
+from results import DailyPath
+
+class TestGetHourlyTable(unittest.TestCase):
+    """
+    Test the get_hourly_table function in the utils module.
+
+    Attributes:
+        None
+
+    Methods:
+        test_get_hourly_table: Test the table of a body above the horizon.
+        test_get_hourly_table_below_horizon: Test the table of a body below the horizon all day.
+    """
+    def test_get_hourly_table(self):
+        """
+        Test case for the get_hourly_table function.
+        It verifies that only the hours above the horizon are listed, with the direction of the body.
+        """
+        # Samples every 30 minutes from midnight UTC, the hourly markers are above the horizon at 01:00 and 02:00
+        samples = [[-10, -5, 5, 20, 10, -2, -8], [90, 100, 110, 180, 200, 270, 300]]
+        path = DailyPath(0.0, 1800.0, 'UTC', samples, np.arange(0, 7, 2))
+        table = utils.get_hourly_table(path)
+        self.assertEqual(table.splitlines()[2:-1], ['01:00    5.0°  110.0° E', '02:00   10.0°  200.0° S'])
+
+    def test_get_hourly_table_below_horizon(self):
+        """
+        Test case for the get_hourly_table function.
+        It verifies that a body below the horizon all day gets a sentence instead of a table.
+        """
+        path = DailyPath(0.0, 3600.0, 'UTC', [[-10, -20, -30], [0, 10, 20]], np.arange(3))
+        self.assertEqual(utils.get_hourly_table(path), 'Sous l\'horizon toute la journée')
+
+if __name__ == '__main__':
+    unittest.main()
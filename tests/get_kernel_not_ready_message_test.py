@@ -0,0 +1,37 @@
+"""
+This script tests the get_kernel_not_ready_message function in the utils module.
+The utils module provides utility functions for the AstroBot project.
+
+Attributes:
+    None
+
+Methods:
+    test_get_kernel_not_ready_message: Test the get_kernel_not_ready_message function.
+"""
+
+import unittest
+from context import astrobot
+from astrobot import utils
+
+class TestGetKernelNotReadyMessage(unittest.TestCase):
+    """
+    Test the get_kernel_not_ready_message function in the utils module.
+
+    Attributes:
+        None
+
+    Methods:
+        test_get_kernel_not_ready_message: Test the get_kernel_not_ready_message function.
+    """
+    def test_get_kernel_not_ready_message(self):
+        """
+        Test case for the get_kernel_not_ready_message function.
+        It verifies that the message reports the download progress, or the failure.
+        """
+        message = utils.get_kernel_not_ready_message({'state': 'downloading', 'progress': 0.42})
+        self.assertIn('42%', message)
+        message = utils.get_kernel_not_ready_message({'state': 'failed', 'progress': 0.0})
+        self.assertIn('administrateur', message)
+
+if __name__ == '__main__':
+    unittest.main()
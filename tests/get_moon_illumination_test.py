@@ -0,0 +1,53 @@
+"""
+This module contains the tests for the get_moon_illumination method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as moon phases.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_moon_illumination: Test the get_moon_illumination method.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from skyfield import almanac
+from context import astrobot
+from astrobot import ephemeris
+
+class TestGetMoonIllumination(unittest.TestCase):
+    """
+    Test the get_moon_illumination method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_moon_illumination: Test the get_moon_illumination method.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_get_moon_illumination(self):
+        """
+        Test case for the get_moon_illumination method.
+        It verifies the samples against the illuminated fraction and phase angle of the almanac.
+        """
+        tt, fraction, phase_angle = self.eph.get_moon_illumination(datetime.datetime(2024, 3, 1), datetime.datetime(2024, 3, 31), datetime.timedelta(hours=2))
+        self.assertEqual(len(tt), 30 * 12 + 1)
+        self.assertAlmostEqual((tt[1] - tt[0]) * 24, 2)
+
+        eph = ephemeris.kernels.manager.load('de440s.bsp')
+        t = ephemeris.ts.tt_jd(tt)
+        np.testing.assert_allclose(fraction, almanac.fraction_illuminated(eph, 'moon', t), atol=1e-4)
+        np.testing.assert_allclose(phase_angle, almanac.phase_angle(eph, 'moon', t).degrees, atol=0.02)
+
+        # Nearly dark at the new moon of March 10, nearly full at the full moon of March 25
+        self.assertLess(fraction[(9 * 24 + 10) // 2], 0.01)
+        self.assertGreater(fraction[(24 * 24 + 8) // 2], 0.99)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+This module contains the tests for the get_moon_phase_events method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as moon phases.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_moon_phase_events: Test the get_moon_phase_events method.
+    test_lunation_boundaries: Test that the phases are continuous across lunations.
+"""
+
+import datetime
+import unittest
+from zoneinfo import ZoneInfo
+from context import astrobot
+from astrobot import ephemeris
+
+class TestGetMoonPhaseEvents(unittest.TestCase):
+    """
+    Test the get_moon_phase_events method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_moon_phase_events: Test the get_moon_phase_events method.
+        test_lunation_boundaries: Test that the phases are continuous across lunations.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_get_moon_phase_events(self):
+        """
+        Test case for the get_moon_phase_events method.
+        It verifies the next four phases from a date against the published times.
+        """
+        events = self.eph.get_moon_phase_events(datetime.datetime(2024, 3, 1))
+        expected = [
+            (datetime.datetime(2024, 3, 3, 16, 23), 3),
+            (datetime.datetime(2024, 3, 10, 10, 0), 0),
+            (datetime.datetime(2024, 3, 17, 5, 10), 1),
+            (datetime.datetime(2024, 3, 25, 8, 0), 2),
+        ]
+        for (time, phase), (expected_time, expected_phase) in zip(events, expected, strict=True):
+            self.assertEqual(phase, expected_phase)
+            self.assertEqual(time.tzinfo, ZoneInfo('Europe/Paris'))
+            self.assertAlmostEqual(time.replace(tzinfo=None), expected_time, delta=datetime.timedelta(minutes=1))
+
+    def test_lunation_boundaries(self):
+        """
+        Test case for the phases spanning several lunations.
+        It verifies that the phases follow each other without gaps or duplicates.
+        """
+        events = self.eph.get_moon_phase_events(datetime.datetime(2023, 12, 20), count=40)
+        self.assertEqual(len(events), 40)
+        for (time, phase), (next_time, next_phase) in zip(events, events[1:]):
+            self.assertEqual(next_phase, (phase + 1) % 4)
+            self.assertGreater(next_time - time, datetime.timedelta(days=6))
+            self.assertLess(next_time - time, datetime.timedelta(days=9))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+This module contains the tests for the get_observing_windows method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as rise and set times.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_altaz_many: Test that the shared grid gives the positions of each body.
+    test_get_observing_windows: Test the windows and their ranking.
+    test_polar_day: Test that there is no window during the polar day.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import chebyshev, ephemeris
+
+class TestGetObservingWindows(unittest.TestCase):
+    """
+    Test the get_observing_windows method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_altaz_many: Test that the shared grid gives the positions of each body.
+        test_get_observing_windows: Test the windows and their ranking.
+        test_polar_day: Test that there is no window during the polar day.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_altaz_many(self):
+        """
+        Test case for the altaz_many method of the Chebyshev engine.
+        It verifies that each row is the position of one body.
+        """
+        tt = 2460538.0 + np.linspace(0, 1, 97)
+        altitudes, azimuths = chebyshev.engine.altaz_many(['sun', 'moon', 'mars barycenter'], tt, 48.8566, 2.3522, 0)
+        self.assertEqual(altitudes.shape, (3, 97))
+        for row, sky_object in enumerate(['sun', 'moon', 'mars barycenter']):
+            altitude, azimuth = chebyshev.engine.altaz(sky_object, tt, 48.8566, 2.3522, 0)
+            np.testing.assert_allclose(altitudes[row], altitude)
+            np.testing.assert_allclose(azimuths[row], azimuth)
+
+    def test_get_observing_windows(self):
+        """
+        Test case for the get_observing_windows method.
+        It verifies that the windows are ranked, and that their edges are set by the sun or the body.
+        """
+        windows = self.eph.get_observing_windows(datetime.date(2024, 8, 15), sun_altitude=-12, min_altitude=15)
+        self.assertEqual([window.body for window in windows], ['uranus', 'neptune', 'jupiter', 'mars', 'saturn', 'pluto'])
+
+        for window in windows:
+            self.assertLessEqual(window.start, window.peak_time)
+            self.assertLessEqual(window.peak_time, window.end)
+            self.assertGreaterEqual(window.peak_altitude, 15)
+
+            # At each edge, either the sun reaches -12° or the body reaches 15°
+            tt = ephemeris.ts.from_datetimes([window.start, window.end]).tt
+            sun, _ = chebyshev.engine.altaz('sun', tt, self.eph.latitude, self.eph.longitude, self.eph.altitude)
+            body, _ = chebyshev.engine.altaz(ephemeris.get_sky_object(window.body), tt, self.eph.latitude, self.eph.longitude, self.eph.altitude)
+            np.testing.assert_allclose(np.minimum(-12 - sun, body - 15), 0, atol=0.05)
+
+        # The moon is low, a lower minimum altitude lets it in
+        windows = self.eph.get_observing_windows(datetime.date(2024, 8, 15), sun_altitude=-12, min_altitude=5, bodies=['moon'])
+        self.assertEqual(len(windows), 1)
+        self.assertAlmostEqual(windows[0].peak_altitude, 11.6, places=1)
+
+    def test_polar_day(self):
+        """
+        Test case for the polar day.
+        It verifies that no body can be observed when the sun never sets.
+        """
+        eph = ephemeris.Ephemeris(78.2232, 15.6267, 0, 'Arctic/Longyearbyen')
+        self.assertEqual(eph.get_observing_windows(datetime.date(2024, 6, 21)), [])
+
+if __name__ == '__main__':
+    unittest.main()
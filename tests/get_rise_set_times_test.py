@@ -0,0 +1,73 @@
+"""
+This script tests the get_rise_set_times method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as rise and set times.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_rise_set_times: Test the get_rise_set_times method against the almanac search.
+    test_get_rise_set_times_with_path: Test the get_rise_set_times method with a precomputed path.
+"""
+
+import datetime
+import unittest
+from context import astrobot
+from astrobot import ephemeris
+from skyfield import almanac
+
+class TestGetRiseSetTimes(unittest.TestCase):
+    """
+    Test the get_rise_set_times method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_rise_set_times: Test the get_rise_set_times method against the almanac search.
+        test_get_rise_set_times_with_path: Test the get_rise_set_times method with a precomputed path.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def assertTimeAlmostEqual(self, first, second, seconds):
+        """
+        Assert that two times of the same day are within the given number of seconds.
+        """
+        day = datetime.date(2024, 1, 1)
+        delta = datetime.datetime.combine(day, first) - datetime.datetime.combine(day, second)
+        self.assertLessEqual(abs(delta.total_seconds()), seconds)
+
+    def test_get_rise_set_times(self):
+        """
+        Test case for the get_rise_set_times method.
+        It verifies that the rise and set times agree with almanac.find_risings and
+        almanac.find_settings within a second, including on daylight saving time days.
+        """
+        dates = [datetime.datetime(2024, 6, 22), datetime.datetime(2024, 3, 31), datetime.datetime(2024, 12, 15)]
+        for date in dates:
+            for sky_object in ['sun', 'moon', 'mars barycenter', 'saturn barycenter']:
+                rise, set_time = self.eph.get_rise_set_times(date, sky_object)
+
+                t0, t1 = self.eph._set_time_range(date.replace(tzinfo=self.eph.timezone))
+                eph = self.eph._load_ephemeris('de440s.bsp')
+                observer = eph['earth'] + self.eph.observer
+                for result, find in ((rise, almanac.find_risings), (set_time, almanac.find_settings)):
+                    times, _ = find(observer, eph[sky_object], t0, t1)
+                    self.assertTimeAlmostEqual(result, times[0].astimezone(self.eph.timezone).time(), 1)
+
+    def test_get_rise_set_times_with_path(self):
+        """
+        Test case for the get_rise_set_times method with a precomputed path.
+        It verifies that the sunrise and sunset times match the expected times.
+        """
+        date = datetime.datetime(2024, 6, 22)
+        path = self.eph.compute_daily_path(date, 'sun')
+        sunrise, sunset = self.eph.get_rise_set_times(date, 'sun', path)
+        self.assertEqual(sunrise.strftime('%H:%M:%S'), '05:47:18')
+        self.assertTimeAlmostEqual(sunset, self.eph.get_sunset_time(date), 1)
+
+if __name__ == '__main__':
+    unittest.main()
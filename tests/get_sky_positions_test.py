@@ -0,0 +1,66 @@
+"""
+This module contains the tests for the get_sky_positions method of the Ephemeris class.
+The Ephemeris class provides methods to calculate the positions of the bodies.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_sky_positions: Test the current positions of every body.
+    test_trail: Test the shared time grid of the trails.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import constants, ephemeris
+
+class TestGetSkyPositions(unittest.TestCase):
+    """
+    Test the get_sky_positions method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_sky_positions: Test the current positions of every body.
+        test_trail: Test the shared time grid of the trails.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+        self.now = datetime.datetime(2024, 8, 16, 4, 0)
+
+    def test_get_sky_positions(self):
+        """
+        Test case for the get_sky_positions method.
+        It verifies that the positions of every body are those of the single-body computation.
+        """
+        positions = self.eph.get_sky_positions(self.now)
+        self.assertEqual(positions.bodies, list(constants.BODIES))
+        self.assertEqual(positions.altitudes.shape, (len(constants.BODIES), 1))
+
+        for body, altitudes, azimuths in zip(positions.bodies, positions.altitudes, positions.azimuths):
+            altitude, azimuth = self.eph.compute_current_position(self.now, ephemeris.get_sky_object(body))
+            self.assertAlmostEqual(altitudes[-1], altitude, delta=0.02)
+            self.assertAlmostEqual(np.cos(np.radians(azimuths[-1] - azimuth)), 1, delta=1e-4)
+
+    def test_trail(self):
+        """
+        Test case for the trail argument.
+        It verifies that the samples end at the current time, every 10 minutes.
+        """
+        positions = self.eph.get_sky_positions(self.now, bodies=['jupiter', 'mars'], trail=datetime.timedelta(hours=3))
+        self.assertEqual(positions.altitudes.shape, (2, 19))
+        np.testing.assert_allclose(np.diff(positions.tt), 10 / 1440)
+        end = ephemeris.ts.tt_jd(positions.tt[-1]).astimezone(self.eph.timezone).replace(tzinfo=None)
+        self.assertAlmostEqual(end, self.now, delta=datetime.timedelta(milliseconds=1))
+
+        # Jupiter and Mars are in conjunction, and rise during the trail
+        self.assertTrue(np.all(np.diff(positions.altitudes, axis=1) > 0))
+        self.assertLess(abs(positions.altitudes[0, -1] - positions.altitudes[1, -1]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
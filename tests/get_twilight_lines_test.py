@@ -0,0 +1,37 @@
+"""
+This script tests the get_twilight_lines function in the utils module.
+The utils module provides utility functions for the AstroBot project.
+
+Attributes:
+    None
+
+Methods:
+    test_get_twilight_lines: Test the lines of the twilight transitions.
+"""
+
+import unittest
+from context import astrobot
+from astrobot import utils
+from results import TwilightEvents
+
+class TestGetTwilightLines(unittest.TestCase):
+    """
+    Test the get_twilight_lines function in the utils module.
+
+    Attributes:
+        None
+
+    Methods:
+        test_get_twilight_lines: Test the lines of the twilight transitions.
+    """
+    def test_get_twilight_lines(self):
+        """
+        Test case for the get_twilight_lines function.
+        It verifies that each transition gets its local time and the light it reaches.
+        """
+        twilight = TwilightEvents('Europe/Paris', [72000.0, 75600.0], [3, 0])
+        self.assertEqual(utils.get_twilight_lines(twilight), '21:00 : Crépuscule civil\n22:00 : Nuit')
+        self.assertEqual(utils.get_twilight_lines(None), 'Aucun changement de luminosité')
+
+if __name__ == '__main__':
+    unittest.main()
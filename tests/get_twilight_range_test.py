@@ -0,0 +1,71 @@
+"""
+This module contains the tests for the get_twilight_range method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as twilight times.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object.
+    test_get_twilight_range: Test that the range agrees with the single-day twilight events.
+    test_polar_day: Test the range without any transition during the polar day.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+
+class TestGetTwilightRange(unittest.TestCase):
+    """
+    Test the get_twilight_range method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object.
+        test_get_twilight_range: Test that the range agrees with the single-day twilight events.
+        test_polar_day: Test the range without any transition during the polar day.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_get_twilight_range(self):
+        """
+        Test case for the get_twilight_range method.
+        It verifies every transition of a month against get_twilight_times_events.
+        """
+        twilight = self.eph.get_twilight_range(datetime.datetime(2024, 3, 1, 12), datetime.datetime(2024, 4, 1, 12))
+        self.assertEqual(twilight.start_level, 4)
+        self.assertEqual(len(twilight.tt), 31 * 8)
+
+        times = ephemeris.ts.tt_jd(twilight.tt).astimezone(self.eph.timezone)
+        for day in range(31):
+            date = datetime.datetime(2024, 3, 1) + datetime.timedelta(days=day)
+            expected_times, expected_levels = self.eph.get_twilight_times_events(date)
+            np.testing.assert_array_equal(twilight.levels[day * 8:day * 8 + 8], expected_levels)
+            for time, expected_time in zip(times[day * 8:day * 8 + 8], expected_times):
+                self.assertAlmostEqual(
+                    datetime.datetime.combine(datetime.date.min, time.time()),
+                    datetime.datetime.combine(datetime.date.min, expected_time),
+                    delta=datetime.timedelta(seconds=1)
+                )
+
+        np.testing.assert_array_equal(twilight.level_at(twilight.tt + 1e-6), twilight.levels)
+
+    def test_polar_day(self):
+        """
+        Test case for the polar day.
+        It verifies that there is no transition, and that the level is the day.
+        """
+        eph = ephemeris.Ephemeris(78.2232, 15.6267, 0, 'Arctic/Longyearbyen')
+        twilight = eph.get_twilight_range(datetime.datetime(2024, 6, 1), datetime.datetime(2024, 6, 8))
+        self.assertEqual(twilight.start_level, 4)
+        self.assertEqual(len(twilight.tt), 0)
+        np.testing.assert_array_equal(twilight.level_at(np.linspace(twilight.t0, twilight.t1, 10)), 4)
+        self.assertEqual(len(twilight.intervals(max_level=3)[0]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
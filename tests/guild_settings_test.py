@@ -0,0 +1,91 @@
+"""
+This script tests the GuildSettings class of the guilds module.
+The guilds module stores the settings of each guild in a JSON file.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Create a temporary directory for the settings file.
+    test_get_default: Test the defaults of the settings.
+    test_set_persists: Test that the settings are saved and read back.
+    test_items: Test the listing of the guilds where a setting is set.
+    test_shared_settings: Test that the changes of several processes sharing the file are kept.
+"""
+
+import os
+import tempfile
+import unittest
+from context import astrobot
+from guilds import GuildSettings
+
+class TestGuildSettings(unittest.TestCase):
+    """
+    Test the GuildSettings class of the guilds module.
+
+    Attributes:
+        directory (TemporaryDirectory): The temporary directory of the settings file.
+        path (str): The path of the settings file.
+
+    Methods:
+        setUp: Create a temporary directory for the settings file.
+        test_get_default: Test the defaults of the settings.
+        test_set_persists: Test that the settings are saved and read back.
+        test_items: Test the listing of the guilds where a setting is set.
+        test_shared_settings: Test that the changes of several processes sharing the file are kept.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'settings', 'guild_settings.json')
+
+    def test_get_default(self):
+        """
+        Test case for the get method.
+        It verifies that a missing file, an unknown guild and a direct message give the default.
+        """
+        settings = GuildSettings(self.path)
+        self.assertFalse(settings.get(1, 'lite', False))
+        settings.set(1, 'lite', True)
+        self.assertFalse(settings.get(2, 'lite', False))
+        self.assertFalse(settings.get(None, 'lite', False))
+
+    def test_set_persists(self):
+        """
+        Test case for the set method.
+        It verifies that a new object reads the settings saved by another one.
+        """
+        GuildSettings(self.path).set(1, 'lite', True)
+        self.assertTrue(GuildSettings(self.path).get(1, 'lite', False))
+        self.assertFalse(os.path.exists(f'{self.path}.tmp'))
+
+    def test_items(self):
+        """
+        Test case for the items method.
+        It verifies that the guilds are listed with their value, except the ones set back to None.
+        """
+        settings = GuildSettings(self.path)
+        settings.set(1, 'live', {'message_id': 10})
+        settings.set(2, 'live', {'message_id': 20})
+        settings.set(3, 'lite', True)
+        settings.set(2, 'live', None)
+        self.assertEqual(settings.items('live'), [(1, {'message_id': 10})])
+
+    def test_shared_settings(self):
+        """
+        Test case for the GuildSettings class shared by several processes.
+        It verifies that each object reads the changes of the other ones before its own change.
+        """
+        first, second = GuildSettings(self.path), GuildSettings(self.path)
+        self.assertFalse(second.get(1, 'lite', False))
+
+        first.set(1, 'lite', True)
+        second.set(2, 'live', {'message_id': 20})
+        first.set(1, 'live', {'message_id': 10})
+        self.assertTrue(second.get(1, 'lite', False))
+        self.assertEqual(second.items('live'), [(1, {'message_id': 10}), (2, {'message_id': 20})])
+        self.assertEqual(GuildSettings(self.path).items('live'), second.items('live'))
+        self.assertTrue(os.path.exists(f'{self.path}.lock'))
+
+if __name__ == '__main__':
+    unittest.main()
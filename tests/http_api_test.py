@@ -0,0 +1,160 @@
+"""
+This script tests the HTTP JSON API of the api module.
+The API serves the daily reports and the plots of the bot to other tools.
+
+Attributes:
+    None
+
+Methods:
+    test_report: Test that the report endpoint answers the report of the pipeline.
+    test_report_plot: Test that the report endpoint answers the solstice paths with the data of the plots.
+    test_etag: Test that a known ETag is answered with 304.
+    test_plot: Test that the plot endpoint answers a PNG image.
+    test_batch: Test that the batch endpoint answers one item per request, errors included.
+    test_batch_full: Test that a batch of the maximum size is computed without busy answers.
+    test_range: Test that the range endpoint streams one report per day.
+    test_invalid: Test that invalid parameters are answered with 400.
+"""
+
+import datetime
+import json
+import unittest
+from aiohttp.test_utils import TestClient, TestServer
+from context import astrobot
+from astrobot import api, pipeline
+
+class TestHttpApi(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the HTTP JSON API of the api module.
+
+    Attributes:
+        client (TestClient): The client of the test server.
+        params (dict): The parameters of a valid request.
+
+    Methods:
+        test_report: Test that the report endpoint answers the report of the pipeline.
+        test_report_plot: Test that the report endpoint answers the solstice paths with the data of the plots.
+        test_etag: Test that a known ETag is answered with 304.
+        test_plot: Test that the plot endpoint answers a PNG image.
+        test_batch: Test that the batch endpoint answers one item per request, errors included.
+        test_batch_full: Test that a batch of the maximum size is computed without busy answers.
+        test_range: Test that the range endpoint streams one report per day.
+        test_invalid: Test that invalid parameters are answered with 400.
+    """
+    async def asyncSetUp(self):
+        """
+        Start the API on a test server.
+        """
+        self.client = TestClient(TestServer(api.create_app()))
+        await self.client.start_server()
+        self.params = {'body': 'moon', 'latitude': '48.8566', 'longitude': '2.3522', 'date': '2024-06-21', 'time': '22:15'}
+
+    async def asyncTearDown(self):
+        """
+        Stop the test server.
+        """
+        await self.client.close()
+
+    async def test_report(self):
+        """
+        Test case for the report endpoint.
+        It verifies that the answer is the report computed by the pipeline, as JSON.
+        """
+        response = await self.client.get('/report', params=self.params)
+        self.assertEqual(response.status, 200)
+        report = await response.json()
+
+        expected, _ = pipeline.render('moon', None, 48.857, 2.352, 0, 'Europe/Paris', datetime.date(2024, 6, 21), datetime.datetime(2024, 6, 21, 22, 15))
+        self.assertEqual(report, json.loads(json.dumps(api.report_to_dict(expected))))
+        self.assertEqual(report['rise_time'], expected.rise_time.isoformat())
+
+    async def test_report_plot(self):
+        """
+        Test case for the plot option of the report endpoint.
+        It verifies that the solstice paths of the sun are only answered with the data of the plots.
+        """
+        params = {**self.params, 'body': 'sun'}
+        report = await (await self.client.get('/report', params=params)).json()
+        self.assertEqual(report['solstice_paths'], {})
+
+        response = await self.client.get('/report', params={**params, 'plot': 'true'})
+        self.assertEqual(response.status, 200)
+        report = await response.json()
+        self.assertEqual(set(report['solstice_paths']), {'summer', 'winter'})
+        self.assertEqual(len(report['solstice_paths']['summer'][0]), len(report['altitudes']))
+
+        response = await self.client.get('/report', params={**params, 'plot': 'maybe'})
+        self.assertEqual(response.status, 400)
+
+    async def test_etag(self):
+        """
+        Test case for the ETag of the answers.
+        It verifies that the ETag does not change and that sending it back gives a 304.
+        """
+        response = await self.client.get('/report', params=self.params)
+        etag = response.headers['ETag']
+        response = await self.client.get('/report', params=self.params, headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        response = await self.client.get('/report', params={**self.params, 'time': '23:15'}, headers={'If-None-Match': etag})
+        self.assertEqual(response.status, 200)
+
+    async def test_plot(self):
+        """
+        Test case for the plot endpoint.
+        It verifies that the answer is a PNG image.
+        """
+        response = await self.client.get('/plot', params={**self.params, 'type': 'cartesian'})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.content_type, 'image/png')
+        self.assertEqual((await response.read())[:8], b'\x89PNG\r\n\x1a\n')
+
+    async def test_batch(self):
+        """
+        Test case for the batch endpoint.
+        It verifies that every request gets its report, or its error, in order.
+        """
+        requests = [self.params, {**self.params, 'body': 'sun'}, {**self.params, 'body': 'comet'}]
+        response = await self.client.post('/batch', json={'requests': requests})
+        self.assertEqual(response.status, 200)
+        results = (await response.json())['results']
+        self.assertEqual([result.get('body') for result in results], ['moon', 'sun', None])
+        self.assertIn('error', results[2])
+
+    async def test_batch_full(self):
+        """
+        Test case for a batch of MAX_BATCH distinct requests.
+        It verifies that no request is answered busy, although the batch is larger than the work queue.
+        """
+        start = datetime.date(2024, 1, 1)
+        requests = [{**self.params, 'body': 'sun', 'date': (start + datetime.timedelta(days=day)).isoformat()} for day in range(api.MAX_BATCH)]
+        response = await self.client.post('/batch', json={'requests': requests})
+        self.assertEqual(response.status, 200)
+        results = (await response.json())['results']
+        self.assertEqual(len(results), api.MAX_BATCH)
+        self.assertEqual([result for result in results if 'error' in result], [])
+
+    async def test_range(self):
+        """
+        Test case for the range endpoint.
+        It verifies that one report is streamed per day, in order.
+        """
+        params = {key: value for key, value in self.params.items() if key not in ('date', 'time')}
+        response = await self.client.get('/range', params={**params, 'start': '2024-06-01', 'end': '2024-06-10'})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.content_type, 'application/x-ndjson')
+        lines = (await response.text()).splitlines()
+        self.assertEqual([json.loads(line)['date'] for line in lines], [f'2024-06-{day:02}' for day in range(1, 11)])
+
+    async def test_invalid(self):
+        """
+        Test case for invalid parameters.
+        It verifies that the answer is a 400 with the error message.
+        """
+        for params in [{**self.params, 'latitude': '95'}, {**self.params, 'timezone': 'Mars/Olympus'}, {**self.params, 'date': '1200-01-01'}]:
+            response = await self.client.get('/report', params=params)
+            self.assertEqual(response.status, 400)
+            self.assertIn('error', await response.json())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+This script tests the KernelManager class of the kernels module.
+The kernels module downloads, verifies and loads the ephemeris kernels.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the KernelManager object in a temporary directory.
+    test_missing_kernel: Test that a missing kernel is reported as not ready.
+    test_corrupted_kernel: Test that a corrupted download is rejected and not renamed.
+"""
+
+import os
+import tempfile
+import unittest
+from context import astrobot
+import kernels
+
+class TestKernelManager(unittest.TestCase):
+    """
+    Test the KernelManager class of the kernels module.
+
+    Attributes:
+        manager (KernelManager): The KernelManager object.
+
+    Methods:
+        setUp: Initialize the KernelManager object in a temporary directory.
+        test_missing_kernel: Test that a missing kernel is reported as not ready.
+        test_corrupted_kernel: Test that a corrupted download is rejected and not renamed.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = kernels.KernelManager(self.tmp_dir.name, {'test.bsp': ('http://localhost/test.bsp', None)})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_missing_kernel(self):
+        """
+        Test case for a kernel that has not been downloaded.
+        It verifies that the kernel is reported as missing and that loading it raises an error.
+        """
+        self.assertFalse(self.manager.is_ready('test.bsp'))
+        self.assertEqual(self.manager.status('test.bsp')['state'], 'missing')
+        with self.assertRaises(kernels.KernelNotReadyError):
+            self.manager.load('test.bsp')
+
+    def test_corrupted_kernel(self):
+        """
+        Test case for a corrupted download.
+        It verifies that the partial file is removed and never renamed to the kernel name.
+        """
+        part_path = self.manager.path('test.bsp') + '.part'
+        with open(part_path, 'wb') as f:
+            f.write(b'not a kernel' * 100)
+
+        with self.assertRaises(ValueError):
+            self.manager._verify('test.bsp')
+        self.assertFalse(os.path.exists(part_path))
+        self.assertFalse(self.manager.is_ready('test.bsp'))
+
+        with open(part_path, 'wb') as f:
+            f.write(b'not a kernel')
+        with self.assertRaises(ValueError):
+            self.manager._verify('test.bsp', '0' * 64)
+        self.assertFalse(os.path.exists(part_path))
+
+if __name__ == '__main__':
+    unittest.main()
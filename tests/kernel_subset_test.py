@@ -0,0 +1,74 @@
+"""
+This script tests the kernel subsets of the KernelManager class.
+The kernels module downloads, verifies and loads the ephemeris kernels.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize a KernelManager object with a subset in a temporary directory.
+    test_select: Test that the subset is selected only when it covers the request.
+    test_subset_positions: Test that the subset gives the same positions as the full kernel.
+"""
+
+import os
+import tempfile
+import unittest
+from context import astrobot
+import kernels
+from constants import EPHEMERIS_KERNEL
+from jplephem.calendar import compute_julian_date
+from skyfield.api import load
+
+class TestKernelSubset(unittest.TestCase):
+    """
+    Test the kernel subsets of the KernelManager class.
+
+    Attributes:
+        manager (KernelManager): The KernelManager object.
+
+    Methods:
+        setUp: Initialize a KernelManager object with a subset in a temporary directory.
+        test_select: Test that the subset is selected only when it covers the request.
+        test_subset_positions: Test that the subset gives the same positions as the full kernel.
+    """
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.manager = kernels.KernelManager(self.tmp_dir.name)
+        os.symlink(kernels.manager.path(EPHEMERIS_KERNEL), self.manager.path(EPHEMERIS_KERNEL))
+        self.metadata = self.manager.create_subset(EPHEMERIS_KERNEL, 'subset.bsp', ['sun', 'moon', 'earth'], 2020, 2030)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_select(self):
+        """
+        Test case for the select method.
+        It verifies that the subset is only selected for covered bodies and dates.
+        """
+        jd = compute_julian_date(2024, 6, 22)
+        self.assertEqual(self.metadata['start_jd'], compute_julian_date(2020))
+        self.assertLess(os.path.getsize(self.manager.path('subset.bsp')), os.path.getsize(self.manager.path(EPHEMERIS_KERNEL)))
+        self.assertEqual(self.manager.select(EPHEMERIS_KERNEL, ['earth', 'moon'], jd, jd + 1), 'subset.bsp')
+        self.assertEqual(self.manager.select(EPHEMERIS_KERNEL, ['earth', 'mars barycenter'], jd, jd + 1), EPHEMERIS_KERNEL)
+        self.assertEqual(self.manager.select(EPHEMERIS_KERNEL, ['earth', 'sun'], compute_julian_date(2040)), EPHEMERIS_KERNEL)
+        self.assertEqual(self.manager.select(EPHEMERIS_KERNEL), EPHEMERIS_KERNEL)
+
+    def test_subset_positions(self):
+        """
+        Test case for the positions computed from the subset.
+        It verifies that the subset and the full kernel give the same positions.
+        """
+        full = self.manager.load(EPHEMERIS_KERNEL)
+        subset = self.manager.load(EPHEMERIS_KERNEL, ['earth', 'moon'], compute_julian_date(2024, 6, 22))
+        self.assertTrue(subset.path.endswith('subset.bsp'))
+
+        t = load.timescale().utc(2024, 6, 22)
+        for body in ['moon', 'sun']:
+            full_position = (full[body] - full['earth']).at(t).position.km
+            subset_position = (subset[body] - subset['earth']).at(t).position.km
+            for a, b in zip(full_position, subset_position):
+                self.assertAlmostEqual(a, b, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+This script tests the live sky maps of the pipeline module.
+The live sky maps draw the daily paths of the sun and the moon once per location and day.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object and empty the live sky maps.
+    test_background_cached: Test that the background is drawn once per location and day.
+    test_render: Test that each render only moves the current positions.
+    test_size: Test that the least recently used maps are dropped.
+"""
+
+import datetime
+import io
+import unittest
+from unittest import mock
+import numpy as np
+from PIL import Image
+from context import astrobot
+from astrobot import pipeline
+from ephemeris import Ephemeris
+
+class TestLiveSkyMap(unittest.TestCase):
+    """
+    Test the live sky maps of the pipeline module.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+
+    Methods:
+        setUp: Initialize the Ephemeris object and empty the live sky maps.
+        test_background_cached: Test that the background is drawn once per location and day.
+        test_render: Test that each render only moves the current positions.
+        test_size: Test that the least recently used maps are dropped.
+    """
+    def setUp(self):
+        self.eph = Ephemeris.for_location(48.8566, 2.3522, 0, 'Europe/Paris')
+        pipeline.live_maps.clear()
+        self.addCleanup(pipeline.live_maps.clear)
+
+    def test_background_cached(self):
+        """
+        Test case for the get_live_map function.
+        It verifies that the daily paths are computed once per day, and again the next day.
+        """
+        with mock.patch.object(Ephemeris, 'compute_daily_path', wraps=self.eph.compute_daily_path) as compute_daily_path:
+            live_map = pipeline.get_live_map(self.eph, datetime.date(2024, 8, 16))
+            self.assertIs(pipeline.get_live_map(self.eph, datetime.date(2024, 8, 16)), live_map)
+            self.assertEqual(compute_daily_path.call_count, 2)
+
+            self.assertIsNot(pipeline.get_live_map(self.eph, datetime.date(2024, 8, 17)), live_map)
+            self.assertEqual(compute_daily_path.call_count, 4)
+
+    def test_render(self):
+        """
+        Test case for the render_live function.
+        It verifies that the image is a PNG, and that two times only differ around the markers and the label.
+        """
+        _, first = pipeline.render_live(48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 12))
+        positions, second = pipeline.render_live(48.8566, 2.3522, 0, 'Europe/Paris', datetime.datetime(2024, 8, 16, 14))
+        self.assertEqual(second[:8], b'\x89PNG\r\n\x1a\n')
+        self.assertEqual(positions.bodies, ['sun', 'moon'])
+
+        first, second = (np.asarray(Image.open(io.BytesIO(image))) for image in (first, second))
+        changed = (first != second).any(axis=2)
+        self.assertTrue(changed.any())
+        self.assertLess(changed.mean(), 0.05)
+
+    def test_size(self):
+        """
+        Test case for the size of the live sky maps.
+        It verifies that no more than LIVE_MAPS maps are kept.
+        """
+        with mock.patch.object(pipeline, 'LIVE_MAPS', 2):
+            for day in (14, 15, 16):
+                pipeline.get_live_map(self.eph, datetime.date(2024, 8, day))
+        self.assertEqual([key[-1].day for key in pipeline.live_maps], [15, 16])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+This script tests the monthly_calendar method of the Ephemeris class.
+The Ephemeris class provides methods to calculate astronomical events such as rise and set times.
+
+Attributes:
+    None
+
+Methods:
+    test_rise_set_times: Test that the calendar agrees with the single-day rise and set times.
+    test_durations: Test the time spent above the horizon.
+    test_horizon_without_crossings: Test that a month without crossings uses the horizon of the crossings.
+    test_moon_phases: Test that the calendar agrees with the single-day moon phases.
+"""
+
+import datetime
+import unittest
+from unittest import mock
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+import chebyshev
+
+class TestMonthlyCalendar(unittest.TestCase):
+    """
+    Test the monthly_calendar method of the Ephemeris class.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object used for testing.
+
+    Methods:
+        test_rise_set_times: Test that the calendar agrees with the single-day rise and set times.
+        test_durations: Test the time spent above the horizon.
+        test_horizon_without_crossings: Test that a month without crossings uses the horizon of the crossings.
+        test_moon_phases: Test that the calendar agrees with the single-day moon phases.
+    """
+    def setUp(self):
+        """
+        Set up the Ephemeris object for testing.
+        """
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+
+    def test_rise_set_times(self):
+        """
+        Test case for the rise and set times of the calendar.
+        It verifies every day of a month with a daylight saving time change against get_rise_set_times.
+        """
+        for body, sky_object in (('sun', 'sun'), ('moon', 'moon'), ('mars', 'mars barycenter')):
+            month_calendar = self.eph.monthly_calendar(2024, 3, body)
+            self.assertEqual(len(month_calendar.dates), 31)
+            for date, rise_time, set_time in zip(month_calendar.dates, month_calendar.rise_times, month_calendar.set_times):
+                expected = self.eph.get_rise_set_times(datetime.datetime(date.year, date.month, date.day), sky_object)
+                self.assertEqual((rise_time, set_time), expected)
+
+    def test_durations(self):
+        """
+        Test case for the time spent above the horizon.
+        It verifies the day length in Paris and during the polar day and night in Tromsø.
+        """
+        month_calendar = self.eph.monthly_calendar(2024, 6, 'sun')
+        day_length = datetime.datetime.combine(datetime.date(2024, 6, 21), month_calendar.set_times[20]) - datetime.datetime.combine(datetime.date(2024, 6, 21), month_calendar.rise_times[20])
+        self.assertAlmostEqual(month_calendar.durations[20].total_seconds(), day_length.total_seconds(), delta=1)
+
+        eph = ephemeris.Ephemeris(69.6492, 18.9553, 0, 'Europe/Oslo')
+        for month, hours in ((6, 24), (12, 0)):
+            month_calendar = eph.monthly_calendar(2024, month, 'sun')
+            self.assertEqual(month_calendar.rise_times[14:17], [None] * 3)
+            for duration in month_calendar.durations[14:17]:
+                self.assertAlmostEqual(duration.total_seconds(), hours * 3600, delta=1)
+
+    def test_horizon_without_crossings(self):
+        """
+        Test case for a month without rise or set.
+        It verifies that the sun staying between the refracted horizon and 0° is above the horizon all the month.
+        """
+        def altaz(sky_object, tt, latitude, longitude, elevation):
+            return np.full(len(tt), -0.5), np.zeros(len(tt))
+
+        with mock.patch.object(chebyshev.engine, 'altaz', altaz):
+            month_calendar = self.eph.monthly_calendar(2024, 6, 'sun')
+        self.assertEqual(month_calendar.rise_times, [None] * 30)
+        for duration in month_calendar.durations:
+            self.assertAlmostEqual(duration.total_seconds(), 24 * 3600, delta=1)
+
+    def test_moon_phases(self):
+        """
+        Test case for the moon phases of the calendar.
+        It verifies every day against get_moon_phase.
+        """
+        month_calendar = self.eph.monthly_calendar(2024, 10, 'moon')
+        for date, phase in zip(month_calendar.dates, month_calendar.moon_phases):
+            self.assertAlmostEqual(phase, self.eph.get_moon_phase(datetime.datetime(date.year, date.month, date.day)), places=6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+This script tests the Observers class in the ephemeris module.
+The Observers class computes the ephemeris of several observers in vectorized calls.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Observers object and the Ephemeris object of each observer.
+    test_compute_altaz: Test that every observer gets the positions of its own Ephemeris.
+    test_get_rise_set_times: Test that every observer gets the rise and set times of its own Ephemeris.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+
+class TestObservers(unittest.TestCase):
+    """
+    Test the Observers class in the ephemeris module.
+
+    Attributes:
+        sites (list): The latitude, longitude, altitude and timezone of each observer.
+        observers (Observers): The Observers object.
+        ephemerides (list): The Ephemeris object of each observer.
+
+    Methods:
+        setUp: Initialize the Observers object and the Ephemeris object of each observer.
+        test_compute_altaz: Test that every observer gets the positions of its own Ephemeris.
+        test_get_rise_set_times: Test that every observer gets the rise and set times of its own Ephemeris.
+    """
+    def setUp(self):
+        self.sites = [
+            (48.8566, 2.3522, 0, 'Europe/Paris'),
+            (-33.8688, 151.2093, 50, 'Australia/Sydney'),
+            (69.6496, 18.9560, 0, 'Europe/Oslo'),
+            (40.7128, -74.0060, 10, 'America/New_York'),
+        ]
+        latitudes, longitudes, altitudes, timezone_names = zip(*self.sites)
+        self.observers = ephemeris.Observers(latitudes, longitudes, altitudes, timezone_names)
+        self.ephemerides = [ephemeris.Ephemeris(*site) for site in self.sites]
+
+    def test_compute_altaz(self):
+        """
+        Test case for the compute_altaz method.
+        It verifies the shape of the positions, and that each row is the position computed by the Ephemeris of the observer.
+        """
+        tt = ephemeris.ts.utc(2024, 6, 1).tt + np.arange(6) * 0.2
+        for precision in ('reference', 'fast', 'approximate'):
+            alt, az = self.observers.compute_altaz(tt, 'moon', precision)
+            self.assertEqual(alt.shape, (4, 6))
+            for row, eph in enumerate(self.ephemerides):
+                expected_alt, expected_az = eph._compute_altaz(tt, 'moon', precision)
+                np.testing.assert_allclose(alt[row], expected_alt, atol=1e-9)
+                np.testing.assert_allclose(az[row], expected_az, atol=1e-9)
+
+    def test_get_rise_set_times(self):
+        """
+        Test case for the get_rise_set_times method.
+        It verifies that the times of every observer are within a second of its Ephemeris, including the polar day.
+        """
+        date = datetime.date(2024, 6, 1)
+        for sky_object in ('sun', 'moon'):
+            rise_times, set_times = self.observers.get_rise_set_times(date, sky_object)
+            self.assertEqual(len(rise_times), 4)
+            for row, eph in enumerate(self.ephemerides):
+                expected = eph.get_rise_set_times(datetime.datetime(2024, 6, 1), sky_object)
+                for time, expected_time in zip((rise_times[row], set_times[row]), expected):
+                    if expected_time is None:
+                        self.assertIsNone(time)
+                        continue
+                    difference = datetime.datetime.combine(date, time) - datetime.datetime.combine(date, expected_time)
+                    self.assertLess(abs(difference), datetime.timedelta(seconds=1))
+
+        # The sun does not set in Tromsø
+        rise_times, set_times = self.observers.get_rise_set_times(date, 'sun')
+        self.assertIsNone(rise_times[2])
+        self.assertIsNone(set_times[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+This script tests the parse_locations function in the utils module.
+The utils module provides utility functions for the AstroBot project.
+
+Attributes:
+    None
+
+Methods:
+    test_parse_locations: Test the parse_locations function.
+    test_parse_locations_invalid: Test the parse_locations function with invalid locations.
+"""
+
+import unittest
+from context import astrobot
+from astrobot import utils
+
+class TestParseLocations(unittest.TestCase):
+    """
+    Test the parse_locations function in the utils module.
+
+    Attributes:
+        None
+
+    Methods:
+        test_parse_locations: Test the parse_locations function.
+        test_parse_locations_invalid: Test the parse_locations function with invalid locations.
+    """
+    def test_parse_locations(self):
+        """
+        Test case for the parse_locations function.
+        It verifies that the locations are parsed with their optional names.
+        """
+        locations = utils.parse_locations('Paris: 48.8566, 2.3522; -33.8688,151.2093 ;')
+        self.assertEqual(locations, [('Paris', 48.8566, 2.3522), (None, -33.8688, 151.2093)])
+
+    def test_parse_locations_invalid(self):
+        """
+        Test case for the parse_locations function with invalid locations.
+        It verifies that a ValueError is raised for malformed or out of range coordinates.
+        """
+        with self.assertRaises(ValueError):
+            utils.parse_locations('Paris')
+        with self.assertRaises(ValueError):
+            utils.parse_locations('95, 2.35')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"""
+This script tests the precision modes of the positions of the Ephemeris class.
+The Ephemeris class computes the positions in the reference, fast or approximate precision mode.
+
+Attributes:
+    None
+
+Methods:
+    separation: Get the angular separation between two lists of positions.
+    setUp: Initialize the Ephemeris objects.
+    test_error_bounds: Test that each mode stays within its documented error of the reference positions.
+    test_default_precision: Test that the precision of the object is the default of the calls.
+    test_unknown_precision: Test that an unknown precision mode is rejected.
+"""
+
+import datetime
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+from constants import PRECISIONS
+
+def separation(
+    alt1,
+    az1,
+    alt2,
+    az2
+):
+    """
+    Get the angular separation between two lists of positions, in degrees.
+    """
+    alt1, az1, alt2, az2 = (np.radians(np.asarray(value, dtype=float)) for value in (alt1, az1, alt2, az2))
+    cosine = np.sin(alt1) * np.sin(alt2) + np.cos(alt1) * np.cos(alt2) * np.cos(az1 - az2)
+    return np.degrees(np.arccos(np.clip(cosine, -1, 1)))
+
+class TestPrecisionModes(unittest.TestCase):
+    """
+    Test the precision modes of the positions of the Ephemeris class.
+
+    Attributes:
+        observers (list): The Ephemeris objects of several locations.
+
+    Methods:
+        setUp: Initialize the Ephemeris objects.
+        test_error_bounds: Test that each mode stays within its documented error of the reference positions.
+        test_default_precision: Test that the precision of the object is the default of the calls.
+        test_unknown_precision: Test that an unknown precision mode is rejected.
+    """
+    def setUp(self):
+        self.observers = [
+            ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris'),
+            ephemeris.Ephemeris(-33.8688, 151.2093, 50, 'Australia/Sydney'),
+            ephemeris.Ephemeris(69.6496, 18.9560, 0, 'Europe/Oslo'),
+        ]
+
+    def test_error_bounds(self):
+        """
+        Test case for the precision modes of the compute_daily_path method.
+        It verifies that the fast and approximate paths stay within the errors of constants.PRECISIONS.
+        """
+        date = datetime.datetime(2024, 3, 14)
+        for eph in self.observers:
+            for sky_object in ['sun', 'moon', 'mars barycenter', 'jupiter barycenter']:
+                reference = eph.compute_daily_path(date, sky_object, precision='reference')
+                for precision in ('fast', 'approximate'):
+                    path = eph.compute_daily_path(date, sky_object, precision=precision)
+                    error = separation(reference.altitudes, reference.azimuths, path.altitudes, path.azimuths).max()
+                    # The paths are stored as float32, about 1e-5° at 360°
+                    self.assertLess(error, PRECISIONS[precision] + 1e-4, f'{precision} {sky_object}')
+
+    def test_default_precision(self):
+        """
+        Test case for the precision of the Ephemeris object.
+        It verifies that the calls without a precision use the precision of the object.
+        """
+        date = datetime.datetime(2024, 3, 14, 22)
+        eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris', precision='fast')
+        self.assertEqual(eph.compute_current_position(date, 'moon'), eph.compute_current_position(date, 'moon', precision='fast'))
+        self.assertNotEqual(eph.compute_current_position(date, 'moon'), eph.compute_current_position(date, 'moon', precision='reference'))
+
+    def test_unknown_precision(self):
+        """
+        Test case for an unknown precision mode.
+        It verifies that a ValueError is raised.
+        """
+        with self.assertRaises(ValueError):
+            ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris', precision='exact')
+        with self.assertRaises(ValueError):
+            self.observers[0].compute_daily_path(datetime.datetime(2024, 3, 14), 'sun', precision='exact')
+
+if __name__ == '__main__':
+    unittest.main()
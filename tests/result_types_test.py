@@ -0,0 +1,90 @@
+"""
+This script tests the compact result types of the results module.
+The results module holds the daily paths and the events in contiguous NumPy arrays.
+
+Attributes:
+    None
+
+Methods:
+    setUp: Initialize the Ephemeris object and compute a daily path and the twilight events.
+    test_legacy_unpacking: Test that the path unpacks as the tuple of Python values it replaces.
+    test_bytes: Test that the path and the events round trip through bytes and pickle.
+    test_compact: Test that the path is stored in compact arrays.
+"""
+
+import datetime
+import pickle
+import unittest
+import numpy as np
+from context import astrobot
+from astrobot import ephemeris
+from results import DailyPath, TwilightEvents
+
+class TestResultTypes(unittest.TestCase):
+    """
+    Test the compact result types of the results module.
+
+    Attributes:
+        eph (Ephemeris): The Ephemeris object.
+        path (DailyPath): The daily path of the sun.
+        twilight (TwilightEvents): The twilight events of the same day.
+
+    Methods:
+        setUp: Initialize the Ephemeris object and compute a daily path and the twilight events.
+        test_legacy_unpacking: Test that the path unpacks as the tuple of Python values it replaces.
+        test_bytes: Test that the path and the events round trip through bytes and pickle.
+        test_compact: Test that the path is stored in compact arrays.
+    """
+    def setUp(self):
+        self.eph = ephemeris.Ephemeris(48.8566, 2.3522, 0, 'Europe/Paris')
+        date = datetime.datetime(2024, 6, 1)
+        self.path = self.eph.compute_daily_path(date, 'sun', precision='approximate')
+        self.twilight = self.eph.get_twilight_times_events(date)
+
+    def test_legacy_unpacking(self):
+        """
+        Test case for the unpacking of a daily path.
+        It verifies that the altitudes and azimuths are rounded floats, and the hourly positions keyed by local time.
+        """
+        altitudes, azimuths, peak_hours_altaz = self.path
+        self.assertEqual(len(altitudes), 24*3+1)
+        self.assertIsInstance(altitudes[0], float)
+        self.assertEqual(altitudes[18], round(float(self.path.altitudes[18]), 2))
+        self.assertEqual(len(peak_hours_altaz), 24) # Both midnights share their key
+        self.assertEqual(peak_hours_altaz[datetime.time(6, 0)], (altitudes[18], azimuths[18]))
+        self.assertEqual((self.path[1], self.path[-1]), (azimuths, peak_hours_altaz))
+        self.assertEqual(self.path[:2], (altitudes, azimuths))
+
+        twilight_times, twilight_events = self.twilight
+        self.assertEqual(len(self.twilight), len(tuple(self.twilight)))
+        self.assertEqual(len(self.twilight.times), 8)
+        self.assertIsInstance(twilight_times[0], datetime.time)
+        self.assertEqual(twilight_events.tolist(), [3, 2, 1, 0, 1, 2, 3, 4])
+
+    def test_bytes(self):
+        """
+        Test case for the to_bytes and from_bytes methods.
+        It verifies that the values survive the round trip, and that pickle goes through the same bytes.
+        """
+        self.assertEqual(DailyPath.from_bytes(self.path.to_bytes()), self.path)
+        self.assertEqual(pickle.loads(pickle.dumps(self.path)), self.path)
+        self.assertLess(len(pickle.dumps(self.path)), len(self.path.to_bytes()) + 100)
+
+        twilight = pickle.loads(pickle.dumps(self.twilight))
+        self.assertIsInstance(twilight, TwilightEvents)
+        self.assertEqual(twilight, self.twilight)
+        self.assertEqual(twilight[0], self.twilight[0])
+
+    def test_compact(self):
+        """
+        Test case for the storage of a daily path.
+        It verifies that the samples are one contiguous float32 array and the hourly markers an index array.
+        """
+        self.assertEqual(self.path.samples.dtype, np.float32)
+        self.assertTrue(self.path.samples.flags['C_CONTIGUOUS'])
+        self.assertEqual(self.path.samples.shape, (2, 24*3+1))
+        np.testing.assert_array_equal(self.path.hours, np.arange(0, 24*3+1, 3))
+        self.assertFalse(hasattr(self.path, '__dict__'))
+
+if __name__ == '__main__':
+    unittest.main()
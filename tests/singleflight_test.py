@@ -0,0 +1,113 @@
+"""
+This script tests the SingleFlight class of the singleflight module.
+The SingleFlight class coalesces identical concurrent requests into one computation.
+
+Attributes:
+    None
+
+Methods:
+    test_coalesce: Test that concurrent calls with the same key share one computation.
+    test_exception: Test that the exception of a computation is raised for every caller.
+    test_cancel: Test that cancelling one caller does not cancel the computation for the others.
+    test_rejected: Test that a full work queue is counted as a rejection, not as an error.
+"""
+
+import asyncio
+import unittest
+from context import astrobot
+from astrobot import singleflight
+from workqueue import QueueFullError
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the SingleFlight class of the singleflight module.
+
+    Attributes:
+        flights (SingleFlight): The single-flight layer under test.
+        calls (int): The number of computations actually run.
+
+    Methods:
+        test_coalesce: Test that concurrent calls with the same key share one computation.
+        test_exception: Test that the exception of a computation is raised for every caller.
+        test_cancel: Test that cancelling one caller does not cancel the computation for the others.
+        test_rejected: Test that a full work queue is counted as a rejection, not as an error.
+    """
+    def setUp(self):
+        """
+        Set up a new single-flight layer for each test.
+        """
+        self.flights = singleflight.SingleFlight()
+        self.calls = 0
+
+    async def compute(self, value):
+        """
+        A slow computation counting its calls.
+        """
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        if value is None:
+            raise ValueError('no value')
+        return value * 2
+
+    async def test_coalesce(self):
+        """
+        Test case for concurrent calls with the same key.
+        It verifies that the computation runs once per key and that every caller gets its result.
+        """
+        results = await asyncio.gather(
+            *[self.flights.run('a', self.compute, 1) for _ in range(5)],
+            self.flights.run('b', self.compute, 2)
+        )
+        self.assertEqual(results, [2, 2, 2, 2, 2, 4])
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(self.flights.metrics(), {'requests': 6, 'computations': 2, 'coalesced': 4, 'errors': 0, 'rejected': 0, 'in_flight': 0})
+
+        # A finished computation is not reused
+        self.assertEqual(await self.flights.run('a', self.compute, 3), 6)
+        self.assertEqual(self.calls, 3)
+
+    async def test_exception(self):
+        """
+        Test case for a computation raising an exception.
+        It verifies that every caller gets the exception and that it is counted once.
+        """
+        results = await asyncio.gather(
+            *[self.flights.run('a', self.compute, None) for _ in range(3)],
+            return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flights.errors, 1)
+        self.assertEqual(self.flights.in_flight(), 0)
+
+    async def test_cancel(self):
+        """
+        Test case for a cancelled caller.
+        It verifies that the other callers still get the result of the shared computation.
+        """
+        first = asyncio.ensure_future(self.flights.run('a', self.compute, 1))
+        second = asyncio.ensure_future(self.flights.run('a', self.compute, 1))
+        await asyncio.sleep(0)
+        first.cancel()
+        self.assertEqual(await second, 2)
+        self.assertTrue(first.cancelled())
+        self.assertEqual(self.calls, 1)
+
+    async def test_rejected(self):
+        """
+        Test case for a computation rejected by the work queue.
+        It verifies that every caller gets the rejection and that it is counted apart from the errors.
+        """
+        async def reject():
+            raise QueueFullError(32)
+
+        results = await asyncio.gather(
+            *[self.flights.run('a', reject) for _ in range(3)],
+            return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, QueueFullError) for result in results))
+        self.assertEqual(self.flights.rejected, 1)
+        self.assertEqual(self.flights.errors, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+This script tests the TimezoneResolver class of the timezones module.
+The timezones module resolves the timezone of a location from a precomputed grid index.
+
+Attributes:
+    PARIS, MONACO, BERLIN, ISLAND (list): The rings of the synthetic timezones, in degrees.
+    ZONES (dict): The synthetic timezones, as a GeoJSON feature collection.
+
+Methods:
+    setUp: Build the index of the synthetic timezones in a temporary directory.
+    test_lookup: Test the timezones of random locations against a point in polygon test.
+    test_high_seas: Test the nautical timezone outside every zone.
+    test_missing_index: Test the default timezone without an index.
+    test_bundled_index: Test the timezones of the coarse index shipped with AstroBot.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+from matplotlib.path import Path
+from context import astrobot
+from constants import DEFAULT_TIMEZONE
+import timezones
+
+PARIS = [[0, 40], [12, 40], [8, 50], [0, 50], [0, 40]]
+MONACO = [[4, 44], [4, 46], [6, 46], [6, 44], [4, 44]]
+BERLIN = [[12, 40], [20, 40], [20, 50], [8, 50], [12, 40]]
+ISLAND = [[30, -10], [31.3, -10], [31.3, -8.7], [30, -10]]
+
+ZONES = {
+    'type': 'FeatureCollection',
+    'features': [
+        {'type': 'Feature', 'properties': {'tzid': 'Europe/Paris'}, 'geometry': {'type': 'Polygon', 'coordinates': [PARIS, MONACO]}},
+        {'type': 'Feature', 'properties': {'tzid': 'Europe/Monaco'}, 'geometry': {'type': 'Polygon', 'coordinates': [MONACO[::-1]]}},
+        {'type': 'Feature', 'properties': {'tzid': 'Europe/Berlin'}, 'geometry': {'type': 'MultiPolygon', 'coordinates': [[BERLIN], [ISLAND]]}},
+    ]
+}
+
+class TestTimezoneResolver(unittest.TestCase):
+    """
+    Test the TimezoneResolver class of the timezones module.
+
+    Attributes:
+        directory (str): The directory of the index.
+        resolver (TimezoneResolver): The TimezoneResolver object.
+
+    Methods:
+        setUp: Build the index of the synthetic timezones in a temporary directory.
+        test_lookup: Test the timezones of random locations against a point in polygon test.
+        test_high_seas: Test the nautical timezone outside every zone.
+        test_missing_index: Test the default timezone without an index.
+        test_bundled_index: Test the timezones of the coarse index shipped with AstroBot.
+    """
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temporary.name, 'index')
+        geojson_path = os.path.join(self.temporary.name, 'zones.json')
+        with open(geojson_path, 'w', encoding='utf-8') as file:
+            json.dump(ZONES, file)
+        timezones.build_index(geojson_path, self.directory, 0.5)
+        self.resolver = timezones.TimezoneResolver(self.directory)
+
+    def tearDown(self):
+        self.temporary.cleanup()
+
+    def test_lookup(self):
+        """
+        Test case for the lookup method.
+        It verifies that random locations, many of them in border cells, get the zone containing them.
+        """
+        rng = np.random.default_rng(0)
+        points = np.column_stack([rng.uniform(-2, 33, 5000), np.concatenate([rng.uniform(38, 52, 4000), rng.uniform(-11, -8, 1000)])])
+
+        monaco = Path(np.array(MONACO)).contains_points(points)
+        paris = Path(np.array(PARIS)).contains_points(points) & ~monaco
+        berlin = Path(np.array(BERLIN)).contains_points(points) | Path(np.array(ISLAND)).contains_points(points)
+        expected = np.where(monaco, 'Europe/Monaco', np.where(paris, 'Europe/Paris', np.where(berlin, 'Europe/Berlin', 'None')))
+
+        found = np.array([str(self.resolver.lookup(latitude, longitude)) for longitude, latitude in points])
+        self.assertEqual(np.count_nonzero(found != expected), 0)
+
+    def test_high_seas(self):
+        """
+        Test case for the get_timezone method outside every zone.
+        It verifies that the nautical timezone of the longitude is used.
+        """
+        self.assertEqual(self.resolver.get_timezone(48.85, 2.35), 'Europe/Paris')
+        self.assertEqual(self.resolver.get_timezone(0, -75), 'Etc/GMT+5')
+        self.assertEqual(self.resolver.get_timezone(0, 30), 'Etc/GMT-2')
+        self.assertEqual(timezones.get_nautical_timezone(3), 'Etc/GMT')
+
+    def test_missing_index(self):
+        """
+        Test case for the get_timezone method without an index.
+        It verifies that the default timezone is used.
+        """
+        resolver = timezones.TimezoneResolver(os.path.join(self.temporary.name, 'missing'))
+        self.assertIsNone(resolver.lookup(48.85, 2.35))
+        self.assertEqual(resolver.get_timezone(48.85, 2.35), DEFAULT_TIMEZONE)
+
+    def test_bundled_index(self):
+        """
+        Test case for the get_timezone method of a default install.
+        It verifies that the bundled index is used while the data directory has no index.
+        """
+        with mock.patch.dict(os.environ, {'ASTROBOT_DATA_DIR': self.temporary.name}):
+            resolver = timezones.TimezoneResolver()
+        self.assertEqual(resolver.fallback, timezones.BUNDLED_INDEX)
+        self.assertEqual(resolver.get_timezone(-33.87, 151.21), 'Australia/Sydney')
+        self.assertEqual(resolver.get_timezone(40.71, -74.01), 'America/New_York')
+        self.assertEqual(resolver.get_timezone(35.68, 139.69), 'Asia/Tokyo')
+        self.assertEqual(resolver.get_timezone(48.85, 2.35), 'Europe/Paris')
+        self.assertEqual(resolver.get_timezone(0, -30), 'Etc/GMT+2')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+This script tests the WorkQueue class of the workqueue module.
+The WorkQueue class limits, orders and measures the computations of the commands.
+
+Attributes:
+    None
+
+Methods:
+    test_concurrency: Test that no more computations than the cap run at once.
+    test_full: Test that requests are rejected when the queue is full.
+    test_order: Test that text requests go first, then guilds and users take turns.
+    test_cancel: Test that a cancelled waiting request does not take a slot.
+"""
+
+import asyncio
+import unittest
+from context import astrobot
+from astrobot import workqueue
+
+class TestWorkQueue(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the WorkQueue class of the workqueue module.
+
+    Attributes:
+        order (list): The requests in the order they ran.
+        active (int): The number of computations running.
+        peak (int): The largest number of computations running at once.
+
+    Methods:
+        test_concurrency: Test that no more computations than the cap run at once.
+        test_full: Test that requests are rejected when the queue is full.
+        test_order: Test that text requests go first, then guilds and users take turns.
+        test_cancel: Test that a cancelled waiting request does not take a slot.
+    """
+    def setUp(self):
+        """
+        Set up the records of the computations.
+        """
+        self.order = []
+        self.active = 0
+        self.peak = 0
+
+    async def compute(self, name, duration=0.01):
+        """
+        A slow computation recording when it runs.
+        """
+        self.order.append(name)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(duration)
+        self.active -= 1
+        return name
+
+    async def test_concurrency(self):
+        """
+        Test case for the concurrency cap.
+        It verifies that every request runs, never more than the cap at once.
+        """
+        queue = workqueue.WorkQueue(concurrency=2, max_size=10)
+        results = await asyncio.gather(*[
+            queue.run(i, 0, workqueue.PRIORITY_IMAGE, self.compute, i) for i in range(6)
+        ])
+        self.assertEqual(results, list(range(6)))
+        self.assertEqual(self.peak, 2)
+        metrics = queue.metrics()
+        self.assertEqual((metrics['running'], metrics['waiting'], metrics['admitted']), (0, 0, 6))
+        self.assertEqual(metrics['max_waiting'], 4)
+        self.assertGreater(metrics['wait_max'], 0)
+
+    async def test_full(self):
+        """
+        Test case for a full queue.
+        It verifies that the requests above the running and waiting limits are rejected at once.
+        """
+        queue = workqueue.WorkQueue(concurrency=1, max_size=2)
+        results = await asyncio.gather(*[
+            queue.run(0, 0, workqueue.PRIORITY_IMAGE, self.compute, i) for i in range(5)
+        ], return_exceptions=True)
+        self.assertEqual(results[:3], [0, 1, 2])
+        self.assertTrue(all(isinstance(result, workqueue.QueueFullError) for result in results[3:]))
+        self.assertEqual(queue.metrics()['rejected'], 2)
+
+    async def test_order(self):
+        """
+        Test case for the scheduling order.
+        It verifies that text requests go before images and background updates last, and that guilds then users take turns.
+        """
+        queue = workqueue.WorkQueue(concurrency=1, max_size=10)
+        requests = [
+            ('first', 'a', 'g1', workqueue.PRIORITY_IMAGE),
+            ('a1', 'a', 'g1', workqueue.PRIORITY_IMAGE),
+            ('a2', 'a', 'g1', workqueue.PRIORITY_IMAGE),
+            ('b1', 'b', 'g1', workqueue.PRIORITY_IMAGE),
+            ('c1', 'c', 'g2', workqueue.PRIORITY_IMAGE),
+            ('text', 'a', 'g1', workqueue.PRIORITY_TEXT),
+            ('live', 'd', 'g3', workqueue.PRIORITY_BACKGROUND),
+        ]
+        await asyncio.gather(*[
+            queue.run(user, guild, priority, self.compute, name) for name, user, guild, priority in requests
+        ])
+        self.assertEqual(self.order, ['first', 'text', 'a1', 'c1', 'b1', 'a2', 'live'])
+
+    async def test_cancel(self):
+        """
+        Test case for a cancelled waiting request.
+        It verifies that its slot goes to the next request and that the counters stay consistent.
+        """
+        queue = workqueue.WorkQueue(concurrency=1, max_size=10)
+        first = asyncio.ensure_future(queue.run(0, 0, workqueue.PRIORITY_IMAGE, self.compute, 'first'))
+        cancelled = asyncio.ensure_future(queue.run(0, 0, workqueue.PRIORITY_IMAGE, self.compute, 'cancelled'))
+        last = asyncio.ensure_future(queue.run(0, 0, workqueue.PRIORITY_IMAGE, self.compute, 'last'))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+        self.assertEqual(self.order, ['first', 'last'])
+        self.assertEqual((queue.running, queue.waiting), (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()